@@ -0,0 +1,52 @@
+# bench_alignment.py
+# 自动对准在模拟光学台上的评估次数、收敛时间与定位误差（按轴数与目标类型）
+#
+# 用法：python -m benchmarks.bench_alignment [--runs 20] [--budget 300] [--settle-ms 0]
+
+import argparse
+import statistics
+
+import numpy as np
+
+from benchmarks.common import print_table
+from logic.alignment import MAXIMIZE_POWER, MINIMIZE_OFFSET, AlignmentOptimizer, SimulatedOpticalBench
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="自动对准基准")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=300)
+    parser.add_argument("--axes", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--settle-ms", type=float, default=0.0, help="每次移动的模拟稳定时间")
+    parser.add_argument("--noise", type=float, default=0.002)
+    args = parser.parse_args(argv)
+
+    for kind in (MAXIMIZE_POWER, MINIMIZE_OFFSET):
+        rows = {}
+        for n_axes in args.axes:
+            evaluations, elapsed, errors, converged = [], [], [], 0
+            for seed in range(args.runs):
+                bench = SimulatedOpticalBench(
+                    n_axes=n_axes, noise=args.noise, settle_time=args.settle_ms / 1000.0, seed=seed
+                )
+                optimizer = AlignmentOptimizer(
+                    bench.axes, bench.objective(kind), maximize=kind == MAXIMIZE_POWER, budget=args.budget
+                )
+                result = optimizer.run()
+                evaluations.append(result.evaluations)
+                elapsed.append(result.elapsed_s * 1000.0)
+                errors.append(float(np.linalg.norm(bench.position - bench.optimum)))
+                converged += result.converged
+            rows[f"{n_axes} axes"] = {
+                "evals_median": statistics.median(evaluations),
+                "evals_max": max(evaluations),
+                "time_median_ms": statistics.median(elapsed),
+                "error_median": statistics.median(errors),
+                "error_max": max(errors),
+                "converged": f"{converged}/{args.runs}",
+            }
+        print_table(f"AlignmentOptimizer ({kind})", rows)
+
+
+if __name__ == "__main__":
+    main()
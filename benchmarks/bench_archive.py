@@ -0,0 +1,67 @@
+# bench_archive.py
+# 分块归档：追加吞吐、压缩比，以及缩小显示/统计（只读索引）与原始读取的耗时
+#
+# 用法：python -m benchmarks.bench_archive [--samples 20000000] [--block 2000]
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import print_table, summarize
+from logic.channel_archive import ChannelArchive
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="分块归档基准")
+    parser.add_argument("--samples", type=int, default=20_000_000)
+    parser.add_argument("--block", type=int, default=2000, help="每次追加的样本数")
+    parser.add_argument("--chunk", type=int, default=1 << 16)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    path = tempfile.mkdtemp(prefix="fos-archive-")
+    try:
+        archive = ChannelArchive(path, chunk_size=args.chunk)
+        rng = np.random.default_rng(0)
+        t_block = np.arange(args.block) / 100_000.0
+        noise = rng.normal(0.0, 0.001, args.block)
+        start = time.perf_counter()
+        for i in range(0, args.samples, args.block):
+            t = t_block + i / 100_000.0
+            archive.append(t, 1.0 + 0.02 * np.sin(t) + noise)
+        append_s = time.perf_counter() - start
+        archive.close()
+
+        archive = ChannelArchive(path)
+        raw_bytes = len(archive) * archive.record_dtype.itemsize
+        print(
+            f"append {args.samples / append_s / 1e6:.1f} MS/s  ·  磁盘 {archive.disk_usage() / 2**20:.1f} MiB"
+            f"（原始 {raw_bytes / 2**20:.1f} MiB，比例 {archive.disk_usage() / raw_bytes:.2f}）"
+        )
+
+        def timed(fn) -> dict[str, float]:
+            samples = []
+            for _ in range(args.repeat):
+                begin = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - begin) * 1000.0)
+            return summarize(samples)
+
+        n = len(archive)
+        rows = {
+            "minmax full (summary)": timed(lambda: archive.read_minmax(0, n, 1000)),
+            "minmax 1% (raw)": timed(lambda: archive.read_minmax(n // 2, n // 2 + n // 100, 1000)),
+            "stats full (index)": timed(lambda: archive.stats()),
+            "read 1M cold": timed(lambda: archive.read(0, 1_000_000)),
+        }
+        print_table(f"ChannelArchive {n:,} samples, chunk {archive.chunk_size}", rows)
+        archive.close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
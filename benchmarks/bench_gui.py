@@ -0,0 +1,220 @@
+# bench_gui.py
+# DecorationPage 界面性能回归套件：界面构建、样式表应用、各导航路径延迟、侧边栏动画帧时间与每页内存
+#
+# 用法：python -m benchmarks.bench_gui [--repeat 10] [--output gui.json]
+#       python -m benchmarks.bench_gui --compare base.json [new.json] [--threshold 0.2]
+#       （只给出基线时先运行一次再与基线比较；有回归时以非零状态退出）
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import (
+    get_app,
+    load_results,
+    print_table,
+    report_comparison,
+    rss_kb,
+    save_results,
+    summarize,
+)
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _new_page(prototype_type: str, lazy: bool = True):
+    from logic.decoration_page_logic import DecorationPage
+
+    page = DecorationPage("bench", lazy_pages=lazy, prewarm=False, prototype_type=prototype_type)
+    page.resize(1400, 900)
+    page.show()
+    get_app().processEvents()
+    return page
+
+
+def _dispose(page):
+    page.close()
+    page.deleteLater()
+    get_app().processEvents()
+
+
+def _navigation_paths(page) -> list[tuple[str, list]]:
+    """每条导航路径：(名称, 依次点击的按钮)。子步骤路径先点击所属的分组步骤。"""
+    ui = page.ui
+    home = ui.nav_buttons[0]
+    paths = [(f"nav:{btn.full_text}", [btn]) for btn in ui.nav_buttons[1:]]
+    paths += [(f"step:{name}", [home, ui.step_buttons[i]]) for i, name in enumerate(ui.step_names)]
+    for group, buttons in ui.sub_step_buttons.items():
+        step = page.workflow.steps[group]
+        paths += [
+            (f"sub:{child.path}", [home, ui.step_buttons[group], buttons[j]]) for j, child in enumerate(step.children)
+        ]
+    return paths
+
+
+def _timed_click(page, button) -> float:
+    """点击到窗口重绘完成的耗时。"""
+    app = get_app()
+    start = time.perf_counter()
+    button.click()
+    app.processEvents()
+    page.repaint()
+    return _elapsed_ms(start)
+
+
+def bench_setup_ui(repeat: int) -> dict[str, dict[str, float]]:
+    from PyQt6 import QtWidgets
+
+    from ui.decoration_page import Ui_decoration_page
+
+    rows = {}
+    for lazy in (True, False):
+        samples = []
+        for _ in range(repeat):
+            widget = QtWidgets.QWidget()
+            start = time.perf_counter()
+            Ui_decoration_page().setupUi(widget, lazy=lazy)
+            samples.append(_elapsed_ms(start))
+            widget.deleteLater()
+            get_app().processEvents()
+        rows[f"setupUi/{'lazy' if lazy else 'eager'}"] = summarize(samples)
+    return rows
+
+
+def bench_apply_style(prototype_type: str, repeat: int) -> dict[str, dict[str, float]]:
+    # 所有页面都已构建并显示时重新应用样式表，包含重新计算样式与重绘
+    page = _new_page(prototype_type, lazy=False)
+    app = get_app()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page.ui._apply_style(page)
+        app.processEvents()
+        page.repaint()
+        samples.append(_elapsed_ms(start))
+    _dispose(page)
+    return {"apply_style/eager": summarize(samples)}
+
+
+def bench_navigation(prototype_type: str, repeat: int, cold_repeat: int) -> dict[str, dict[str, float]]:
+    cold: dict[str, list[float]] = {}
+    for _ in range(cold_repeat):
+        # 新页面上第一次访问每条路径，包含懒加载构建页面的开销
+        page = _new_page(prototype_type)
+        for name, buttons in _navigation_paths(page):
+            for button in buttons[:-1]:
+                button.click()
+            cold.setdefault(name, []).append(_timed_click(page, buttons[-1]))
+        _dispose(page)
+
+    warm: dict[str, list[float]] = {}
+    page = _new_page(prototype_type)
+    paths = _navigation_paths(page)
+    for name, buttons in paths:
+        for button in buttons:
+            button.click()
+    for _ in range(repeat):
+        for name, buttons in paths:
+            for button in buttons[:-1]:
+                button.click()
+            warm.setdefault(name, []).append(_timed_click(page, buttons[-1]))
+    _dispose(page)
+
+    rows = {f"navigate/cold/{name}": summarize(samples) for name, samples in cold.items()}
+    rows.update({f"navigate/warm/{name}": summarize(samples) for name, samples in warm.items()})
+    return rows
+
+
+def bench_sidebar(prototype_type: str, repeat: int, frame_ms: int = 16) -> dict[str, dict[str, float]]:
+    # 暂停动画后按固定步长推进，逐帧测量布局与重绘的耗时，不受动画定时器节拍影响
+    page = _new_page(prototype_type)
+    app = get_app()
+    samples: dict[bool, list[float]] = {True: [], False: []}
+    for _ in range(repeat):
+        # 收起与展开交替进行，每次切换都会启动一次新的动画
+        for collapsed in (True, False):
+            page.ui.toggle_btn.setChecked(collapsed)
+            animation = page._sidebar_animation
+            animation.pause()
+            for t in range(0, animation.duration() + frame_ms, frame_ms):
+                start = time.perf_counter()
+                animation.setCurrentTime(min(t, animation.duration()))
+                app.processEvents()
+                page.repaint()
+                samples[collapsed].append(_elapsed_ms(start))
+    rows = {
+        "sidebar/collapse": summarize(samples[True]),
+        "sidebar/expand": summarize(samples[False]),
+    }
+    _dispose(page)
+    return rows
+
+
+def bench_memory(prototype_type: str) -> dict[str, dict[str, float]]:
+    """首次访问每条路径时常驻内存（Qt 对象）与 Python 分配的增量。"""
+    page = _new_page(prototype_type)
+    rows = {}
+    tracemalloc.start()
+    try:
+        for name, buttons in _navigation_paths(page):
+            gc.collect()
+            rss_before = rss_kb()
+            py_before = tracemalloc.get_traced_memory()[0]
+            for button in buttons:
+                button.click()
+            get_app().processEvents()
+            page.repaint()
+            gc.collect()
+            rows[f"memory/{name}"] = {
+                "rss_kb": rss_kb() - rss_before,
+                "py_kb": (tracemalloc.get_traced_memory()[0] - py_before) / 1024.0,
+            }
+    finally:
+        tracemalloc.stop()
+    _dispose(page)
+    return rows
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="DecorationPage 界面性能回归套件")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--cold-repeat", type=int, default=3, help="冷导航（首次访问）重复次数")
+    parser.add_argument("--prototype-type", default="样机A", help="使用该样机类型的装调流程")
+    parser.add_argument("--output", help="结果 JSON 的路径")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="基线 [新结果]；省略新结果时先运行一次")
+    parser.add_argument("--threshold", type=float, default=0.2, help="相对回归阈值")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        ok = report_comparison(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    # 预热一次，排除模块导入与字体加载等一次性开销
+    _dispose(_new_page(args.prototype_type))
+
+    metrics: dict[str, dict[str, float]] = {}
+    for title, rows in (
+        ("Ui_decoration_page.setupUi", bench_setup_ui(args.repeat)),
+        ("_apply_style", bench_apply_style(args.prototype_type, args.repeat)),
+        ("navigation (click to repaint)", bench_navigation(args.prototype_type, args.repeat, args.cold_repeat)),
+        ("sidebar animation frames", bench_sidebar(args.prototype_type, max(1, args.repeat // 3))),
+        ("memory per page (first visit)", bench_memory(args.prototype_type)),
+    ):
+        print_table(title, rows)
+        metrics.update(rows)
+
+    if args.output:
+        save_results(args.output, "gui", metrics, repeat=args.repeat, prototype_type=args.prototype_type)
+    if args.compare:
+        new = {"metrics": metrics}
+        if not report_comparison(load_results(args.compare[0]), new, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
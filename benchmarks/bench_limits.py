@@ -0,0 +1,124 @@
+# bench_limits.py
+# 限值判定吞吐：不同块大小、规则数与数据形态下每条规则每秒可判定的样本数，并与逐样本 Python 判定对比
+#
+# 用法：python -m benchmarks.bench_limits [--repeat 20] [--output limits.json]
+#       python -m benchmarks.bench_limits --compare base.json [new.json] [--threshold 0.2]
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import load_results, print_table, report_comparison, save_results, summarize
+from logic.limits import LimitEngine, LimitRule
+
+BLOCK_SIZES = [10, 256, 4096, 65536]
+RULE_COUNTS = [1, 4, 16]
+# 数据形态：quiet 全部在限内（最常见），noisy 约 5% 样本超限，storm 每 8 个样本在超限与限内之间来回
+PROFILES = ("quiet", "noisy", "storm")
+
+
+def make_block(profile: str, n: int, rng: np.random.Generator) -> np.ndarray:
+    if profile == "quiet":
+        return 1.0 + rng.normal(0.0, 0.01, n)
+    if profile == "noisy":
+        return 1.0 + rng.normal(0.0, 0.025, n)
+    return 1.0 + np.where(np.arange(n) % 16 < 8, 0.1, 0.0) + rng.normal(0.0, 0.01, n)
+
+
+def make_rules(count: int) -> list[LimitRule]:
+    return [
+        LimitRule(f"rule{i}", "功率", low=0.95, high=1.05, hysteresis=0.005, debounce=1 + i % 4) for i in range(count)
+    ]
+
+
+def python_reference(rules: list[LimitRule], v: np.ndarray):
+    """逐样本判定的基线，相当于在槽函数里对每个读数做比较。"""
+    states = [[False, 0] for _ in rules]
+    for x in v.tolist():
+        for rule, state in zip(rules, states):
+            if state[0]:
+                ok = rule.low + rule.hysteresis <= x <= rule.high - rule.hysteresis
+            else:
+                ok = x < rule.low or x > rule.high
+            state[1] = state[1] + 1 if ok else 0
+            if state[1] >= rule.debounce:
+                state[0] = not state[0]
+                state[1] = 0
+
+
+def bench_engine(profile: str, block: int, rules: int, repeat: int) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    # 每次测量至少判定约 256k 个样本，小块时同样的总量被拆成更多次调用
+    calls = max(1, 262_144 // block)
+    blocks = [make_block(profile, block, rng) for _ in range(min(calls, 16))]
+    t = np.arange(block, dtype=np.float64)
+    engine = LimitEngine()
+    engine.set_rules(make_rules(rules))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(calls):
+            engine.evaluate("功率", t, blocks[i % len(blocks)])
+        samples.append((time.perf_counter() - start) * 1000.0 / calls)
+    row = summarize(samples)
+    # 每条规则折算的吞吐：样本数 × 规则数 / 耗时
+    row["samples_per_s_per_rule"] = block * rules / (row["median_ms"] / 1000.0)
+    row["alarms"] = sum(state.alarms for _, state in engine.stats())
+    return row
+
+
+def bench_python(profile: str, rules: int, repeat: int) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    block = 4096
+    v = make_block(profile, block, rng)
+    rule_set = make_rules(rules)
+    samples = []
+    for _ in range(max(1, repeat // 4)):
+        start = time.perf_counter()
+        python_reference(rule_set, v)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    row = summarize(samples)
+    row["samples_per_s_per_rule"] = block * rules / (row["median_ms"] / 1000.0)
+    return row
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="限值判定吞吐基准")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="结果 JSON 的路径")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="基线 [新结果]；省略新结果时先运行一次")
+    parser.add_argument("--threshold", type=float, default=0.2, help="相对回归阈值")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        ok = report_comparison(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    metrics: dict[str, dict[str, float]] = {}
+    for profile in PROFILES:
+        rows = {}
+        for rules in RULE_COUNTS:
+            for block in BLOCK_SIZES:
+                rows[f"{profile}/r{rules}/b{block}"] = bench_engine(profile, block, rules, args.repeat)
+            rows[f"{profile}/r{rules}/python"] = bench_python(profile, rules, args.repeat)
+        print_table(f"LimitEngine.evaluate, {profile} data (ms per block)", rows)
+        metrics.update(rows)
+
+    print("samples/s per rule (block 4096)")
+    for profile in PROFILES:
+        for rules in RULE_COUNTS:
+            engine = metrics[f"{profile}/r{rules}/b4096"]["samples_per_s_per_rule"]
+            python = metrics[f"{profile}/r{rules}/python"]["samples_per_s_per_rule"]
+            print(f"  {profile:<6} {rules:>2} rules  engine {engine / 1e6:8.2f} M  python {python / 1e6:6.3f} M  ×{engine / python:.0f}")
+
+    if args.output:
+        save_results(args.output, "limits", metrics, repeat=args.repeat)
+    if args.compare:
+        if not report_comparison(load_results(args.compare[0]), {"metrics": metrics}, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# bench_log_sink.py
+# 以持续的 10k 行/秒写入日志，同时测量 GUI 事件循环延迟
+#
+# 用法：python -m benchmarks.bench_log_sink [--rate 10000] [--seconds 5]
+
+import argparse
+import logging
+import threading
+import time
+
+from PyQt6 import QtCore, QtWidgets
+
+from benchmarks.common import get_app, print_table, summarize
+from logic.log_sink import LogViewSink
+
+
+def produce(logger: logging.Logger, rate: int, seconds: float, stop: threading.Event, counter: list[int]):
+    # 以 1ms 为粒度批量发送，尽量贴近目标速率
+    start = time.perf_counter()
+    sent = 0
+    while not stop.is_set():
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            break
+        target = int(elapsed * rate)
+        while sent < target:
+            logger.info("power=%.6f mW pos=(%d, %d)", sent * 1e-3, sent % 640, sent % 480)
+            sent += 1
+        time.sleep(0.001)
+    counter[0] = sent
+
+
+def run(rate: int, seconds: float, max_blocks: int) -> dict[str, dict[str, float]]:
+    app = get_app()
+    view = QtWidgets.QPlainTextEdit()
+    view.resize(900, 300)
+    view.show()
+
+    logger = logging.getLogger("bench.log_sink")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    sink = LogViewSink(view, logger, max_blocks=max_blocks)
+
+    lags: list[float] = []
+    probe_interval = 5
+    last = [time.perf_counter()]
+
+    def on_probe():
+        now = time.perf_counter()
+        lags.append(max(0.0, (now - last[0]) * 1000.0 - probe_interval))
+        last[0] = now
+
+    probe = QtCore.QTimer()
+    probe.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+    probe.setInterval(probe_interval)
+    probe.timeout.connect(on_probe)
+    probe.start()
+
+    stop = threading.Event()
+    counter = [0]
+    producer = threading.Thread(target=produce, args=(logger, rate, seconds, stop, counter), daemon=True)
+    start = time.perf_counter()
+    producer.start()
+    QtCore.QTimer.singleShot(int(seconds * 1000) + 200, app.quit)
+    app.exec()
+    stop.set()
+    producer.join()
+    elapsed = time.perf_counter() - start
+    probe.stop()
+    sink.close()
+
+    return {
+        "event_loop_lag": summarize(lags),
+        "throughput": {
+            "lines": counter[0],
+            "lines_per_s": counter[0] / elapsed,
+            "displayed": sink.flushed_lines,
+            "dropped": sink.buffer.dropped,
+            "blocks": view.blockCount(),
+        },
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="日志 sink 吞吐与事件循环延迟基准")
+    parser.add_argument("--rate", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--max-blocks", type=int, default=5000)
+    args = parser.parse_args(argv)
+    print_table(f"LogViewSink @ {args.rate} lines/s", run(args.rate, args.seconds, args.max_blocks))
+
+
+if __name__ == "__main__":
+    main()
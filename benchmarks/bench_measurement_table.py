@@ -0,0 +1,74 @@
+# bench_measurement_table.py
+# 在持续滚动表格的同时向 MeasurementTableModel 追加 1M 行
+#
+# 用法：python -m benchmarks.bench_measurement_table [--rows 1000000] [--batch 10000]
+
+import argparse
+import time
+
+import numpy as np
+from PyQt6 import QtCore
+
+from benchmarks.common import get_app, print_table, summarize
+from logic.measurement_table import MeasurementProxyModel, MeasurementTableModel
+from ui.measurement_table_view import MeasurementTableView
+
+COLUMNS = [("时间 (s)", "f8", ".3f"), ("X (px)", "f4", ".2f"), ("Y (px)", "f4", ".2f"), ("功率 (mW)", "f8", ".4f")]
+
+
+def run(rows: int, batch: int, sort: bool) -> dict[str, float]:
+    app = get_app()
+    rng = np.random.default_rng(0)
+    model = MeasurementTableModel(COLUMNS, flush_interval_ms=0)
+    view = MeasurementTableView()
+    proxy = MeasurementProxyModel(model, resort_delay_ms=100, parent=view)
+    view.setModel(proxy)
+    view.resize(600, 400)
+    view.show()
+    if sort:
+        proxy.sort(3, QtCore.Qt.SortOrder.DescendingOrder)
+
+    frame_ms = []
+    appended = 0
+    start = time.perf_counter()
+    while appended < rows:
+        t0 = time.perf_counter()
+        n = min(batch, rows - appended)
+        t = (appended + np.arange(n)) * 1e-3
+        model.append_rows(t, rng.normal(320, 5, n), rng.normal(240, 5, n), rng.normal(1.0, 0.01, n))
+        appended += n
+        model.flush()
+        # 模拟用户滚动：在顶部、中部和底部之间来回跳转
+        bar = view.verticalScrollBar()
+        bar.setValue((appended // batch) * 97 % max(1, bar.maximum() + 1))
+        view.viewport().repaint()
+        app.processEvents()
+        frame_ms.append((time.perf_counter() - t0) * 1000.0)
+    elapsed = time.perf_counter() - start
+    settle = time.perf_counter()
+    while (proxy.busy or proxy.rowCount() < rows) and time.perf_counter() - settle < 10:
+        app.processEvents()
+
+    stats = summarize(frame_ms)
+    stats["rows_per_s"] = rows / elapsed
+    stats["proxy_rows"] = proxy.rowCount()
+    stats["storage_mb"] = model.nbytes / 1e6
+    stats["cached_cells"] = model.cached_cells
+    view.close()
+    return stats
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="测量表格追加与滚动基准")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    rows = {
+        "append+scroll": run(args.rows, args.batch, sort=False),
+        "append+scroll (sorted)": run(args.rows, args.batch, sort=True),
+    }
+    print_table(f"MeasurementTableModel: {args.rows:,} rows in batches of {args.batch:,}", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_replay.py
+# 回放/仿真模式：以预设负载剖面驱动完整装调页面，测量端到端吞吐（样本/帧/日志）与事件循环、相机抓取延迟
+#
+# 用法：python -m benchmarks.bench_replay [--profiles nominal heavy] [--speeds max 4] [--duration 30] [--output replay.json]
+#       python -m benchmarks.bench_replay --compare base.json [new.json] [--threshold 0.2]
+
+import argparse
+import dataclasses
+import shutil
+import sys
+import tempfile
+
+from benchmarks.common import get_app, load_results, print_table, report_comparison, save_results
+from logic.replay import REPLAY_PRESETS, ReplayController, parse_speed
+
+SPANS = ["event_loop.lag_ms", "camera.grab"]
+
+
+def run_once(name: str, speed: float, duration: float | None) -> dict:
+    """以 ``speed`` 回放一次剖面 ``name``，返回 ``ReplayController.report()``。"""
+    app = get_app()
+    profile = REPLAY_PRESETS[name]()
+    if duration:
+        profile = dataclasses.replace(profile, duration=duration)
+    root = tempfile.mkdtemp(prefix="fos-replay-")
+    controller = ReplayController(profile, speed=speed)
+    window = controller.create_page(session_root=root)
+    result: dict = {}
+    try:
+        controller.finished.connect(result.update)
+        window.show()
+        controller.start()
+        while not result:
+            app.processEvents()
+    finally:
+        window.close()
+        controller.stop()
+        app.processEvents()
+        shutil.rmtree(root, ignore_errors=True)
+    return result
+
+
+def to_row(report: dict) -> dict[str, float]:
+    row = {
+        "median_ms": report["wall_s"] * 1000.0,
+        "speed_x": report["effective_speed"],
+        "samples": report["power"]["samples"],
+        "dropped": report["power"]["dropped"],
+        "frames": report["camera"]["frames"],
+        "logs": report["logs"],
+    }
+    for name in SPANS:
+        span = report["spans"].get(name)
+        if span:
+            key = name.split(".")[-1].removesuffix("_ms")
+            row[f"{key}_p50"] = span["p50_ms"]
+            row[f"{key}_p99"] = span["p99_ms"]
+    return row
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="回放/仿真模式端到端基准")
+    parser.add_argument("--profiles", nargs="+", default=list(REPLAY_PRESETS), choices=list(REPLAY_PRESETS))
+    parser.add_argument("--speeds", nargs="+", default=["max"], help="回放速度：N 倍速或 max")
+    parser.add_argument("--duration", type=float, help="覆盖剖面的虚拟时长 (s)")
+    parser.add_argument("--output", help="结果 JSON 的路径")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="基线 [新结果]；省略新结果时先运行一次")
+    parser.add_argument("--threshold", type=float, default=0.2, help="相对回归阈值")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        ok = report_comparison(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    metrics: dict[str, dict[str, float]] = {}
+    for name in args.profiles:
+        for text in args.speeds:
+            report = run_once(name, parse_speed(text), args.duration)
+            metrics[f"{name}@{text}"] = to_row(report)
+    # max 速度下样本/帧/日志数应在多次运行间完全一致，median_ms 为墙钟耗时
+    print_table("replay（median_ms 为墙钟耗时，lag/grab 为事件循环延迟与相机抓取耗时的分位数 ms）", metrics)
+
+    if args.output:
+        save_results(args.output, "replay", metrics, duration=args.duration)
+    if args.compare:
+        if not report_comparison(load_results(args.compare[0]), {"metrics": metrics}, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# bench_report.py
+# 报告生成：不同时长的合成会话（功率归档 + 会话快照、同轴度、日志）生成 HTML / PDF 的耗时与工作进程峰值内存
+#
+# 用法：python -m benchmarks.bench_report [--hours 0.1 0.5 2] [--rate 1000] [--output report.json]
+#       python -m benchmarks.bench_report --compare base.json [new.json] [--threshold 0.2]
+
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import load_results, print_table, report_comparison, rss_kb, save_results
+from logic.channel_archive import ChannelArchive
+from logic.report import ReportSpec, build_report
+from logic.session_store import SessionStore
+from logic.streaming_stats import AllanDeviation, SessionStatistics
+
+SNAPSHOT_FPS = 30
+COAX_FPS = 10
+FLUSH_S = 0.5  # 与 SessionStore 默认的提交间隔相同，每个块约为一次提交的行数
+COAX_CHANNELS = [("同轴度/信号收发同轴度", "信号收发同轴度"), ("同轴度/信标收发同轴度", "信标收发同轴度")]
+
+
+def make_session(root: str, hours: float, rate: int) -> ReportSpec:
+    """生成 ``hours`` 小时的合成会话与 ``rate`` Hz 的功率归档，返回对应的报告参数。"""
+    path = os.path.join(root, "session.sqlite")
+    store = SessionStore(path, "bench", "样机A")
+    store.record_state(nav=0, step=5, sub_step=0)
+    store.close()
+
+    rng = np.random.default_rng(0)
+    duration = hours * 3600.0
+    stats = SessionStatistics()
+    stats.channel("功率", AllanDeviation(1.0 / rate, base=max(1, round(0.01 * rate))))
+    archive = ChannelArchive(os.path.join(root, "session.power"))
+    step = 100_000
+    total = int(duration * rate)
+    for start in range(0, total, step):
+        t = np.arange(start, min(total, start + step)) / rate
+        v = 1.0 + 0.01 * np.sin(t / 600.0) + rng.normal(0.0, 0.002, len(t))
+        archive.append(t, v)
+        stats.update("功率", v, t)
+    archive.close()
+
+    conn = sqlite3.connect(path)
+    with conn:
+        rows = []
+        n = int(SNAPSHOT_FPS * FLUSH_S)
+        for t0 in np.arange(0.0, duration, FLUSH_S):
+            t = t0 + np.arange(n) / SNAPSHOT_FPS
+            data = np.column_stack([t, 1.0 + rng.normal(0.0, 0.002, n)])
+            rows.append(("功率", t[0], t[-1], n, 2, data.tobytes()))
+        n = int(COAX_FPS * FLUSH_S)
+        for channel, _ in COAX_CHANNELS:
+            for t0 in np.arange(0.0, duration, FLUSH_S):
+                t = t0 + np.arange(n) / COAX_FPS
+                offset = np.abs(rng.normal(0.8, 0.4, n))
+                data = np.column_stack([t, 320 + offset, 240 + offset, np.full(n, 12.0), np.full(n, 12.0), offset])
+                rows.append((channel, t[0], t[-1], n, 6, data.tobytes()))
+                stats.update(channel, offset)
+        conn.executemany("INSERT INTO measurements (channel, t0, t1, count, width, data) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        # 每分钟一条警告
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO logs (ts, level, message) VALUES (?, ?, ?)",
+            [(now + t, logging.WARNING, f"功率波动偏大：{t:.0f} s") for t in np.arange(0.0, duration, 60.0)],
+        )
+    conn.close()
+    return ReportSpec(
+        session_path=path,
+        output_path="",
+        title="bench 装调报告",
+        archive_path=os.path.join(root, "session.power"),
+        coax_channels=COAX_CHANNELS,
+        statistics=stats.to_dict(),
+        limits={"power_stability": 0.01, "coax_offset_p95": 2.0},
+    )
+
+
+def peak_rss_kb() -> float:
+    """当前进程的峰值常驻内存（KiB）。
+
+    不用 ``ru_maxrss``：Linux 上它经 fork/exec 继承，子进程会报告父进程生成合成数据时的峰值。
+    ``VmHWM`` 属于 exec 后新的地址空间；非 Linux 平台返回 NaN。
+    """
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _child(spec: ReportSpec, conn):
+    """在干净的子进程中生成一次报告，发回耗时与峰值内存（相对导入完成后的基线）。"""
+    app = None
+    if spec.fmt == "pdf":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6 import QtGui
+
+        app = QtGui.QGuiApplication(["bench"])
+    base = rss_kb()
+    start = time.perf_counter()
+    result = build_report(spec)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    conn.send({"median_ms": elapsed, "rss_kb": peak_rss_kb() - base, "pages": result["pages"], "kib": result["bytes"] / 1024})
+    conn.close()
+    del app
+
+
+def run_once(spec: ReportSpec) -> dict[str, float]:
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_child, args=(spec, sender))
+    process.start()
+    sender.close()
+    row = receiver.recv()
+    process.join()
+    return row
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="报告生成基准")
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.1, 0.5, 2.0], help="合成会话时长（小时）")
+    parser.add_argument("--rate", type=int, default=1000, help="功率归档采样率 (Hz)")
+    parser.add_argument("--formats", nargs="+", default=["html", "pdf"])
+    parser.add_argument("--output", help="结果 JSON 的路径")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="基线 [新结果]；省略新结果时先运行一次")
+    parser.add_argument("--threshold", type=float, default=0.2, help="相对回归阈值")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        ok = report_comparison(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    metrics: dict[str, dict[str, float]] = {}
+    for hours in args.hours:
+        root = tempfile.mkdtemp(prefix="fos-report-")
+        try:
+            start = time.perf_counter()
+            spec = make_session(root, hours, args.rate)
+            print(f"{hours:g} h：生成合成会话 {time.perf_counter() - start:.1f} s")
+            for fmt in args.formats:
+                spec.output_path = os.path.join(root, f"report.{fmt}")
+                metrics[f"{fmt}/{hours:g}h"] = run_once(spec)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    # 峰值内存应与会话时长基本无关
+    print_table("build_report（耗时 ms，rss_kb 为工作进程峰值内存减去导入后的基线）", metrics)
+
+    if args.output:
+        save_results(args.output, "report", metrics, rate=args.rate)
+    if args.compare:
+        if not report_comparison(load_results(args.compare[0]), {"metrics": metrics}, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_spot_analysis.py
+# 不同分辨率下光斑分析的单帧耗时：整帧找峰、ROI 跟踪、批量帧栈
+#
+# 用法：python -m benchmarks.bench_spot_analysis [--repeat 20] [--batch 8]
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import print_table, summarize
+from logic.camera import SimulatedCamera
+from logic.spot_analysis import SpotAnalyzer
+
+FRAME_SIZES = [(480, 640), (1024, 1280), (1536, 2048), (3000, 4096)]
+
+
+def make_frames(shape: tuple[int, int], count: int, dtype) -> np.ndarray:
+    camera = SimulatedCamera(shape=shape, fps=1e9, dtype=dtype, spot_sigma=shape[1] / 50)
+    camera.open()
+    frames = np.empty((count, *shape), dtype=dtype)
+    for frame in frames:
+        camera.grab_into(frame)
+    return frames
+
+
+def time_calls(fn, repeat: int, per_call: int = 1) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0 / per_call)
+    return summarize(samples)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="光斑分析基准")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--dtype", choices=["uint8", "uint16"], default="uint16")
+    args = parser.parse_args(argv)
+
+    for shape in FRAME_SIZES:
+        frames = make_frames(shape, args.batch, np.dtype(args.dtype))
+        frame = frames[0]
+
+        full = SpotAnalyzer(track=False)
+        tracked = SpotAnalyzer()
+        tracked.analyze(frame)  # 建立 ROI
+        batch = SpotAnalyzer(track=False)
+        batch_tracked = SpotAnalyzer()
+        batch_tracked.analyze(frame)
+
+        rows = {
+            "full frame": time_calls(lambda: full.analyze(frame), args.repeat),
+            "roi tracked": time_calls(lambda: tracked.analyze(frame), args.repeat),
+            f"stack x{args.batch} (per frame)": time_calls(
+                lambda: batch.analyze_stack(frames), max(1, args.repeat // 4), per_call=args.batch
+            ),
+            f"stack x{args.batch} roi (per frame)": time_calls(
+                lambda: batch_tracked.analyze_stack(frames), args.repeat, per_call=args.batch
+            ),
+        }
+        print_table(f"SpotAnalyzer {shape[1]}x{shape[0]} {args.dtype}", rows)
+
+
+if __name__ == "__main__":
+    main()
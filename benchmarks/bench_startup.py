@@ -0,0 +1,45 @@
+# bench_startup.py
+# 比较按需构建（lazy）与一次性构建（eager）步骤页面时 DecorationPage 的首帧时间
+#
+# 用法：python -m benchmarks.bench_startup [--repeat N]
+
+import argparse
+import time
+
+from benchmarks.common import get_app, print_table, summarize, wait_for_first_paint
+
+
+def measure_first_paint(lazy: bool, repeat: int) -> dict[str, float]:
+    from logic.decoration_page_logic import DecorationPage
+
+    app = get_app()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = DecorationPage("bench", lazy_pages=lazy, prewarm=False)
+        page.resize(1400, 900)
+        wait_for_first_paint(page)
+        samples.append((time.perf_counter() - start) * 1000.0)
+        page.close()
+        page.deleteLater()
+        app.processEvents()
+    return summarize(samples)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="DecorationPage 首帧时间基准")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    # 预热一次，排除模块导入与字体加载等一次性开销
+    measure_first_paint(lazy=True, repeat=1)
+    rows = {
+        "lazy": measure_first_paint(lazy=True, repeat=args.repeat),
+        "eager": measure_first_paint(lazy=False, repeat=args.repeat),
+    }
+    print_table("DecorationPage time-to-first-paint", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_startup_main.py
+# 冷启动回归基准：多次启动 main.py，统计到 InitialPage.show() 与首帧的耗时
+#
+# 用法：python -m benchmarks.bench_startup_main [--runs 10] [--max-show-ms 300]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(extra_args: list[str]) -> dict[str, float]:
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "profile.json")
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "main.py"), "--profile-json", out, "--quit-after-startup", *extra_args],
+            cwd=ROOT,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        wall = (time.perf_counter() - start) * 1000.0
+        with open(out, encoding="utf-8") as fh:
+            data = json.load(fh)
+    return {
+        "show_ms": data["marks_ms"]["InitialPage.show()"],
+        "first_paint_ms": data["marks_ms"]["first paint"],
+        "imports_ms": data["imports_total_ms"],
+        "process_wall_ms": wall,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="main.py 冷启动基准")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-show-ms", type=float, default=0.0, help="中位数超过该值时以非零状态退出")
+    args = parser.parse_args(argv)
+
+    runs = [run_once([]) for _ in range(args.runs)]
+    rows = {key: summarize([r[key] for r in runs]) for key in runs[0]}
+    print_table(f"main.py startup ({args.runs} runs)", rows)
+
+    if args.max_show_ms and rows["show_ms"]["median_ms"] > args.max_show_ms:
+        print(f"REGRESSION: median time to InitialPage.show() {rows['show_ms']['median_ms']:.1f} ms > {args.max_show_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# bench_theme.py
+# 样式表/主题引擎基准：与原先每次整窗 setStyleSheet 的做法对比重复应用、状态切换与新窗口的耗时，并测量深浅主题切换
+#
+# 用法：python -m benchmarks.bench_theme [--repeat 20] [--output theme.json]
+#       python -m benchmarks.bench_theme --compare base.json [new.json] [--threshold 0.2]
+
+import argparse
+import sys
+import time
+
+from benchmarks.common import get_app, load_results, print_table, report_comparison, save_results, summarize
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _settle(widget):
+    get_app().processEvents()
+    widget.repaint()
+
+
+def _new_page(prototype_type: str):
+    from logic.decoration_page_logic import DecorationPage
+
+    # 所有页面都构建出来，样式表作用于完整的控件树
+    page = DecorationPage("bench", lazy_pages=False, prewarm=False, prototype_type=prototype_type)
+    page.resize(1400, 900)
+    page.show()
+    _settle(page)
+    return page
+
+
+def _timed(widget, fn, repeat: int) -> list[float]:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        _settle(widget)
+        samples.append(_elapsed_ms(start))
+    return samples
+
+
+def bench_compile(repeat: int) -> dict[str, dict[str, float]]:
+    from ui.theme import THEMES, ThemeEngine
+
+    samples = []
+    for _ in range(repeat):
+        engine = ThemeEngine(settings_path=None)
+        start = time.perf_counter()
+        for name in THEMES:
+            engine.stylesheet(name)
+            engine.palette(name)
+        samples.append(_elapsed_ms(start) / len(THEMES))
+    return {"theme/compile": summarize(samples)}
+
+
+def bench_reapply(page, repeat: int) -> dict[str, dict[str, float]]:
+    """重复应用同一主题：原做法每次都整窗重新解析与 polish，引擎发现样式未变时直接跳过。"""
+    from ui.theme import THEME
+
+    sheet = THEME.stylesheet()
+    return {
+        "reapply/legacy": summarize(_timed(page, lambda _: page.setStyleSheet(sheet), repeat)),
+        "reapply/engine": summarize(_timed(page, lambda _: THEME.install(page), repeat)),
+    }
+
+
+def bench_state_change(page, repeat: int) -> dict[str, dict[str, float]]:
+    """样机总结的结论标签在合格/不合格间切换：每控件样式表 vs 动态属性 + 只重新 polish 该控件。"""
+    from ui.summary_panel import SummaryPanel
+    from ui.theme import THEME
+
+    panel = SummaryPanel(parent=page.ui.content_container)
+    panel.set_value("bench", "key", "1", True)
+    label = panel._rows[("bench", "key")][2]
+    colors = ("color: #16a34a;", "color: #dc2626;")
+    rows = {
+        "state/legacy": summarize(_timed(page, lambda i: label.setStyleSheet(colors[i % 2]), repeat)),
+        "state/engine": summarize(
+            _timed(page, lambda i: THEME.set_state(label, "verdict", ("pass", "fail")[i % 2]), repeat)
+        ),
+    }
+    panel.deleteLater()
+    return rows
+
+
+def bench_theme_switch(page, repeat: int) -> dict[str, dict[str, float]]:
+    from ui.theme import THEME
+
+    original = THEME.name
+    repolish = []
+
+    def switch(i: int):
+        repolish.append(THEME.set_theme(("dark", "light")[i % 2], persist=False))
+
+    rows = {"theme/switch": summarize(_timed(page, switch, repeat))}
+    rows["theme/switch_repolish"] = summarize(repolish)
+    THEME.set_theme(original, persist=False)
+    return rows
+
+
+def bench_new_window(prototype_type: str, repeat: int) -> dict[str, dict[str, float]]:
+    """再打开一个窗口时构建 + 应用样式的总耗时（样式表字符串已缓存）。"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = _new_page(prototype_type)
+        samples.append(_elapsed_ms(start))
+        page.close()
+        page.deleteLater()
+        get_app().processEvents()
+    return {"window/new": summarize(samples)}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="样式表/主题引擎基准")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--prototype-type", default="样机A", help="使用该样机类型的装调流程")
+    parser.add_argument("--output", help="结果 JSON 的路径")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="基线 [新结果]；省略新结果时先运行一次")
+    parser.add_argument("--threshold", type=float, default=0.2, help="相对回归阈值")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        ok = report_comparison(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(0 if ok else 1)
+
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    page = _new_page(args.prototype_type)
+    metrics: dict[str, dict[str, float]] = {}
+    for title, rows in (
+        ("QSS/palette generation", bench_compile(args.repeat)),
+        ("re-apply unchanged theme", bench_reapply(page, args.repeat)),
+        ("verdict state change", bench_state_change(page, args.repeat)),
+        ("dark/light switch", bench_theme_switch(page, args.repeat)),
+        ("new window", bench_new_window(args.prototype_type, max(1, args.repeat // 4))),
+    ):
+        print_table(title, rows)
+        metrics.update(rows)
+    page.close()
+
+    if args.output:
+        save_results(args.output, "theme", metrics, repeat=args.repeat, prototype_type=args.prototype_type)
+    if args.compare:
+        if not report_comparison(load_results(args.compare[0]), {"metrics": metrics}, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_trace_plot.py
+# 在缓冲 1M 样本的情况下测量 TracePlotWidget 的单帧绘制时间
+#
+# 用法：python -m benchmarks.bench_trace_plot [--samples 1000000] [--frames 200]
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import get_app, print_table, summarize
+from ui.trace_plot import TracePlotWidget
+
+
+def run_case(plot: TracePlotWidget, frames: int, append_per_frame: int, rng: np.random.Generator) -> dict[str, float]:
+    app = get_app()
+    paint_ms = []
+    frame_ms = []
+    t_last, _ = plot.buffer.latest(1)
+    next_t = float(t_last[-1]) if len(t_last) else 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        if append_per_frame:
+            t = next_t + np.arange(1, append_per_frame + 1) * 1e-4
+            next_t = t[-1]
+            plot.append(t, rng.normal(1.0, 0.01, append_per_frame))
+        plot.repaint()
+        app.processEvents()
+        frame_ms.append((time.perf_counter() - start) * 1000.0)
+        paint_ms.append(plot.last_paint_ms)
+    stats = summarize(paint_ms)
+    stats["frame_median_ms"] = summarize(frame_ms)["median_ms"]
+    return stats
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="TracePlotWidget 帧时间基准")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=800)
+    args = parser.parse_args(argv)
+
+    app = get_app()  # noqa: F841  保持 QApplication 存活
+    rng = np.random.default_rng(0)
+    plot = TracePlotWidget(capacity=args.samples, max_fps=1000)
+    plot.resize(args.width, 300)
+    plot.show()
+    plot.append(np.arange(args.samples) * 1e-4, rng.normal(1.0, 0.01, args.samples))
+
+    rows = {}
+    for window in (10_000, 100_000, args.samples):
+        plot.window = window
+        plot.follow_live()
+        rows[f"live window={window}"] = run_case(plot, args.frames, 1000, rng)
+    plot.window = 100_000
+    plot.pan_to(plot.buffer.total_written - args.samples // 2)
+    rows["panned window=100000"] = run_case(plot, args.frames, 1000, rng)
+    print_table(f"TracePlotWidget paint time ({args.samples:,} buffered samples, {args.width}px)", rows)
+
+
+if __name__ == "__main__":
+    main()
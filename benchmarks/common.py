@@ -0,0 +1,124 @@
+# common.py
+# 基准测试的公共工具：无界面 QApplication、计时统计与结果输出、JSON 结果比较
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from PyQt6 import QtCore, QtWidgets
+
+# 比较时检查的字段；相对变化超过阈值且绝对变化超过下限才算回归，避免噪声误报
+COMPARE_FIELDS = {"median_ms": 0.5, "p95_ms": 2.0, "rss_kb": 256.0, "py_kb": 64.0}
+
+
+def get_app() -> QtWidgets.QApplication:
+    """返回（必要时创建）QApplication，默认使用 offscreen 平台。"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(sys.argv[:1])
+    return app
+
+
+class _PaintProbe(QtCore.QObject):
+    def __init__(self):
+        super().__init__()
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Type.Paint:
+            self.painted = True
+        return False
+
+
+def wait_for_first_paint(widget: QtWidgets.QWidget, timeout: float = 5.0) -> bool:
+    """显示 ``widget`` 并处理事件直到其第一次绘制。"""
+    probe = _PaintProbe()
+    widget.installEventFilter(probe)
+    widget.show()
+    app = QtWidgets.QApplication.instance()
+    deadline = time.perf_counter() + timeout
+    while not probe.painted and time.perf_counter() < deadline:
+        app.processEvents()
+    widget.removeEventFilter(probe)
+    return probe.painted
+
+
+def summarize(samples_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(samples_ms)
+    return {
+        "n": len(ordered),
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max_ms": ordered[-1],
+    }
+
+
+def print_table(title: str, rows: dict[str, dict[str, float]]):
+    print(title)
+    for name, stats in rows.items():
+        cols = "  ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items())
+        print(f"  {name:<24} {cols}")
+
+
+def rss_kb() -> float:
+    """当前进程的常驻内存（KiB）；只在 Linux 上可用，其他平台返回 NaN。"""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024.0
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def save_results(path: str, name: str, metrics: dict[str, dict[str, float]], **meta):
+    """把 ``metrics``（指标名 -> 统计字段）写成 JSON，附带运行环境信息。"""
+    data = {
+        "benchmark": name,
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QtCore.QT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **meta,
+        },
+        "metrics": metrics,
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def compare_results(base: dict, new: dict, threshold: float) -> list[tuple[str, str, float, float, float]]:
+    """比较两次运行，返回 [(指标, 字段, 基线, 新值, 相对变化)]，只包含超过阈值的回归。"""
+    regressions = []
+    base_metrics = base["metrics"]
+    for key, stats in new["metrics"].items():
+        old = base_metrics.get(key)
+        if old is None:
+            continue
+        for field, min_abs in COMPARE_FIELDS.items():
+            if field not in stats or field not in old or not old[field] > 0:
+                continue
+            change = stats[field] / old[field] - 1.0
+            if change > threshold and stats[field] - old[field] > min_abs:
+                regressions.append((key, field, old[field], stats[field], change))
+    return regressions
+
+
+def report_comparison(base: dict, new: dict, threshold: float) -> bool:
+    """打印超过阈值的回归，没有回归时返回 True。"""
+    regressions = compare_results(base, new, threshold)
+    for key, field, old, value, change in regressions:
+        print(f"REGRESSION: {key} {field} {old:.3f} -> {value:.3f} (+{change * 100:.0f}%)")
+    if not regressions:
+        print(f"no regressions beyond {threshold * 100:.0f}%")
+    return not regressions
@@ -0,0 +1,437 @@
+# acquisition_process.py
+# 进程外采集：驱动在独立的工作进程中运行，样本块与相机帧经共享内存环形缓冲交给界面进程，带心跳监控与自动重启
+
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+
+import numpy as np
+
+from logic.camera import CameraSource
+from logic.power_meter import PowerMeterDriver
+
+POWER = "power"
+CAMERA = "camera"
+_HEADER = 8  # int64：0 写入计数 / 帧序号，1 心跳（monotonic ns），2 驱动丢弃样本数，3 工作进程 pid
+
+logger = logging.getLogger("decoration.acquisition")
+
+
+def _attach(name: str | None, size: int) -> shared_memory.SharedMemory:
+    # spawn 启动的工作进程与界面进程共用同一个 resource_tracker，附加方退出不会删除共享内存，
+    # 只由创建方在 shutdown 时 unlink
+    return shared_memory.SharedMemory(name=name, create=size > 0, size=size)
+
+
+class SharedSampleRing:
+    """共享内存中的 (时间, 数值) 单生产者单消费者环形缓冲。
+
+    写入方只追加并最后更新写入计数；读取方按自己的读取位置取新数据，落后超过
+    ``capacity`` 或读取期间被覆盖的样本计入丢失数。``name`` 为 None 时创建，
+    否则附加到已有缓冲。
+    """
+
+    def __init__(self, capacity: int, name: str | None = None):
+        self.capacity = capacity
+        self.shm = _attach(name, 0) if name else _attach(None, _HEADER * 8 + capacity * 16)
+        buf = self.shm.buf
+        self.header = np.ndarray((_HEADER,), np.int64, buf, 0)
+        self.t = np.ndarray((capacity,), np.float64, buf, _HEADER * 8)
+        self.v = np.ndarray((capacity,), np.float64, buf, _HEADER * 8 + capacity * 8)
+        if name is None:
+            self.header[:] = 0
+
+    def spec(self) -> tuple:
+        return (SharedSampleRing, self.capacity, self.shm.name)
+
+    @property
+    def written(self) -> int:
+        return int(self.header[0])
+
+    def write(self, t: np.ndarray, v: np.ndarray):
+        total = n = len(v)
+        if n > self.capacity:
+            # 只保留最后 capacity 个，写入计数仍按全部样本前进，被挤掉的计入读取方的丢失数
+            t, v, n = t[-self.capacity:], v[-self.capacity:], self.capacity
+        start = int(self.header[0]) + total - n
+        i = start % self.capacity
+        first = min(n, self.capacity - i)
+        self.t[i:i + first] = t[:first]
+        self.v[i:i + first] = v[:first]
+        self.t[:n - first] = t[first:]
+        self.v[:n - first] = v[first:]
+        self.header[0] = start + n
+
+    def read(self, since: int) -> tuple[np.ndarray, np.ndarray, int, int]:
+        """读取 ``since`` 之后的样本，返回 (t, v, 新的读取位置, 丢失样本数)。"""
+        end = int(self.header[0])
+        lost = max(0, end - since - self.capacity)
+        since += lost
+        n = end - since
+        i = since % self.capacity
+        idx = (i + np.arange(n)) % self.capacity if i + n > self.capacity else slice(i, i + n)
+        t, v = self.t[idx].copy(), self.v[idx].copy()
+        # 复制期间写入方可能已绕回覆盖了开头的样本
+        overwritten = min(n, int(self.header[0]) - self.capacity - since)
+        if overwritten > 0:
+            t, v = t[overwritten:], v[overwritten:]
+            lost += overwritten
+        return t, v, end, lost
+
+    def close(self, unlink: bool = False):
+        del self.header, self.t, self.v
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class SharedFrameRing:
+    """共享内存中的相机帧槽位。
+
+    写入方直接把帧采集到下一个槽位（写入期间槽位序号置为 -1），完成后更新槽位
+    序号与全局帧序号；读取方只取最新一帧，复制前后序号不一致说明被覆盖，放弃本次读取。
+    """
+
+    def __init__(self, shape: tuple[int, int], dtype, slots: int = 4, name: str | None = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        offset = _HEADER * 8 + slots * 16
+        self.shm = _attach(name, 0) if name else _attach(None, offset + slots * frame_bytes)
+        buf = self.shm.buf
+        self.header = np.ndarray((_HEADER,), np.int64, buf, 0)
+        self.slot_seq = np.ndarray((slots,), np.int64, buf, _HEADER * 8)
+        self.stamps = np.ndarray((slots,), np.float64, buf, _HEADER * 8 + slots * 8)
+        self.frames = np.ndarray((slots, *self.shape), self.dtype, buf, offset)
+        if name is None:
+            self.header[:] = 0
+            self.slot_seq[:] = 0
+
+    def spec(self) -> tuple:
+        return (SharedFrameRing, self.shape, self.dtype.str, self.slots, self.shm.name)
+
+    @property
+    def written(self) -> int:
+        return int(self.header[0])
+
+    def grab(self, source: CameraSource):
+        seq = int(self.header[0]) + 1
+        slot = seq % self.slots
+        self.slot_seq[slot] = -1
+        self.stamps[slot] = source.grab_into(self.frames[slot])
+        self.slot_seq[slot] = seq
+        self.header[0] = seq
+
+    def read_latest_into(self, out: np.ndarray, last_seq: int) -> tuple[int, float] | None:
+        seq = int(self.header[0])
+        if seq <= last_seq:
+            return None
+        slot = seq % self.slots
+        if self.slot_seq[slot] != seq:
+            return None
+        out[...] = self.frames[slot]
+        stamp = float(self.stamps[slot])
+        if self.slot_seq[slot] != seq:
+            return None
+        return seq, stamp
+
+    def close(self, unlink: bool = False):
+        del self.header, self.slot_seq, self.stamps, self.frames
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _open_ring(spec: tuple):
+    cls, *args = spec
+    return cls(*args[:-1], name=args[-1])
+
+
+def _worker_main(kind: str, device, spec: tuple, commands: Connection, events: Connection):
+    """工作进程入口：按命令打开/关闭设备，打开期间循环采集写入共享内存，每轮更新心跳。"""
+    ring = _open_ring(spec)
+    ring.header[3] = multiprocessing.current_process().pid
+    running = False
+    try:
+        while True:
+            ring.header[1] = time.monotonic_ns()
+            if commands.poll(0 if running else 0.05):
+                command, *args = commands.recv()
+                if command == "stop":
+                    break
+                try:
+                    if command == "open" and not running:
+                        device.open()
+                        running = True
+                    elif command == "close" and running:
+                        running = False
+                        device.close()
+                    elif command == "call":
+                        getattr(device, args[0])(*args[1])
+                except Exception as exc:
+                    events.send(("error", f"{command}: {exc}"))
+                continue
+            if not running:
+                continue
+            try:
+                if kind == POWER:
+                    t, v = device.read_block()
+                    if len(v):
+                        ring.write(t, v)
+                    ring.header[2] = device.dropped
+                else:
+                    ring.grab(device)
+            except Exception as exc:  # 驱动异常交给界面进程处理，本进程停止采集等待命令
+                events.send(("error", str(exc)))
+                running = False
+                device.close()
+    finally:
+        if running:
+            device.close()
+        ring.close()
+
+
+class AcquisitionProcess:
+    """采集工作进程的监控器。
+
+    以 spawn 方式启动工作进程（不复制界面进程的 Qt 状态），命令经单向管道下发，
+    驱动错误经另一条管道返回。``supervise`` 由读取线程周期调用：工作进程退出或
+    心跳超过 ``heartbeat_timeout`` 秒未更新（驱动调用卡死）时终止并重启，共享内存
+    与读取位置保持不变，之前处于打开状态时在新进程中重新打开设备。``restart_window``
+    秒内重启超过 ``max_restarts`` 次后放弃并抛出异常。
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        device,
+        ring: SharedSampleRing | SharedFrameRing,
+        heartbeat_timeout: float = 2.0,
+        start_timeout: float = 15.0,
+        max_restarts: int = 3,
+        restart_window: float = 60.0,
+    ):
+        self.kind = kind
+        self.device = device
+        self.ring = ring
+        self.heartbeat_timeout = heartbeat_timeout
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.restarts = 0
+        self._restart_times: list[float] = []
+        self._context = multiprocessing.get_context("spawn")
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._commands: Connection | None = None
+        self._events: Connection | None = None
+        self._lock = threading.Lock()
+        self._opened = False
+        self._started_at = 0.0
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        with self._lock:
+            self._spawn()
+
+    def _spawn(self):
+        # 调用方持有 self._lock
+        if self.is_alive():
+            return
+        commands_recv, self._commands = self._context.Pipe(duplex=False)
+        self._events, events_send = self._context.Pipe(duplex=False)
+        self.ring.header[1] = 0
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self.kind, self.device, self.ring.spec(), commands_recv, events_send),
+            name=f"acquisition-{self.kind}",
+            daemon=True,
+        )
+        self._process.start()
+        self._started_at = time.monotonic()
+        commands_recv.close()
+        events_send.close()
+        if self._opened:
+            self._commands.send(("open",))
+
+    def send(self, command: str, *args):
+        with self._lock:
+            if command == "open":
+                self._opened = True
+            elif command == "close":
+                self._opened = False
+            if self._commands is not None:
+                try:
+                    self._commands.send((command, *args))
+                except OSError:
+                    # 工作进程已退出、尚未被 supervise 重启：丢弃命令，重启后按 _opened 恢复打开状态
+                    logger.warning("%s 采集进程不可用，已丢弃命令 %s", self.kind, command)
+
+    def heartbeat_age(self) -> float:
+        beat = int(self.ring.header[1])
+        if beat == 0:
+            return time.monotonic() - self._started_at
+        return time.monotonic() - beat / 1e9
+
+    def supervise(self):
+        """检查驱动错误与工作进程健康状况；驱动错误以 ``RuntimeError`` 抛出。"""
+        events = self._events
+        if events is not None and events.poll():
+            try:
+                _, message = events.recv()
+            except (EOFError, OSError):
+                pass  # 工作进程已退出，管道只剩 EOF，下面按进程退出处理
+            else:
+                raise RuntimeError(message)
+        started = int(self.ring.header[1]) != 0
+        timeout = self.heartbeat_timeout if started else self.start_timeout
+        if self.is_alive() and self.heartbeat_age() <= timeout:
+            return
+        reason = "心跳超时" if self.is_alive() else "进程退出"
+        now = time.monotonic()
+        self._restart_times = [t for t in self._restart_times if now - t < self.restart_window] + [now]
+        if len(self._restart_times) > self.max_restarts:
+            raise RuntimeError(f"{self.kind} 采集进程反复失效（{reason}），已停止重启")
+        logger.warning("%s 采集进程%s，正在重启", self.kind, reason)
+        # 与 send 互斥：GUI 线程不会向正被关闭的命令管道发送
+        with self._lock:
+            self._terminate()
+            self.restarts += 1
+            self._spawn()
+
+    def _terminate(self, timeout: float = 1.0):
+        # 调用方持有 self._lock
+        process = self._process
+        if process is None:
+            return
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout)
+        for conn in (self._commands, self._events):
+            if conn is not None:
+                conn.close()
+        self._process = self._commands = self._events = None
+
+    def shutdown(self, timeout: float = 2.0):
+        """停止工作进程并释放共享内存。"""
+        with self._lock:
+            if self.is_alive():
+                self._commands.send(("stop",))
+                self._process.join(timeout)
+            self._terminate()
+        self.ring.close(unlink=True)
+
+
+class RemotePowerMeter(PowerMeterDriver):
+    """在独立进程中运行 ``driver`` 的功率计驱动，可直接交给 ``PowerAcquisitionEngine``。
+
+    ``read_block`` 只从共享内存复制新样本，驱动调用卡死或 GIL 密集的处理都不会
+    占用界面进程；``close`` 只让工作进程关闭设备，进程保持运行以便下次快速打开，
+    ``shutdown`` 才结束进程。``call`` 把方法调用转发给工作进程中的驱动。
+    """
+
+    def __init__(
+        self,
+        driver: PowerMeterDriver,
+        capacity: int = 1 << 18,
+        poll_interval: float = 0.002,
+        **process_kwargs,
+    ):
+        self.sample_rate = driver.sample_rate
+        self.poll_interval = poll_interval
+        self.ring = SharedSampleRing(capacity)
+        self.process = AcquisitionProcess(POWER, driver, self.ring, **process_kwargs)
+        self.lost = 0
+        self._read = 0
+        self.process.start()
+
+    @property
+    def dropped(self) -> int:
+        return int(self.ring.header[2]) + self.lost
+
+    def open(self):
+        self.process.start()
+        self._read = self.ring.written  # 不回放上次关闭前的旧样本
+        self.process.send("open")
+
+    def close(self):
+        self.process.send("close")
+
+    def call(self, method: str, *args):
+        self.process.send("call", method, args)
+
+    def read_block(self) -> tuple[np.ndarray, np.ndarray]:
+        self.process.supervise()
+        if self.ring.written == self._read:
+            time.sleep(self.poll_interval)
+        t, v, self._read, lost = self.ring.read(self._read)
+        self.lost += lost
+        return t, v
+
+    def shutdown(self):
+        self.process.shutdown()
+
+
+class RemoteCamera(CameraSource):
+    """在独立进程中运行 ``source`` 的相机，可直接交给 ``CameraPipeline``。
+
+    工作进程把帧采集到共享内存槽位，``grab_into`` 等到新帧后复制最新一帧；
+    来不及读取而被跳过的帧计入 ``skipped``。时间戳沿用 ``source`` 的
+    ``perf_counter``（系统范围的单调时钟），界面进程中计算的延迟仍然有效。
+    """
+
+    def __init__(self, source: CameraSource, slots: int = 4, poll_interval: float = 0.001, **process_kwargs):
+        self.shape = source.shape
+        self.dtype = np.dtype(source.dtype)
+        self.poll_interval = poll_interval
+        self.ring = SharedFrameRing(self.shape, self.dtype, slots)
+        self.process = AcquisitionProcess(CAMERA, source, self.ring, **process_kwargs)
+        self.skipped = 0
+        self._last = 0
+        self.process.start()
+
+    def open(self):
+        self.process.start()
+        self._last = self.ring.written
+        self.process.send("open")
+
+    def close(self):
+        self.process.send("close")
+
+    def call(self, method: str, *args):
+        self.process.send("call", method, args)
+
+    def grab_into(self, out: np.ndarray) -> float:
+        while True:
+            self.process.supervise()
+            result = self.ring.read_latest_into(out, self._last)
+            if result is not None:
+                seq, stamp = result
+                self.skipped += seq - self._last - 1
+                self._last = seq
+                return stamp
+            time.sleep(self.poll_interval)
+
+    def shutdown(self):
+        self.process.shutdown()
+
+
+__all__ = [
+    "SharedSampleRing",
+    "SharedFrameRing",
+    "AcquisitionProcess",
+    "RemotePowerMeter",
+    "RemoteCamera",
+]
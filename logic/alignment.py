@@ -0,0 +1,336 @@
+# alignment.py
+# 闭环自动对准：驱动执行器各轴，按功率计或光斑偏移反馈做粗网格 + Nelder–Mead 搜索
+
+import abc
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import numpy as np
+from PyQt6 import QtCore
+
+from logic.task_scheduler import IO, TaskHandle, TaskScheduler
+
+MAXIMIZE_POWER = "power"
+MINIMIZE_OFFSET = "offset"
+
+
+@dataclass
+class AlignmentAxis:
+    """一个执行器轴及其行程范围。"""
+
+    name: str
+    lower: float
+    upper: float
+
+    @property
+    def span(self) -> float:
+        return self.upper - self.lower
+
+
+@dataclass
+class AlignmentResult:
+    """一次对准的结果。``reason`` 为停止原因：converged / target / stalled / budget / cancelled。
+
+    ``value`` 是搜索中 ``x`` 处的最优读数；结束时执行器移回 ``x`` 并重新读取一次，即 ``final_value``。
+    """
+
+    x: np.ndarray
+    value: float
+    evaluations: int
+    elapsed_s: float
+    reason: str
+    final_value: float
+    history: np.ndarray = field(repr=False)  # 每次评估后的最优值
+
+    @property
+    def converged(self) -> bool:
+        return self.reason in ("converged", "target")
+
+
+class AlignmentBench(abc.ABC):
+    """对准台：一组执行器轴加上功率与光斑偏移两种反馈。"""
+
+    axes: list[AlignmentAxis]
+
+    @abc.abstractmethod
+    def move(self, x: np.ndarray):
+        """把各轴移动到 ``x``（与 ``axes`` 一一对应），返回时已稳定。"""
+
+    @abc.abstractmethod
+    def read_power(self) -> float:
+        ...
+
+    @abc.abstractmethod
+    def read_offset(self) -> float:
+        ...
+
+    def objective(self, kind: str) -> Callable[[np.ndarray], float]:
+        """返回“移动后读取反馈”的目标函数。"""
+        read = self.read_power if kind == MAXIMIZE_POWER else self.read_offset
+
+        def evaluate(x: np.ndarray) -> float:
+            self.move(x)
+            return read()
+
+        return evaluate
+
+
+class SimulatedOpticalBench(AlignmentBench):
+    """模拟光学对准台，给定种子时结果完全确定。
+
+    耦合功率是以 ``optimum`` 为中心、宽度 ``waist`` 的高斯；光斑偏移与到最优点的
+    距离成正比（各轴增益不同，且轴间有耦合）。两者都带相对噪声 ``noise``；
+    ``settle_time`` 模拟每次移动的稳定时间。
+    """
+
+    def __init__(
+        self,
+        n_axes: int = 2,
+        span: float = 1.0,
+        optimum: np.ndarray | None = None,
+        waist: float = 0.15,
+        peak_power: float = 1.0,
+        offset_gain: float = 100.0,
+        noise: float = 0.002,
+        settle_time: float = 0.0,
+        seed: int = 0,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.axes = [AlignmentAxis(f"轴{i + 1}", -span, span) for i in range(n_axes)]
+        self.optimum = (
+            np.asarray(optimum, dtype=np.float64)
+            if optimum is not None
+            else self.rng.uniform(-0.6 * span, 0.6 * span, n_axes)
+        )
+        self.waist = waist
+        self.peak_power = peak_power
+        self.noise = noise
+        self.settle_time = settle_time
+        mixing = np.eye(n_axes) + 0.3 * self.rng.standard_normal((n_axes, n_axes))
+        self._offset_matrix = offset_gain * mixing
+        self.position = np.zeros(n_axes)
+        self.moves = 0
+
+    def move(self, x: np.ndarray):
+        lower = np.array([a.lower for a in self.axes])
+        upper = np.array([a.upper for a in self.axes])
+        self.position = np.clip(np.asarray(x, dtype=np.float64), lower, upper)
+        self.moves += 1
+        if self.settle_time:
+            time.sleep(self.settle_time)
+
+    def read_power(self) -> float:
+        d2 = float(np.sum((self.position - self.optimum) ** 2))
+        power = self.peak_power * np.exp(-d2 / (2.0 * self.waist ** 2))
+        return float(power * (1.0 + self.noise * self.rng.standard_normal()))
+
+    def read_offset(self) -> float:
+        offset = float(np.linalg.norm(self._offset_matrix @ (self.position - self.optimum)))
+        return abs(offset + self.noise * self._offset_matrix[0, 0] * self.rng.standard_normal())
+
+
+class _Stop(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AlignmentOptimizer:
+    """粗网格 + Nelder–Mead 的有界搜索。
+
+    先在各轴行程内取 ``grid_points`` 个格点（总数受评估预算约束）做粗扫描，
+    从最好的格点出发、以半个格距为初始单纯形做 Nelder–Mead，越界的点被截到
+    行程内。以下任一条件满足即停止：
+
+    - 单纯形在各轴上的尺寸（相对行程）小于 ``xtol``；
+    - 达到 ``target``（最大化时为不低于，最小化时为不高于）；
+    - 细搜索阶段连续 ``patience`` 次评估没有改进超过 ``ftol``（``ftol`` 应大于反馈噪声）；
+    - 用完 ``budget`` 次评估，或被 ``cancel`` 取消。
+
+    ``progress`` 回调在每次评估后以 (评估次数, 当前最优值) 调用。无论因何停止，执行器最后
+    都移回最优点（这次移动不计入预算），否则会停在最后一个探测点上。
+    """
+
+    def __init__(
+        self,
+        axes: list[AlignmentAxis],
+        objective: Callable[[np.ndarray], float],
+        maximize: bool = False,
+        budget: int = 150,
+        grid_points: int = 5,
+        xtol: float = 2e-3,
+        ftol: float = 1e-3,
+        patience: int = 40,
+        target: float | None = None,
+        progress: Callable[[int, float], None] | None = None,
+    ):
+        self.axes = axes
+        self.objective = objective
+        self.maximize = maximize
+        self.budget = budget
+        self.grid_points = grid_points
+        self.xtol = xtol
+        self.ftol = ftol
+        self.patience = patience
+        self.target = target
+        self.progress = progress
+        self._lower = np.array([a.lower for a in axes], dtype=np.float64)
+        self._upper = np.array([a.upper for a in axes], dtype=np.float64)
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    # -- evaluation bookkeeping -----------------------------------------------
+
+    def _reset(self):
+        self.evaluations = 0
+        self.best_x = (self._lower + self._upper) / 2.0
+        self.best_cost = np.inf
+        self._since_improvement = 0
+        self._refining = False
+        self._history: list[float] = []
+
+    def _cost(self, x: np.ndarray) -> tuple[np.ndarray, float]:
+        """评估一个点（内部一律最小化），并检查各停止条件。"""
+        if self._cancel.is_set():
+            raise _Stop("cancelled")
+        if self.evaluations >= self.budget:
+            raise _Stop("budget")
+        x = np.clip(x, self._lower, self._upper)
+        value = float(self.objective(x))
+        cost = -value if self.maximize else value
+        self.evaluations += 1
+        if cost < self.best_cost - self.ftol:
+            self._since_improvement = 0
+        else:
+            self._since_improvement += 1
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.best_x = x.copy()
+        best_value = -self.best_cost if self.maximize else self.best_cost
+        self._history.append(best_value)
+        if self.progress is not None:
+            self.progress(self.evaluations, best_value)
+        if self.target is not None and (best_value >= self.target if self.maximize else best_value <= self.target):
+            raise _Stop("target")
+        if self._refining and self._since_improvement >= self.patience:
+            raise _Stop("stalled")
+        return x, cost
+
+    # -- search phases ------------------------------------------------------
+
+    def _grid(self) -> np.ndarray:
+        n = len(self.axes)
+        points = self.grid_points
+        while points > 2 and points ** n > self.budget // 3:
+            points -= 1
+        cell = (self._upper - self._lower) / points
+        centers = [self._lower[i] + (np.arange(points) + 0.5) * cell[i] for i in range(n)]
+        for x in np.stack(np.meshgrid(*centers, indexing="ij"), axis=-1).reshape(-1, n):
+            self._cost(x)
+        return cell
+
+    def _nelder_mead(self, x0: np.ndarray, step: np.ndarray):
+        n = len(x0)
+        span = self._upper - self._lower
+        simplex = [self._cost(x0)]
+        for i in range(n):
+            vertex = x0.copy()
+            vertex[i] += step[i] if x0[i] + step[i] <= self._upper[i] else -step[i]
+            simplex.append(self._cost(vertex))
+        while True:
+            simplex.sort(key=lambda item: item[1])
+            points = np.array([p for p, _ in simplex])
+            costs = [c for _, c in simplex]
+            if np.max(np.abs(points[1:] - points[0]) / span) <= self.xtol:
+                raise _Stop("converged")
+            centroid = points[:-1].mean(axis=0)
+            worst, worst_cost = simplex[-1]
+            reflected = self._cost(centroid + (centroid - worst))
+            if reflected[1] < costs[0]:
+                expanded = self._cost(centroid + 2.0 * (centroid - worst))
+                simplex[-1] = expanded if expanded[1] < reflected[1] else reflected
+            elif reflected[1] < costs[-2]:
+                simplex[-1] = reflected
+            else:
+                if reflected[1] < worst_cost:
+                    contracted = self._cost(centroid + 0.5 * (reflected[0] - centroid))
+                else:
+                    contracted = self._cost(centroid + 0.5 * (worst - centroid))
+                if contracted[1] < min(reflected[1], worst_cost):
+                    simplex[-1] = contracted
+                else:
+                    # 收缩整个单纯形到最优顶点
+                    best = simplex[0][0]
+                    simplex = [simplex[0]] + [self._cost(best + 0.5 * (p - best)) for p, _ in simplex[1:]]
+
+    def run(self) -> AlignmentResult:
+        self._reset()
+        start = time.perf_counter()
+        final_value = float("nan")
+        try:
+            cell = self._grid()
+            self._refining = True
+            self._since_improvement = 0
+            self._nelder_mead(self.best_x.copy(), cell / 2.0)
+        except _Stop as stop:
+            reason = stop.reason
+        finally:
+            if self.evaluations:
+                final_value = float(self.objective(self.best_x))
+        best_value = -self.best_cost if self.maximize else self.best_cost
+        return AlignmentResult(
+            x=self.best_x,
+            value=float(best_value),
+            evaluations=self.evaluations,
+            elapsed_s=time.perf_counter() - start,
+            reason=reason,
+            final_value=final_value,
+            history=np.asarray(self._history),
+        )
+
+
+class AlignmentRun(QtCore.QObject):
+    """在 ``TaskScheduler`` 的 I/O 线程池中运行一次对准，进度与结果回到 GUI 线程。
+
+    任务属于 ``step``，离开该步骤时调度器取消任务，同时通知优化器在下一次评估前停止。
+    """
+
+    progress = QtCore.pyqtSignal(int, float)
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, optimizer: AlignmentOptimizer, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.optimizer = optimizer
+        self.handle: TaskHandle | None = None
+        # progress 在工作线程中发出，经排队连接送到接收方
+        optimizer.progress = self.progress.emit
+
+    def start(self, scheduler: TaskScheduler, step: str | None = None) -> TaskHandle:
+        self.handle = scheduler.submit(self.optimizer.run, kind=IO, step=step)
+        self.handle.finished.connect(self.finished)
+        self.handle.failed.connect(self.failed)
+        self.handle.cancelled.connect(self.optimizer.cancel)
+        return self.handle
+
+    def cancel(self):
+        self.optimizer.cancel()
+
+    def is_running(self) -> bool:
+        return self.handle is not None and not self.handle.is_done()
+
+
+__all__ = [
+    "MAXIMIZE_POWER",
+    "MINIMIZE_OFFSET",
+    "AlignmentAxis",
+    "AlignmentResult",
+    "AlignmentBench",
+    "SimulatedOpticalBench",
+    "AlignmentOptimizer",
+    "AlignmentRun",
+]
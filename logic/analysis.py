@@ -0,0 +1,42 @@
+# analysis.py
+# 各步骤的离线分析函数。都是模块级纯函数，参数与返回值可 pickle，供 TaskScheduler 在进程池中调用
+
+import numpy as np
+
+
+def fit_power_trend(t: np.ndarray, v: np.ndarray) -> dict[str, float]:
+    """功率曲线线性拟合：返回均值、斜率（mW/s）、残差标准差与相对波动。"""
+    t = np.asarray(t, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    if len(v) < 2:
+        return {"mean": float(v.mean()) if len(v) else float("nan"), "slope": 0.0, "residual_std": 0.0, "stability": 0.0}
+    slope, intercept = np.polyfit(t - t[0], v, 1)
+    residual = v - (slope * (t - t[0]) + intercept)
+    mean = float(v.mean())
+    return {
+        "mean": mean,
+        "slope": float(slope),
+        "residual_std": float(residual.std()),
+        "stability": float((v.max() - v.min()) / mean) if mean else float("nan"),
+    }
+
+
+def coaxiality_statistics(cx: np.ndarray, cy: np.ndarray, ref: tuple[float, float] | None = None) -> dict[str, float]:
+    """同轴度偏移统计：相对参考点（缺省为均值）的平均偏移、最大偏移与 RMS。"""
+    cx = np.asarray(cx, dtype=np.float64)
+    cy = np.asarray(cy, dtype=np.float64)
+    ok = np.isfinite(cx) & np.isfinite(cy)
+    cx, cy = cx[ok], cy[ok]
+    if not len(cx):
+        return {"count": 0, "mean_offset": float("nan"), "max_offset": float("nan"), "rms": float("nan")}
+    rx, ry = ref if ref is not None else (cx.mean(), cy.mean())
+    dist = np.hypot(cx - rx, cy - ry)
+    return {
+        "count": int(len(dist)),
+        "mean_offset": float(dist.mean()),
+        "max_offset": float(dist.max()),
+        "rms": float(np.sqrt((dist ** 2).mean())),
+    }
+
+
+__all__ = ["fit_power_trend", "coaxiality_statistics"]
@@ -0,0 +1,289 @@
+# camera.py
+# 相机帧采集流水线：预分配帧缓冲池 + 生产者线程 + “最新帧优先”的交接
+
+import abc
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from PyQt6 import QtCore, QtGui
+
+from logic.instrumentation import span
+
+
+class CameraSource(abc.ABC):
+    """相机驱动接口。``grab_into`` 在生产者线程中被循环调用。"""
+
+    shape: tuple[int, int] = (480, 640)
+    dtype = np.uint8
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abc.abstractmethod
+    def grab_into(self, out: np.ndarray) -> float:
+        """阻塞直到下一帧就绪，把像素写入 ``out`` 并返回曝光时间戳（perf_counter 秒）。"""
+
+
+class SimulatedCamera(CameraSource):
+    """生成高斯光斑的模拟光束分析相机。
+
+    光斑中心做缓慢的圆周漂移并叠加随机抖动，``seed`` 固定时序列可复现；
+    ``spot`` 可设置为 None 以模拟无光。
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int] = (480, 640),
+        fps: float = 60.0,
+        dtype=np.uint8,
+        spot_sigma: float = 12.0,
+        noise: float = 2.0,
+        seed: int | None = 0,
+    ):
+        self.shape = shape
+        self.fps = fps
+        self.dtype = np.dtype(dtype)
+        self.spot_sigma = spot_sigma
+        self.noise = noise
+        self.spot: tuple[float, float] | None = (shape[1] / 2, shape[0] / 2)
+        self.peak = float(np.iinfo(self.dtype).max) * 0.8
+        self._rng = np.random.default_rng(seed)
+        self._yy = np.arange(shape[0], dtype=np.float32)[:, None]
+        self._xx = np.arange(shape[1], dtype=np.float32)[None, :]
+        # 预先生成几帧噪声轮流使用，避免每帧生成随机数拖慢帧率
+        self._noise_bank = [
+            self._rng.normal(noise * 4, noise, shape).astype(np.float32) for _ in range(4 if noise else 0)
+        ]
+        self._next = 0.0
+        self._count = 0
+
+    def open(self):
+        self._next = time.perf_counter()
+        self._count = 0
+
+    def spot_at(self, count: int) -> tuple[float, float] | None:
+        if self.spot is None:
+            return None
+        phase = 2 * np.pi * count / (self.fps * 10)
+        jitter = self._rng.normal(0.0, 0.3, 2)
+        return (
+            self.spot[0] + 3.0 * np.cos(phase) + jitter[0],
+            self.spot[1] + 3.0 * np.sin(phase) + jitter[1],
+        )
+
+    def grab_into(self, out: np.ndarray) -> float:
+        self._next += 1.0 / self.fps
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self._next = time.perf_counter()
+        stamp = time.perf_counter()
+        center = self.spot_at(self._count)
+        self._count += 1
+        self.render_into(out, center, self._count)
+        return stamp
+
+    def render_into(self, out: np.ndarray, center: tuple[float, float] | None, count: int, sigma: float | None = None):
+        """把中心在 ``center``、宽度 ``sigma``（缺省为 ``spot_sigma``）的光斑加第 ``count`` 帧的噪声写入 ``out``。"""
+        sigma = self.spot_sigma if sigma is None else sigma
+        if center is None:
+            image = np.zeros(self.shape, dtype=np.float32)
+        else:
+            gx = np.exp(-((self._xx - center[0]) ** 2) / (2 * sigma ** 2))
+            gy = np.exp(-((self._yy - center[1]) ** 2) / (2 * sigma ** 2))
+            image = (self.peak * gy) * gx
+        if self._noise_bank:
+            image += self._noise_bank[count % len(self._noise_bank)]
+        np.clip(image, 0, np.iinfo(self.dtype).max, out=image)
+        out[...] = image
+
+
+@dataclass
+class Frame:
+    """帧缓冲池中的一帧，使用完毕后必须调用 ``release``。"""
+
+    seq: int
+    timestamp: float
+    data: np.ndarray
+    _pool: "FramePool" = field(repr=False)
+    _slot: int = field(repr=False)
+
+    def release(self):
+        self._pool._release(self._slot)
+
+    def qimage(self) -> QtGui.QImage:
+        return qimage_view(self.data)
+
+
+def qimage_view(array: np.ndarray) -> QtGui.QImage:
+    """构造直接引用 ``array`` 内存的 QImage（不复制）。
+
+    QImage 不持有数组的引用，调用方需要保证数组在图像使用期间存活且不被改写。
+    """
+    if array.dtype == np.uint8:
+        fmt = QtGui.QImage.Format.Format_Grayscale8
+    elif array.dtype == np.uint16:
+        fmt = QtGui.QImage.Format.Format_Grayscale16
+    else:
+        raise TypeError(f"不支持的像素类型：{array.dtype}")
+    height, width = array.shape
+    return QtGui.QImage(array.data, width, height, array.strides[0], fmt)
+
+
+class FramePool:
+    """预分配的帧缓冲池，实现“最新帧优先”的单槽交接。
+
+    生产者 ``acquire`` 一个空闲缓冲、写入后 ``publish``；如果上一帧发布后还没被
+    消费者取走，它会直接回收到空闲列表并计为丢帧。消费者用 ``take_latest`` 取走
+    最新帧，处理完调用 ``Frame.release``。
+    """
+
+    def __init__(self, shape: tuple[int, int], dtype=np.uint8, size: int = 4):
+        self.buffers = [np.zeros(shape, dtype=dtype) for _ in range(size)]
+        self._free = list(range(size))
+        self._latest: tuple[int, int, float] | None = None  # (slot, seq, timestamp)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.starved = 0  # 没有空闲缓冲（消费者持有过多帧）而跳过的帧
+
+    def acquire(self) -> int | None:
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            self.starved += 1
+            return None
+
+    def publish(self, slot: int, seq: int, timestamp: float):
+        with self._lock:
+            if self._latest is not None:
+                self._free.append(self._latest[0])
+                self.dropped += 1
+            self._latest = (slot, seq, timestamp)
+
+    def take_latest(self) -> Frame | None:
+        with self._lock:
+            if self._latest is None:
+                return None
+            slot, seq, timestamp = self._latest
+            self._latest = None
+        return Frame(seq, timestamp, self.buffers[slot], self, slot)
+
+    def _release(self, slot: int):
+        with self._lock:
+            self._free.append(slot)
+
+
+class CameraPipeline(QtCore.QObject):
+    """相机采集流水线。
+
+    生产者线程把每帧写入 ``FramePool`` 的预分配缓冲，``frame_ready`` 只在界面
+    还没有待处理通知时才发出，GUI 收到后用 ``take_latest`` 取最新帧，因此界面
+    永远不会积压。统计采集帧率、显示帧率、端到端延迟和丢帧数。
+    """
+
+    frame_ready = QtCore.pyqtSignal()
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, source: CameraSource, pool_size: int = 4, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.source = source
+        self.pool = FramePool(source.shape, source.dtype, pool_size)
+        self.captured = 0
+        self.displayed = 0
+        self.capture_fps = 0.0
+        self.display_fps = 0.0
+        self.latency_ms = 0.0  # 最近一帧从曝光到显示的延迟（指数平滑）
+        self._notify_pending = threading.Event()
+        self._running = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._scratch_buffer: np.ndarray | None = None
+        self._display_window = (time.perf_counter(), 0)
+
+    @property
+    def dropped(self) -> int:
+        return self.pool.dropped + self.pool.starved
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._produce, name="camera-producer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """请求生产线程退出并等待至多 ``timeout`` 秒；返回线程是否已退出。
+
+        超时（``grab_into`` 仍阻塞）时保留线程句柄，``start`` 不会向同一个缓冲池再启动第二个生产者。
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return False
+            self._thread = None
+        return True
+
+    def take_latest(self) -> Frame | None:
+        """GUI 线程取最新帧；调用后才允许发出下一次 ``frame_ready``。"""
+        self._notify_pending.clear()
+        return self.pool.take_latest()
+
+    def mark_displayed(self, frame: Frame):
+        """在帧真正绘制后调用，用于统计显示帧率与端到端延迟。"""
+        now = time.perf_counter()
+        latency = (now - frame.timestamp) * 1000.0
+        self.latency_ms = latency if self.displayed == 0 else 0.9 * self.latency_ms + 0.1 * latency
+        self.displayed += 1
+        start, count = self._display_window
+        if now - start >= 1.0:
+            self.display_fps = (self.displayed - count) / (now - start)
+            self._display_window = (now, self.displayed)
+
+    def _produce(self):
+        source = self.source
+        try:
+            source.open()
+            window_start = time.perf_counter()
+            window_count = 0
+            seq = 0
+            while self._running.is_set():
+                slot = self.pool.acquire()
+                if slot is None:
+                    # 所有缓冲都被消费者持有：仍然读走这一帧以保持相机节拍
+                    source.grab_into(self._scratch())
+                    continue
+                with span("camera.grab", "acquisition"):
+                    timestamp = source.grab_into(self.pool.buffers[slot])
+                seq += 1
+                self.pool.publish(slot, seq, timestamp)
+                self.captured = seq
+                window_count += 1
+                now = time.perf_counter()
+                if now - window_start >= 1.0:
+                    self.capture_fps = window_count / (now - window_start)
+                    window_start = now
+                    window_count = 0
+                if not self._notify_pending.is_set():
+                    self._notify_pending.set()
+                    self.frame_ready.emit()
+        except Exception as exc:  # 驱动异常不能让线程静默退出
+            self.error.emit(str(exc))
+        finally:
+            source.close()
+
+    def _scratch(self) -> np.ndarray:
+        if self._scratch_buffer is None:
+            self._scratch_buffer = np.zeros(self.source.shape, dtype=self.source.dtype)
+        return self._scratch_buffer
+
+
+__all__ = ["CameraSource", "SimulatedCamera", "Frame", "FramePool", "CameraPipeline", "qimage_view"]
@@ -0,0 +1,459 @@
+# channel_archive.py
+# 长时间测量的分块二进制归档：np.memmap 追加写、每块 min/max/均值索引、冷块无损压缩
+
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from logic.ring_buffer import decimate_minmax
+
+FORMAT_VERSION = 1
+
+logger = logging.getLogger("decoration.archive")
+
+CHUNK_INDEX_DTYPE = np.dtype(
+    [
+        ("t0", "<f8"),
+        ("t1", "<f8"),
+        ("count", "<i8"),
+        ("vmin", "<f8"),
+        ("vmax", "<f8"),
+        ("vsum", "<f8"),
+        ("vsumsq", "<f8"),
+    ]
+)
+
+BLOCK_SUMMARY_DTYPE = np.dtype([("t", "<f8"), ("vmin", "<f8"), ("vmax", "<f8")])
+
+
+def _shuffle(raw: np.ndarray) -> bytes:
+    """按字节平面重排记录（同一字节位置的字节放在一起），时间戳与缓变数值因此更易压缩。"""
+    itemsize = raw.dtype.itemsize
+    return raw.view(np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).ravel()
+
+
+class ChannelArchive:
+    """单通道 (时间戳, 数值) 的分块归档目录。
+
+    目录结构：
+
+    - ``archive.json``：块大小与数值类型；
+    - ``index.bin``：每个已封存块一条 ``CHUNK_INDEX_DTYPE`` 记录（只追加）；
+    - ``blocks.bin``：块内每 ``summary_block`` 个样本一条 ``BLOCK_SUMMARY_DTYPE`` 极值记录；
+    - ``chunk_XXXXXX.raw``：未压缩块，按 ``chunk_size`` 条记录预分配，以 ``np.memmap`` 写入；
+    - ``chunk_XXXXXX.z``：冷块，字节重排后 zlib 压缩（无损）。
+
+    ``append`` 直接写入当前热块的内存映射，写满即封存：计算块摘要并追加到索引，
+    最近 ``hot_chunks`` 个封存块保持未压缩，更早的块交给后台线程压缩。缩小显示
+    （``read_minmax``）按缩放程度使用块索引或块内极值摘要，只有放大到每像素不足
+    ``summary_block`` 个样本时才读原始数据；统计（``stats``）在覆盖整块时只读索引。热块预填 NaN 时间戳，
+    异常退出后重新打开时据此恢复已写入的样本数。
+
+    写入与读取可以在不同线程中进行，内部以锁互斥。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 1 << 16,
+        value_dtype=np.float64,
+        summary_block: int = 256,
+        hot_chunks: int = 2,
+        compress_level: int = 1,
+        cache_chunks: int = 8,
+    ):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "archive.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            chunk_size = meta["chunk_size"]
+            value_dtype = meta["value_dtype"]
+            summary_block = meta["summary_block"]
+        else:
+            if chunk_size % summary_block:
+                raise ValueError("chunk_size 必须是 summary_block 的整数倍")
+            meta = {
+                "version": FORMAT_VERSION,
+                "chunk_size": chunk_size,
+                "value_dtype": np.dtype(value_dtype).str,
+                "summary_block": summary_block,
+            }
+            with open(meta_path, "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+        self.chunk_size = int(chunk_size)
+        self.summary_block = int(summary_block)
+        self.record_dtype = np.dtype([("t", "<f8"), ("v", np.dtype(value_dtype))])
+        self.hot_chunks = hot_chunks
+        self.compress_level = compress_level
+
+        self._lock = threading.RLock()
+        self._raw: dict[int, np.memmap] = {}
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_chunks = cache_chunks
+        self._compressor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="archive-compress")
+
+        index_path = os.path.join(path, "index.bin")
+        if os.path.exists(index_path):
+            stored = np.fromfile(index_path, dtype=CHUNK_INDEX_DTYPE)
+        else:
+            stored = np.empty(0, dtype=CHUNK_INDEX_DTYPE)
+        self._index = np.empty(max(64, 2 * len(stored)), dtype=CHUNK_INDEX_DTYPE)
+        self._index[:len(stored)] = stored
+        self._sealed = len(stored)
+        self._index_file = open(index_path, "ab")
+        # 极值摘要先于索引写入，异常退出后多出的部分截掉
+        self._blocks_path = os.path.join(path, "blocks.bin")
+        blocks_size = self._sealed * (self.chunk_size // self.summary_block) * BLOCK_SUMMARY_DTYPE.itemsize
+        if os.path.exists(self._blocks_path) and os.path.getsize(self._blocks_path) > blocks_size:
+            os.truncate(self._blocks_path, blocks_size)
+        self._blocks_file = open(self._blocks_path, "ab")
+
+        self._hot = self._open_raw(self._sealed, create=True)
+        t = self._hot["t"]
+        self._hot_count = int(np.argmax(np.isnan(t))) if np.isnan(t).any() else self.chunk_size
+        if self._hot_count == self.chunk_size:
+            self._seal()
+        # 上次关闭前可能还有未压缩的冷块
+        for chunk in range(max(0, self._sealed - self.hot_chunks)):
+            if os.path.exists(self._chunk_path(chunk, "raw")):
+                self._submit_compress(chunk)
+
+    # -- files --------------------------------------------------------------
+
+    def _chunk_path(self, chunk: int, ext: str) -> str:
+        return os.path.join(self.path, f"chunk_{chunk:06d}.{ext}")
+
+    def _open_raw(self, chunk: int, create: bool = False) -> np.memmap:
+        mm = self._raw.get(chunk)
+        if mm is not None:
+            return mm
+        path = self._chunk_path(chunk, "raw")
+        if create and not os.path.exists(path):
+            mm = np.memmap(path, dtype=self.record_dtype, mode="w+", shape=(self.chunk_size,))
+            mm["t"] = np.nan
+        else:
+            mm = np.memmap(path, dtype=self.record_dtype, mode="r+", shape=(self.chunk_size,))
+        self._raw[chunk] = mm
+        return mm
+
+    def _chunk_records(self, chunk: int) -> np.ndarray:
+        """返回某块的记录数组（热块与未压缩块为内存映射视图，冷块解压后缓存）。"""
+        if chunk == self._sealed:
+            return self._hot[:self._hot_count]
+        mm = self._raw.get(chunk)
+        if mm is None and os.path.exists(self._chunk_path(chunk, "raw")):
+            mm = self._open_raw(chunk)
+        if mm is not None:
+            return mm
+        records = self._cache.get(chunk)
+        if records is None:
+            with open(self._chunk_path(chunk, "z"), "rb") as fh:
+                records = _unshuffle(zlib.decompress(fh.read()), self.record_dtype)
+            self._cache[chunk] = records
+            if len(self._cache) > self._cache_chunks:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(chunk)
+        return records
+
+    def _submit_compress(self, chunk: int):
+        future = self._compressor.submit(self._compress, chunk)
+        future.add_done_callback(lambda f, chunk=chunk: self._compress_done(chunk, f))
+
+    def _compress_done(self, chunk: int, future: concurrent.futures.Future):
+        if not future.cancelled() and future.exception() is not None:
+            # 未压缩的块仍完整可读，下次打开归档时会重试
+            logger.warning("归档 %s 第 %d 块压缩失败：%s", self.path, chunk, future.exception())
+
+    def _compress(self, chunk: int):
+        raw_path = self._chunk_path(chunk, "raw")
+        with self._lock:
+            mm = self._raw.get(chunk)
+            if mm is None:
+                if not os.path.exists(raw_path):
+                    return
+                mm = self._open_raw(chunk)
+            data = np.array(mm)
+            # Windows 上文件仍被映射时不能删除：不在压缩期间持有映射，删除前连缓存中的映射一起释放
+            del mm
+            self._raw.pop(chunk, None)
+        blob = zlib.compress(_shuffle(data), self.compress_level)
+        tmp = self._chunk_path(chunk, "z.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(blob)
+        os.replace(tmp, self._chunk_path(chunk, "z"))
+        with self._lock:
+            # 压缩期间的读取可能又映射了原始文件
+            self._raw.pop(chunk, None)
+            os.remove(raw_path)
+
+    # -- writing ------------------------------------------------------------
+
+    def _seal(self):
+        records = self._hot
+        v = records["v"].astype(np.float64)
+        entry = np.array(
+            [(records["t"][0], records["t"][-1], self.chunk_size, v.min(), v.max(), v.sum(), np.dot(v, v))],
+            dtype=CHUNK_INDEX_DTYPE,
+        )
+        records.flush()
+        per_block = records.reshape(-1, self.summary_block)
+        blocks = np.empty(len(per_block), dtype=BLOCK_SUMMARY_DTYPE)
+        blocks["t"] = per_block["t"][:, self.summary_block // 2]
+        blocks["vmin"] = per_block["v"].min(axis=1)
+        blocks["vmax"] = per_block["v"].max(axis=1)
+        self._blocks_file.write(blocks.tobytes())
+        self._blocks_file.flush()
+        if self._sealed == len(self._index):
+            grown = np.empty(2 * len(self._index), dtype=CHUNK_INDEX_DTYPE)
+            grown[:self._sealed] = self._index[:self._sealed]
+            self._index = grown
+        self._index[self._sealed] = entry[0]
+        self._index_file.write(entry.tobytes())
+        self._index_file.flush()
+        self._sealed += 1
+        cold = self._sealed - 1 - self.hot_chunks
+        if cold >= 0:
+            self._submit_compress(cold)
+        self._hot = self._open_raw(self._sealed, create=True)
+        self._hot_count = 0
+
+    def append(self, t: np.ndarray, v: np.ndarray):
+        """追加一块样本（时间戳应单调递增）。"""
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v)
+        with self._lock:
+            pos = 0
+            n = len(t)
+            while pos < n:
+                take = min(n - pos, self.chunk_size - self._hot_count)
+                # 先写数值再写时间戳：时间戳非 NaN 即表示该行完整
+                self._hot["v"][self._hot_count:self._hot_count + take] = v[pos:pos + take]
+                self._hot["t"][self._hot_count:self._hot_count + take] = t[pos:pos + take]
+                self._hot_count += take
+                pos += take
+                if self._hot_count == self.chunk_size:
+                    self._seal()
+
+    def flush(self):
+        with self._lock:
+            self._hot.flush()
+
+    def close(self):
+        self._compressor.shutdown(wait=True)
+        with self._lock:
+            self._hot.flush()
+            self._index_file.close()
+            self._blocks_file.close()
+            self._raw.clear()
+            self._cache.clear()
+
+    # -- reading ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._sealed * self.chunk_size + self._hot_count
+
+    @property
+    def sealed_chunks(self) -> int:
+        return self._sealed
+
+    def chunk_index(self, first: int = 0) -> np.ndarray:
+        """返回从第 ``first`` 块起已封存块的摘要记录（副本）。"""
+        with self._lock:
+            return self._index[first:self._sealed].copy()
+
+    def read(self, start: int = 0, stop: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """按样本序号读取 [start, stop) 的原始数据。"""
+        with self._lock:
+            total = len(self)
+            stop = total if stop is None else min(stop, total)
+            start = max(0, start)
+            if start >= stop:
+                return np.empty(0), np.empty(0, dtype=self.record_dtype["v"])
+            parts = []
+            for chunk in range(start // self.chunk_size, (stop - 1) // self.chunk_size + 1):
+                base = chunk * self.chunk_size
+                records = self._chunk_records(chunk)
+                parts.append(records[max(start - base, 0):min(stop - base, len(records))])
+            merged = np.concatenate(parts)
+            # 释锁前放下对内存映射的视图，压缩线程随后才能删除原始文件
+            del records, parts
+        return merged["t"].copy(), merged["v"].copy()
+
+    def read_minmax(self, start: int, stop: int, n_bins: int) -> tuple[np.ndarray, np.ndarray]:
+        """[start, stop) 区间的 min/max 抽取，结果格式与 ``decimate_minmax`` 相同。
+
+        每个分箱的样本数不少于 1/4 块时用块索引，不少于 ``summary_block`` 时用
+        块内极值摘要，两者的尾部热块都读原始数据再抽取；否则（或区间全在热块内）
+        读取原始数据，读取量至多约 ``n_bins * summary_block`` 个样本。
+        """
+        start = max(0, start)
+        per_bin = (stop - start) / max(1, n_bins)
+        with self._lock:
+            stop = min(stop, len(self))
+            sealed_end = self._sealed * self.chunk_size
+            if per_bin < self.summary_block or start >= sealed_end:
+                t, v = self.read(start, stop)
+                return decimate_minmax(t, v, n_bins)
+            coarse = per_bin >= self.chunk_size / 4
+            if coarse:
+                first = start // self.chunk_size
+                last = -(-min(stop, sealed_end) // self.chunk_size)
+                index = self._index[first:last]
+                t = np.repeat((index["t0"] + index["t1"]) / 2.0, 2)
+                v = np.empty(len(t))
+                v[0::2] = index["vmin"]
+                v[1::2] = index["vmax"]
+            else:
+                first = start // self.summary_block
+                last = -(-min(stop, sealed_end) // self.summary_block)
+                blocks = np.fromfile(
+                    self._blocks_path, dtype=BLOCK_SUMMARY_DTYPE, count=last - first, offset=first * BLOCK_SUMMARY_DTYPE.itemsize
+                )
+                t = np.repeat(blocks["t"], 2)
+                v = np.empty(len(t))
+                v[0::2] = blocks["vmin"]
+                v[1::2] = blocks["vmax"]
+            if stop > sealed_end:
+                # 未封存的热块没有索引与摘要，读原始数据后按同样的分箱宽度抽取
+                tail_t, tail_v = self.read(sealed_end, stop)
+                tail_t, tail_v = decimate_minmax(tail_t, tail_v, max(1, int((stop - sealed_end) / per_bin)))
+                t = np.concatenate((t, tail_t))
+                v = np.concatenate((v, tail_v))
+            if coarse:
+                return t, v
+        # 摘要点数仍可能多于分箱数，再按像素分箱抽取一次
+        return decimate_minmax(t, v, n_bins)
+
+    def stats(self, start: int = 0, stop: int | None = None) -> dict[str, float]:
+        """[start, stop) 区间的样本数、最小、最大、均值与标准差；整块部分只读索引。"""
+        with self._lock:
+            total = len(self)
+            stop = total if stop is None else min(stop, total)
+            start = max(0, start)
+            first_full = -(-start // self.chunk_size)
+            last_full = min(stop // self.chunk_size, self._sealed)
+            count, vmin, vmax, vsum, vsumsq = 0, np.inf, -np.inf, 0.0, 0.0
+            edges = [(start, stop)]
+            if first_full < last_full:
+                index = self._index[first_full:last_full]
+                count = int(index["count"].sum())
+                vmin, vmax = float(index["vmin"].min()), float(index["vmax"].max())
+                vsum, vsumsq = float(index["vsum"].sum()), float(index["vsumsq"].sum())
+                edges = [(start, first_full * self.chunk_size), (last_full * self.chunk_size, stop)]
+            for lo, hi in edges:
+                if lo < hi:
+                    _, v = self.read(lo, hi)
+                    v = v.astype(np.float64)
+                    count += len(v)
+                    vmin, vmax = min(vmin, float(v.min())), max(vmax, float(v.max()))
+                    vsum += float(v.sum())
+                    vsumsq += float(np.dot(v, v))
+        if not count:
+            return {"count": 0, "min": float("nan"), "max": float("nan"), "mean": float("nan"), "std": float("nan")}
+        mean = vsum / count
+        return {
+            "count": count,
+            "min": vmin,
+            "max": vmax,
+            "mean": mean,
+            "std": float(np.sqrt(max(vsumsq / count - mean * mean, 0.0))),
+        }
+
+    def disk_usage(self) -> int:
+        """归档目录占用的字节数。"""
+        return sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+
+
+class ArchiveReader:
+    """归档目录的只读视图：只读文件，不写入、不封存也不压缩，可在其他进程中与写入方并存。
+
+    ``index`` 与 ``iter_summaries`` 覆盖打开时已封存的块，尚未封存的热块由
+    ``tail_summaries`` 按 ``summary_block`` 个样本一组汇总成同样的极值记录，
+    逐批读取时内存只与批大小有关。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "archive.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        self.chunk_size = int(meta["chunk_size"])
+        self.summary_block = int(meta["summary_block"])
+        self.record_dtype = np.dtype([("t", "<f8"), ("v", np.dtype(meta["value_dtype"]))])
+        index_path = os.path.join(path, "index.bin")
+        if os.path.exists(index_path):
+            # 写入方可能正在追加一条记录，只取完整的记录
+            rows = os.path.getsize(index_path) // CHUNK_INDEX_DTYPE.itemsize
+            self.index = np.fromfile(index_path, dtype=CHUNK_INDEX_DTYPE, count=rows)
+        else:
+            self.index = np.empty(0, dtype=CHUNK_INDEX_DTYPE)
+        self.sealed_chunks = len(self.index)
+        self.summary_rows = self.sealed_chunks * (self.chunk_size // self.summary_block)
+
+    def iter_summaries(self, batch_rows: int = 1 << 16):
+        """逐批生成 ``BLOCK_SUMMARY_DTYPE`` 记录，最后一批为热块的汇总。"""
+        if self.summary_rows:
+            blocks = np.memmap(
+                os.path.join(self.path, "blocks.bin"), dtype=BLOCK_SUMMARY_DTYPE, mode="r", shape=(self.summary_rows,)
+            )
+            for start in range(0, self.summary_rows, batch_rows):
+                yield np.array(blocks[start:start + batch_rows])
+            del blocks
+        tail = self.tail_summaries()
+        if len(tail):
+            yield tail
+
+    def chunk_records(self, chunk: int) -> np.ndarray:
+        """第 ``chunk`` 块的原始记录（副本）；``chunk == sealed_chunks`` 时为热块中已写入的部分。"""
+        path = os.path.join(self.path, f"chunk_{chunk:06d}")
+        if chunk >= self.sealed_chunks:
+            if not os.path.exists(path + ".raw"):
+                return np.empty(0, dtype=self.record_dtype)
+            mm = np.memmap(path + ".raw", dtype=self.record_dtype, mode="r", shape=(self.chunk_size,))
+            nan = np.isnan(mm["t"])
+            records = np.array(mm[:int(np.argmax(nan)) if nan.any() else self.chunk_size])
+            del mm
+            return records
+        try:
+            mm = np.memmap(path + ".raw", dtype=self.record_dtype, mode="r", shape=(self.chunk_size,))
+        except FileNotFoundError:
+            # 冷块已压缩（或写入方刚把它压缩完）
+            with open(path + ".z", "rb") as fh:
+                return _unshuffle(zlib.decompress(fh.read()), self.record_dtype)
+        records = np.array(mm)
+        del mm
+        return records
+
+    def tail_summaries(self) -> np.ndarray:
+        records = self.chunk_records(self.sealed_chunks)
+        count = len(records)
+        starts = np.arange(0, count, self.summary_block)
+        blocks = np.empty(len(starts), dtype=BLOCK_SUMMARY_DTYPE)
+        if count:
+            blocks["t"] = records["t"][np.minimum(starts + self.summary_block // 2, count - 1)]
+            blocks["vmin"] = np.minimum.reduceat(records["v"], starts)
+            blocks["vmax"] = np.maximum.reduceat(records["v"], starts)
+        return blocks
+
+    def time_range(self) -> tuple[float, float] | None:
+        tail = self.tail_summaries()
+        if not self.sealed_chunks:
+            return (float(tail["t"][0]), float(tail["t"][-1])) if len(tail) else None
+        end = float(tail["t"][-1]) if len(tail) else float(self.index["t1"][-1])
+        return float(self.index["t0"][0]), end
+
+
+__all__ = ["BLOCK_SUMMARY_DTYPE", "CHUNK_INDEX_DTYPE", "ChannelArchive", "ArchiveReader"]
@@ -1,23 +1,363 @@
-from PyQt6 import QtCore, QtWidgets
+import logging
+import math
+import os
+import time
 
-from ui.decoration_page import NavigationButton, Ui_decoration_page
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from logic.acquisition_process import RemoteCamera, RemotePowerMeter
+from logic.alignment import (
+    MAXIMIZE_POWER,
+    AlignmentBench,
+    AlignmentOptimizer,
+    AlignmentResult,
+    AlignmentRun,
+)
+from logic.analysis import fit_power_trend
+from logic.camera import CameraPipeline, CameraSource
+from logic.channel_archive import ChannelArchive
+from logic.instrument_io import InstrumentIO
+from logic.instrumentation import TRACER, EventLoopLagProbe
+from logic.limits import AlarmLog, LimitEngine
+from logic.log_sink import LogViewSink
+from logic.measurement_table import MeasurementProxyModel, MeasurementTableModel
+from logic.power_meter import PowerAcquisitionEngine, PowerMeterDriver
+from logic.report import REPORT_FORMATS, ReportJob, ReportSpec
+from logic.ring_buffer import SampleRingBuffer
+from logic.session_store import SessionLogHandler, SessionStore
+from logic.spot_analysis import SpotAnalyzer, SpotResult, beam_offset
+from logic.streaming_stats import AllanDeviation, SessionStatistics
+from logic.task_scheduler import CPU, IO, SchedulerSession, TaskHandle, TaskScheduler, UiWatchdog
+from logic.throughput import TokenBucket
+from logic.visibility import VisibilityManager
+from logic.workflow import (
+    CAMERA,
+    CAMERA_ENGINE,
+    COAX_ANALYSIS,
+    POWER_ENGINE,
+    POWER_TEST_ANALYSIS,
+    REPORT,
+    SUMMARY,
+    TRANSMITTER_ENGINE,
+    StepHooks,
+    Workflow,
+    WorkflowStep,
+    workflow_for,
+)
+from ui.alignment_panel import AlignmentPanel
+from ui.decoration_page import CommonContentWidget, NavigationButton, Ui_decoration_page
+from ui.measurement_table_view import MeasurementTableView
+from ui.power_meter_panel import PowerMeterPanel
+from ui.theme import THEME
+from ui.transmitter_panel import TransmitterPanel
+
+POWER_TABLE_COLUMNS = [("时间 (s)", "f8", ".3f"), ("功率 (mW)", "f8", ".4f")]
+COAX_TABLE_COLUMNS = [
+    ("时间 (s)", "f8", ".3f"),
+    ("X (px)", "f4", ".2f"),
+    ("Y (px)", "f4", ".2f"),
+    ("σx (px)", "f4", ".2f"),
+    ("σy (px)", "f4", ".2f"),
+    ("偏移 (px)", "f4", ".3f"),
+]
+ARCHIVE_TABLE_COLUMNS = [
+    ("起始 (s)", "f8", ".3f"),
+    ("结束 (s)", "f8", ".3f"),
+    ("样本数", "i8", "d"),
+    ("最小 (mW)", "f8", ".4f"),
+    ("最大 (mW)", "f8", ".4f"),
+    ("均值 (mW)", "f8", ".4f"),
+]
+TRANSMITTER_DEVICE = "transmitter"
+# 有人观看 / 无人观看时的功率快照帧率与发射机轮询间隔
+SNAPSHOT_FPS = 30.0
+IDLE_SNAPSHOT_FPS = 1.0
+TX_POLL_MS = 200
+IDLE_TX_POLL_MS = 2000
+POWER_CHANNEL = "功率"
+# 限值规则使用的其他通道：同轴度分析的每帧偏移、发射机回读功率
+COAX_CHANNEL = "同轴度偏移"
+TX_POWER_CHANNEL = "发射功率"
+# 样机总结的判定限值：功率相对波动（std / mean）与同轴度偏移的 P95
+SUMMARY_LIMITS = {"power_stability": 0.01, "coax_offset_p95": 2.0}
+ALLAN_TAUS = (0.1, 1.0, 10.0)
+# 启用性能跟踪时计时的槽函数
+TRACED_SLOTS = ["_on_nav_selected", "_on_step_selected", "_on_sub_step_selected", "_update_title", "_apply_step"]
+
+
+def _buffer_power_trend(buffer: SampleRingBuffer) -> dict[str, float]:
+    """复制环形缓冲的当前内容并拟合功率趋势；作为 io 任务运行，快照不占用界面线程，也不必 pickle 到进程池。"""
+    return fit_power_trend(*buffer.latest())
 
 
 class DecorationPage(QtWidgets.QWidget):
-    """装调主页面，包含侧边栏、步骤导航和公共组件区域。"""
+    """装调主页面，包含侧边栏、步骤导航和公共组件区域。
 
-    def __init__(self, prototype_name: str = "", parent: QtWidgets.QWidget | None = None):
+    步骤树、各步骤的页面类型、所需采集引擎与限值规则来自 ``workflow``（默认按 ``prototype_type``
+    加载 ``workflows/`` 下的流程文件）。设备、会话与调度等可选参数各自启用对应功能，缺省时不启用。
+    """
+
+    def __init__(
+        self,
+        prototype_name: str = "",
+        parent: QtWidgets.QWidget | None = None,
+        lazy_pages: bool = True,
+        prewarm: bool = True,
+        log_path: str | None = None,
+        power_driver: PowerMeterDriver | None = None,
+        camera_source: CameraSource | None = None,
+        prototype_type: str = "",
+        session: SessionStore | None = None,
+        instruments: InstrumentIO | None = None,
+        alignment_bench: AlignmentBench | None = None,
+        power_archive: ChannelArchive | None = None,
+        workflow: Workflow | None = None,
+        scheduler: SchedulerSession | None = None,
+        station: str | None = None,
+        camera_fps: float | None = None,
+        watchdog: bool = True,
+        acquisition_process: bool = False,
+        tracing: bool | None = None,
+    ):
         super().__init__(parent)
+        self.workflow = workflow if workflow is not None else workflow_for(prototype_type)
         self.ui = Ui_decoration_page()
-        self.ui.setupUi(self)
-        self.ui.set_prototype_name(prototype_name)
+        self.ui.setupUi(self, lazy=lazy_pages, workflow=self.workflow)
+        self.ui.set_prototype_name(f"{prototype_name} · {prototype_type}" if prototype_name and prototype_type else prototype_name)
+        self.prototype_name = prototype_name
+        self.prototype_type = prototype_type
+        # 有会话时导航进度、测量数据与日志追加写入，并从中恢复上次所在的步骤；页面关闭时会话随之关闭
+        self.session = session
+        # 步骤页面按需构建（lazy_pages），prewarm 时在事件循环空闲时预建下一个可能访问的页面
+        self._prewarm = prewarm
+
+        # 多工位时每个工位使用独立、不向上传播的 logger，各工位的日志视图与会话日志互不串扰
+        self.station = station
+        self.logger = logging.getLogger("decoration" if station is None else f"decoration.{station.replace('.', '_')}")
+        self.logger.setLevel(logging.DEBUG)
+        if station is not None:
+            self.logger.propagate = False
+        # 合并刷新到 log_view，log_path 非空时同时写入滚动日志文件
+        self.log_sink = LogViewSink(self.ui.log_view, self.logger, file_path=log_path, parent=self)
+        self._session_log_handler: SessionLogHandler | None = None
+        if session is not None:
+            self._session_log_handler = SessionLogHandler(session)
+            self.logger.addHandler(self._session_log_handler)
 
         self._active_nav = 0
         self._active_step = 0
         self._active_sub_step = 0
+        self._sub_selection: dict[int, int] = {}  # 分组步骤 -> 上次选中的子步骤
+
+        # 功率与同轴度偏移到达时增量累计，样机总结只读取累计量；统计随会话检查点保存并从中恢复
+        resumed = session.resume() if session is not None else {}
+        self.statistics = SessionStatistics.from_dict(resumed.get("statistics"))
+        if session is not None:
+            session.add_checkpoint_provider("statistics", self.statistics.to_dict)
+            self._checkpoint_timer = QtCore.QTimer(self)
+            self._checkpoint_timer.setInterval(30_000)
+            self._checkpoint_timer.timeout.connect(session.checkpoint)
+            self._checkpoint_timer.start()
+
+        self._remote_devices: list[RemotePowerMeter | RemoteCamera] = []
+        # 驱动与相机在独立工作进程中运行，样本块与帧经共享内存交回，采集接口不变；页面关闭时结束进程
+        if acquisition_process:
+            if power_driver is not None:
+                power_driver = RemotePowerMeter(power_driver)
+                self._remote_devices.append(power_driver)
+            if camera_source is not None:
+                camera_source = RemoteCamera(camera_source)
+                self._remote_devices.append(camera_source)
+
+        self.table_models: dict[QtWidgets.QWidget, MeasurementTableModel] = {}
+        # 只让可见页面接收界面更新：隐藏页面的快照、回读与相机帧直接丢弃，重新可见时补一次最新快照；
+        # 窗口最小化或侧边栏动画期间全部暂停
+        self.visibility = VisibilityManager(parent=self)
+        self.visibility.changed.connect(self._apply_update_rates)
+        self.power_panels: dict[QtWidgets.QWidget, PowerMeterPanel] = {}
+        self._step_pages: dict[str, QtWidgets.QWidget] = {}
+        self.power_engine: PowerAcquisitionEngine | None = None
+        self.power_archive = power_archive
+        self._archive_rows = 0
+        if power_driver is not None:
+            # 有会话或传入 power_archive 时全部原始样本写入分块归档，功率测试页面可回看整个测试过程
+            if power_archive is None and session is not None:
+                self.power_archive = ChannelArchive(os.path.splitext(session.path)[0] + ".power")
+            self.power_engine = PowerAcquisitionEngine(
+                power_driver, max_fps=SNAPSHOT_FPS, archive=self.power_archive, parent=self
+            )
+            self.power_engine.snapshot_ready.connect(self._record_power_snapshot)
+            self.power_engine.error.connect(lambda msg: self.logger.error("功率计采集错误：%s", msg))
+            rate = power_driver.sample_rate
+            # Allan 偏差以 10 ms 平均为最短 τ，统计在采集线程中随数据块更新
+            self.statistics.channel(POWER_CHANNEL, AllanDeviation(1.0 / rate, base=max(1, round(0.01 * rate))))
+            self.power_engine.add_block_listener(lambda t, v: self.statistics.update(POWER_CHANNEL, v, t))
+
+        # 发射机命令经异步 I/O 线程发送，界面线程从不阻塞在仪器通信上；instruments 由调用方负责关闭
+        self.instruments = instruments
+        self.transmitter_panels: dict[QtWidgets.QWidget, TransmitterPanel] = {}
+        self._tx_poll_id: int | None = None
+        self._tx_requests: set[int] = set()
+        if instruments is not None and instruments.has_device(TRANSMITTER_DEVICE):
+            instruments.reply.connect(self._on_instrument_reply)
+            instruments.failed.connect(self._on_instrument_failed)
+            self._tx_poll_timer = QtCore.QTimer(self)
+            self._tx_poll_timer.setInterval(TX_POLL_MS)
+            self._tx_poll_timer.timeout.connect(self._poll_transmitter)
+
+        # 限值判定：规则随步骤切换，功率数据块在采集线程中整块判定，报警按规则限速写入日志
+        self.limits = LimitEngine()
+        self.alarm_log = AlarmLog(self.logger)
+        if self.power_engine is not None:
+            self.power_engine.add_block_listener(lambda t, v: self._check_limits(POWER_CHANNEL, t, v))
+
+        self.alignment_bench = alignment_bench
+        self._alignment_run: AlignmentRun | None = None
+
+        # 多工位时使用宿主窗口共享调度器上的本工位视图，关闭时只取消本工位的任务
+        self.scheduler: TaskScheduler | SchedulerSession = scheduler if scheduler is not None else TaskScheduler(parent=self)
+        self.watchdog: UiWatchdog | None = None
+        if watchdog:
+            self.watchdog = UiWatchdog(self.logger, parent=self)
+            self.watchdog.start()
+
+        self._t0 = time.perf_counter()
+        self.spot_analyzer = SpotAnalyzer()
+        self._coax_reference: SpotResult | None = None
+        self.camera: CameraPipeline | None = None
+        if camera_source is not None:
+            self.camera = CameraPipeline(camera_source, parent=self)
+            self.camera.frame_ready.connect(self._on_frame_ready)
+            self.camera.error.connect(lambda msg: self.logger.error("相机采集错误：%s", msg))
+            self._camera_stats_timer = QtCore.QTimer(self)
+            self._camera_stats_timer.setInterval(500)
+            self._camera_stats_timer.timeout.connect(self._update_camera_stats)
+        # 令牌桶限制每秒处理的相机帧数，一个工位的相机流不会占满共享的界面线程
+        self.frame_limiter = TokenBucket(camera_fps) if camera_fps else None
+        self._frame_timer = QtCore.QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._on_frame_ready)
+
+        self.report_job: ReportJob | None = None
+
+        self._summary_timer = QtCore.QTimer(self)
+        self._summary_timer.setInterval(1000)
+        self._summary_timer.timeout.connect(self._refresh_summary)
+
+        # 切换步骤时停止不再需要的引擎、启动新需要的引擎，离开“开始装调”页面时全部停止
+        self.hooks = StepHooks()
+        self._register_step_hooks()
+
+        self.tracer = TRACER
+        self.lag_probe = EventLoopLagProbe(TRACER, parent=self)
+        self._register_gauges()
+        self._perf_timer = QtCore.QTimer(self)
+        self._perf_timer.setInterval(1000)
+        self._perf_timer.timeout.connect(self._refresh_perf)
+        if TRACER.enabled if tracing is None else tracing:
+            self.set_tracing(True)
 
         self._connect_signals()
         self._set_initial_state()
+        if session is not None:
+            self._resume_session(resumed)
+        self._apply_step()
+
+    def _register_step_hooks(self):
+        if self.power_engine is not None:
+            self.hooks.register_engine(POWER_ENGINE, self.power_engine.start, self.power_engine.stop)
+        if self.camera is not None:
+            self.hooks.register_engine(CAMERA_ENGINE, self._start_camera, self._stop_camera)
+        if self.instruments is not None and self.instruments.has_device(TRANSMITTER_DEVICE):
+            self.hooks.register_engine(TRANSMITTER_ENGINE, self._tx_poll_timer.start, self._tx_poll_timer.stop)
+        for step in self.workflow.leaves():
+            if step.analysis == POWER_TEST_ANALYSIS:
+                self.hooks.on_enter(step.path, lambda _: self._fit_power_trend())
+            elif step.analysis == COAX_ANALYSIS:
+                self.hooks.on_enter(step.path, lambda _: self._reset_coax_reference())
+            if step.limits:
+                self.hooks.on_enter(step.path, lambda step: self.limits.set_rules(step.limits))
+                self.hooks.on_exit(step.path, lambda _: self.limits.set_rules(()))
+            if step.page == SUMMARY:
+                self.hooks.on_enter(step.path, lambda _: (self._refresh_summary(), self._summary_timer.start()))
+                self.hooks.on_exit(step.path, lambda _: self._summary_timer.stop())
+
+    def _register_gauges(self):
+        prefix = f"{self.station}/" if self.station else ""
+        probe = self.lag_probe
+        probe.add_gauge(f"{prefix}tasks.cpu", lambda: self.scheduler.pending_count(CPU))
+        probe.add_gauge(f"{prefix}tasks.io", lambda: self.scheduler.pending_count(IO))
+        probe.add_gauge(f"{prefix}tasks.running", lambda: self.scheduler.running_count())
+        probe.add_gauge(f"{prefix}log.pending", lambda: self.log_sink.buffer.pending)
+        if self.session is not None:
+            probe.add_gauge(f"{prefix}session.pending", lambda: self.session.pending)
+
+    def set_tracing(self, enabled: bool):
+        """开关性能跟踪。跟踪器是全局的，多工位时对所有工位的采集与任务区间生效。
+
+        开启时导航槽函数被计时，``EventLoopLagProbe`` 采样事件循环延迟与各队列深度，配置信息页面
+        显示各区间的 p50/p99；关闭时不保留任何计时包装与定时器。
+        """
+        self.tracer.enabled = enabled
+        if enabled:
+            self.tracer.instrument(self, TRACED_SLOTS, prefix="ui.")
+            self.lag_probe.start()
+            self._perf_timer.start()
+        else:
+            self.tracer.uninstrument(self, TRACED_SLOTS)
+            self.lag_probe.stop()
+            self._perf_timer.stop()
+        panel = self.ui.perf_panel
+        if panel is not None and panel.enable_box.isChecked() != enabled:
+            panel.enable_box.setChecked(enabled)
+
+    def _refresh_perf(self):
+        page = self.ui.config_page
+        if page is None or not self.visibility.is_active(page):
+            return
+        with self.visibility.track(page):
+            self.ui.perf_panel.set_stats(self.tracer.stats())
+            self.ui.perf_panel.set_queues(self.tracer.counters)
+
+    def _reset_perf(self):
+        self.tracer.reset()
+        self.ui.perf_panel.clear()
+
+    def set_theme(self, name: str) -> float:
+        """切换深色/浅色主题（作用于所有窗口），返回重新应用样式的耗时（ms）。"""
+        elapsed = THEME.set_theme(name)
+        self.logger.info("切换主题：%s，重新应用样式 %.1f ms", name, elapsed)
+        return elapsed
+
+    def export_trace(self, path: str | None = None) -> int:
+        """导出 Chrome trace JSON；未给出路径时弹出保存对话框。返回事件数。"""
+        if path is None:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "导出 Chrome trace", "trace.json", "JSON (*.json)")
+            if not path:
+                return 0
+        count = self.tracer.export_chrome_trace(path)
+        self.logger.info("已导出性能跟踪（%d 个事件）：%s", count, path)
+        return count
+
+    def _start_camera(self):
+        self.camera.start()
+        self._camera_stats_timer.start()
+
+    def _stop_camera(self):
+        self._frame_timer.stop()
+        self._camera_stats_timer.stop()
+        self.camera.stop()
+
+    def _current_step(self) -> WorkflowStep | None:
+        """当前可见的步骤（分组步骤取选中的子步骤）；不在开始装调页面时为 None。"""
+        if self._active_nav != 0:
+            return None
+        return self.workflow.leaf(self._active_step, self._active_sub_step)
+
+    def _apply_step(self):
+        self.scheduler.set_active_step(self._current_step_name())
+        self.hooks.transition(self._current_step())
 
     def _connect_signals(self):
         for idx, btn in enumerate(self.ui.nav_buttons):
@@ -26,57 +366,600 @@ class DecorationPage(QtWidgets.QWidget):
         for idx, btn in enumerate(self.ui.step_buttons):
             btn.clicked.connect(lambda _, i=idx: self._on_step_selected(i))
 
-        for idx, btn in enumerate(self.ui.sub_step_buttons):
-            btn.clicked.connect(lambda _, i=idx: self._on_sub_step_selected(i))
+        for buttons in self.ui.sub_step_buttons.values():
+            for idx, btn in enumerate(buttons):
+                btn.clicked.connect(lambda _, i=idx: self._on_sub_step_selected(i))
 
         self.ui.toggle_btn.toggled.connect(self._toggle_sidebar)
+        self.ui.main_stack.page_built.connect(self._on_main_page_built)
+
+        stacks = [(self.ui.step_stack, self.workflow.steps)]
+        stacks += [(stack, self.workflow.steps[g].children) for g, stack in self.ui.sub_step_stacks.items()]
+        for stack, steps in stacks:
+            stack.page_built.connect(lambda idx, page, steps=steps: self._on_page_built(steps[idx], page))
+            # 非懒加载模式下页面在连接信号之前就已构建
+            for idx in range(stack.count()):
+                if stack.is_built(idx):
+                    self._on_page_built(steps[idx], stack.page(idx))
+
+    def _on_main_page_built(self, idx: int, page: QtWidgets.QWidget):
+        if page is self.ui.flow_page:
+            self.ui.flow_tree.itemActivated.connect(
+                lambda item, _: self.select_step(item.data(0, QtCore.Qt.ItemDataRole.UserRole))
+            )
+        elif page is self.ui.config_page:
+            panel = self.ui.perf_panel
+            panel.enable_box.setChecked(self.tracer.enabled)
+            panel.enable_box.toggled.connect(self.set_tracing)
+            panel.export_requested.connect(self.export_trace)
+            panel.reset_requested.connect(self._reset_perf)
+            self.ui.theme_box.toggled.connect(lambda dark: self.set_theme("dark" if dark else "light"))
+            self.visibility.register(page, "配置信息", on_resume=self._refresh_perf)
+
+    def select_step(self, path: str):
+        """切换到 ``path`` 指定的步骤（如 ``"同轴度/信号收发同轴度"``）。"""
+        step_idx, sub_idx = self.workflow.locate(path)
+        if sub_idx is not None:
+            self._sub_selection[step_idx] = sub_idx
+        if self._active_nav != 0:
+            self._on_nav_selected(0)
+        self._on_step_selected(step_idx)
+
+    def _on_page_built(self, step: WorkflowStep, page: QtWidgets.QWidget):
+        if step.is_group:
+            return
+        self.visibility.register(page, step.path)
+        self._step_pages[step.path] = page
+        if self.camera is not None:
+            for view in self.ui.camera_views.values():
+                if page.isAncestorOf(view):
+                    view.frame_painted.connect(self.camera.mark_displayed)
+        if step.page == SUMMARY:
+            self.visibility.register(page, step.path, on_resume=self._refresh_summary)
+        if step.page in (SUMMARY, REPORT):
+            self._mount_report_panel(step)
+        if not isinstance(page, CommonContentWidget):
+            return
+        if page.align_group is not None and self.alignment_bench is not None:
+            self._mount_alignment(page, step.alignment)
+        if step.analysis == COAX_ANALYSIS:
+            self._mount_table(page, COAX_TABLE_COLUMNS)
+            return
+        archive_page = self.power_archive is not None and step.analysis == POWER_TEST_ANALYSIS
+        model = self._mount_table(page, ARCHIVE_TABLE_COLUMNS if archive_page else POWER_TABLE_COLUMNS)
+        if self.instruments is not None and self.instruments.has_device(TRANSMITTER_DEVICE):
+            tx_panel = TransmitterPanel()
+            tx_panel.output_requested.connect(lambda on: self._send_transmitter(f"OUTP {'ON' if on else 'OFF'}"))
+            tx_panel.power_requested.connect(lambda mw: self._send_transmitter(f"POW {mw:.4f}"))
+            page.set_group_content(page.tx_group, tx_panel)
+            self.transmitter_panels[page] = tx_panel
+            # 重新可见时立即轮询一次，不等下一个周期
+            self.visibility.register(page, step.path, on_resume=self._poll_transmitter)
+        if self.power_engine is not None:
+            panel = PowerMeterPanel()
+            # 曲线直接引用采集引擎的环形缓冲，不复制历史数据
+            panel.plot.set_buffer(self.power_engine.buffer)
+            panel.plot.window = int(self.power_engine.snapshot_seconds * self.power_engine.driver.sample_rate)
+            page.set_group_content(page.power_group, panel)
+            self.power_panels[page] = panel
+            if archive_page:
+                panel.plot.set_archive(self.power_archive, self.power_engine.archive_offset)
+                self._append_archive_rows(model)
+
+                def update(snapshot, panel=panel, model=model):
+                    panel.update_snapshot(snapshot)
+                    self._append_archive_rows(model)
+            else:
+
+                def update(snapshot, panel=panel, model=model):
+                    panel.update_snapshot(snapshot)
+                    if len(snapshot.t):
+                        model.append_rows(snapshot.t[-1], snapshot.latest)
+
+            self.power_engine.snapshot_ready.connect(self.visibility.gate(page, update))
+            self.visibility.register(
+                page, step.path, on_resume=lambda panel=panel, update=update: self._resume_power(panel, update)
+            )
+            panel.plot.set_paused(not self.visibility.is_active(page))
+
+    def _mount_alignment(self, page: CommonContentWidget, kind: str):
+        """挂载自动对准面板：二向色镜装调最大化耦合功率，同轴度子步骤最小化光斑偏移。"""
+        if kind == MAXIMIZE_POWER:
+            panel = AlignmentPanel("目标：最大化耦合功率", unit="mW")
+        else:
+            panel = AlignmentPanel("目标：最小化光斑偏移", unit="px")
+        panel.start_requested.connect(lambda budget: self.start_alignment(panel, kind, budget))
+        panel.stop_requested.connect(self.stop_alignment)
+        page.set_group_content(page.align_group, panel)
+
+    def start_alignment(self, panel: AlignmentPanel, kind: str, budget: int = 150) -> AlignmentRun | None:
+        """在当前步骤中启动一次自动对准；同一时间只允许一次对准。
+
+        对准在调度器的 I/O 线程中运行，离开步骤时随步骤任务一起停止。
+        """
+        if self._alignment_run is not None and self._alignment_run.is_running():
+            self.logger.warning("已有自动对准在运行")
+            return None
+        bench = self.alignment_bench
+        optimizer = AlignmentOptimizer(bench.axes, bench.objective(kind), maximize=kind == MAXIMIZE_POWER, budget=budget)
+        run = AlignmentRun(optimizer, parent=self)
+        run.progress.connect(panel.set_progress)
+        # 结果记到发起对准的步骤，而不是结束时所在的步骤
+        step = self._current_step_name()
+        run.finished.connect(lambda result: self._on_alignment_finished(panel, kind, step, result))
+        run.failed.connect(lambda msg: self._on_alignment_failed(panel, msg))
+        panel.set_running(True)
+        handle = run.start(self.scheduler, step=step)
+        handle.cancelled.connect(lambda: panel.set_result("已取消"))
+        self._alignment_run = run
+        self.logger.info("开始自动对准（%s，预算 %d 次）", "功率" if kind == MAXIMIZE_POWER else "偏移", budget)
+        return run
+
+    def stop_alignment(self):
+        if self._alignment_run is not None:
+            self._alignment_run.cancel()
+
+    def _on_alignment_finished(self, panel: AlignmentPanel, kind: str, step: str | None, result: AlignmentResult):
+        reasons = {"converged": "已收敛", "target": "达到目标", "stalled": "无改进", "budget": "预算用尽", "cancelled": "已停止"}
+        reason = reasons.get(result.reason, result.reason)
+        panel.set_result(
+            f"{reason}  ·  最优点读数 {result.final_value:.4f}  ·  评估 {result.evaluations} 次  ·  用时 {result.elapsed_s:.2f} s"
+        )
+        self.logger.info(
+            "自动对准%s：搜索最优 %.4f，移回最优点后读数 %.4f，评估 %d 次，用时 %.2f s，位置 %s",
+            reason, result.value, result.final_value, result.evaluations, result.elapsed_s,
+            np.array2string(result.x, precision=4),
+        )
+        if self.session is not None:
+            self.session.record_event(
+                "alignment",
+                step=step,
+                kind=kind,
+                value=result.value,
+                final_value=result.final_value,
+                x=result.x.tolist(),
+                evaluations=result.evaluations,
+                elapsed_s=result.elapsed_s,
+                reason=result.reason,
+            )
+
+    def _on_alignment_failed(self, panel: AlignmentPanel, message: str):
+        self.logger.error("自动对准失败：%s", message)
+        panel.set_result(f"失败：{message}")
+
+    def _poll_transmitter(self):
+        # 上一次轮询未返回时不再排队新的轮询，慢设备不会积压请求
+        if self._tx_poll_id is None and self.transmitter_panels:
+            self._tx_poll_id = self.instruments.request(TRANSMITTER_DEVICE, ["OUTP?", "POW?"])
+
+    def _send_transmitter(self, command: str):
+        self._tx_requests.add(self.instruments.request(TRANSMITTER_DEVICE, command))
+        self.logger.info("发射机命令：%s", command)
+
+    def _on_instrument_reply(self, request_id: int, device: str, response):
+        # 仪器服务可能被多个页面共享，只处理本页面发出的请求
+        if request_id in self._tx_requests:
+            self._tx_requests.discard(request_id)
+            if response != "OK":
+                self.logger.warning("发射机命令未确认：%s", response)
+            return
+        if request_id != self._tx_poll_id:
+            return
+        self._tx_poll_id = None
+        t = time.perf_counter() - self._t0
+        try:
+            output, power = response[0] == "1", float(response[1])
+        except (ValueError, IndexError, TypeError):
+            # 乱码或 ERR 应答只丢弃本次读数，槽函数中的异常会终止整个进程
+            self.logger.warning("发射机应答无法解析：%r", response)
+            return
+        self._check_limits(TX_POWER_CHANNEL, [t], [power])
+        hist = self.instruments.latency.get("POW?")
+        latency = f"POW? p50 {hist.quantile(0.5):.2f} ms  ·  p99 {hist.quantile(0.99):.2f} ms" if hist else ""
+        for page, panel in self.transmitter_panels.items():
+            if self.visibility.is_active(page):
+                with self.visibility.track(page):
+                    panel.update_readback(t, output, power)
+                    panel.set_latency_text(latency)
+
+    def _on_instrument_failed(self, request_id: int, device: str, message: str):
+        if request_id == self._tx_poll_id:
+            self._tx_poll_id = None
+        elif request_id in self._tx_requests:
+            self._tx_requests.discard(request_id)
+        else:
+            return
+        self.logger.error("仪器 %s 通信失败：%s", device, message)
+
+    def _visible_camera_step(self) -> str | None:
+        step = self.hooks.current
+        return step.path if step is not None and step.page == CAMERA else None
+
+    def _visible_coax_page(self) -> QtWidgets.QWidget | None:
+        step = self.hooks.current
+        if step is None or step.analysis != COAX_ANALYSIS:
+            return None
+        if step.parent is None:
+            return self.ui.step_stack.page(step.index)
+        return self.ui.sub_step_stacks[step.parent.index].page(step.index)
+
+    def _on_frame_ready(self):
+        if self.frame_limiter is not None:
+            delay = self.frame_limiter.acquire()
+            if delay > 0:
+                # 超出本工位的帧预算：暂不取帧（相机线程继续覆盖最新帧），到期后再处理
+                if not self._frame_timer.isActive():
+                    self._frame_timer.start(max(1, math.ceil(delay * 1000)))
+                return
+        with self.tracer.span("camera.frame"):
+            self._handle_frame()
+
+    def _handle_frame(self):
+        """把最新帧交给可见的相机页面；同轴度子步骤中做光斑分析，偏移写入该子步骤的表格。"""
+        frame = self.camera.take_latest()
+        if frame is None:
+            return
+        coax_page = self._visible_coax_page()
+        if coax_page is not None:
+            # 同轴度分析产生测量数据，页面被挂起时也照常进行
+            with self.visibility.track(coax_page):
+                self._analyze_coax_frame(coax_page, frame)
+            return
+        name = self._visible_camera_step()
+        view = self.ui.camera_views.get(name) if name else None
+        page = self._step_pages.get(name) if name else None
+        if view is None or not self.visibility.is_active(page):
+            # 没有可见的相机页面，直接归还缓冲
+            frame.release()
+            return
+        with self.visibility.track(page):
+            view.set_frame(frame)
+
+    def _analyze_coax_frame(self, page: QtWidgets.QWidget, frame):
+        try:
+            with self.tracer.span("coax.analyze", "analysis"):
+                result = self.spot_analyzer.analyze(frame.data)
+        finally:
+            frame.release()
+        if not result.valid:
+            return
+        if self._coax_reference is None:
+            # 进入子步骤后的第一个有效光斑作为参考光斑
+            self._coax_reference = result
+        offset = beam_offset(self._coax_reference, result)[2]
+        row = (frame.timestamp - self._t0, result.cx, result.cy, result.sigma_x, result.sigma_y, offset)
+        self.table_models[page].append_rows(*row)
+        channel = self.hooks.current.path
+        self.statistics.update(channel, [offset])
+        self._check_limits(COAX_CHANNEL, [row[0]], [offset])
+        if self.session is not None:
+            self.session.record_measurement(channel, *row)
+
+    def _check_limits(self, channel: str, t, v):
+        """按当前步骤的规则判定一块样本；在采集线程与 GUI 线程中都会被调用。"""
+        events = self.limits.evaluate(channel, t, v)
+        if events:
+            self.alarm_log.emit(events)
+
+    def _update_camera_stats(self):
+        name = self._visible_camera_step()
+        label = self.ui.camera_stats.get(name) if name else None
+        if label is None:
+            return
+        camera = self.camera
+        text = (
+            f"采集 {camera.capture_fps:.1f} fps  ·  显示 {camera.display_fps:.1f} fps  ·  "
+            f"延迟 {camera.latency_ms:.1f} ms  ·  丢帧 {camera.dropped}"
+        )
+        if self.frame_limiter is not None:
+            text += f"  ·  限速 {self.frame_limiter.rate:g} fps"
+        label.setText(text)
+
+    def _record_power_snapshot(self, snapshot):
+        # 每个快照只记录一次，与哪些页面可见无关
+        if self.session is not None and len(snapshot.t):
+            self.session.record_measurement(POWER_CHANNEL, snapshot.t[-1], snapshot.latest)
+
+    def _resume_power(self, panel: PowerMeterPanel, update):
+        panel.plot.set_paused(False)
+        if self.power_engine.is_running() and len(self.power_engine.buffer):
+            update(self.power_engine.snapshot())
+
+    def _apply_update_rates(self):
+        """不可见页面的曲线停止重绘；没有页面在看时降低功率快照帧率与发射机轮询频率。"""
+        if self.power_engine is not None:
+            for page, panel in self.power_panels.items():
+                panel.plot.set_paused(not self.visibility.is_active(page))
+            watched = self.visibility.any_active(self.power_panels)
+            self.power_engine.set_max_fps(SNAPSHOT_FPS if watched else IDLE_SNAPSHOT_FPS)
+        if self.transmitter_panels:
+            watched = self.visibility.any_active(self.transmitter_panels)
+            self._tx_poll_timer.setInterval(TX_POLL_MS if watched else IDLE_TX_POLL_MS)
+
+    def page_activity(self) -> list[dict]:
+        """各页面的更新次数、丢弃次数、GUI 线程 CPU 时间与更新频率。"""
+        return self.visibility.report()
+
+    def _append_archive_rows(self, model: MeasurementTableModel):
+        # 每个快照只比较已封存块数，有新块时追加其摘要行，不读取原始数据
+        if self.power_archive.sealed_chunks == self._archive_rows:
+            return
+        index = self.power_archive.chunk_index(self._archive_rows)
+        self._archive_rows += len(index)
+        model.append_rows(
+            index["t0"],
+            index["t1"],
+            index["count"],
+            index["vmin"],
+            index["vmax"],
+            index["vsum"] / index["count"],
+        )
+
+    def _refresh_summary(self):
+        """用累计统计刷新样机总结页面；进入该步骤时刷新一次，停留期间每秒刷新。"""
+        panel = self.ui.summary_panel
+        if panel is None:
+            return
+        verdicts: list[bool] = []
+        power = self.statistics.summary(POWER_CHANNEL)
+        if power is not None and power["count"]:
+            section = "功率稳定性"
+            stability = power["std"] / power["mean"] if power["mean"] else float("nan")
+            passed = bool(stability <= SUMMARY_LIMITS["power_stability"])
+            verdicts.append(passed)
+            panel.set_value(section, "样本数", f"{power['count']:,}")
+            panel.set_value(section, "均值", f"{power['mean']:.4f} mW")
+            panel.set_value(
+                section, "标准差 / 相对波动", f"{power['std']:.4g} mW / {stability * 100:.3f}%", passed
+            )
+            panel.set_value(
+                section, "P5 / P50 / P95", f"{power['p05']:.4f} / {power['p50']:.4f} / {power['p95']:.4f} mW"
+            )
+            panel.set_value(section, "最小 / 最大", f"{power['min']:.4f} / {power['max']:.4f} mW")
+            for tau in ALLAN_TAUS:
+                actual, sigma = self.statistics.allan_at(POWER_CHANNEL, tau)
+                # 数据时长还不足以覆盖该 τ 时不显示最近的较短 τ，以免误读
+                covered = sigma == sigma and 0.5 * tau <= actual <= 2.0 * tau
+                text = f"{sigma:.3g} mW（τ = {actual:.3g} s）" if covered else "—"
+                panel.set_value(section, f"Allan σ @ {tau:g} s", text)
+        for step in self.workflow.leaves():
+            if step.analysis != COAX_ANALYSIS:
+                continue
+            coax = self.statistics.summary(step.path)
+            if coax is None or not coax["count"]:
+                continue
+            section = step.title
+            passed = bool(coax["p95"] <= SUMMARY_LIMITS["coax_offset_p95"])
+            verdicts.append(passed)
+            panel.set_value(section, "帧数", f"{coax['count']:,}")
+            panel.set_value(section, "平均偏移", f"{coax['mean']:.3f} px")
+            panel.set_value(section, "P95 偏移", f"{coax['p95']:.3f} px", passed)
+            panel.set_value(section, "最大偏移", f"{coax['max']:.3f} px")
+        for rule, state in self.limits.stats():
+            if not state.samples:
+                continue
+            # error 级规则报警过即判为不合格，warning 级只显示
+            passed = state.alarms == 0 if rule.severity == "error" else None
+            if passed is not None:
+                verdicts.append(passed)
+            panel.set_value(
+                "限值报警",
+                rule.name,
+                f"限值 {rule.describe()}  ·  超限 {state.violations:,} / {state.samples:,}  ·  报警 {state.alarms} 次",
+                passed,
+            )
+        panel.set_verdict(all(verdicts) if verdicts else None)
+
+    def _mount_report_panel(self, step: WorkflowStep):
+        panel = self.ui.report_panels[step.path]
+        if self.session is None:
+            panel.set_available(False, "未启用会话记录，无法生成报告")
+            return
+        panel.generate_requested.connect(lambda fmt: self.generate_report(fmt))
+        panel.cancel_requested.connect(self.cancel_report)
+        panel.set_running(self.report_job is not None and self.report_job.is_running())
+
+    def generate_report(self, fmt: str = "html", path: str | None = None) -> ReportJob | None:
+        """在工作进程中生成当前会话的报告；已有报告在生成或没有会话时返回 None。
+
+        ``path`` 缺省时写到会话文件旁，文件名带生成时间。统计与限值报警计数取自本页面的
+        当前累计量，测量数据、日志与功率曲线由工作进程从会话和归档中读取，界面线程只转发进度。
+        """
+        if self.session is None or (self.report_job is not None and self.report_job.is_running()):
+            return None
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"不支持的报告格式：{fmt}")
+        if path is None:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = f"{os.path.splitext(self.session.path)[0]}_报告_{stamp}.{fmt}"
+        # 让工作进程读到尽量新的数据：热块写回磁盘，统计写入检查点
+        if self.power_archive is not None:
+            self.power_archive.flush()
+        self.session.checkpoint()
+        spec = ReportSpec(
+            session_path=self.session.path,
+            output_path=path,
+            title=f"{self.prototype_name or self.prototype_type} 装调报告",
+            archive_path=self.power_archive.path if self.power_archive is not None else None,
+            power_channel=POWER_CHANNEL,
+            coax_channels=[(step.path, step.title) for step in self.workflow.leaves() if step.analysis == COAX_ANALYSIS],
+            statistics=self.statistics.to_dict(),
+            limits=dict(SUMMARY_LIMITS),
+            alarms=[
+                {
+                    "name": rule.name,
+                    "limit": rule.describe(),
+                    "severity": rule.severity,
+                    "samples": state.samples,
+                    "violations": state.violations,
+                    "alarms": state.alarms,
+                }
+                for rule, state in self.limits.stats()
+                if state.samples
+            ],
+            allan_taus=ALLAN_TAUS,
+        )
+        job = ReportJob(spec, parent=self)
+        job.progress.connect(self._on_report_progress)
+        job.finished.connect(self._on_report_finished)
+        job.failed.connect(self._on_report_failed)
+        job.cancelled.connect(self._on_report_cancelled)
+        self.report_job = job
+        job.start()
+        self.logger.info("开始生成 %s 报告：%s", REPORT_FORMATS[fmt], path)
+        for panel in self.ui.report_panels.values():
+            panel.set_running(True)
+            panel.set_status("正在启动报告进程…")
+        return job
+
+    def cancel_report(self):
+        if self.report_job is not None:
+            self.report_job.cancel()
+
+    def _on_report_progress(self, done: int, total: int, stage: str):
+        for panel in self.ui.report_panels.values():
+            panel.set_progress(done, total, stage)
+
+    def _report_done(self, text: str):
+        for panel in self.ui.report_panels.values():
+            panel.set_running(False)
+            panel.set_status(text)
+
+    def _on_report_finished(self, result: dict):
+        self.logger.info("报告已生成：%s（%d 页，%.1f KB）", result["path"], result["pages"], result["bytes"] / 1024)
+        self._report_done(f"已生成：{result['path']}")
+
+    def _on_report_failed(self, message: str):
+        self.logger.error("报告生成失败：%s", message)
+        self._report_done("报告生成失败，详见日志")
+
+    def _on_report_cancelled(self):
+        self.logger.warning("报告生成已取消")
+        self._report_done("已取消")
+
+    def _mount_table(self, page: CommonContentWidget, columns: list[tuple[str, str, str]]) -> MeasurementTableModel:
+        model = MeasurementTableModel(columns, max_rows=200_000, parent=page)
+        view = MeasurementTableView()
+        view.setModel(MeasurementProxyModel(model, parent=view))
+        page.set_group_content(page.table_group, view)
+        self.table_models[page] = model
+        return model
 
     def _set_initial_state(self):
         self._activate_button(self.ui.nav_buttons[self._active_nav], self.ui.nav_buttons)
         self.ui.main_stack.setCurrentIndex(self._active_nav)
         self._activate_button(self.ui.step_buttons[self._active_step], self.ui.step_buttons)
         self.ui.step_stack.setCurrentIndex(self._active_step)
-        self._update_sub_steps_visibility(show=False)
+        self._update_sub_steps_visibility()
         self._update_title()
+        self._prewarm_next_step()
+
+    def _current_step_name(self) -> str:
+        step = self._current_step()
+        return step.path if step is not None else self.ui.nav_buttons[self._active_nav].full_text
+
+    def run_step_analysis(self, fn, *args, kind: str = CPU, on_result=None) -> TaskHandle:
+        """在后台运行属于当前步骤的分析任务，离开该步骤时任务被取消。"""
+        handle = self.scheduler.submit(fn, *args, kind=kind, step=self._current_step_name())
+        if on_result is not None:
+            handle.finished.connect(on_result)
+        handle.failed.connect(lambda msg: self.logger.error("分析任务失败：%s", msg))
+        return handle
+
+    def _resume_session(self, state: dict):
+        if not state:
+            return
+        step = state.get("step", 0)
+        sub_step = state.get("sub_step", 0)
+        nav = state.get("nav", 0)
+        if not 0 <= step < len(self.workflow.steps):
+            step = 0
+        if 0 <= sub_step < len(self.workflow.steps[step].children):
+            self._sub_selection[step] = sub_step
+        self._on_step_selected(step)
+        if 0 < nav < len(self.ui.nav_buttons):
+            self._on_nav_selected(nav)
+        self.logger.info("已恢复会话：%s", self._current_step_name())
+
+    def _record_progress(self):
+        if self.session is not None:
+            self.session.record_state(nav=self._active_nav, step=self._active_step, sub_step=self._active_sub_step)
 
     def _on_nav_selected(self, idx: int):
         self._active_nav = idx
+        self._record_progress()
         self.ui.main_stack.setCurrentIndex(idx)
         self._activate_button(self.ui.nav_buttons[idx], self.ui.nav_buttons)
         if idx == 0:
             # 回到开始装调时保持当前步骤状态
-            self._update_title()
+            self._update_title(self._sub_step_suffix())
         else:
             # 切换到其他主页面时重置标题
             self.ui.title_label.setText(self.ui.nav_buttons[idx].full_text)
-        coax_index = self.ui.step_names.index("同轴度")
-        self.ui.substep_frame.setVisible(idx == 0 and self._active_step == coax_index)
+        self._update_sub_steps_visibility()
+        self._apply_step()
 
     def _on_step_selected(self, idx: int):
         self._active_step = idx
+        step = self.workflow.steps[idx]
+        self._active_sub_step = self._sub_selection.get(idx, 0) if step.is_group else 0
+        self._record_progress()
+        self.logger.info("进入步骤：%s", step.name)
         self._activate_button(self.ui.step_buttons[idx], self.ui.step_buttons)
         self.ui.step_stack.setCurrentIndex(idx)
-        coax_index = self.ui.step_names.index("同轴度")
-        if idx == coax_index:
-            self._update_sub_steps_visibility(show=True)
+        self._update_sub_steps_visibility()
+        if step.is_group:
             self._on_sub_step_selected(self._active_sub_step)
         else:
-            self._update_sub_steps_visibility(show=False)
-        self._update_title()
+            self._update_title()
+        self._prewarm_next_step()
+        self._apply_step()
+
+    def _fit_power_trend(self):
+        if self.power_engine is not None:
+            self.run_step_analysis(_buffer_power_trend, self.power_engine.buffer, kind=IO, on_result=self._log_power_trend)
+
+    def _log_power_trend(self, result: dict):
+        self.logger.info(
+            "功率趋势：均值 %.4f mW，斜率 %.3g mW/s，残差 %.3g mW，波动 %.2f%%",
+            result["mean"], result["slope"], result["residual_std"], result["stability"] * 100,
+        )
+
+    def _prewarm_next_step(self):
+        # 用户通常按顺序执行步骤，空闲时提前构建下一步页面
+        if self._prewarm:
+            self.ui.step_stack.prewarm(self._active_step + 1)
 
     def _on_sub_step_selected(self, idx: int):
+        group = self._active_step
         self._active_sub_step = idx
-        self._activate_button(self.ui.sub_step_buttons[idx], self.ui.sub_step_buttons)
-        self.ui.sub_step_stack.setCurrentIndex(idx)
-        self._update_title(suffix=f"- {self.ui.sub_step_names[idx]}")
-
-    def _update_sub_steps_visibility(self, show: bool):
-        self.ui.substep_frame.setVisible(show)
-        if show:
-            self._activate_button(self.ui.sub_step_buttons[self._active_sub_step], self.ui.sub_step_buttons)
-        else:
-            for btn in self.ui.sub_step_buttons:
-                btn.setChecked(False)
+        self._sub_selection[group] = idx
+        self._record_progress()
+        buttons = self.ui.sub_step_buttons[group]
+        self._activate_button(buttons[idx], buttons)
+        self.ui.sub_step_stacks[group].setCurrentIndex(idx)
+        self._update_title(self._sub_step_suffix())
+        self._apply_step()
+
+    def _reset_coax_reference(self):
+        # 每次进入同轴度子步骤都以新的第一个有效光斑作为参考
+        self._coax_reference = None
+        self.spot_analyzer.reset_tracking()
+
+    def _sub_step_suffix(self) -> str | None:
+        step = self.workflow.steps[self._active_step]
+        return f"- {step.children[self._active_sub_step].name}" if step.is_group else None
+
+    def _update_sub_steps_visibility(self):
+        for group, frame in self.ui.sub_step_frames.items():
+            show = self._active_nav == 0 and group == self._active_step
+            frame.setVisible(show)
+            buttons = self.ui.sub_step_buttons[group]
+            if show:
+                self._activate_button(buttons[self._sub_selection.get(group, 0)], buttons)
+            else:
+                for btn in buttons:
+                    btn.setChecked(False)
 
     def _toggle_sidebar(self, collapsed: bool):
         target_width = 78 if collapsed else 260
@@ -87,6 +970,9 @@ class DecorationPage(QtWidgets.QWidget):
         animation.setDuration(150)
         animation.setStartValue(self.ui.sidebar.width())
         animation.setEndValue(target_width)
+        # 动画期间暂停各页面的更新，结束后补一次快照
+        self.visibility.suspend("sidebar")
+        animation.finished.connect(lambda: self.visibility.release("sidebar"))
         animation.start()
         self._sidebar_animation = animation  # Keep reference
 
@@ -94,6 +980,49 @@ class DecorationPage(QtWidgets.QWidget):
         for btn in all_buttons:
             btn.setChecked(btn is active_btn)
 
+    def changeEvent(self, event: QtCore.QEvent):
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            if self.isMinimized():
+                self.visibility.suspend("minimized")
+            else:
+                self.visibility.release("minimized")
+        super().changeEvent(event)
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self.lag_probe.stop()
+        self._perf_timer.stop()
+        self.stop_alignment()
+        if self.report_job is not None:
+            self.report_job.shutdown()
+        # 离开当前步骤：停止全部采集引擎与轮询
+        self.hooks.transition(None)
+        for device in self._remote_devices:
+            device.shutdown()
+        self.scheduler.shutdown()
+        if self.instruments is not None and self.instruments.has_device(TRANSMITTER_DEVICE):
+            self.instruments.reply.disconnect(self._on_instrument_reply)
+            self.instruments.failed.disconnect(self._on_instrument_failed)
+        if self.session is not None:
+            self.logger.removeHandler(self._session_log_handler)
+        session, archive = self.session, self.power_archive
+
+        def close_storage():
+            if session is not None:
+                session.checkpoint()
+                session.close()
+            if archive is not None:
+                archive.close()
+
+        # 驱动阻塞导致采集线程未能及时退出时，等它写完最后一块再关闭归档与会话
+        if self.power_engine is not None:
+            self.power_engine.when_stopped(close_storage)
+        else:
+            close_storage()
+        self.log_sink.close()
+        super().closeEvent(event)
+
     def _update_title(self, suffix: str | None = None):
         if self._active_nav != 0:
             self.ui.title_label.setText(self.ui.nav_buttons[self._active_nav].full_text)
@@ -105,4 +1034,4 @@ class DecorationPage(QtWidgets.QWidget):
         self.ui.title_label.setText(base_title)
 
 
-__all__ = ["DecorationPage"]
+__all__ = ["DecorationPage", "TRANSMITTER_DEVICE", "POWER_CHANNEL", "COAX_CHANNEL", "TX_POWER_CHANNEL", "SUMMARY_LIMITS"]
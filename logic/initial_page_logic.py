@@ -1,20 +1,37 @@
 # initial_page_page.py
 # 这个文件负责封装 initial_page 的逻辑
 
-from PyQt6 import QtWidgets
+import importlib
+import threading
+
+from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtWidgets import QMessageBox
 
-from logic.decoration_page_logic import DecorationPage
+# 装调主页面及其依赖（NumPy、采集与分析模块）只在点击“开始装调”后才需要，
+# 这里不直接导入，而是在窗口显示后由 start_warm_up 在后台线程中预加载。
+DEFERRED_MODULES = ("logic.session_store", "logic.decoration_page_logic", "logic.station_window_logic")
 
 
 from ui.initial_page import Ui_start_to_adjust   # <-- 这里换成你 pyuic6 生成的那个文件名
 
 
 class InitialPage(QtWidgets.QWidget):
-    """开始装调页面：封装 Ui_widget + 逻辑"""
+    """开始装调页面：封装 Ui_widget + 逻辑
+
+    ``multi_station`` 为真时每次开始装调都在同一个多工位窗口中添加一个标签页，
+    开始页面保持打开，以便继续添加其他样机。``acquisition_process`` 为真时装调
+    主页面的采集驱动在独立的工作进程中运行。
+    """
 
-    def __init__(self, parent=None):
+    first_painted = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None, multi_station: bool = False, acquisition_process: bool = False):
         super().__init__(parent)
+        self._painted = False
+        self.multi_station = multi_station
+        self.acquisition_process = acquisition_process
+        self.station_window = None
+        self._warm_up_thread: threading.Thread | None = None
 
         # 创建 UI 对象并在当前 QWidget 上布置界面
         self.ui = Ui_start_to_adjust()
@@ -31,6 +48,24 @@ class InitialPage(QtWidgets.QWidget):
         # 按钮点击逻辑
         self.ui.start_to_adjust_btn.clicked.connect(self.on_start_clicked)
 
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
+    def start_warm_up(self):
+        """在后台线程中预先导入装调主页面相关模块（只导入模块，不创建任何控件）。"""
+        if self._warm_up_thread is not None:
+            return
+
+        def warm_up():
+            for name in DEFERRED_MODULES:
+                importlib.import_module(name)
+
+        self._warm_up_thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+        self._warm_up_thread.start()
+
     def on_start_clicked(self):
         """点击“开始装调”后的逻辑"""
         name = self.ui.prototype_name.text().strip()
@@ -39,13 +74,50 @@ class InitialPage(QtWidgets.QWidget):
             QMessageBox.warning(self, "提示", "请先输入样机名称！")
             return
 
-        self._open_decoration_page(name)
+        self._open_decoration_page(name, self.prototype_type())
+
+    def prototype_type(self) -> str:
+        """当前选中的样机类型（单选按钮上的文字）。"""
+        button = self.ui.prototype_rd_B if self.ui.prototype_rd_B.isChecked() else self.ui.prototype_rd_A
+        return button.text()
 
-    def _open_decoration_page(self, name: str):
-        """打开装调主页面并传递样机信息，只在顶部展示一次样机名。"""
+    def _open_decoration_page(self, name: str, prototype_type: str):
+        """打开装调主页面并传递样机信息，只在顶部展示一次样机名。
 
-        self.decoration_window = DecorationPage(prototype_name=name)
+        同名同类型的样机共用一个会话文件，再次打开时从上次的进度继续。
+        """
+
+        if self.multi_station:
+            self._open_station(name, prototype_type)
+            return
+
+        from logic.decoration_page_logic import DecorationPage
+        from logic.session_store import DEFAULT_SESSION_ROOT, SessionStore
+
+        session = SessionStore.open(DEFAULT_SESSION_ROOT, name, prototype_type)
+        self.decoration_window = DecorationPage(
+            prototype_name=name,
+            prototype_type=prototype_type,
+            session=session,
+            acquisition_process=self.acquisition_process,
+        )
         self.decoration_window.setWindowTitle("装调主页面")
         self.decoration_window.resize(1400, 900)
         self.decoration_window.show()
         self.close()
+
+    def _open_station(self, name: str, prototype_type: str):
+        """在多工位窗口中添加（或切换到）该样机的工位，窗口关闭后再次添加时重新创建。"""
+        from logic.station_window_logic import StationWindow
+
+        if self.station_window is None:
+            self.station_window = StationWindow(acquisition_process=self.acquisition_process)
+            self.station_window.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+            self.station_window.destroyed.connect(self._on_station_window_destroyed)
+            self.station_window.resize(1400, 900)
+        self.station_window.add_station(name, prototype_type)
+        self.station_window.show()
+        self.station_window.raise_()
+
+    def _on_station_window_destroyed(self):
+        self.station_window = None
@@ -0,0 +1,358 @@
+# instrument_io.py
+# 仪器异步 I/O 层：独立线程中的 asyncio 事件循环 + 每台设备复用连接 + 命令流水线，通过 Qt 信号回到界面
+
+import abc
+import asyncio
+import concurrent.futures
+import itertools
+import math
+import threading
+import time
+from collections.abc import Awaitable, Callable
+
+from PyQt6 import QtCore
+
+
+class Transport(abc.ABC):
+    """面向行的字节传输（串口、TCP 等）。每条命令对应一行应答。"""
+
+    @abc.abstractmethod
+    async def connect(self):
+        ...
+
+    @abc.abstractmethod
+    async def write(self, data: bytes):
+        ...
+
+    @abc.abstractmethod
+    async def readline(self) -> bytes:
+        ...
+
+    @abc.abstractmethod
+    async def close(self):
+        ...
+
+
+class TcpTransport(Transport):
+    """基于 ``asyncio.open_connection`` 的 TCP 传输（如 LXI/以太网串口服务器）。"""
+
+    def __init__(self, host: str, port: int, connect_timeout: float = 3.0):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.connect_timeout
+        )
+
+    async def write(self, data: bytes):
+        self._writer.write(data)
+        await self._writer.drain()
+
+    async def readline(self) -> bytes:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError(f"{self.host}:{self.port} 连接已关闭")
+        return line
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+
+class MockTransport(Transport):
+    """回环/模拟传输：把每行命令交给 ``handler`` 生成应答，可模拟延迟与丢应答。
+
+    ``handler`` 返回 None 表示设备不应答（用于测试超时与重试）。
+    """
+
+    def __init__(self, handler: Callable[[str], str | None], latency: float = 0.0):
+        self.handler = handler
+        self.latency = latency
+        self.connects = 0
+        self._lines: asyncio.Queue | None = None
+
+    async def connect(self):
+        self.connects += 1
+        self._lines = asyncio.Queue()
+
+    async def write(self, data: bytes):
+        for line in data.decode().splitlines():
+            reply = self.handler(line)
+            if reply is not None:
+                asyncio.get_running_loop().call_later(self.latency, self._lines.put_nowait, (reply + "\n").encode())
+
+    async def readline(self) -> bytes:
+        return await self._lines.get()
+
+    async def close(self):
+        self._lines = None
+
+
+class MockTransmitter:
+    """模拟信号发射机的命令处理器，可直接作为 ``MockTransport`` 的 handler。"""
+
+    def __init__(self, power: float = 1.0):
+        self.output = False
+        self.power = power
+
+    def __call__(self, command: str) -> str | None:
+        head, _, arg = command.strip().partition(" ")
+        head = head.upper()
+        if head == "*IDN?":
+            return "FOS,MockTransmitter,0,1.0"
+        if head == "OUTP?":
+            return "1" if self.output else "0"
+        if head == "OUTP":
+            self.output = arg.strip().upper() in ("1", "ON")
+            return "OK"
+        if head == "POW?":
+            return f"{self.power if self.output else 0.0:.4f}"
+        if head == "POW":
+            self.power = float(arg)
+            return "OK"
+        return "ERR"
+
+
+class LatencyHistogram:
+    """对数分桶的延迟直方图（微秒到分钟），记录开销为常数。"""
+
+    BINS_PER_DECADE = 10
+
+    def __init__(self, min_ms: float = 0.01, max_ms: float = 60_000.0):
+        self.min_ms = min_ms
+        self.n_bins = int(math.ceil(math.log10(max_ms / min_ms) * self.BINS_PER_DECADE)) + 1
+        self.counts = [0] * self.n_bins
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        idx = 0 if ms <= self.min_ms else int(math.log10(ms / self.min_ms) * self.BINS_PER_DECADE)
+        self.counts[min(idx, self.n_bins - 1)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def bin_upper(self, idx: int) -> float:
+        return self.min_ms * 10 ** ((idx + 1) / self.BINS_PER_DECADE)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return float("nan")
+        target = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bin_upper(idx), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else float("nan"),
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+
+def command_type(command: str) -> str:
+    """命令类型：取命令头（如 ``POW?``、``OUTP``），用于分类统计延迟。"""
+    return command.strip().split(" ", 1)[0].upper()
+
+
+class InstrumentConnection:
+    """单台设备的复用连接，支持命令流水线。
+
+    多条命令可以不等应答连续写出，应答按先进先出与命令对应。某条命令超时
+    后连接视为失步：关闭并让所有在途命令失败，下次使用时自动重连。
+    """
+
+    def __init__(self, name: str, transport_factory: Callable[[], Transport], latency: dict[str, LatencyHistogram]):
+        self.name = name
+        self._factory = transport_factory
+        self._latency = latency
+        self._transport: Transport | None = None
+        self._pending: "asyncio.Queue[tuple[str, float, asyncio.Future]] | None" = None
+        self._reader_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+        self._connect_lock = asyncio.Lock()
+        self.reconnects = 0
+
+    async def _ensure_connected(self):
+        async with self._connect_lock:
+            if self._transport is not None:
+                return
+            transport = self._factory()
+            await transport.connect()
+            self._transport = transport
+            self._pending = asyncio.Queue()
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(transport, self._pending))
+
+    async def _read_loop(self, transport: Transport, pending: asyncio.Queue):
+        try:
+            while True:
+                line = await transport.readline()
+                command, sent_at, future = await pending.get()
+                elapsed = (time.perf_counter() - sent_at) * 1000.0
+                self._latency.setdefault(command_type(command), LatencyHistogram()).add(elapsed)
+                if not future.done():
+                    future.set_result(line.decode().rstrip("\r\n"))
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            await self._fail_pending(pending, exc)
+            await self.disconnect()
+
+    @staticmethod
+    async def _fail_pending(pending: asyncio.Queue, exc: BaseException):
+        while not pending.empty():
+            _, _, future = pending.get_nowait()
+            if not future.done():
+                future.set_exception(ConnectionError(str(exc)))
+
+    async def disconnect(self):
+        transport, self._transport = self._transport, None
+        task, self._reader_task = self._reader_task, None
+        pending, self._pending = self._pending, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        if pending is not None:
+            await self._fail_pending(pending, ConnectionError(f"{self.name} 连接已重置"))
+        if transport is not None:
+            await transport.close()
+
+    async def _send(self, commands: list[str]) -> list[asyncio.Future]:
+        await self._ensure_connected()
+        loop = asyncio.get_running_loop()
+        futures = []
+        async with self._write_lock:
+            now = time.perf_counter()
+            for command in commands:
+                future = loop.create_future()
+                self._pending.put_nowait((command, now, future))
+                futures.append(future)
+            # 一次写出整批命令（流水线），不等待中间应答
+            await self._transport.write("".join(c + "\n" for c in commands).encode())
+        return futures
+
+    async def query_many(self, commands: list[str], timeout: float = 1.0, retries: int = 1) -> list[str]:
+        for attempt in range(retries + 1):
+            try:
+                futures = await self._send(commands)
+                return list(await asyncio.wait_for(asyncio.gather(*futures), timeout))
+            except (asyncio.TimeoutError, ConnectionError, OSError) as exc:
+                await self.disconnect()
+                self.reconnects += 1
+                if attempt == retries:
+                    raise TimeoutError(f"{self.name}: {commands[0]} 等命令失败：{exc!r}") from exc
+        raise AssertionError("unreachable")
+
+    async def query(self, command: str, timeout: float = 1.0, retries: int = 1) -> str:
+        return (await self.query_many([command], timeout, retries))[0]
+
+
+class InstrumentIO(QtCore.QObject):
+    """在专用线程中运行 asyncio 事件循环的仪器 I/O 服务。
+
+    设备用 ``register`` 注册传输工厂，连接在首次使用时建立并一直复用。
+    ``request`` 从 GUI 线程发起命令（或命令批），结果通过 ``reply``/``failed``
+    信号回到 GUI 线程；``submit`` 可以直接提交协程并得到 ``concurrent.futures.Future``。
+    ``latency`` 按命令类型保存延迟直方图。
+    """
+
+    reply = QtCore.pyqtSignal(int, str, object)  # request_id, device, 应答（str 或 list[str]）
+    failed = QtCore.pyqtSignal(int, str, str)  # request_id, device, 错误信息
+
+    def __init__(self, timeout: float = 1.0, retries: int = 1, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.retries = retries
+        self.latency: dict[str, LatencyHistogram] = {}
+        self._factories: dict[str, Callable[[], Transport]] = {}
+        self._connections: dict[str, InstrumentConnection] = {}
+        self._ids = itertools.count(1)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="instrument-io", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def register(self, device: str, transport_factory: Callable[[], Transport]):
+        self._factories[device] = transport_factory
+
+    def has_device(self, device: str) -> bool:
+        return device in self._factories
+
+    def connection(self, device: str) -> InstrumentConnection:
+        """返回设备的复用连接（只应在 I/O 线程中使用）。"""
+        conn = self._connections.get(device)
+        if conn is None:
+            conn = InstrumentConnection(device, self._factories[device], self.latency)
+            self._connections[device] = conn
+        return conn
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def request(self, device: str, commands: str | list[str], timeout: float | None = None) -> int:
+        """发送一条命令或一批流水线命令，返回请求编号。"""
+        request_id = next(self._ids)
+        batch = [commands] if isinstance(commands, str) else list(commands)
+        timeout = self.timeout if timeout is None else timeout
+
+        async def run():
+            return await self.connection(device).query_many(batch, timeout, self.retries)
+
+        future = self.submit(run())
+
+        def done(f: concurrent.futures.Future):
+            if f.exception() is not None:
+                self.failed.emit(request_id, device, str(f.exception()))
+            else:
+                result = f.result()
+                self.reply.emit(request_id, device, result[0] if isinstance(commands, str) else result)
+
+        future.add_done_callback(done)
+        return request_id
+
+    def latency_summary(self) -> dict[str, dict[str, float]]:
+        return {name: hist.summary() for name, hist in sorted(self.latency.items())}
+
+    def close(self, timeout: float = 2.0):
+        async def shutdown():
+            for conn in list(self._connections.values()):
+                await conn.disconnect()
+
+        if self._loop.is_running():
+            try:
+                self.submit(shutdown()).result(timeout)
+            except Exception:
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+
+
+__all__ = [
+    "Transport",
+    "TcpTransport",
+    "MockTransport",
+    "MockTransmitter",
+    "LatencyHistogram",
+    "InstrumentConnection",
+    "InstrumentIO",
+    "command_type",
+]
@@ -0,0 +1,211 @@
+# instrumentation.py
+# 运行时性能跟踪：热点路径计时区间、事件循环延迟探针、队列深度计数，可导出 Chrome trace JSON
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from PyQt6 import QtCore
+
+from logic.instrument_io import LatencyHistogram
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: dict | None):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, time.perf_counter(), self.cat, self.args)
+        return False
+
+
+class Tracer:
+    """进程内的性能跟踪器，线程安全。
+
+    ``span`` 记录一个计时区间：每个名称一个对数分桶直方图（p50/p99 等），同时把
+    区间作为 Chrome trace 的完整事件（``ph = "X"``）写入有界事件缓冲；``counter``
+    记录队列深度等计数（``ph = "C"``）；``export_chrome_trace`` 写出可在
+    ``chrome://tracing`` / Perfetto 中打开的 JSON。未启用时 ``span`` 返回共享的空
+    上下文，``instrument`` 包装的方法被移除，只剩一次属性判断的开销。
+    """
+
+    def __init__(self, max_events: int = 200_000):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.counters: dict[str, float] = {}
+        self._events: deque[dict] = deque(maxlen=max_events)
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, cat: str = "ui", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def complete(self, name: str, start: float, end: float, cat: str = "ui", args: dict | None = None):
+        """记录一个已经结束的区间（``start`` / ``end`` 为 ``perf_counter`` 秒）。"""
+        ms = (end - start) * 1000.0
+        tid = threading.get_ident()
+        event = {"name": name, "cat": cat, "ph": "X", "ts": (start - self.origin) * 1e6, "dur": ms * 1000.0, "tid": tid}
+        if args:
+            event["args"] = args
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.add(ms)
+            self._events.append(event)
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+
+    def record(self, name: str, ms: float):
+        """只计入直方图、不产生 trace 事件的测量值（如事件循环延迟）。"""
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.add(ms)
+
+    def counter(self, name: str, value: float):
+        ts = (time.perf_counter() - self.origin) * 1e6
+        with self._lock:
+            self.counters[name] = value
+            self._events.append({"name": name, "ph": "C", "ts": ts, "tid": 0, "args": {"value": value}})
+
+    def traced(self, name: str | None = None, cat: str = "ui") -> Callable:
+        """函数装饰器：启用时把每次调用记为一个区间。"""
+
+        def decorate(fn: Callable) -> Callable:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.complete(label, start, time.perf_counter(), cat)
+
+            return wrapper
+
+        return decorate
+
+    def instrument(self, obj: object, names: list[str], prefix: str = "", cat: str = "ui"):
+        """用计时包装替换 ``obj`` 上的方法（只影响这个实例，通过 ``self.x()`` 的调用都会被计时）。"""
+        for name in names:
+            method = getattr(type(obj), name).__get__(obj)
+            setattr(obj, name, self.traced(f"{prefix}{name}", cat)(method))
+
+    @staticmethod
+    def uninstrument(obj: object, names: list[str]):
+        for name in names:
+            obj.__dict__.pop(name, None)
+
+    def stats(self) -> list[dict]:
+        """各区间的计数与延迟分位数，按 p99 降序。"""
+        with self._lock:
+            rows = [{"name": name, **hist.summary()} for name, hist in self.histograms.items()]
+        return sorted(rows, key=lambda row: -row["p99_ms"])
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self._events.clear()
+            self._threads.clear()
+            self.origin = time.perf_counter()
+
+    def export_chrome_trace(self, path: str) -> int:
+        """写出 Chrome trace JSON，返回写出的事件数。"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        events = [dict(event, pid=pid) for event in events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return len(events)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, cat: str = "ui", **args):
+    """在全局跟踪器上记录一个区间：``with span("power.block", "acquisition"): ...``。"""
+    return TRACER.span(name, cat, **args)
+
+
+class EventLoopLagProbe(QtCore.QObject):
+    """事件循环延迟探针与队列深度采样。
+
+    GUI 线程上的定时器每 ``interval_ms`` 触发一次，实际间隔超出设定的部分计入
+    ``event_loop.lag_ms`` 直方图；同时对 ``add_gauge`` 注册的每个队列深度取样，
+    作为 trace 计数写入跟踪器。只在跟踪启用时运行。
+    """
+
+    def __init__(self, tracer: Tracer, interval_ms: int = 50, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.interval_ms = interval_ms
+        self.gauges: dict[str, Callable[[], float]] = {}
+        self._last = 0.0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def add_gauge(self, name: str, read: Callable[[], float]):
+        self.gauges[name] = read
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.tracer.record("event_loop.lag_ms", max(0.0, (now - self._last) * 1000.0 - self.interval_ms))
+        self._last = now
+        for name, read in self.gauges.items():
+            self.tracer.counter(name, read())
+
+
+__all__ = ["Tracer", "TRACER", "span", "EventLoopLagProbe"]
@@ -0,0 +1,241 @@
+# limits.py
+# 限值判定与报警：按样本块用 NumPy 判定超限，带回差与去抖的报警状态机，报警日志按规则限速
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from logic.throughput import TokenBucket
+
+SEVERITIES = {"warning": logging.WARNING, "error": logging.ERROR}
+
+
+@dataclass(frozen=True)
+class LimitRule:
+    """一个通道上的限值规则。
+
+    样本低于 ``low`` 或高于 ``high`` 即为超限；连续 ``debounce`` 个样本超限才触发
+    报警，报警期间样本回到 [low + hysteresis, high - hysteresis] 内且连续 ``debounce``
+    个样本才解除，限值附近的抖动不会反复触发。
+    """
+
+    name: str
+    channel: str
+    low: float | None = None
+    high: float | None = None
+    hysteresis: float = 0.0
+    debounce: int = 1
+    severity: str = "warning"
+    unit: str = ""
+
+    def violates(self, v: np.ndarray) -> np.ndarray:
+        mask = np.zeros(len(v), dtype=bool)
+        if self.low is not None:
+            mask |= v < self.low
+        if self.high is not None:
+            mask |= v > self.high
+        return mask
+
+    def clears(self, v: np.ndarray) -> np.ndarray:
+        mask = np.ones(len(v), dtype=bool)
+        if self.low is not None:
+            mask &= v >= self.low + self.hysteresis
+        if self.high is not None:
+            mask &= v <= self.high - self.hysteresis
+        return mask
+
+    def format(self, value: float) -> str:
+        return f"{value:.4g} {self.unit}".rstrip()
+
+    def describe(self) -> str:
+        if self.low is not None and self.high is not None:
+            return f"[{self.low:g}, {self.high:g}] {self.unit}".rstrip()
+        if self.low is not None:
+            return f"≥ {self.low:g} {self.unit}".rstrip()
+        return f"≤ {self.high:g} {self.unit}".rstrip()
+
+    @classmethod
+    def from_dict(cls, data: dict, default_name: str = "") -> "LimitRule":
+        channel = data.get("channel")
+        if not channel:
+            raise ValueError(f"限值规则 {default_name}：缺少通道")
+        low, high = data.get("low"), data.get("high")
+        if low is None and high is None:
+            raise ValueError(f"限值规则 {default_name}：至少需要 low 或 high")
+        if low is not None and high is not None and low >= high:
+            raise ValueError(f"限值规则 {default_name}：low 必须小于 high")
+        hysteresis = float(data.get("hysteresis", 0.0))
+        if hysteresis < 0 or (low is not None and high is not None and 2 * hysteresis >= high - low):
+            raise ValueError(f"限值规则 {default_name}：回差必须非负且小于限值区间的一半")
+        debounce = int(data.get("debounce", 1))
+        if debounce < 1:
+            raise ValueError(f"限值规则 {default_name}：去抖样本数至少为 1")
+        severity = data.get("severity", "warning")
+        if severity not in SEVERITIES:
+            raise ValueError(f"限值规则 {default_name}：未知级别 {severity}")
+        return cls(
+            data.get("name", default_name or channel),
+            channel,
+            None if low is None else float(low),
+            None if high is None else float(high),
+            hysteresis,
+            debounce,
+            severity,
+            data.get("unit", ""),
+        )
+
+
+@dataclass
+class AlarmEvent:
+    rule: LimitRule
+    raised: bool  # True = 触发，False = 解除
+    t: float
+    value: float
+
+
+@dataclass
+class RuleState:
+    active: bool = False  # 是否处于报警中
+    run: int = 0  # 跨块延续的连续超限（或连续恢复）样本数
+    samples: int = 0
+    violations: int = 0
+    alarms: int = 0
+
+
+def _runs(mask: np.ndarray, carry: int) -> np.ndarray:
+    """以每个位置结尾的连续 True 个数，开头接上上一块延续的 ``carry``。"""
+    idx = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, idx))
+    runs = idx - last_false
+    runs[last_false < 0] += carry
+    return runs
+
+
+class LimitEngine:
+    """按通道批量判定限值，线程安全（采集线程与 GUI 线程都会调用 ``evaluate``）。
+
+    每块样本先用最小/最大值判断是否全部在限内且不在报警中——这是绝大多数块的
+    情况，只花两次归约；否则构造超限与恢复掩码，用游程长度一次找出去抖后的全部
+    状态切换点，每次切换产生一个 ``AlarmEvent``。``set_rules`` 切换当前步骤的规则集，报警状态
+    清零但累计计数保留，``stats`` 返回所有启用过的规则的样本数、超限样本数与报警次数。
+    """
+
+    def __init__(self):
+        self._channels: dict[str, list[tuple[LimitRule, RuleState]]] = {}
+        self._states: dict[LimitRule, RuleState] = {}
+        self._lock = threading.Lock()
+
+    def set_rules(self, rules: Iterable[LimitRule]):
+        channels: dict[str, list[tuple[LimitRule, RuleState]]] = {}
+        with self._lock:
+            for rule in rules:
+                state = self._states.setdefault(rule, RuleState())
+                # 切换步骤后数据不再连续，报警与去抖计数从头开始
+                state.active = False
+                state.run = 0
+                channels.setdefault(rule.channel, []).append((rule, state))
+            self._channels = channels
+
+    @property
+    def rules(self) -> list[LimitRule]:
+        return [rule for entries in self._channels.values() for rule, _ in entries]
+
+    def evaluate(self, channel: str, t, v) -> list[AlarmEvent]:
+        entries = self._channels.get(channel)
+        if entries is None:
+            return []
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        if not len(v):
+            return []
+        vmin, vmax = float(v.min()), float(v.max())
+        events: list[AlarmEvent] = []
+        with self._lock:
+            for rule, state in entries:
+                state.samples += len(v)
+                inside = (rule.low is None or vmin >= rule.low) and (rule.high is None or vmax <= rule.high)
+                if inside and not state.active:
+                    state.run = 0
+                    continue
+                events.extend(self._step(rule, state, t, v))
+        return events
+
+    @staticmethod
+    def _step(rule: LimitRule, state: RuleState, t: np.ndarray, v: np.ndarray) -> list[AlarmEvent]:
+        violate = rule.violates(v)
+        state.violations += int(np.count_nonzero(violate))
+        # 超限与回到回差内互斥，所以去抖后的状态机等价于一个继电器：连续超限满 debounce 个
+        # 的位置置位，连续恢复满 debounce 个的位置复位，每个样本之后的状态就是最近一次触发
+        # 的类型。跨块延续的计数只属于块开始时的状态。
+        initial, carry = state.active, state.run
+        raise_runs = _runs(violate, 0 if initial else carry)
+        clear_runs = _runs(rule.clears(v), carry if initial else 0)
+        rises = raise_runs >= rule.debounce
+        triggers = np.flatnonzero(rises | (clear_runs >= rule.debounce))
+        if not len(triggers):
+            state.run = int((clear_runs if initial else raise_runs)[-1])
+            return []
+        kinds = rises[triggers]
+        changed = kinds != np.concatenate(([initial], kinds[:-1]))
+        switches = triggers[changed]
+        state.active = bool(kinds[-1])
+        state.run = int((clear_runs if state.active else raise_runs)[-1])
+        if not len(switches):
+            return []
+        raised = kinds[changed]
+        state.alarms += int(np.count_nonzero(raised))
+        return [
+            AlarmEvent(rule, r, ti, vi)
+            for r, ti, vi in zip(raised.tolist(), t[switches].tolist(), v[switches].tolist())
+        ]
+
+    def stats(self) -> list[tuple[LimitRule, RuleState]]:
+        with self._lock:
+            return [(rule, RuleState(**vars(state))) for rule, state in self._states.items()]
+
+
+class AlarmLog:
+    """把报警事件写入 logger，每条规则用令牌桶限速。
+
+    每条规则平均每秒最多 ``rate`` 条、连续最多 ``burst`` 条，超出的事件只计数，
+    在该规则的下一条日志中注明被抑制的条数，报警风暴不会淹没 ``log_view``。
+    """
+
+    def __init__(
+        self, logger: logging.Logger, rate: float = 1.0, burst: float = 3.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.logger = logger
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._buckets: dict[str, TokenBucket] = {}
+        self._suppressed: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def emit(self, events: list[AlarmEvent]):
+        for event in events:
+            rule = event.rule
+            with self._lock:
+                bucket = self._buckets.get(rule.name)
+                if bucket is None:
+                    bucket = self._buckets[rule.name] = TokenBucket(self.rate, self.burst, self._clock)
+                if bucket.acquire() > 0:
+                    self._suppressed[rule.name] = self._suppressed.get(rule.name, 0) + 1
+                    continue
+                suppressed = self._suppressed.pop(rule.name, 0)
+            note = f"（期间另有 {suppressed} 条报警被抑制）" if suppressed else ""
+            if event.raised:
+                self.logger.log(
+                    SEVERITIES[rule.severity],
+                    "超限报警：%s = %s，限值 %s，t = %.3f s%s",
+                    rule.name, rule.format(event.value), rule.describe(), event.t, note,
+                )
+            else:
+                self.logger.info("报警解除：%s = %s，t = %.3f s%s", rule.name, rule.format(event.value), event.t, note)
+
+
+__all__ = ["LimitRule", "AlarmEvent", "RuleState", "LimitEngine", "AlarmLog"]
@@ -0,0 +1,184 @@
+# log_sink.py
+# 装调日志子系统：线程安全的 logging.Handler + 有界环形缓冲 + 按帧合并刷新到 log_view
+
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from collections import deque
+
+from PyQt6 import QtCore, QtWidgets
+
+DEFAULT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+class LogRingBuffer:
+    """有界的日志记录环形缓冲区。
+
+    ``history`` 保存最近 ``capacity`` 条已格式化的记录，``pending`` 保存尚未刷新
+    到界面的记录；两者写满后都丢弃最旧的记录，丢弃数量记录在 ``dropped`` 中。
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._history: deque[tuple[int, str]] = deque(maxlen=capacity)
+        self._pending: deque[tuple[int, str]] = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def append(self, levelno: int, line: str):
+        with self._lock:
+            if len(self._pending) == self.capacity:
+                self.dropped += 1
+            self._history.append((levelno, line))
+            self._pending.append((levelno, line))
+
+    def drain(self) -> list[tuple[int, str]]:
+        """取出并清空所有待刷新的记录。"""
+        with self._lock:
+            if not self._pending:
+                return []
+            records = list(self._pending)
+            self._pending.clear()
+        return records
+
+    @property
+    def pending(self) -> int:
+        """尚未刷新到界面的记录数。"""
+        with self._lock:
+            return len(self._pending)
+
+    def snapshot(self, min_level: int = logging.NOTSET) -> list[str]:
+        with self._lock:
+            return [line for levelno, line in self._history if levelno >= min_level]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._history)
+
+
+class RingBufferHandler(logging.Handler):
+    """可在任意线程调用的 Handler，只做格式化并写入环形缓冲，不触碰 Qt 对象。"""
+
+    def __init__(self, buffer: LogRingBuffer, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.buffer = buffer
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.buffer.append(record.levelno, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class RotatingFileSink:
+    """由后台线程写入的滚动日志文件。
+
+    基于 ``QueueHandler``/``QueueListener``：调用方线程只负责入队，
+    ``RotatingFileHandler`` 的磁盘写入全部在监听线程中完成。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        level: int = logging.NOTSET,
+        fmt: str = DEFAULT_FORMAT,
+    ):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self.file_handler.setFormatter(logging.Formatter(fmt))
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = logging.handlers.QueueHandler(self._queue)
+        self.handler.setLevel(level)
+        self._listener = logging.handlers.QueueListener(self._queue, self.file_handler, respect_handler_level=False)
+
+    def start(self):
+        self._listener.start()
+
+    def stop(self):
+        self._listener.stop()
+        self.file_handler.close()
+
+
+class LogViewSink(QtCore.QObject):
+    """把环形缓冲中的日志按帧合并追加到 ``QPlainTextEdit``。
+
+    每次定时器触发最多调用一次 ``appendPlainText``，``max_blocks`` 通过
+    ``setMaximumBlockCount`` 限制文档行数，``level`` 控制界面显示的最低级别。
+    """
+
+    def __init__(
+        self,
+        log_view: QtWidgets.QPlainTextEdit,
+        logger: logging.Logger,
+        capacity: int = 10000,
+        max_blocks: int = 5000,
+        level: int = logging.INFO,
+        flush_interval_ms: int = 16,
+        file_path: str | None = None,
+        file_max_bytes: int = 10 * 1024 * 1024,
+        file_backup_count: int = 5,
+        fmt: str = DEFAULT_FORMAT,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent or log_view)
+        self.log_view = log_view
+        self.logger = logger
+        self.buffer = LogRingBuffer(capacity)
+        self.handler = RingBufferHandler(self.buffer)
+        self.handler.setFormatter(logging.Formatter(fmt))
+        self.level = level
+        self.set_max_blocks(max_blocks)
+
+        self.file_sink: RotatingFileSink | None = None
+        if file_path:
+            self.file_sink = RotatingFileSink(file_path, file_max_bytes, file_backup_count, fmt=fmt)
+            self.file_sink.start()
+            logger.addHandler(self.file_sink.handler)
+        logger.addHandler(self.handler)
+
+        self.flushed_lines = 0
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def set_level(self, level: int):
+        """设置界面显示的最低日志级别，并按新级别重绘已有记录。"""
+        self.level = level
+        self.flush()
+        self.log_view.setPlainText("\n".join(self.buffer.snapshot(level)))
+        self.log_view.moveCursor(self.log_view.textCursor().MoveOperation.End)
+
+    def set_max_blocks(self, max_blocks: int):
+        self.max_blocks = max_blocks
+        self.log_view.setMaximumBlockCount(max_blocks)
+
+    def flush(self):
+        records = self.buffer.drain()
+        if not records:
+            return
+        lines = [line for levelno, line in records if levelno >= self.level]
+        # 超过最大行数的部分反正会被文档立即裁掉，不必交给 Qt 排版
+        if len(lines) > self.max_blocks > 0:
+            lines = lines[-self.max_blocks:]
+        if lines:
+            self.log_view.appendPlainText("\n".join(lines))
+            self.flushed_lines += len(lines)
+
+    def close(self):
+        self._timer.stop()
+        self.flush()
+        self.logger.removeHandler(self.handler)
+        if self.file_sink is not None:
+            self.logger.removeHandler(self.file_sink.handler)
+            self.file_sink.stop()
+            self.file_sink = None
+
+
+__all__ = ["LogRingBuffer", "RingBufferHandler", "RotatingFileSink", "LogViewSink"]
@@ -0,0 +1,389 @@
+# measurement_table.py
+# 基于列式 NumPy 数组的测量表格模型，以及在后台线程中排序/过滤的代理模型
+
+import concurrent.futures
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+from PyQt6 import QtCore
+
+logger = logging.getLogger("decoration.table")
+
+
+class MeasurementTableModel(QtCore.QAbstractTableModel):
+    """列式存储的测量表格模型。
+
+    ``columns`` 为 (列名, dtype, 格式串) 列表。``append_rows`` 只把数据放入待提交
+    队列，定时器每 ``flush_interval_ms`` 合并成一次 ``beginInsertRows``；单元格
+    文本在 ``data()`` 中按需格式化，并缓存在容量为 ``cache_size`` 的 LRU 中，
+    因此与界面相关的内存只和可见区域有关。``max_rows`` 大于 0 时超出部分从头部
+    成块丢弃。
+    """
+
+    def __init__(
+        self,
+        columns: list[tuple[str, str, str]],
+        initial_capacity: int = 4096,
+        max_rows: int = 0,
+        flush_interval_ms: int = 50,
+        cache_size: int = 4096,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.names = [name for name, _, _ in columns]
+        self.formats = [fmt for _, _, fmt in columns]
+        self._arrays = [np.empty(initial_capacity, dtype=dtype) for _, dtype, _ in columns]
+        self._rows = 0
+        self.max_rows = max_rows
+        #: 已从头部丢弃的行数，用于把行号换算为稳定的绝对序号
+        self.row_offset = 0
+        self._pending: list[list[np.ndarray]] = []
+        self._cache: OrderedDict[tuple[int, int], str] = OrderedDict()
+        self._cache_size = cache_size
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval_ms)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # -- Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.cell_text(index.row(), index.column())
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self.names[section]
+        return str(section + 1)
+
+    # -- data access --------------------------------------------------------
+
+    def cell_text(self, row: int, column: int) -> str:
+        key = (row + self.row_offset, column)
+        text = self._cache.get(key)
+        if text is None:
+            text = format(self._arrays[column][row].item(), self.formats[column])
+            self._cache[key] = text
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return text
+
+    def column(self, column: int) -> np.ndarray:
+        """返回某列已提交数据的只读视图。"""
+        view = self._arrays[column][:self._rows]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def nbytes(self) -> int:
+        """列数组占用的字节数（含预留容量）。"""
+        return sum(a.nbytes for a in self._arrays)
+
+    @property
+    def cached_cells(self) -> int:
+        return len(self._cache)
+
+    def columns_snapshot(self) -> tuple[list[np.ndarray], int]:
+        """返回 (各列视图, row_offset)，供后台线程读取。
+
+        追加只写入视图之外的区域，扩容与丢弃头部都会换成新数组，所以视图在
+        后台任务期间保持不变。
+        """
+        return [self.column(c) for c in range(len(self._arrays))], self.row_offset
+
+    # -- appending ----------------------------------------------------------
+
+    def append_rows(self, *columns):
+        """追加一批行，每个参数是一列的一维数组（或标量）。"""
+        block = [np.atleast_1d(np.asarray(c, dtype=a.dtype)) for c, a in zip(columns, self._arrays)]
+        self._pending.append(block)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """把所有待提交的行一次性插入模型。"""
+        if not self._pending:
+            return
+        blocks = self._pending
+        self._pending = []
+        merged = [np.concatenate([b[c] for b in blocks]) for c in range(len(self._arrays))]
+        n = len(merged[0])
+        if self.max_rows and self._rows + n > self.max_rows:
+            self._drop_head(self._rows + n - self.max_rows)
+        if self.max_rows and n > self.max_rows:
+            # 单批就超过上限时，批内较早的行直接视为已丢弃
+            merged = [m[-self.max_rows:] for m in merged]
+            self.row_offset += n - self.max_rows
+            n = self.max_rows
+        self._reserve(self._rows + n)
+
+        self.beginInsertRows(QtCore.QModelIndex(), self._rows, self._rows + n - 1)
+        for array, values in zip(self._arrays, merged):
+            array[self._rows:self._rows + n] = values
+        self._rows += n
+        self.endInsertRows()
+
+    def _reserve(self, rows: int):
+        capacity = len(self._arrays[0])
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        new_arrays = []
+        for array in self._arrays:
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._rows] = array[:self._rows]
+            new_arrays.append(grown)
+        self._arrays = new_arrays
+
+    def _drop_head(self, count: int):
+        # 至少丢弃 1/8 的行，避免每次追加都整体搬移数组
+        count = min(self._rows, max(count, self.max_rows // 8))
+        if count <= 0:
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), 0, count - 1)
+        self._arrays = [np.concatenate((a[count:self._rows], np.empty(len(a) - self._rows + count, a.dtype)))
+                        for a in self._arrays]
+        self._rows -= count
+        self.row_offset += count
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._pending.clear()
+        self.row_offset += self._rows
+        self._rows = 0
+        self._cache.clear()
+        self.endResetModel()
+
+
+class MeasurementProxyModel(QtCore.QAbstractTableModel):
+    """在后台线程中完成排序与过滤的代理模型。
+
+    排序键和过滤掩码由 NumPy 在线程池中计算（``argsort`` 等会释放 GIL），
+    结果通过排队信号回到 GUI 线程，再以一次模型重置生效。源模型追加的新行
+    在未排序时增量追加（有过滤条件时同样在线程池中判定，同一时间只有一个增量
+    任务，期间提交的行在它完成后合并判定），已排序时会合并为一次后台重排。
+    """
+
+    _job_done = QtCore.pyqtSignal(int, object)
+    _append_done = QtCore.pyqtSignal(int, object)
+
+    _executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def __init__(self, source: MeasurementTableModel, resort_delay_ms: int = 250, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.source = source
+        # 显示行对应的绝对行号，前 _count 个有效，按倍增预留容量
+        self._mapped = np.empty(1024, dtype=np.int64)
+        self._count = 0
+        self._generation = 0
+        self._sort_column: int | None = None
+        self._sort_order = QtCore.Qt.SortOrder.AscendingOrder
+        self._predicate: Callable[[list[np.ndarray]], np.ndarray] | None = None
+        self._resetting = False  # 完整的排序/过滤任务进行中
+        self._appending = False  # 增量过滤任务进行中
+        self._evaluated_end = 0  # 已判定（或正在判定）到的绝对行号
+
+        self._resort_timer = QtCore.QTimer(self)
+        self._resort_timer.setSingleShot(True)
+        self._resort_timer.setInterval(resort_delay_ms)
+        self._resort_timer.timeout.connect(self._schedule)
+
+        self._job_done.connect(self._apply_result)
+        self._append_done.connect(self._apply_append)
+        source.rowsInserted.connect(self._on_source_rows_inserted)
+        source.rowsRemoved.connect(self._on_source_rows_removed)
+        source.modelReset.connect(self._schedule)
+        self._schedule()
+
+    @classmethod
+    def _pool(cls) -> concurrent.futures.ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="table-proxy")
+        return cls._executor
+
+    # -- Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return self.source.columnCount(parent)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            row = int(self._mapped[index.row()]) - self.source.row_offset
+            return self.source.cell_text(row, index.column())
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation == QtCore.Qt.Orientation.Vertical and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return str(int(self._mapped[section]) + 1)
+        return self.source.headerData(section, orientation, role)
+
+    def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder):
+        self._sort_column = column if column >= 0 else None
+        self._sort_order = order
+        self._schedule()
+
+    def set_filter(self, predicate: Callable[[list[np.ndarray]], np.ndarray] | None):
+        """设置过滤条件：接收各列数组，返回布尔掩码的向量化函数。"""
+        self._predicate = predicate
+        self._schedule()
+
+    def source_row(self, row: int) -> int:
+        return int(self._mapped[row]) - self.source.row_offset
+
+    @property
+    def busy(self) -> bool:
+        """是否有后台排序/过滤任务尚未生效。"""
+        return self._resetting or self._appending
+
+    def _set_rows(self, rows: np.ndarray):
+        self._mapped = rows
+        self._count = len(rows)
+
+    def _reserve(self, rows: int):
+        capacity = len(self._mapped)
+        if rows <= capacity:
+            return
+        capacity = max(capacity, 1024)
+        while capacity < rows:
+            capacity *= 2
+        grown = np.empty(capacity, dtype=np.int64)
+        grown[:self._count] = self._mapped[:self._count]
+        self._mapped = grown
+
+    def _result(self, future: concurrent.futures.Future):
+        try:
+            return future.result()
+        except Exception:
+            # 过滤条件由调用方提供，出错时保留当前显示的行
+            logger.exception("表格排序/过滤任务失败")
+            return None
+
+    # -- background jobs ----------------------------------------------------
+
+    def _schedule(self):
+        self._generation += 1
+        generation = self._generation
+        columns, offset = self.source.columns_snapshot()
+        sort_column = self._sort_column
+        descending = self._sort_order == QtCore.Qt.SortOrder.DescendingOrder
+        predicate = self._predicate
+        self._resetting = True
+        # 进行中的增量任务随之作废，由这次任务的结果统一补齐
+        self._appending = False
+
+        def job():
+            rows = np.arange(len(columns[0]), dtype=np.int64)
+            if predicate is not None:
+                rows = rows[predicate(columns)]
+            if sort_column is not None:
+                keys = columns[sort_column][rows]
+                order = np.argsort(keys, kind="stable")
+                if descending:
+                    order = order[::-1]
+                rows = rows[order]
+            return rows + offset, offset + len(columns[0])
+
+        future = self._pool().submit(job)
+        future.add_done_callback(lambda f: self._job_done.emit(generation, f))
+
+    def _apply_result(self, generation: int, future: concurrent.futures.Future):
+        if generation != self._generation:
+            return
+        self._resetting = False
+        result = self._result(future)
+        if result is None:
+            return
+        rows, self._evaluated_end = result
+        # 任务期间被丢弃的头部行需要剔除
+        rows = rows[rows >= self.source.row_offset]
+        self.beginResetModel()
+        self._set_rows(rows)
+        self.endResetModel()
+        # 后台任务期间又有新行提交，按增量路径补上
+        self._catch_up()
+
+    def _on_source_rows_inserted(self, parent: QtCore.QModelIndex, first: int, last: int):
+        if self._sort_column is not None:
+            # 节流而非防抖：持续追加时也保证每个周期至少重排一次
+            if not self._resort_timer.isActive():
+                self._resort_timer.start()
+            return
+        self._catch_up()
+
+    def _catch_up(self):
+        """未排序时把已判定位置之后提交的行追加到末尾；有后台任务时等它完成再补。"""
+        if self.busy or self._sort_column is not None:
+            return
+        offset = self.source.row_offset
+        start = max(self._evaluated_end, offset)
+        stop = offset + self.source.rowCount()
+        if stop <= start:
+            return
+        self._evaluated_end = stop
+        predicate = self._predicate
+        if predicate is None:
+            self._extend(np.arange(start, stop, dtype=np.int64))
+            return
+        columns = [c[start - offset:stop - offset] for c in self.source.columns_snapshot()[0]]
+        generation = self._generation
+        self._appending = True
+
+        def job():
+            return start + np.flatnonzero(predicate(columns))
+
+        future = self._pool().submit(job)
+        future.add_done_callback(lambda f: self._append_done.emit(generation, f))
+
+    def _apply_append(self, generation: int, future: concurrent.futures.Future):
+        if generation != self._generation:
+            return
+        self._appending = False
+        rows = self._result(future)
+        if rows is not None:
+            self._extend(rows[rows >= self.source.row_offset])
+        self._catch_up()
+
+    def _extend(self, rows: np.ndarray):
+        if not len(rows):
+            return
+        self._reserve(self._count + len(rows))
+        self.beginInsertRows(QtCore.QModelIndex(), self._count, self._count + len(rows) - 1)
+        self._mapped[self._count:self._count + len(rows)] = rows
+        self._count += len(rows)
+        self.endInsertRows()
+
+    def _on_source_rows_removed(self, parent: QtCore.QModelIndex, first: int, last: int):
+        # 源模型只会从头部丢弃；row_offset 已更新
+        rows = self._mapped[:self._count]
+        keep = rows >= self.source.row_offset
+        if keep.all():
+            return
+        self.beginResetModel()
+        self._set_rows(rows[keep])
+        self.endResetModel()
+
+
+__all__ = ["MeasurementTableModel", "MeasurementProxyModel"]
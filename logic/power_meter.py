@@ -0,0 +1,280 @@
+# power_meter.py
+# 功率计采集引擎：可插拔驱动 + QThread 采集 + 限帧率的抽取快照
+
+import abc
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from PyQt6 import QtCore
+
+from logic.channel_archive import ChannelArchive
+from logic.instrumentation import span
+from logic.ring_buffer import SampleRingBuffer, decimate_minmax
+
+
+# stop() 超时后仍在运行的采集线程：运行中的 QThread 被回收会使进程崩溃，保留到线程真正退出
+_LINGERING: set[tuple[QtCore.QThread, QtCore.QObject]] = set()
+
+
+class PowerMeterDriver(abc.ABC):
+    """功率计驱动接口，``read_block`` 会在采集线程中被循环调用。"""
+
+    sample_rate: float = 1000.0
+    #: 驱动侧（硬件 FIFO 溢出等）丢失的样本数
+    dropped: int = 0
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abc.abstractmethod
+    def read_block(self) -> tuple[np.ndarray, np.ndarray]:
+        """阻塞读取一块样本，返回 (时间戳秒, 功率 mW)。"""
+
+
+class SimulatedPowerMeter(PowerMeterDriver):
+    """按墙钟时间生成样本的模拟功率计。
+
+    每次读取返回自上次读取以来“硬件”产生的样本；超过 ``fifo_size`` 的部分
+    视为 FIFO 溢出丢弃，计入 ``dropped``。``seed`` 固定时噪声序列可复现。
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 2000.0,
+        block_interval: float = 0.005,
+        fifo_size: int = 65536,
+        base_power: float = 1.0,
+        noise: float = 0.01,
+        seed: int | None = 0,
+    ):
+        self.sample_rate = sample_rate
+        self.block_interval = block_interval
+        self.fifo_size = fifo_size
+        self.base_power = base_power
+        self.noise = noise
+        self.dropped = 0
+        self._rng = np.random.default_rng(seed)
+        self._t0: float | None = None
+        self._emitted = 0
+
+    def open(self):
+        if self._t0 is None:
+            self._t0 = time.perf_counter()
+            self._emitted = 0
+            self.dropped = 0
+        else:
+            # 重新打开时时间轴接着走，关闭期间的样本不产生也不计入丢失
+            self._emitted = int((time.perf_counter() - self._t0) * self.sample_rate)
+
+    def set_power(self, base_power: float):
+        self.base_power = base_power
+
+    def read_block(self) -> tuple[np.ndarray, np.ndarray]:
+        time.sleep(self.block_interval)
+        due = int((time.perf_counter() - self._t0) * self.sample_rate)
+        n = due - self._emitted
+        if n > self.fifo_size:
+            self.dropped += n - self.fifo_size
+            self._emitted += n - self.fifo_size
+            n = self.fifo_size
+        idx = np.arange(self._emitted, self._emitted + n)
+        self._emitted += n
+        t = idx / self.sample_rate
+        drift = 0.02 * np.sin(2 * np.pi * 0.1 * t)
+        v = self.base_power * (1.0 + drift) + self._rng.normal(0.0, self.noise, n)
+        return t, v
+
+
+@dataclass
+class PowerSnapshot:
+    """推送给界面的抽取快照。"""
+
+    t: np.ndarray
+    v: np.ndarray
+    latest: float
+    total_samples: int
+    throughput: float
+    dropped: int
+
+
+class _AcquisitionWorker(QtCore.QObject):
+    snapshot_ready = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, engine: "PowerAcquisitionEngine"):
+        super().__init__()
+        self._engine = engine
+        self._running = False
+
+    def run(self):
+        engine = self._engine
+        driver = engine.driver
+        self._running = True
+        try:
+            driver.open()
+            last_emit = 0.0
+            window_start = time.perf_counter()
+            window_count = 0
+            while self._running:
+                t, v = driver.read_block()
+                if len(v):
+                    with span("power.block", "acquisition"):
+                        engine.overflow += engine.buffer.write(t, v)
+                        if engine.archive is not None:
+                            engine.archive.append(t, v)
+                        for listener in engine.block_listeners:
+                            listener(t, v)
+                    window_count += len(v)
+                now = time.perf_counter()
+                if now - window_start >= 0.5:
+                    engine.throughput = window_count / (now - window_start)
+                    window_start = now
+                    window_count = 0
+                if now - last_emit >= engine.frame_interval and len(engine.buffer):
+                    last_emit = now
+                    with span("power.snapshot", "acquisition"):
+                        snapshot = engine.snapshot()
+                    self.snapshot_ready.emit(snapshot)
+        except Exception as exc:  # 驱动异常不能让线程静默退出
+            self.error.emit(str(exc))
+        finally:
+            driver.close()
+            self.finished.emit()
+
+    def stop(self):
+        self._running = False
+
+
+class PowerAcquisitionEngine(QtCore.QObject):
+    """在独立 QThread 中连续读取功率计，并以不超过 ``max_fps`` 的频率推送快照。
+
+    样本写入预分配的 ``SampleRingBuffer``；``snapshot_ready`` 通过排队连接在
+    GUI 线程中触发，快照覆盖最近 ``snapshot_seconds`` 秒并抽取到
+    ``snapshot_points`` 个分箱。传入 ``archive`` 时全部样本同时追加到该 ``ChannelArchive``，
+    ``archive_offset`` 为本次采集第一个样本在归档中的序号。``add_block_listener`` 注册的回调
+    在采集线程中对每块样本调用（如在线统计），必须足够快且线程安全。
+    """
+
+    snapshot_ready = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(
+        self,
+        driver: PowerMeterDriver,
+        capacity: int = 1 << 20,
+        max_fps: float = 30.0,
+        snapshot_seconds: float = 10.0,
+        snapshot_points: int = 500,
+        archive: ChannelArchive | None = None,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.driver = driver
+        self.buffer = SampleRingBuffer(capacity)
+        self.archive = archive
+        self.archive_offset = len(archive) if archive is not None else 0
+        self.block_listeners: list[Callable[[np.ndarray, np.ndarray], None]] = []
+        self.frame_interval = 1.0 / max_fps
+        self.snapshot_seconds = snapshot_seconds
+        self.snapshot_points = snapshot_points
+        self.throughput = 0.0
+        self.overflow = 0
+        self._thread: QtCore.QThread | None = None
+        self._worker: _AcquisitionWorker | None = None
+
+    @property
+    def dropped_samples(self) -> int:
+        return self.driver.dropped + self.overflow
+
+    @property
+    def total_samples(self) -> int:
+        return self.buffer.total_written
+
+    def add_block_listener(self, listener: Callable[[np.ndarray, np.ndarray], None]):
+        self.block_listeners.append(listener)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.isRunning()
+
+    def set_max_fps(self, max_fps: float):
+        self.frame_interval = 1.0 / max_fps
+
+    def start(self):
+        if self.is_running():
+            return
+        self._thread = QtCore.QThread()
+        self._worker = _AcquisitionWorker(self)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._thread.quit)
+        self._worker.snapshot_ready.connect(
+            self.snapshot_ready, QtCore.Qt.ConnectionType.QueuedConnection
+        )
+        self._worker.error.connect(self.error, QtCore.Qt.ConnectionType.QueuedConnection)
+        self._thread.finished.connect(self._on_thread_finished)
+        self._thread.start()
+
+    def stop(self, timeout_ms: int = 2000) -> bool:
+        """请求采集线程退出并等待至多 ``timeout_ms``；返回线程是否已退出。
+
+        超时（驱动仍阻塞在 ``read_block``）时保留线程引用：``is_running`` 仍为 True，
+        ``start`` 不会再启动第二个采集线程，线程退出后才释放。
+        """
+        if self._thread is None:
+            return True
+        self._worker.stop()
+        self._thread.quit()
+        if not self._thread.wait(timeout_ms):
+            entry = (self._thread, self._worker)
+            _LINGERING.add(entry)
+            self._thread.finished.connect(lambda: _LINGERING.discard(entry), QtCore.Qt.ConnectionType.QueuedConnection)
+            return False
+        self._thread = None
+        self._worker = None
+        return True
+
+    def when_stopped(self, callback: Callable[[], None]):
+        """采集线程已退出时立即调用 ``callback``，否则在线程退出后于 GUI 线程中调用一次。"""
+        thread = self._thread
+        if thread is None or thread.isFinished():
+            callback()
+            return
+        pending = [callback]
+
+        def run():
+            try:
+                fn = pending.pop()
+            except IndexError:
+                return
+            fn()
+
+        thread.finished.connect(run, QtCore.Qt.ConnectionType.QueuedConnection)
+        if thread.isFinished():
+            run()
+
+    def _on_thread_finished(self):
+        if self._thread is not None and self._thread.isFinished():
+            self._thread = None
+            self._worker = None
+
+    def snapshot(self) -> PowerSnapshot:
+        n = int(self.snapshot_seconds * self.driver.sample_rate)
+        t, v = self.buffer.latest(n)
+        dt, dv = decimate_minmax(t, v, self.snapshot_points)
+        return PowerSnapshot(
+            t=dt,
+            v=dv,
+            latest=float(v[-1]) if len(v) else float("nan"),
+            total_samples=self.buffer.total_written,
+            throughput=self.throughput,
+            dropped=self.dropped_samples,
+        )
+
+
+__all__ = ["PowerMeterDriver", "SimulatedPowerMeter", "PowerSnapshot", "PowerAcquisitionEngine"]
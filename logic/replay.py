@@ -0,0 +1,687 @@
+# replay.py
+# 回放/仿真模式：按虚拟时钟把录制或合成的功率、相机、发射机与日志数据流送入装调主页面
+
+import itertools
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from PyQt6 import QtCore
+
+from logic.camera import SimulatedCamera
+from logic.channel_archive import ArchiveReader
+from logic.instrument_io import InstrumentIO, MockTransmitter, MockTransport
+from logic.power_meter import PowerMeterDriver
+from logic.session_store import SessionReader, SessionStore
+from logic.workflow import CAMERA_ENGINE, POWER_ENGINE, WorkflowStep
+
+MAX_SPEED = 0.0
+# 实时/倍速回放时一次读取最多覆盖的虚拟时长，界面卡顿后追赶时不会一次交出过大的块
+MAX_BLOCK_SECONDS = 0.5
+# 从录制会话载入的相机轨迹帧数与日志行数上限
+MAX_TRACK_FRAMES = 1 << 20
+MAX_LOG_LINES = 100_000
+NOISE_BANK = 1 << 16
+LOG_MESSAGES = (
+    "功率计读数刷新",
+    "相机曝光已调整",
+    "发射机状态查询完成",
+    "光斑质心更新",
+    "温度传感器读数正常",
+)
+
+
+def parse_speed(text: str) -> float:
+    """``"max"`` 为尽快回放（``MAX_SPEED``），其余为正的倍速（``"1"`` 为实时）。"""
+    if text.strip().lower() == "max":
+        return MAX_SPEED
+    speed = float(text.rstrip("xX×"))
+    if not speed > 0:
+        raise ValueError(f"回放速度必须为正数或 max：{text}")
+    return speed
+
+
+def _step_function(events: list[tuple[float, float]], default: float):
+    """把 (t, 值) 事件表变成向量化的阶梯函数：t 时刻的值为 t 之前最后一个事件的值。"""
+    ordered = sorted(events)
+    times = np.array([t for t, _ in ordered], dtype=np.float64)
+    levels = np.array([default] + [value for _, value in ordered], dtype=np.float64)
+
+    def at(t):
+        return levels[np.searchsorted(times, t, side="right")]
+
+    return at
+
+
+@dataclass
+class LoadProfile:
+    """确定性的负载剖面：回放时长、各数据流的速率与按虚拟时间排定的事件。
+
+    同一剖面每次回放送入页面的数据（逐样本、逐帧、逐行日志）与步骤切换时刻都相同，
+    不同版本之间的吞吐与延迟因此可以直接比较。时间均为回放开始后的虚拟秒；``steps`` 为空时
+    按流程的叶子步骤依次均分 ``duration``。
+    """
+
+    name: str = "nominal"
+    duration: float = 120.0
+    seed: int = 0
+    prototype_type: str = "样机A"
+    power_rate: float = 2000.0
+    power_block: float = 0.005
+    power_base: float = 1.0
+    power_noise: float = 0.01
+    power_events: list[tuple[float, float]] = field(default_factory=list)  # (t, 基准功率 mW)
+    camera_fps: float = 30.0
+    camera_shape: tuple[int, int] = (480, 640)
+    spot_drift: float = 0.5  # 光斑圆周漂移半径 (px)
+    spot_events: list[tuple[float, float, float]] = field(default_factory=list)  # (t, dx, dy) 光斑整体偏移
+    tx_power: float = 1.0
+    tx_events: list[tuple[float, float]] = field(default_factory=list)  # (t, 回读功率 mW)
+    tx_latency: float = 0.002
+    log_rate: float = 2.0  # 每虚拟秒的日志行数
+    warning_ratio: float = 0.05
+    steps: list[tuple[float, str]] = field(default_factory=list)  # (t, 步骤路径)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LoadProfile":
+        unknown = set(data) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"未知的负载剖面字段：{', '.join(sorted(unknown))}")
+        data = dict(data)
+        for key in ("power_events", "spot_events", "tx_events", "steps"):
+            if key in data:
+                data[key] = [tuple(item) for item in data[key]]
+        if "camera_shape" in data:
+            data["camera_shape"] = tuple(data["camera_shape"])
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: str) -> "LoadProfile":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        return cls.from_dict(data)
+
+    def schedule(self, leaves: list[str]) -> list[tuple[float, str]]:
+        if self.steps:
+            return sorted(self.steps)
+        dwell = self.duration / max(1, len(leaves))
+        return [(i * dwell, path) for i, path in enumerate(leaves)]
+
+
+def _periodic(duration: float, period: float, length: float, level: float, normal: float) -> list[tuple[float, float]]:
+    """每 ``period`` 秒出现一次、持续 ``length`` 秒的偏离。"""
+    events = []
+    for start in np.arange(period / 2, duration, period):
+        events += [(float(start), level), (float(start + length), normal)]
+    return events
+
+
+def _heavy() -> LoadProfile:
+    duration = 120.0
+    return LoadProfile(
+        name="heavy",
+        duration=duration,
+        power_rate=20000.0,
+        power_block=0.002,
+        power_noise=0.02,
+        # 周期性掉功率与同轴度突跳，触发限值报警
+        power_events=_periodic(duration, 15.0, 1.5, 0.85, 1.0),
+        camera_fps=60.0,
+        spot_drift=1.5,
+        spot_events=[(t, d, d) for t, d in _periodic(duration, 12.0, 1.0, 3.0, 0.0)],
+        tx_events=_periodic(duration, 10.0, 0.8, 0.7, 1.0),
+        log_rate=50.0,
+        warning_ratio=0.2,
+    )
+
+
+REPLAY_PRESETS = {"nominal": LoadProfile, "heavy": _heavy}
+
+
+# -- clock -----------------------------------------------------------------
+
+
+class ReplayClock:
+    """回放的虚拟时钟（秒）。
+
+    ``speed`` 为正数时虚拟时间按墙钟的 ``speed`` 倍前进。为 ``MAX_SPEED`` 时尽快回放：
+    数据源在 ``open`` 时 ``register``，每交出一段数据前调用 ``wait_until``；虚拟时间取所有
+    活动数据源进度的最小值，领先超过 ``quantum`` 的数据源等待落后者，各数据流在虚拟时间上的
+    交错因此与机器快慢无关。``hold`` 设置的屏障之后的数据一律等待，界面线程在屏障处切换步骤
+    后再放开，每个步骤收到的数据因此完全确定；引擎即将停止的数据源先 ``release``，其等待
+    立即返回 False，停止引擎时不会互相等待。没有活动数据源时由 ``advance_idle`` 直接跳到
+    下一个计划事件。
+    """
+
+    def __init__(self, speed: float = 1.0, quantum: float = 0.05):
+        self.speed = speed
+        self.quantum = quantum
+        self._cond = threading.Condition()
+        self._origin: float | None = None
+        self._now = 0.0
+        self.sources: dict[int, float] = {}
+        self._released: set[int] = set()
+        self._barrier = 0.0 if speed <= 0 else math.inf
+        self._epoch = 0.0
+        self._ids = itertools.count(1)
+        self._stopped = False
+
+    @property
+    def unbounded(self) -> bool:
+        return self.speed <= 0
+
+    @property
+    def active_sources(self) -> int:
+        with self._cond:
+            return len(self.sources)
+
+    def start(self):
+        self._origin = time.perf_counter()
+
+    def stop(self):
+        """结束回放，放行所有正在等待的数据源。"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def now(self) -> float:
+        if not self.unbounded:
+            return 0.0 if self._origin is None else (time.perf_counter() - self._origin) * self.speed
+        with self._cond:
+            return self._now
+
+    def join_time(self) -> float:
+        """新打开的数据源从这一虚拟时刻开始出数：尽快回放时为最近一次放开屏障的时刻，与线程启动快慢无关。"""
+        return self._epoch if self.unbounded else self.now()
+
+    def register(self) -> int:
+        with self._cond:
+            source = next(self._ids)
+            self.sources[source] = self._epoch if self.unbounded else self._now
+            self._advance()
+            return source
+
+    def unregister(self, source: int):
+        with self._cond:
+            self.sources.pop(source, None)
+            self._released.discard(source)
+            self._advance()
+
+    def hold(self, t: float):
+        """尽快回放时只放行虚拟时间早于 ``t`` 的数据。"""
+        with self._cond:
+            self._epoch = self._now
+            self._barrier = t
+            self._cond.notify_all()
+
+    def release(self, source: int | None):
+        with self._cond:
+            if source in self.sources:
+                self._released.add(source)
+                self._cond.notify_all()
+
+    def wait_until(self, source: int, t: float) -> bool:
+        """阻塞到可以交出虚拟时间为 ``t`` 的数据。
+
+        实时/倍速回放时等到虚拟时间到达 ``t``；尽快回放时等到 ``t`` 早于屏障且其他数据源
+        都已跟上。返回 False 表示该数据源已被 ``release``，本次不应交出数据。
+        """
+        if not self.unbounded:
+            while not self._stopped:
+                delay = (t - self.now()) / self.speed
+                if delay <= 0:
+                    break
+                time.sleep(min(delay, 0.05))
+            return True
+        with self._cond:
+            self.sources[source] = t
+            self._advance()
+            while not self._stopped:
+                if source in self._released:
+                    return False
+                if t < self._barrier and t <= min(self.sources.values()) + self.quantum:
+                    return True
+                self._cond.wait(0.1)
+            return True
+
+    def advance_idle(self, t: float):
+        """尽快回放且没有活动数据源时把虚拟时间推进到 ``t``。"""
+        if not self.unbounded:
+            return
+        with self._cond:
+            if not self.sources:
+                self._now = max(self._now, t)
+
+    def _advance(self):
+        if self.sources:
+            self._now = max(self._now, min(min(self.sources.values()), self._barrier))
+        self._cond.notify_all()
+
+
+# -- sources ---------------------------------------------------------------
+
+
+class _SyntheticPower:
+    def __init__(self, profile: LoadProfile):
+        self.rate = profile.power_rate
+        self._base = _step_function(profile.power_events, profile.power_base)
+        self._noise = np.random.default_rng(profile.seed).normal(0.0, profile.power_noise, NOISE_BANK)
+
+    def samples(self, start: float, end: float) -> tuple[np.ndarray, np.ndarray]:
+        # 样本由序号唯一确定，与读取时的分块方式无关
+        idx = np.arange(math.ceil(start * self.rate), math.ceil(end * self.rate))
+        t = idx / self.rate
+        drift = 0.02 * np.sin(2 * np.pi * 0.1 * t)
+        return t, self._base(t) * (1.0 + drift) + self._noise[idx % NOISE_BANK]
+
+
+class _RecordedPower:
+    """按样本序号循环读取录制的功率归档：录制中采集停止的间隔被跳过，波形连续回放。
+
+    内存中只保留当前一块。
+    """
+
+    def __init__(self, path: str):
+        self.reader = ArchiveReader(path)
+        self.chunk_size = self.reader.chunk_size
+        tail = self.reader.chunk_records(self.reader.sealed_chunks)
+        self.total = self.reader.sealed_chunks * self.chunk_size + len(tail)
+        if not self.total:
+            raise ValueError(f"功率归档为空：{path}")
+        first = self.reader.chunk_records(0)
+        self.rate = float((len(first) - 1) / (first["t"][-1] - first["t"][0])) if len(first) > 1 else 1000.0
+        self._chunk = -1
+        self._values = np.empty(0)
+
+    def _load(self, chunk: int) -> np.ndarray:
+        if chunk != self._chunk:
+            self._chunk = chunk
+            self._values = self.reader.chunk_records(chunk)["v"].astype(np.float64)
+        return self._values
+
+    def samples(self, start: float, end: float) -> tuple[np.ndarray, np.ndarray]:
+        idx = np.arange(math.ceil(start * self.rate), math.ceil(end * self.rate))
+        v = np.empty(len(idx))
+        pos = idx % self.total
+        # 一次读取最多跨过一块边界（或循环的首尾），按块分段取值
+        chunks = pos // self.chunk_size
+        for chunk in np.unique(chunks):
+            sel = chunks == chunk
+            v[sel] = self._load(int(chunk))[pos[sel] - chunk * self.chunk_size]
+        return idx / self.rate, v
+
+
+class ReplayPowerMeter(PowerMeterDriver):
+    """按回放时钟交出样本的功率计驱动：合成数据或录制的功率归档（``archive_path``）。
+
+    尽快回放时每次读取固定的 ``power_block`` 虚拟秒；实时/倍速回放时交出到当前虚拟时间为止的
+    全部样本。关闭期间的时间被跳过，与 ``SimulatedPowerMeter`` 相同。``source`` 为打开期间
+    在时钟上登记的编号。
+    """
+
+    def __init__(self, clock: ReplayClock, profile: LoadProfile, archive_path: str | None = None):
+        self.clock = clock
+        self.block = profile.power_block
+        self.stream = _RecordedPower(archive_path) if archive_path else _SyntheticPower(profile)
+        self.sample_rate = self.stream.rate
+        self.dropped = 0
+        self.delivered = 0
+        self.source: int | None = None
+        self._t = 0.0
+
+    def open(self):
+        self._t = max(self._t, self.clock.join_time())
+        self.source = self.clock.register()
+
+    def close(self):
+        if self.source is not None:
+            self.clock.unregister(self.source)
+            self.source = None
+
+    def read_block(self) -> tuple[np.ndarray, np.ndarray]:
+        start = self._t
+        end = start + self.block
+        if self.clock.unbounded:
+            # 尽快回放时一块数据以起点计时，跨过屏障的那一块每次都相同
+            if not self.clock.wait_until(self.source, start):
+                time.sleep(0.001)
+                return np.empty(0), np.empty(0)
+        else:
+            self.clock.wait_until(self.source, end)
+            end = max(end, min(self.clock.now(), start + MAX_BLOCK_SECONDS))
+        self._t = end
+        t, v = self.stream.samples(start, end)
+        self.delivered += len(t)
+        return t, v
+
+
+class ReplayCamera(SimulatedCamera):
+    """按回放时钟出帧的相机：第 k 帧的虚拟时间为 k / fps。
+
+    ``track`` 为录制的 (质心 x, 质心 y, 光斑 σ) 序列时按帧号循环重现，否则由剖面合成
+    （圆周漂移 + 按帧号确定的抖动 + ``spot_events`` 偏移）。实时回放跟不上帧率时跳到当前帧，
+    与真实相机一样丢帧。
+    """
+
+    def __init__(self, clock: ReplayClock, profile: LoadProfile, track: np.ndarray | None = None):
+        super().__init__(shape=profile.camera_shape, fps=profile.camera_fps, seed=profile.seed)
+        self.clock = clock
+        self.track = track
+        self.drift = profile.spot_drift
+        self._offset_x = _step_function([(t, dx) for t, dx, _ in profile.spot_events], 0.0)
+        self._offset_y = _step_function([(t, dy) for t, _, dy in profile.spot_events], 0.0)
+        self._jitter = np.random.default_rng(profile.seed + 1).normal(0.0, 0.3, (NOISE_BANK, 2))
+        self.delivered = 0
+        self.source: int | None = None
+        self._frame = 0
+
+    def open(self):
+        self._frame = max(self._frame, math.ceil(self.clock.join_time() * self.fps))
+        self.source = self.clock.register()
+
+    def close(self):
+        if self.source is not None:
+            self.clock.unregister(self.source)
+            self.source = None
+
+    def spot_at(self, count: int) -> tuple[float, float] | None:
+        if self.track is not None:
+            row = self.track[count % len(self.track)]
+            return float(row[0]), float(row[1])
+        t = count / self.fps
+        phase = 2 * np.pi * t / 10.0
+        jitter = self._jitter[count % NOISE_BANK]
+        return (
+            self.spot[0] + self.drift * np.cos(phase) + jitter[0] + float(self._offset_x(t)),
+            self.spot[1] + self.drift * np.sin(phase) + jitter[1] + float(self._offset_y(t)),
+        )
+
+    def grab_into(self, out: np.ndarray) -> float:
+        count = self._frame
+        if not self.clock.wait_until(self.source, count / self.fps):
+            # 采集即将停止：不产生新帧，缓冲中留着旧帧，界面不会再显示它
+            time.sleep(0.001)
+            return time.perf_counter()
+        if not self.clock.unbounded:
+            count = max(count, math.floor(self.clock.now() * self.fps))
+        self._frame = count + 1
+        self.delivered += 1
+        stamp = time.perf_counter()
+        sigma = float(self.track[count % len(self.track)][2]) if self.track is not None else None
+        self.render_into(out, self.spot_at(count), count, sigma)
+        return stamp
+
+
+class ReplayTransmitter(MockTransmitter):
+    """回读功率按剖面的 ``tx_events`` 随虚拟时间变化的模拟发射机，输出默认打开。"""
+
+    def __init__(self, clock: ReplayClock, profile: LoadProfile):
+        super().__init__(profile.tx_power)
+        self.clock = clock
+        self.output = True
+        self._power = _step_function(profile.tx_events, profile.tx_power)
+
+    def __call__(self, command: str) -> str | None:
+        if command.strip().upper() == "POW?":
+            return f"{float(self._power(self.clock.now())) if self.output else 0.0:.4f}"
+        if command.strip().upper().startswith("POW "):
+            # 手动设定功率时不再跟随剖面
+            self._power = _step_function([], float(command.split()[1]))
+        return super().__call__(command)
+
+
+class _LogFeed:
+    """按虚拟时间排定的日志行：合成（``log_rate`` 行/秒）或录制会话中的日志（循环）。"""
+
+    def __init__(self, profile: LoadProfile, recorded: list[tuple[float, int, str]] | None = None):
+        self.recorded = recorded
+        self.rate = profile.log_rate
+        self.warning_ratio = profile.warning_ratio
+        self.span = (recorded[-1][0] + 1.0) if recorded else 0.0
+        self.emitted = 0
+
+    def due(self, now: float) -> list[tuple[int, str]]:
+        """返回到虚拟时间 ``now`` 为止尚未发出的 (级别, 消息)。"""
+        lines = []
+        if self.recorded:
+            while True:
+                loop, i = divmod(self.emitted, len(self.recorded))
+                t, level, message = self.recorded[i]
+                if loop * self.span + t > now:
+                    break
+                lines.append((level, message))
+                self.emitted += 1
+        elif self.rate > 0:
+            end = math.floor(now * self.rate) + 1
+            for i in range(self.emitted, end):
+                # 黄金分割序列：警告在时间上均匀分布且与回放速度无关
+                level = logging.WARNING if (i * 0.6180339887) % 1.0 < self.warning_ratio else logging.INFO
+                lines.append((level, f"{LOG_MESSAGES[i % len(LOG_MESSAGES)]}（#{i}）"))
+            self.emitted = max(self.emitted, end)
+        return lines
+
+
+# -- controller ------------------------------------------------------------
+
+
+class ReplayController(QtCore.QObject):
+    """把回放数据源接入一个 ``DecorationPage`` 并按剖面驱动它。
+
+    ``create_page`` 用回放的功率计、相机与发射机（``MockTransport`` 上的 ``InstrumentIO``）
+    创建页面，会话写入临时目录，性能跟踪打开；``start`` 后按虚拟时间切换步骤、写入日志，
+    到达 ``profile.duration`` 时发出 ``finished``，附带 ``report()`` 的吞吐与延迟指标。
+    ``source`` 为录制的会话文件时，功率取自其旁边的归档，相机重现同轴度步骤记录的质心，
+    日志按原时间间隔重放。
+    """
+
+    finished = QtCore.pyqtSignal(dict)
+
+    def __init__(
+        self,
+        profile: LoadProfile,
+        speed: float = 1.0,
+        source: str | None = None,
+        tick_ms: int = 20,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.profile = profile
+        self.recording = source
+        self.clock = ReplayClock(speed)
+        archive_path, track, logs = None, None, None
+        if source is not None:
+            archive_path, track, logs = _load_recording(source)
+        self.power = ReplayPowerMeter(self.clock, profile, archive_path)
+        self.camera = ReplayCamera(self.clock, profile, track)
+        self.transmitter = ReplayTransmitter(self.clock, profile)
+        self.instruments = InstrumentIO()
+        self.instruments.register("transmitter", lambda: MockTransport(self.transmitter, profile.tx_latency))
+        self.logs = _LogFeed(profile, logs)
+        self.page = None
+        self._steps: dict[str, WorkflowStep] = {}
+        self._schedule: list[tuple[float, str]] = []
+        self._next_step = 0
+        self._started = 0.0
+        self._elapsed: float | None = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(tick_ms)
+        self._timer.timeout.connect(self._tick)
+
+    @classmethod
+    def from_source(cls, source: str, speed: float = 1.0, **kwargs) -> "ReplayController":
+        """``source`` 为预设剖面名（``REPLAY_PRESETS``）、剖面 JSON 文件或录制的会话文件。"""
+        if source in REPLAY_PRESETS:
+            return cls(REPLAY_PRESETS[source](), speed, **kwargs)
+        if source.lower().endswith(".json"):
+            return cls(LoadProfile.load(source), speed, **kwargs)
+        if not os.path.exists(source):
+            raise ValueError(f"未知的回放来源：{source}（可用预设：{', '.join(REPLAY_PRESETS)}）")
+        reader = SessionReader(source)
+        try:
+            meta, channels = reader.meta(), reader.channels()
+        finally:
+            reader.close()
+        spans = [info["t1"] - info["t0"] for info in channels.values() if info["rows"]]
+        profile = LoadProfile(
+            name=os.path.splitext(os.path.basename(source))[0],
+            duration=max(spans) if spans else LoadProfile.duration,
+            prototype_type=meta.get("prototype_type") or LoadProfile.prototype_type,
+        )
+        return cls(profile, speed, source=source, **kwargs)
+
+    def create_page(self, session_root: str | None = None, **page_kwargs):
+        from logic.decoration_page_logic import DecorationPage
+
+        root = session_root or tempfile.mkdtemp(prefix="fos-replay-")
+        session = SessionStore(os.path.join(root, f"replay_{self.profile.name}.sqlite"), "回放", self.profile.prototype_type)
+        page_kwargs.setdefault("tracing", True)
+        self.page = DecorationPage(
+            prototype_name=f"回放 · {self.profile.name}",
+            prototype_type=self.profile.prototype_type,
+            power_driver=self.power,
+            camera_source=self.camera,
+            instruments=self.instruments,
+            session=session,
+            **page_kwargs,
+        )
+        self._steps = {step.path: step for step in self.page.workflow.leaves()}
+        self._schedule = self.profile.schedule(list(self._steps))
+        return self.page
+
+    def start(self):
+        self._started = time.perf_counter()
+        self.page.tracer.reset()
+        self.clock.start()
+        self._timer.start()
+        self._tick()
+
+    def stop(self):
+        """停止回放并关闭仪器服务（页面关闭后调用）。"""
+        self._timer.stop()
+        self.clock.stop()
+        self.instruments.close()
+
+    def _upcoming(self) -> float:
+        """下一次步骤切换或回放结束的虚拟时间。"""
+        if self._next_step < len(self._schedule):
+            return min(self._schedule[self._next_step][0], self.profile.duration)
+        return self.profile.duration
+
+    def _release_stopping(self, step: WorkflowStep | None):
+        """切换到 ``step`` 会停止的引擎，其数据源先从屏障处放开，停止时不会卡在等待中。"""
+        required = step.engines if step is not None else frozenset()
+        stopping = self.page.hooks.running - required
+        if POWER_ENGINE in stopping:
+            self.clock.release(self.power.source)
+        if CAMERA_ENGINE in stopping:
+            self.clock.release(self.camera.source)
+
+    def _tick(self):
+        if self.clock.unbounded and not self.clock.active_sources:
+            # 当前步骤不采集：直接跳到下一次步骤切换或回放结束
+            self.clock.advance_idle(self._upcoming())
+        now = self.clock.now()
+        while self._next_step < len(self._schedule) and self._schedule[self._next_step][0] <= now:
+            step = self._steps.get(self._schedule[self._next_step][1])
+            if step is None:
+                raise ValueError(f"负载剖面中的步骤不存在：{self._schedule[self._next_step][1]}")
+            self._release_stopping(step)
+            # 先把时钟的起点定在切换时刻，新启动的采集线程从这里开始出数
+            self.clock.hold(self._schedule[self._next_step][0])
+            self.page.select_step(step.path)
+            self._next_step += 1
+        for level, message in self.logs.due(min(now, self.profile.duration)):
+            self.page.logger.log(level, "[回放] %s", message)
+        if now >= self.profile.duration:
+            self._timer.stop()
+            self._elapsed = time.perf_counter() - self._started
+            # 回放结束时停止采集；尽快回放时屏障停在结束时刻，之后手动切换步骤也不再出数
+            self._release_stopping(None)
+            self.page.hooks.transition(None)
+            self.finished.emit(self.report())
+            return
+        self.clock.hold(self._upcoming())
+
+    def report(self) -> dict:
+        """回放的吞吐与延迟指标：数据量、虚拟/墙钟时长、各计时区间与事件循环延迟的分位数。"""
+        page = self.page
+        wall = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        virtual = min(self.clock.now(), self.profile.duration)
+        engine, camera = page.power_engine, page.camera
+        spans = {row["name"]: {key: value for key, value in row.items() if key != "name"} for row in page.tracer.stats()}
+        return {
+            "profile": self.profile.name,
+            "speed": "max" if self.clock.unbounded else self.clock.speed,
+            "virtual_s": virtual,
+            "wall_s": wall,
+            "effective_speed": virtual / wall if wall else float("nan"),
+            "power": {
+                "samples": self.power.delivered,
+                "consumed": engine.total_samples,
+                "dropped": engine.dropped_samples,
+                "samples_per_wall_s": self.power.delivered / wall if wall else float("nan"),
+            },
+            "camera": {
+                "frames": self.camera.delivered,
+                "captured": camera.captured,
+                "displayed": camera.displayed,
+                "dropped": camera.dropped,
+                "latency_ms": camera.latency_ms,
+            },
+            "logs": self.logs.emitted,
+            "alarms": {rule.name: state.alarms for rule, state in page.limits.stats()},
+            "instruments": self.instruments.latency_summary(),
+            "spans": spans,
+        }
+
+
+def _load_recording(path: str) -> tuple[str | None, np.ndarray | None, list[tuple[float, int, str]] | None]:
+    """从录制的会话中取出功率归档路径、相机质心轨迹与日志。"""
+    archive = os.path.splitext(path)[0] + ".power"
+    if not os.path.exists(os.path.join(archive, "archive.json")):
+        archive = None
+    reader = SessionReader(path)
+    try:
+        parts, frames = [], 0
+        for channel in reader.channels():
+            for block in reader.measurements(channel):
+                # 同轴度步骤的行：时间、质心 x/y、光斑 σx/σy、偏移
+                if block.shape[1] != 6 or frames >= MAX_TRACK_FRAMES:
+                    break
+                parts.append(np.column_stack([block[:, 1], block[:, 2], (block[:, 3] + block[:, 4]) / 2]))
+                frames += len(block)
+        track = np.concatenate(parts)[:MAX_TRACK_FRAMES] if parts else None
+        logs = []
+        for rows in reader.logs():
+            logs += rows[: MAX_LOG_LINES - len(logs)]
+            if len(logs) >= MAX_LOG_LINES:
+                break
+    finally:
+        reader.close()
+    if logs:
+        t0 = logs[0][0]
+        logs = [(ts - t0, level, message) for ts, level, message in logs]
+    return archive, track, logs or None
+
+
+__all__ = [
+    "MAX_SPEED",
+    "REPLAY_PRESETS",
+    "parse_speed",
+    "LoadProfile",
+    "ReplayClock",
+    "ReplayPowerMeter",
+    "ReplayCamera",
+    "ReplayTransmitter",
+    "ReplayController",
+]
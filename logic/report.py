@@ -0,0 +1,822 @@
+# report.py
+# 装调报告：在工作进程中按块读取会话与功率归档，用预抽取的极值摘要画曲线，逐段写出 HTML / PDF，可报告进度与取消
+
+import datetime
+import html
+import logging
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+
+import numpy as np
+from PyQt6 import QtCore
+
+from logic.channel_archive import ArchiveReader
+from logic.session_store import SessionReader
+from logic.streaming_stats import SessionStatistics
+
+REPORT_FORMATS = {"html": "HTML", "pdf": "PDF"}
+# 表格最多的行数：时间越长，每行覆盖的区间越宽，报告大小与会话时长无关
+MAX_TABLE_ROWS = 240
+MAX_LOG_ROWS = 500
+# 每次从归档读取的极值摘要条数（每条对应 summary_block 个样本）
+SUMMARY_BATCH = 1 << 14
+# 会话中每个测量块只有一次提交的几行，攒够这么多行再做一次分箱，避免逐块的 numpy 调用开销
+ROW_BATCH = 1 << 13
+LEVEL_NAMES = {logging.WARNING: "警告", logging.ERROR: "错误", logging.CRITICAL: "严重"}
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+@dataclass
+class ReportSpec:
+    """生成一份报告所需的全部输入，可 pickle 后交给工作进程。
+
+    ``statistics`` 为 ``SessionStatistics.to_dict()``，缺省时使用会话最后一个检查点中的统计；
+    ``coax_channels`` 为 (通道, 标题) 列表；``alarms`` 为各限值规则的计数。
+    """
+
+    session_path: str
+    output_path: str
+    title: str = "装调报告"
+    archive_path: str | None = None
+    power_channel: str = "功率"
+    coax_channels: list[tuple[str, str]] = field(default_factory=list)
+    statistics: dict | None = None
+    limits: dict[str, float] = field(default_factory=dict)
+    alarms: list[dict] = field(default_factory=list)
+    allan_taus: tuple[float, ...] = (0.1, 1.0, 10.0)
+    plot_bins: int = 600
+    chunk_rows: int = 64
+
+    @property
+    def fmt(self) -> str:
+        return os.path.splitext(self.output_path)[1].lstrip(".").lower()
+
+
+class TimeBins:
+    """固定时间范围内的 min/max 分箱，逐块累计，内存只与分箱数有关。"""
+
+    def __init__(self, t0: float, t1: float, n_bins: int):
+        self.t0 = t0
+        self.n_bins = max(1, n_bins)
+        self.width = max(t1 - t0, 1e-9) / self.n_bins
+        self.vmin = np.full(self.n_bins, np.inf)
+        self.vmax = np.full(self.n_bins, -np.inf)
+
+    def update(self, t: np.ndarray, vmin: np.ndarray, vmax: np.ndarray | None = None):
+        if not len(t):
+            return
+        idx = np.clip(((t - self.t0) / self.width).astype(np.int64), 0, self.n_bins - 1)
+        np.minimum.at(self.vmin, idx, vmin)
+        np.maximum.at(self.vmax, idx, vmin if vmax is None else vmax)
+
+    def series(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """非空分箱的 (中心时间, 最小, 最大)。"""
+        filled = np.flatnonzero(self.vmax >= self.vmin)
+        return self.t0 + (filled + 0.5) * self.width, self.vmin[filled], self.vmax[filled]
+
+
+class IntervalTable:
+    """把 (t, v) 流按等长时间区间汇总成表格行：起始、结束、样本数、最小、最大、均值。
+
+    区间宽度取 ``nice_interval``，行数不超过 ``max_rows``。
+    """
+
+    def __init__(self, t0: float, t1: float, max_rows: int = MAX_TABLE_ROWS):
+        self.t0 = t0
+        self.interval = nice_interval(max(t1 - t0, 1e-9) / max_rows)
+        n = int((t1 - t0) // self.interval) + 1
+        self.count = np.zeros(n, dtype=np.int64)
+        self.vsum = np.zeros(n)
+        self.vmin = np.full(n, np.inf)
+        self.vmax = np.full(n, -np.inf)
+
+    def _bins(self, t: np.ndarray) -> np.ndarray:
+        return np.clip(((t - self.t0) // self.interval).astype(np.int64), 0, len(self.count) - 1)
+
+    def update(self, t: np.ndarray, v: np.ndarray):
+        idx = self._bins(t)
+        np.add.at(self.count, idx, 1)
+        np.add.at(self.vsum, idx, v)
+        np.minimum.at(self.vmin, idx, v)
+        np.maximum.at(self.vmax, idx, v)
+
+    def update_summary(self, t: np.ndarray, count: np.ndarray, vmin: np.ndarray, vmax: np.ndarray, vsum: np.ndarray):
+        """按已汇总的记录累计（如归档块索引：起始时间、样本数、最小、最大、和）。"""
+        idx = self._bins(t)
+        np.add.at(self.count, idx, count)
+        np.add.at(self.vsum, idx, vsum)
+        np.minimum.at(self.vmin, idx, vmin)
+        np.maximum.at(self.vmax, idx, vmax)
+
+    def rows(self, fmt: str = ".4f") -> list[list[str]]:
+        out = []
+        for i in np.flatnonzero(self.count):
+            start = self.t0 + i * self.interval
+            out.append([
+                format_seconds(start),
+                format_seconds(start + self.interval),
+                f"{self.count[i]:,}",
+                f"{self.vmin[i]:{fmt}}",
+                f"{self.vmax[i]:{fmt}}",
+                f"{self.vsum[i] / self.count[i]:{fmt}}",
+            ])
+        return out
+
+
+def nice_interval(seconds: float) -> float:
+    """不小于 ``seconds`` 的 1/2/5 × 10^n 秒。"""
+    if seconds <= 0:
+        return 1.0
+    base = 10.0 ** math.floor(math.log10(seconds))
+    for step in (1.0, 2.0, 5.0, 10.0):
+        if base * step >= seconds:
+            return base * step
+    return base * 10.0
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+# -- writers ---------------------------------------------------------------
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: "Microsoft YaHei", "PingFang SC", sans-serif; color: #111827; margin: 32px auto; max-width: 960px; }}
+h1 {{ font-size: 24px; margin-bottom: 4px; }}
+h2 {{ font-size: 18px; margin-top: 32px; border-bottom: 1px solid #e5e7eb; padding-bottom: 4px; }}
+.muted {{ color: #6b7280; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 13px; margin: 8px 0; }}
+th, td {{ border: 1px solid #e5e7eb; padding: 4px 8px; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+th {{ background: #f6f7fb; }}
+.pass {{ color: #16a34a; font-weight: 600; }}
+.fail {{ color: #dc2626; font-weight: 600; }}
+svg {{ display: block; margin: 8px 0; }}
+</style></head><body>
+"""
+
+
+class HtmlReportWriter:
+    """逐段写出的 HTML 报告，曲线为内嵌 SVG。每段写完即刷新到文件。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "w", encoding="utf-8")
+
+    def _write(self, text: str):
+        self._fh.write(text)
+        self._fh.flush()
+
+    def title(self, text: str, subtitle: str = ""):
+        self._write(HTML_HEAD.format(title=html.escape(text)))
+        self._write(f"<h1>{html.escape(text)}</h1>\n<p class='muted'>{html.escape(subtitle)}</p>\n")
+
+    def heading(self, text: str):
+        self._write(f"<h2>{html.escape(text)}</h2>\n")
+
+    def paragraph(self, text: str):
+        self._write(f"<p class='muted'>{html.escape(text)}</p>\n")
+
+    def key_values(self, rows: list[tuple[str, str, bool | None]]):
+        parts = ["<table>\n"]
+        for key, value, passed in rows:
+            verdict = "" if passed is None else ("<span class='pass'>合格</span>" if passed else "<span class='fail'>不合格</span>")
+            parts.append(f"<tr><td>{html.escape(key)}</td><td>{html.escape(value)}</td><td>{verdict}</td></tr>\n")
+        parts.append("</table>\n")
+        self._write("".join(parts))
+
+    def begin_table(self, columns: list[str]):
+        self._write("<table>\n<tr>" + "".join(f"<th>{html.escape(c)}</th>" for c in columns) + "</tr>\n")
+
+    def table_rows(self, rows: list[list[str]]):
+        self._write("".join("<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in row) + "</tr>\n" for row in rows))
+
+    def end_table(self):
+        self._write("</table>\n")
+
+    def plot(self, title: str, t: np.ndarray, vmin: np.ndarray, vmax: np.ndarray, unit: str, limits=()):
+        width, height, left, bottom = 900, 240, 70, 28
+        plot_w, plot_h = width - left - 10, height - bottom - 10
+        lo, hi = _value_range(vmin, vmax, limits)
+        t0, t1 = (float(t[0]), float(t[-1])) if len(t) else (0.0, 1.0)
+        span = max(t1 - t0, 1e-9)
+
+        def x(values):
+            return left + (np.asarray(values) - t0) / span * plot_w
+
+        def y(values):
+            return 10 + (hi - np.asarray(values)) / (hi - lo) * plot_h
+
+        parts = [
+            f"<p>{html.escape(title)}</p>\n<svg width='{width}' height='{height}' xmlns='http://www.w3.org/2000/svg' "
+            f"font-size='11' font-family='sans-serif'>\n",
+            f"<rect x='{left}' y='10' width='{plot_w}' height='{plot_h}' fill='#ffffff' stroke='#e5e7eb'/>\n",
+        ]
+        for value in (lo, (lo + hi) / 2, hi):
+            parts.append(f"<text x='{left - 6}' y='{y(value) + 4:.1f}' text-anchor='end'>{value:.4g} {unit}</text>\n")
+        parts.append(f"<text x='{left}' y='{height - 8}'>{format_seconds(t0)}</text>\n")
+        parts.append(f"<text x='{left + plot_w}' y='{height - 8}' text-anchor='end'>{format_seconds(t1)}</text>\n")
+        for limit in limits:
+            parts.append(
+                f"<line x1='{left}' x2='{left + plot_w}' y1='{y(limit):.1f}' y2='{y(limit):.1f}' "
+                "stroke='#dc2626' stroke-dasharray='4 3'/>\n"
+            )
+        if len(t):
+            # 上沿按时间顺序、下沿逆序，构成极值包络
+            xs = np.concatenate((x(t), x(t[::-1])))
+            ys = np.concatenate((y(vmax), y(vmin[::-1])))
+            points = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(xs.tolist(), ys.tolist()))
+            parts.append(f"<polygon points='{points}' fill='#2563eb' fill-opacity='0.35' stroke='#2563eb' stroke-width='1'/>\n")
+        parts.append("</svg>\n")
+        self._write("".join(parts))
+
+    def close(self):
+        self._write("</body></html>\n")
+        self._fh.close()
+
+    def abort(self):
+        self._fh.close()
+        os.remove(self.path)
+
+
+class PdfReportWriter:
+    """逐页写出的 PDF 报告（``QPdfWriter``）。页面写满即换页，之前的页面不再保留在内存中。
+
+    需要在已有 ``QGuiApplication`` 的进程中使用；工作进程会创建 offscreen 平台的实例。
+    """
+
+    MARGIN = 40.0
+
+    def __init__(self, path: str):
+        from PyQt6 import QtGui
+
+        self.path = path
+        self._gui = QtGui
+        self._writer = QtGui.QPdfWriter(path)
+        self._writer.setPageSize(QtGui.QPageSize(QtGui.QPageSize.PageSizeId.A4))
+        self._writer.setResolution(72)  # 1 个单位 = 1 pt
+        self._writer.setTitle(os.path.basename(path))
+        self._painter = QtGui.QPainter(self._writer)
+        rect = self._writer.pageLayout().paintRectPixels(72)
+        self.width = rect.width() - 2 * self.MARGIN
+        self.bottom = rect.height() - self.MARGIN
+        self.y = self.MARGIN
+        self.pages = 1
+        self._columns: list[str] | None = None
+        self._fonts = {size: self._font(size, bold) for size, bold in ((9, False), (10, True), (13, True), (18, True))}
+
+    def _font(self, size: int, bold: bool):
+        font = self._gui.QFont()
+        font.setPointSizeF(size)
+        font.setBold(bold)
+        return font
+
+    def _new_page(self):
+        self._writer.newPage()
+        self.pages += 1
+        self.y = self.MARGIN
+        if self._columns is not None:
+            self._row(self._columns, header=True)
+
+    def _ensure(self, height: float):
+        if self.y + height > self.bottom:
+            self._new_page()
+
+    def _text(self, text: str, size: int, color: str = "#111827", gap: float = 6.0):
+        painter = self._painter
+        painter.setFont(self._fonts[size])
+        painter.setPen(self._gui.QColor(color))
+        flags = int(QtCore.Qt.TextFlag.TextWordWrap)
+        bound = painter.boundingRect(QtCore.QRectF(0, 0, self.width, 1e6), flags, text)
+        self._ensure(bound.height())
+        painter.drawText(QtCore.QRectF(self.MARGIN, self.y, self.width, bound.height()), flags, text)
+        self.y += bound.height() + gap
+
+    def title(self, text: str, subtitle: str = ""):
+        self._text(text, 18, gap=2.0)
+        self._text(subtitle, 9, "#6b7280", gap=12.0)
+
+    def heading(self, text: str):
+        self._ensure(60)
+        self.y += 10
+        self._text(text, 13)
+
+    def paragraph(self, text: str):
+        self._text(text, 9, "#6b7280")
+
+    def key_values(self, rows: list[tuple[str, str, bool | None]]):
+        for key, value, passed in rows:
+            verdict = "" if passed is None else ("合格" if passed else "不合格")
+            self._row([key, value, verdict], colors={2: "#16a34a" if passed else "#dc2626"}, widths=(0.4, 0.45, 0.15))
+
+    def _row(self, cells: list[str], header: bool = False, colors: dict | None = None, widths=None):
+        height = 15.0
+        self._ensure(height)
+        painter = self._painter
+        painter.setFont(self._fonts[10 if header else 9])
+        widths = widths or [1.0 / len(cells)] * len(cells)
+        x = self.MARGIN
+        if header:
+            painter.fillRect(QtCore.QRectF(x, self.y, self.width, height), self._gui.QColor("#f6f7fb"))
+        for i, (cell, share) in enumerate(zip(cells, widths)):
+            w = self.width * share
+            painter.setPen(self._gui.QColor((colors or {}).get(i, "#111827")))
+            align = QtCore.Qt.AlignmentFlag.AlignVCenter | (
+                QtCore.Qt.AlignmentFlag.AlignLeft if i == 0 else QtCore.Qt.AlignmentFlag.AlignRight
+            )
+            painter.drawText(QtCore.QRectF(x + 3, self.y, w - 6, height), align, cell)
+            x += w
+        painter.setPen(self._gui.QColor("#e5e7eb"))
+        painter.drawLine(QtCore.QPointF(self.MARGIN, self.y + height), QtCore.QPointF(self.MARGIN + self.width, self.y + height))
+        self.y += height
+
+    def begin_table(self, columns: list[str]):
+        self._ensure(45)
+        self._columns = columns
+        self._row(columns, header=True)
+
+    def table_rows(self, rows: list[list[str]]):
+        for row in rows:
+            if self.y + 15.0 > self.bottom:
+                self._new_page()
+            self._row(row)
+
+    def end_table(self):
+        self._columns = None
+        self.y += 8
+
+    def plot(self, title: str, t: np.ndarray, vmin: np.ndarray, vmax: np.ndarray, unit: str, limits=()):
+        gui, painter = self._gui, self._painter
+        self._text(title, 9, gap=2.0)
+        height, left = 170.0, 60.0
+        self._ensure(height + 16)
+        area = QtCore.QRectF(self.MARGIN + left, self.y, self.width - left, height)
+        painter.setPen(gui.QColor("#e5e7eb"))
+        painter.drawRect(area)
+        lo, hi = _value_range(vmin, vmax, limits)
+        t0, t1 = (float(t[0]), float(t[-1])) if len(t) else (0.0, 1.0)
+        span = max(t1 - t0, 1e-9)
+
+        def point(ti: float, vi: float):
+            return QtCore.QPointF(area.left() + (ti - t0) / span * area.width(), area.top() + (hi - vi) / (hi - lo) * height)
+
+        painter.setFont(self._fonts[9])
+        painter.setPen(gui.QColor("#4b5563"))
+        for value in (lo, (lo + hi) / 2, hi):
+            y = point(t0, value).y()
+            painter.drawText(QtCore.QRectF(self.MARGIN, y - 7, left - 6, 14), QtCore.Qt.AlignmentFlag.AlignRight, f"{value:.4g} {unit}")
+        painter.drawText(QtCore.QRectF(area.left(), area.bottom() + 2, 100, 14), QtCore.Qt.AlignmentFlag.AlignLeft, format_seconds(t0))
+        painter.drawText(
+            QtCore.QRectF(area.right() - 100, area.bottom() + 2, 100, 14), QtCore.Qt.AlignmentFlag.AlignRight, format_seconds(t1)
+        )
+        pen = gui.QPen(gui.QColor("#dc2626"))
+        pen.setStyle(QtCore.Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        for limit in limits:
+            painter.drawLine(point(t0, limit), point(t1, limit))
+        if len(t):
+            polygon = gui.QPolygonF(
+                [point(a, b) for a, b in zip(t.tolist(), vmax.tolist())]
+                + [point(a, b) for a, b in zip(t[::-1].tolist(), vmin[::-1].tolist())]
+            )
+            fill = gui.QColor("#2563eb")
+            fill.setAlphaF(0.35)
+            painter.setPen(gui.QPen(gui.QColor("#2563eb"), 0.8))
+            painter.setBrush(fill)
+            painter.drawPolygon(polygon)
+            painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        self.y += height + 22
+
+    def close(self):
+        self._painter.end()
+
+    def abort(self):
+        self._painter.end()
+        os.remove(self.path)
+
+
+def _value_range(vmin: np.ndarray, vmax: np.ndarray, limits=()) -> tuple[float, float]:
+    values = [float(v) for v in limits]
+    if len(vmin):
+        values += [float(vmin.min()), float(vmax.max())]
+    if not values:
+        return 0.0, 1.0
+    lo, hi = min(values), max(values)
+    pad = (hi - lo) * 0.05 or abs(hi) * 0.05 or 1.0
+    return lo - pad, hi + pad
+
+
+def open_writer(path: str) -> HtmlReportWriter | PdfReportWriter:
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt == "html":
+        return HtmlReportWriter(path)
+    if fmt == "pdf":
+        return PdfReportWriter(path)
+    raise ValueError(f"不支持的报告格式：{fmt}")
+
+
+# -- building --------------------------------------------------------------
+
+
+def _batched(blocks, rows: int = ROW_BATCH):
+    """把逐块读出的测量数据合并成约 ``rows`` 行一批，生成 (合并后的数组, 块数)。"""
+    parts, count = [], 0
+    for block in blocks:
+        parts.append(block)
+        count += len(block)
+        if count >= rows:
+            yield np.concatenate(parts), len(parts)
+            parts, count = [], 0
+    if parts:
+        yield np.concatenate(parts), len(parts)
+
+
+class _Progress:
+    """进度计数，最多每 ``interval`` 秒回调一次，并在每次回调时检查取消。"""
+
+    def __init__(self, total: int, callback, cancelled, interval: float = 0.1):
+        self.total = max(1, total)
+        self.done = 0
+        self.stage = ""
+        self._callback = callback
+        self._cancelled = cancelled
+        self._interval = interval
+        self._last = 0.0
+
+    def set_stage(self, stage: str):
+        self.stage = stage
+        self.advance(0, force=True)
+
+    def advance(self, units: int, force: bool = False):
+        self.done += units
+        now = time.monotonic()
+        if not force and now - self._last < self._interval:
+            return
+        self._last = now
+        if self._cancelled is not None and self._cancelled():
+            raise ReportCancelled()
+        if self._callback is not None:
+            self._callback(min(self.done, self.total), self.total, self.stage)
+
+
+def build_report(
+    spec: ReportSpec,
+    progress: Callable[[int, int, str], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> dict:
+    """在当前进程中生成报告，返回输出路径、页数等信息；取消时删除不完整的文件并抛出 ``ReportCancelled``。
+
+    测量数据逐块读取：曲线累计到固定数量的时间分箱，表格累计到固定数量的时间区间，
+    功率曲线只读取归档的块内极值摘要，不读原始样本；所有中间量的大小与会话时长无关。
+    """
+    reader = SessionReader(spec.session_path)
+    try:
+        meta, state, channels = reader.meta(), reader.state(), reader.channels()
+        archive = None
+        if spec.archive_path and os.path.exists(os.path.join(spec.archive_path, "archive.json")):
+            archive = ArchiveReader(spec.archive_path)
+        coax = [(channel, title) for channel, title in spec.coax_channels if channel in channels]
+        if archive is not None:
+            power_units = -(-archive.summary_rows // SUMMARY_BATCH) + 1
+        else:
+            power_units = channels.get(spec.power_channel, {}).get("blocks", 0)
+        total = (
+            power_units
+            + sum(channels[channel]["blocks"] for channel, _ in coax)
+            + reader.log_count(logging.WARNING)
+        )
+        tracker = _Progress(total, progress, cancelled)
+        writer = open_writer(spec.output_path)
+        try:
+            stats = SessionStatistics.from_dict(spec.statistics if spec.statistics is not None else state.get("statistics"))
+            _write_overview(writer, spec, meta, state, stats)
+            tracker.set_stage("功率稳定性")
+            _write_power(writer, spec, reader, channels, archive, stats, tracker)
+            for channel, title in coax:
+                tracker.set_stage(title)
+                _write_coax(writer, spec, reader, channel, title, channels[channel], stats, tracker)
+            _write_alarms(writer, spec)
+            tracker.set_stage("日志")
+            _write_logs(writer, reader, tracker)
+            tracker.advance(0, force=True)
+            pages = getattr(writer, "pages", 1)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+    finally:
+        reader.close()
+    return {"path": spec.output_path, "pages": pages, "bytes": os.path.getsize(spec.output_path)}
+
+
+def _verdicts(spec: ReportSpec, stats: SessionStatistics) -> list[bool]:
+    verdicts = []
+    power = stats.summary(spec.power_channel)
+    if power is not None and power["count"] and "power_stability" in spec.limits:
+        verdicts.append(bool(power["std"] / power["mean"] <= spec.limits["power_stability"]) if power["mean"] else False)
+    for channel, _ in spec.coax_channels:
+        coax = stats.summary(channel)
+        if coax is not None and coax["count"] and "coax_offset_p95" in spec.limits:
+            verdicts.append(bool(coax["p95"] <= spec.limits["coax_offset_p95"]))
+    verdicts += [alarm["alarms"] == 0 for alarm in spec.alarms if alarm["severity"] == "error" and alarm["samples"]]
+    return verdicts
+
+
+def _write_overview(writer, spec: ReportSpec, meta: dict, state: dict, stats: SessionStatistics):
+    created = float(meta.get("created", 0) or 0)
+    writer.title(
+        spec.title,
+        f"生成于 {datetime.datetime.now():%Y-%m-%d %H:%M:%S}  ·  会话 {os.path.basename(spec.session_path)}",
+    )
+    writer.heading("概要")
+    verdicts = _verdicts(spec, stats)
+    writer.key_values([
+        ("样机名称", meta.get("prototype_name", ""), None),
+        ("样机类型", meta.get("prototype_type", ""), None),
+        ("会话创建", f"{datetime.datetime.fromtimestamp(created):%Y-%m-%d %H:%M:%S}" if created else "—", None),
+        ("已完成步骤", "、".join(state.get("completed_steps", [])) or "—", None),
+        ("总体结论", "—" if not verdicts else ("合格" if all(verdicts) else "不合格"), all(verdicts) if verdicts else None),
+    ])
+
+
+def _write_power(
+    writer, spec: ReportSpec, reader: SessionReader, channels: dict, archive: ArchiveReader | None, stats, tracker
+):
+    power = stats.summary(spec.power_channel)
+    if (power is None or not power["count"]) and archive is None:
+        return
+    writer.heading("功率稳定性")
+    if power is not None and power["count"]:
+        stability = power["std"] / power["mean"] if power["mean"] else float("nan")
+        limit = spec.limits.get("power_stability")
+        rows = [
+            ("样本数", f"{power['count']:,}", None),
+            ("均值", f"{power['mean']:.4f} mW", None),
+            (
+                "标准差 / 相对波动",
+                f"{power['std']:.4g} mW / {stability * 100:.3f}%",
+                None if limit is None else bool(stability <= limit),
+            ),
+            ("P5 / P50 / P95", f"{power['p05']:.4f} / {power['p50']:.4f} / {power['p95']:.4f} mW", None),
+            ("最小 / 最大", f"{power['min']:.4f} / {power['max']:.4f} mW", None),
+        ]
+        for tau in spec.allan_taus:
+            actual, sigma = stats.allan_at(spec.power_channel, tau)
+            covered = sigma == sigma and 0.5 * tau <= actual <= 2.0 * tau
+            rows.append((f"Allan σ @ {tau:g} s", f"{sigma:.3g} mW（τ = {actual:.3g} s）" if covered else "—", None))
+        writer.key_values(rows)
+
+    if archive is not None:
+        span = archive.time_range()
+        if span is None:
+            return
+        bins = TimeBins(*span, spec.plot_bins)
+        for blocks in archive.iter_summaries(SUMMARY_BATCH):
+            bins.update(blocks["t"], blocks["vmin"], blocks["vmax"])
+            tracker.advance(1)
+        writer.plot("功率（归档块内极值包络）", *bins.series(), "mW")
+        index = archive.index
+        if len(index):
+            table = IntervalTable(float(index["t0"][0]), float(index["t1"][-1]))
+            table.update_summary(index["t0"], index["count"], index["vmin"], index["vmax"], index["vsum"])
+            writer.paragraph(f"已封存归档块按 {format_seconds(table.interval)} 汇总")
+            writer.begin_table(["起始", "结束", "样本数", "最小 (mW)", "最大 (mW)", "均值 (mW)"])
+            writer.table_rows(table.rows())
+            writer.end_table()
+        return
+
+    # 没有归档时用会话中记录的功率快照
+    info = channels.get(spec.power_channel)
+    if info is None:
+        return
+    bins = TimeBins(info["t0"], info["t1"], spec.plot_bins)
+    for block, n in _batched(reader.measurements(spec.power_channel, spec.chunk_rows)):
+        bins.update(block[:, 0], block[:, 1])
+        tracker.advance(n)
+    writer.plot("功率（快照）", *bins.series(), "mW")
+
+
+def _write_coax(writer, spec: ReportSpec, reader: SessionReader, channel: str, title: str, info: dict, stats, tracker):
+    writer.heading(title)
+    coax = stats.summary(channel)
+    limit = spec.limits.get("coax_offset_p95")
+    if coax is not None and coax["count"]:
+        writer.key_values([
+            ("帧数", f"{coax['count']:,}", None),
+            ("平均偏移", f"{coax['mean']:.3f} px", None),
+            ("P95 偏移", f"{coax['p95']:.3f} px", None if limit is None else bool(coax["p95"] <= limit)),
+            ("最大偏移", f"{coax['max']:.3f} px", None),
+        ])
+    bins = TimeBins(info["t0"], info["t1"], spec.plot_bins)
+    table = IntervalTable(info["t0"], info["t1"])
+    for block, n in _batched(reader.measurements(channel, spec.chunk_rows)):
+        # 列：时间、质心 x/y、光斑 σx/σy、偏移
+        bins.update(block[:, 0], block[:, -1])
+        table.update(block[:, 0], block[:, -1])
+        tracker.advance(n)
+    writer.plot("相对参考光斑的偏移", *bins.series(), "px", limits=() if limit is None else (limit,))
+    writer.paragraph(f"按 {format_seconds(table.interval)} 汇总")
+    writer.begin_table(["起始", "结束", "帧数", "最小 (px)", "最大 (px)", "平均 (px)"])
+    writer.table_rows(table.rows(".3f"))
+    writer.end_table()
+
+
+def _write_alarms(writer, spec: ReportSpec):
+    alarms = [alarm for alarm in spec.alarms if alarm["samples"]]
+    if not alarms:
+        return
+    writer.heading("限值报警")
+    writer.begin_table(["规则", "限值", "样本数", "超限样本", "报警次数", "结论"])
+    writer.table_rows([
+        [
+            alarm["name"],
+            alarm["limit"],
+            f"{alarm['samples']:,}",
+            f"{alarm['violations']:,}",
+            str(alarm["alarms"]),
+            ("合格" if alarm["alarms"] == 0 else "不合格") if alarm["severity"] == "error" else "",
+        ]
+        for alarm in alarms
+    ])
+    writer.end_table()
+
+
+def _write_logs(writer, reader: SessionReader, tracker):
+    total = reader.log_count(logging.WARNING)
+    if not total:
+        return
+    writer.heading("警告与错误")
+    if total > MAX_LOG_ROWS:
+        writer.paragraph(f"共 {total:,} 条，只列出前 {MAX_LOG_ROWS} 条")
+    writer.begin_table(["时间", "级别", "消息"])
+    written = 0
+    for rows in reader.logs(logging.WARNING):
+        take = rows[: MAX_LOG_ROWS - written]
+        writer.table_rows([
+            [f"{datetime.datetime.fromtimestamp(ts):%m-%d %H:%M:%S}", LEVEL_NAMES.get(level, str(level)), message[-120:]]
+            for ts, level, message in take
+        ])
+        written += len(take)
+        tracker.advance(len(rows))
+        if written >= MAX_LOG_ROWS:
+            break
+    writer.end_table()
+
+
+# -- worker process --------------------------------------------------------
+
+
+def _report_main(spec: ReportSpec, events: Connection, cancel):
+    """工作进程入口：生成报告，进度与结果经管道发回界面进程。"""
+    app = None
+    if spec.fmt == "pdf":
+        # QPdfWriter 排版文字需要 QGuiApplication，工作进程没有窗口，使用 offscreen 平台
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6 import QtGui
+
+        app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication(["report"])
+    try:
+        result = build_report(spec, lambda done, total, stage: events.send(("progress", done, total, stage)), cancel.is_set)
+        events.send(("done", result))
+    except ReportCancelled:
+        events.send(("cancelled",))
+    except Exception:
+        events.send(("error", traceback.format_exc(limit=4)))
+    finally:
+        del app
+
+
+class ReportJob(QtCore.QObject):
+    """在独立工作进程中生成一份报告。
+
+    工作进程以 spawn 启动，界面进程只用定时器轮询管道转发进度，界面线程不做任何
+    读取或排版。``cancel`` 通知工作进程在下一次进度检查时停止并删除不完整的文件，
+    超过 ``cancel_timeout`` 仍未退出则强制结束进程。
+    """
+
+    progress = QtCore.pyqtSignal(int, int, str)  # 已完成, 总量, 阶段
+    finished = QtCore.pyqtSignal(dict)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, spec: ReportSpec, poll_ms: int = 100, cancel_timeout: float = 3.0, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        if spec.fmt not in REPORT_FORMATS:
+            raise ValueError(f"不支持的报告格式：{spec.fmt}")
+        self.spec = spec
+        self.cancel_timeout = cancel_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._cancel = self._ctx.Event()
+        self._events: Connection | None = None
+        self._process = None
+        self._cancel_deadline: float | None = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(poll_ms)
+        self._timer.timeout.connect(self._poll)
+
+    def start(self):
+        receiver, sender = self._ctx.Pipe(duplex=False)
+        self._events = receiver
+        self._process = self._ctx.Process(
+            target=_report_main, args=(self.spec, sender, self._cancel), name="report", daemon=True
+        )
+        self._process.start()
+        sender.close()
+        self._timer.start()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def cancel(self):
+        if self.is_running() and self._cancel_deadline is None:
+            self._cancel.set()
+            self._cancel_deadline = time.monotonic() + self.cancel_timeout
+
+    def shutdown(self):
+        """立即结束工作进程（页面关闭时使用），不发出信号。"""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(1.0)
+            self._remove_partial()
+        self._finish()
+
+    def _remove_partial(self):
+        try:
+            os.remove(self.spec.output_path)
+        except OSError:
+            pass
+
+    def _finish(self):
+        self._timer.stop()
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+
+    def _drain(self) -> bool:
+        """转发管道中已有的消息，收到最终结果时结束任务并返回 True。"""
+        try:
+            while self._events is not None and self._events.poll():
+                kind, *args = self._events.recv()
+                if kind == "progress":
+                    self.progress.emit(*args)
+                    continue
+                self._process.join(1.0)
+                self._finish()
+                if kind == "done":
+                    self.finished.emit(args[0])
+                elif kind == "cancelled":
+                    self.cancelled.emit()
+                else:
+                    self.failed.emit(args[0])
+                return True
+        except (EOFError, OSError):
+            pass
+        return False
+
+    def _poll(self):
+        if self._drain():
+            return
+        if self._process is None or self._process.is_alive():
+            if self._cancel_deadline is not None and time.monotonic() > self._cancel_deadline:
+                self.shutdown()
+                self.cancelled.emit()
+            return
+        # 工作进程可能在上面读完管道之后才发出结果并退出，判定为崩溃前再读一次
+        if self._drain():
+            return
+        # 工作进程没有发回结果就退出了（崩溃或被系统结束）
+        self._remove_partial()
+        self._finish()
+        if self._cancel_deadline is not None:
+            self.cancelled.emit()
+        else:
+            self.failed.emit(f"报告进程异常退出（退出码 {self._process.exitcode}）")
+
+
+__all__ = [
+    "REPORT_FORMATS",
+    "ReportCancelled",
+    "ReportSpec",
+    "TimeBins",
+    "IntervalTable",
+    "HtmlReportWriter",
+    "PdfReportWriter",
+    "open_writer",
+    "build_report",
+    "ReportJob",
+]
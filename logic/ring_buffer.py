@@ -0,0 +1,141 @@
+# ring_buffer.py
+# 预分配的 NumPy 环形缓冲区与 min/max 抽取工具，供采集线程与界面共享
+
+import threading
+
+import numpy as np
+
+
+class SampleRingBuffer:
+    """固定容量的 (时间戳, 数值) 环形缓冲区。
+
+    写入方（采集线程）与读取方（GUI 线程）通过内部锁互斥；存储在构造时一次性
+    分配，写入时不再产生新的数组。
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.capacity = int(capacity)
+        self.t = np.zeros(self.capacity, dtype=np.float64)
+        self.v = np.zeros(self.capacity, dtype=dtype)
+        self._head = 0  # 下一次写入的位置
+        self.total_written = 0
+        self._lock = threading.Lock()
+
+    def write(self, t: np.ndarray, v: np.ndarray) -> int:
+        """写入一块样本，返回因超过容量而未保存的样本数。"""
+        n = len(v)
+        skipped = 0
+        if n > self.capacity:
+            skipped = n - self.capacity
+            t = t[skipped:]
+            v = v[skipped:]
+            n = self.capacity
+        with self._lock:
+            first = min(n, self.capacity - self._head)
+            self.t[self._head:self._head + first] = t[:first]
+            self.v[self._head:self._head + first] = v[:first]
+            rest = n - first
+            if rest:
+                self.t[:rest] = t[first:]
+                self.v[:rest] = v[first:]
+            self._head = (self._head + n) % self.capacity
+            self.total_written += n + skipped
+        return skipped
+
+    def __len__(self) -> int:
+        return min(self.total_written, self.capacity)
+
+    @property
+    def lock(self) -> threading.Lock:
+        return self._lock
+
+    def segments(self, start: int, n: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """返回逻辑区间 [start, start + n) 对应的至多两段数组视图（不复制）。
+
+        ``start`` 以当前保留的最旧样本为 0。视图直接引用内部存储，调用方需要
+        持有 ``lock`` 直到用完视图，以免被写入方覆盖。
+        """
+        size = min(self.total_written, self.capacity)
+        start = max(0, min(start, size))
+        n = max(0, min(n, size - start))
+        if n == 0:
+            return []
+        oldest = self._head if self.total_written >= self.capacity else 0
+        first = (oldest + start) % self.capacity
+        if first + n <= self.capacity:
+            return [(self.t[first:first + n], self.v[first:first + n])]
+        split = self.capacity - first
+        return [(self.t[first:], self.v[first:]), (self.t[:n - split], self.v[:n - split])]
+
+    def latest(self, n: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """按时间顺序复制最近 ``n`` 个样本。"""
+        with self._lock:
+            size = min(self.total_written, self.capacity)
+            n = size if n is None else min(n, size)
+            start = (self._head - n) % self.capacity
+            if start + n <= self.capacity:
+                return self.t[start:start + n].copy(), self.v[start:start + n].copy()
+            first = self.capacity - start
+            t = np.concatenate((self.t[start:], self.t[:n - first]))
+            v = np.concatenate((self.v[start:], self.v[:n - first]))
+            return t, v
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self.total_written = 0
+
+
+def decimate_minmax(t: np.ndarray, v: np.ndarray, n_bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """把样本按等长分箱，每箱保留最小值和最大值（共 ``2 * n_bins`` 个点）。
+
+    折线穿过每箱的极值即可在像素宽度内保留所有尖峰，样本数不超过
+    ``2 * n_bins`` 时原样返回。
+    """
+    n = len(v)
+    if n <= 2 * n_bins or n_bins <= 0:
+        return t, v
+    per_bin = n // n_bins
+    usable = per_bin * n_bins
+    vb = v[n - usable:].reshape(n_bins, per_bin)
+    tb = t[n - usable:].reshape(n_bins, per_bin)
+    imin = vb.argmin(axis=1)
+    imax = vb.argmax(axis=1)
+    # 保持每箱内极值的时间先后顺序
+    first = np.minimum(imin, imax)
+    second = np.maximum(imin, imax)
+    rows = np.arange(n_bins)
+    out_t = np.empty(2 * n_bins, dtype=t.dtype)
+    out_v = np.empty(2 * n_bins, dtype=v.dtype)
+    out_t[0::2] = tb[rows, first]
+    out_t[1::2] = tb[rows, second]
+    out_v[0::2] = vb[rows, first]
+    out_v[1::2] = vb[rows, second]
+    head = n - usable + per_bin
+    if head > per_bin:
+        # 不能整除时多出的最早样本并入第一箱，不丢弃其中的极值
+        i, j = int(v[:head].argmin()), int(v[:head].argmax())
+        out_t[0], out_t[1] = t[min(i, j)], t[max(i, j)]
+        out_v[0], out_v[1] = v[min(i, j)], v[max(i, j)]
+    return out_t, out_v
+
+
+def decimate_segments(segments: list[tuple[np.ndarray, np.ndarray]], n_bins: int) -> tuple[np.ndarray, np.ndarray]:
+    """对 ``SampleRingBuffer.segments`` 返回的多段视图做 min/max 抽取。
+
+    分箱数按各段长度比例分配，只复制抽取后的结果而不拼接原始数据。
+    """
+    total = sum(len(v) for _, v in segments)
+    if total == 0:
+        return np.empty(0), np.empty(0)
+    parts = []
+    for t, v in segments:
+        bins = max(1, round(n_bins * len(v) / total))
+        parts.append(decimate_minmax(t, v, bins))
+    if len(parts) == 1:
+        t, v = parts[0]
+        return t.copy(), v.copy()
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+__all__ = ["SampleRingBuffer", "decimate_minmax", "decimate_segments"]
@@ -0,0 +1,325 @@
+# session_store.py
+# 每台样机的装调会话存储：SQLite(WAL) + 后台批量写入线程，追加写、检查点恢复
+
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    t0 REAL NOT NULL,
+    t1 REAL NOT NULL,
+    count INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS measurements_channel ON measurements (channel, t0);
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    level INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+DEFAULT_SESSION_ROOT = os.path.join(os.path.expanduser("~"), ".fos", "sessions")
+
+_STOP = object()
+
+
+def session_path(root: str, prototype_name: str, prototype_type: str) -> str:
+    """样机会话文件路径：``<root>/<类型>_<名称>.sqlite``，名称中的非法字符替换为下划线。"""
+    safe = re.sub(r'[\\/:*?"<>|\s]+', "_", f"{prototype_type}_{prototype_name}").strip("_") or "session"
+    return os.path.join(root, f"{safe}.sqlite")
+
+
+class SessionStore:
+    """单台样机的会话存储。
+
+    所有写入（步骤事件、测量数据、日志）只入队，由后台线程每 ``flush_interval``
+    秒在一个事务里批量提交，GUI 线程不会等待磁盘。事件只追加不修改；后台线程
+    每累计 ``checkpoint_every`` 个事件写一次当前状态的检查点，``resume`` 只需
+    读取最后一个检查点并重放其后的少量事件。测量数据按通道把一批行打包成
+    一个 float64 BLOB 存储。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        prototype_name: str = "",
+        prototype_type: str = "",
+        flush_interval: float = 0.5,
+        checkpoint_every: int = 200,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._state_lock = threading.Lock()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('prototype_name', ?)", (prototype_name,))
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('prototype_type', ?)", (prototype_type,))
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('created', ?)", (str(time.time()),))
+        self.state, self._last_event_id = self._recover(conn)
+        conn.close()
+        self.meta = {"prototype_name": prototype_name, "prototype_type": prototype_type}
+
+        self.written_events = 0
+        self.written_rows = 0
+        self._checkpoint_providers: dict[str, Callable[[], object]] = {}
+        self._events_since_checkpoint = 0
+        self._thread = threading.Thread(target=self._writer, name="session-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, root: str, prototype_name: str, prototype_type: str, **kwargs) -> "SessionStore":
+        return cls(session_path(root, prototype_name, prototype_type), prototype_name, prototype_type, **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -- recovery -----------------------------------------------------------
+
+    @staticmethod
+    def _apply_event(state: dict, kind: str, payload: dict):
+        if kind == "state":
+            state.update(payload)
+        elif kind == "step_done":
+            done = state.setdefault("completed_steps", [])
+            if payload["step"] not in done:
+                done.append(payload["step"])
+
+    @classmethod
+    def _recover(cls, conn: sqlite3.Connection) -> tuple[dict, int]:
+        row = conn.execute("SELECT last_event_id, state FROM checkpoints ORDER BY id DESC LIMIT 1").fetchone()
+        state, last_id = ({}, 0) if row is None else (json.loads(row[1]), row[0])
+        for event_id, kind, payload in conn.execute(
+            "SELECT id, kind, payload FROM events WHERE id > ? ORDER BY id", (last_id,)
+        ):
+            cls._apply_event(state, kind, json.loads(payload))
+            last_id = event_id
+        return state, last_id
+
+    def resume(self) -> dict:
+        """返回恢复出的会话状态（上次的步骤、已完成步骤等）的副本。"""
+        with self._state_lock:
+            return json.loads(json.dumps(self.state))
+
+    # -- recording (any thread) ---------------------------------------------
+
+    def record_event(self, kind: str, **payload):
+        with self._state_lock:
+            self._apply_event(self.state, kind, payload)
+        self._queue.put(("event", time.time(), kind, json.dumps(payload, ensure_ascii=False)))
+
+    def record_state(self, **changes):
+        """记录状态变化（如当前步骤），恢复时按顺序合并。"""
+        self.record_event("state", **changes)
+
+    def record_measurement(self, channel: str, t, *columns):
+        """追加测量行：``t`` 与各列可以是标量或等长一维数组。"""
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        block = np.column_stack([t] + [np.broadcast_to(np.asarray(c, dtype=np.float64), t.shape) for c in columns])
+        self._queue.put(("measurement", channel, block))
+
+    def record_log(self, ts: float, level: int, message: str):
+        self._queue.put(("log", ts, level, message))
+
+    def checkpoint(self):
+        self._queue.put(("checkpoint",))
+
+    @property
+    def pending(self) -> int:
+        """写入队列中等待后台线程提交的条目数。"""
+        return self._queue.qsize()
+
+    def add_checkpoint_provider(self, key: str, provider: Callable[[], object]):
+        """每次写检查点时调用 ``provider``（在写入线程中），结果以 ``key`` 存入检查点状态。
+
+        用于在线统计等不经事件重放的状态；恢复时 ``resume()`` 的结果中带有最后一次的值。
+        """
+        self._checkpoint_providers[key] = provider
+
+    def close(self, timeout: float = 5.0):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # -- reading ------------------------------------------------------------
+
+    def read_measurements(self, channel: str, chunk_rows: int = 64):
+        """按块生成某通道的测量数据（每次 yield 一个二维数组），不一次性载入内存。"""
+        reader = SessionReader(self.path)
+        try:
+            yield from reader.measurements(channel, chunk_rows)
+        finally:
+            reader.close()
+
+    # -- writer thread ------------------------------------------------------
+
+    def _writer(self):
+        conn = self._connect()
+        stop = False
+        while not stop:
+            items = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                items.append(item)
+            if items:
+                self._write_batch(conn, items)
+            if stop or self._events_since_checkpoint >= self.checkpoint_every:
+                self._write_checkpoint(conn)
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, items: list):
+        events = []
+        logs = []
+        blocks: dict[str, list[np.ndarray]] = {}
+        want_checkpoint = False
+        for item in items:
+            kind = item[0]
+            if kind == "event":
+                events.append(item[1:])
+            elif kind == "measurement":
+                blocks.setdefault(item[1], []).append(item[2])
+            elif kind == "log":
+                logs.append(item[1:])
+            elif kind == "checkpoint":
+                want_checkpoint = True
+        with conn:
+            if events:
+                conn.executemany("INSERT INTO events (ts, kind, payload) VALUES (?, ?, ?)", events)
+                self._last_event_id = conn.execute("SELECT MAX(id) FROM events").fetchone()[0]
+                self.written_events += len(events)
+                self._events_since_checkpoint += len(events)
+            for channel, parts in blocks.items():
+                for width in {p.shape[1] for p in parts}:
+                    data = np.concatenate([p for p in parts if p.shape[1] == width])
+                    conn.execute(
+                        "INSERT INTO measurements (channel, t0, t1, count, width, data) VALUES (?, ?, ?, ?, ?, ?)",
+                        (channel, float(data[0, 0]), float(data[-1, 0]), len(data), width, data.tobytes()),
+                    )
+                    self.written_rows += len(data)
+            if logs:
+                conn.executemany("INSERT INTO logs (ts, level, message) VALUES (?, ?, ?)", logs)
+        if want_checkpoint:
+            self._write_checkpoint(conn)
+
+    def _write_checkpoint(self, conn: sqlite3.Connection):
+        with self._state_lock:
+            state = dict(self.state)
+        for key, provider in list(self._checkpoint_providers.items()):
+            state[key] = provider()
+        state = json.dumps(state, ensure_ascii=False)
+        with conn:
+            conn.execute(
+                "INSERT INTO checkpoints (ts, last_event_id, state) VALUES (?, ?, ?)",
+                (time.time(), self._last_event_id, state),
+            )
+        self._events_since_checkpoint = 0
+
+
+class SessionReader:
+    """会话文件的只读访问：不启动写入线程，测量数据与日志按块生成，可在其他进程中使用。
+
+    写入方仍在运行时读到的是最近一次提交为止的数据。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+    def close(self):
+        self._conn.close()
+
+    def meta(self) -> dict[str, str]:
+        return dict(self._conn.execute("SELECT key, value FROM meta"))
+
+    def state(self) -> dict:
+        """最后一个检查点加上其后的事件重放出的会话状态（含检查点中的统计）。"""
+        return SessionStore._recover(self._conn)[0]
+
+    def channels(self) -> dict[str, dict]:
+        """各通道的块数、行数与时间范围。"""
+        return {
+            channel: {"blocks": blocks, "rows": rows, "t0": t0, "t1": t1}
+            for channel, blocks, rows, t0, t1 in self._conn.execute(
+                "SELECT channel, COUNT(*), SUM(count), MIN(t0), MAX(t1) FROM measurements GROUP BY channel"
+            )
+        }
+
+    def measurements(self, channel: str, chunk_rows: int = 64):
+        cursor = self._conn.execute(
+            "SELECT count, width, data FROM measurements WHERE channel = ? ORDER BY id", (channel,)
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            for count, width, data in rows:
+                yield np.frombuffer(data, dtype=np.float64).reshape(count, width)
+
+    def log_count(self, min_level: int = logging.NOTSET) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM logs WHERE level >= ?", (min_level,)).fetchone()[0]
+
+    def logs(self, min_level: int = logging.NOTSET, chunk_rows: int = 256):
+        """按块生成 (时间戳, 级别, 消息) 列表。"""
+        cursor = self._conn.execute("SELECT ts, level, message FROM logs WHERE level >= ? ORDER BY id", (min_level,))
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+
+
+class SessionLogHandler(logging.Handler):
+    """把日志记录写入会话存储的 Handler（只入队，可在任意线程调用）。"""
+
+    def __init__(self, store: SessionStore, level: int = logging.INFO):
+        super().__init__(level)
+        self.store = store
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.store.record_log(record.created, record.levelno, self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+__all__ = ["DEFAULT_SESSION_ROOT", "SessionStore", "SessionReader", "SessionLogHandler", "session_path"]
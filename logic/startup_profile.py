@@ -0,0 +1,126 @@
+# startup_profile.py
+# 启动性能剖析：模块导入耗时（包含/自身）与各启动阶段耗时
+
+import importlib.abc
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, name: str, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+        self._create_time = 0.0
+
+    def create_module(self, spec):
+        # 扩展模块（如 PyQt6 的 .so）主要耗时在 create_module 中
+        start = time.perf_counter()
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._create_time = time.perf_counter() - start
+
+    def exec_module(self, module):
+        profiler = self._profiler
+        profiler._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start + self._create_time
+            nested = profiler._stack.pop()
+            if profiler._stack:
+                profiler._stack[-1] += elapsed
+            profiler.imports.append((self._name, elapsed * 1000.0, (elapsed - nested) * 1000.0))
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """记录启动期间的模块导入与阶段耗时。
+
+    ``install`` 在 ``sys.meta_path`` 最前面挂一个包装查找器，为每个首次导入的
+    模块记录包含子模块的耗时与自身耗时；``phase`` 记录界面构建等阶段。未启用
+    时不安装任何钩子，没有额外开销。
+    """
+
+    def __init__(self, origin: float | None = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.imports: list[tuple[str, float, float]] = []  # (模块, 包含耗时 ms, 自身耗时 ms)
+        self.phases: list[tuple[str, float, float]] = []  # (阶段, 开始 ms, 耗时 ms)
+        self.marks: dict[str, float] = {}
+        self._stack: list[float] = []
+        self._finder: _TimingFinder | None = None
+
+    def install(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, (start - self.origin) * 1000.0, (end - start) * 1000.0))
+
+    def mark(self, name: str):
+        """记录从进程起点到现在的时间点。"""
+        self.marks[name] = (time.perf_counter() - self.origin) * 1000.0
+
+    def to_dict(self, top: int = 25) -> dict:
+        by_self = sorted(self.imports, key=lambda item: item[2], reverse=True)[:top]
+        return {
+            "marks_ms": self.marks,
+            "phases": [{"name": n, "start_ms": s, "duration_ms": d} for n, s, d in self.phases],
+            "imports_total_ms": sum(item[2] for item in self.imports),
+            "imports_count": len(self.imports),
+            "imports_top_self": [{"module": n, "inclusive_ms": i, "self_ms": s} for n, i, s in by_self],
+        }
+
+    def report(self, top: int = 25) -> str:
+        data = self.to_dict(top)
+        lines = ["== 启动剖析 =="]
+        for name, value in data["marks_ms"].items():
+            lines.append(f"  {name:<28} {value:9.1f} ms")
+        lines.append("-- 阶段 --")
+        for phase in data["phases"]:
+            lines.append(f"  {phase['name']:<28} {phase['duration_ms']:9.1f} ms  (@{phase['start_ms']:.1f})")
+        lines.append(f"-- 导入：{data['imports_count']} 个模块，自身耗时合计 {data['imports_total_ms']:.1f} ms --")
+        for item in data["imports_top_self"]:
+            lines.append(f"  {item['module']:<40} self {item['self_ms']:7.1f} ms  incl {item['inclusive_ms']:7.1f} ms")
+        return "\n".join(lines)
+
+    def dump_json(self, path: str, top: int = 25):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(top), fh, ensure_ascii=False, indent=2)
+
+
+__all__ = ["StartupProfiler"]
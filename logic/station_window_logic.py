@@ -0,0 +1,131 @@
+# station_window_logic.py
+# 多工位模式：一个窗口用标签页同时承载多个样机的装调主页面，共享调度器、工作进程池与仪器服务
+
+import logging
+from dataclasses import dataclass
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from logic.decoration_page_logic import DecorationPage
+from logic.instrument_io import InstrumentIO
+from logic.session_store import DEFAULT_SESSION_ROOT, SessionStore
+from logic.task_scheduler import TaskScheduler, UiWatchdog
+
+
+@dataclass
+class StationLimits:
+    """单个工位的吞吐上限，None 表示不限制。"""
+
+    camera_fps: float | None = 15.0  # 每秒处理的相机帧数
+    max_tasks: int | None = 2  # 每类后台任务同时占用的执行器槽位
+
+
+class StationWindow(QtWidgets.QWidget):
+    """多工位装调窗口，每个标签页是一个样机的 ``DecorationPage``。
+
+    所有工位共用一个 ``TaskScheduler``（进程池与线程池）、一个界面看门狗和调用方传入的
+    ``instruments``；每个工位有自己的会话文件、采集缓冲与 ``decoration.<工位>`` 日志，
+    后台任务的并发与相机帧率按 ``limits`` 分别限制。非当前标签页的页面不可见，其界面
+    更新由各自的可见性管理自动暂停。同名同类型的样机再次添加时切换到已有的标签页。
+    ``instruments`` 由调用方负责关闭。``acquisition_process`` 为各工位的缺省值，
+    为真时工位的采集驱动在独立的工作进程中运行。
+    """
+
+    station_added = QtCore.pyqtSignal(str)
+    station_closed = QtCore.pyqtSignal(str)
+
+    def __init__(
+        self,
+        session_root: str | None = DEFAULT_SESSION_ROOT,
+        limits: StationLimits | None = None,
+        instruments: InstrumentIO | None = None,
+        acquisition_process: bool = False,
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.session_root = session_root
+        self.limits = limits or StationLimits()
+        self.instruments = instruments
+        self.acquisition_process = acquisition_process
+        self.logger = logging.getLogger("decoration.stations")
+        self.scheduler = TaskScheduler(parent=self)
+        self.watchdog = UiWatchdog(self.logger, parent=self)
+        self.watchdog.start()
+        self._pages: dict[str, DecorationPage] = {}
+
+        self.setWindowTitle("装调主页面 · 多工位")
+        self.tabs = QtWidgets.QTabWidget(self)
+        self.tabs.setDocumentMode(True)
+        self.tabs.setTabsClosable(True)
+        self.tabs.tabCloseRequested.connect(lambda idx: self.close_station(self.tabs.widget(idx).station))
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.tabs)
+
+    @staticmethod
+    def station_key(prototype_name: str, prototype_type: str) -> str:
+        return f"{prototype_name} · {prototype_type}" if prototype_type else prototype_name
+
+    def stations(self) -> list[DecorationPage]:
+        return list(self._pages.values())
+
+    def station(self, key: str) -> DecorationPage | None:
+        return self._pages.get(key)
+
+    def add_station(self, prototype_name: str, prototype_type: str = "", **page_kwargs) -> DecorationPage:
+        """添加一个工位并切换到它；``page_kwargs`` 传给 ``DecorationPage``（功率计、相机等）。"""
+        key = self.station_key(prototype_name, prototype_type)
+        page = self._pages.get(key)
+        if page is None:
+            session = None
+            if self.session_root is not None and "session" not in page_kwargs:
+                session = SessionStore.open(self.session_root, prototype_name, prototype_type)
+            page_kwargs.setdefault("session", session)
+            page_kwargs.setdefault("acquisition_process", self.acquisition_process)
+            page = DecorationPage(
+                prototype_name=prototype_name,
+                prototype_type=prototype_type,
+                instruments=self.instruments,
+                scheduler=self.scheduler.session(key, self.limits.max_tasks),
+                station=key,
+                camera_fps=self.limits.camera_fps,
+                watchdog=False,
+                **page_kwargs,
+            )
+            self._pages[key] = page
+            self.tabs.addTab(page, key)
+            self.logger.info("添加工位：%s", key)
+            self.station_added.emit(key)
+        self.tabs.setCurrentWidget(page)
+        return page
+
+    def close_station(self, key: str):
+        """关闭工位：停止其采集、取消其后台任务并关闭会话，不影响其他工位。"""
+        page = self._pages.pop(key, None)
+        if page is None:
+            return
+        page.close()
+        self.tabs.removeTab(self.tabs.indexOf(page))
+        page.deleteLater()
+        self.logger.info("关闭工位：%s", key)
+        self.station_closed.emit(key)
+
+    def changeEvent(self, event: QtCore.QEvent):
+        # 标签页中的页面不是顶层窗口，收不到最小化事件，由宿主窗口转发
+        if event.type() == QtCore.QEvent.Type.WindowStateChange:
+            for page in self._pages.values():
+                if self.isMinimized():
+                    page.visibility.suspend("minimized")
+                else:
+                    page.visibility.release("minimized")
+        super().changeEvent(event)
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        for key in list(self._pages):
+            self.close_station(key)
+        self.watchdog.stop()
+        self.scheduler.shutdown()
+        super().closeEvent(event)
+
+
+__all__ = ["StationLimits", "StationWindow"]
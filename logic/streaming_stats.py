@@ -0,0 +1,367 @@
+# streaming_stats.py
+# 在线统计：Welford 均值/方差与极值、KLL 分位数草图、Allan 偏差，可序列化后随会话检查点保存
+
+import math
+import threading
+
+import numpy as np
+
+
+class RunningStats:
+    """Welford 均值/方差与最小/最大值。批量更新用 Chan 的合并公式，结果与逐点更新一致。"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        v = np.asarray(values, dtype=np.float64).ravel()
+        v = v[np.isfinite(v)]
+        n = len(v)
+        if not n:
+            return
+        mean = float(v.mean())
+        m2 = float(np.dot(v - mean, v - mean))
+        self._merge(n, mean, m2, float(v.min()), float(v.max()))
+
+    def merge(self, other: "RunningStats"):
+        if other.count:
+            self._merge(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _merge(self, n: int, mean: float, m2: float, vmin: float, vmax: float):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count > 1 else float("nan")
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        stats = cls()
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        return stats
+
+
+class QuantileSketch:
+    """KLL 分位数草图：秩误差约为 ``1.7 / k``，与数据分布和量级无关，内存约 ``3k`` 个数。
+
+    第 h 层的每个元素代表 2^h 个原始样本；某层超过容量时排序后隔一取一（起点
+    随机）提升到上一层，越低的层容量越小（按 2/3 递减）。
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # 奇数个时留下一个在本层，其余成对压缩
+                keep = items[:len(items) % 2]
+                promoted = items[len(keep) + int(self._rng.integers(2))::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+
+    def update(self, values):
+        v = np.asarray(values, dtype=np.float64).ravel()
+        v = v[np.isfinite(v)]
+        if not len(v):
+            return
+        self.levels[0] = np.concatenate((self.levels[0], v))
+        self.count += len(v)
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return float("nan")
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+        idx = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(items[order[min(idx, len(items) - 1)]])
+
+    def merge(self, other: "QuantileSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate((self.levels[h], items))
+        self.count += other.count
+        self._compress()
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "count": self.count, "levels": [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["k"])
+        sketch.count = data["count"]
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data["levels"]]
+        return sketch
+
+
+class AllanDeviation:
+    """按倍频程 τ 的非重叠 Allan 偏差累加器。
+
+    输入视为间隔 ``sample_interval`` 的等间隔样本，先每 ``base`` 个求平均得到
+    τ0 = base · sample_interval 的平均值序列；第 k 级由第 k-1 级相邻两个平均值
+    再平均得到（τ = τ0 · 2^k）。每级只保存未配对的部分和、上一个平均值和相邻
+    差值平方和，内存为 O(levels)。
+
+    ``update`` 传入时间戳时，相邻样本间隔超过 1.5 个采样间隔或时间倒退（采集
+    停止后重启、FIFO 溢出丢样、会话恢复后驱动时间轴重新开始）即开始新的一段：
+    丢弃未完成的平均与各级待配对值，差值只在段内计算，各段的平方和继续累加。
+    """
+
+    def __init__(self, sample_interval: float, base: int = 1, levels: int = 24):
+        self.sample_interval = sample_interval
+        self.base = max(1, int(base))
+        self.levels = levels
+        self._base_sum = 0.0
+        self._base_n = 0
+        self._pending: list[float | None] = [None] * levels  # 等待配对的平均值
+        self._last: list[float | None] = [None] * levels  # 上一个完整平均值
+        self._sumsq = [0.0] * levels
+        self._count = [0] * levels
+        self._last_t: float | None = None
+
+    @property
+    def tau0(self) -> float:
+        return self.base * self.sample_interval
+
+    def update(self, values, t=None):
+        v = np.asarray(values, dtype=np.float64).ravel()
+        if not len(v):
+            return
+        if t is None:
+            self._append(v)
+            return
+        t = np.asarray(t, dtype=np.float64).ravel()
+        dt = np.diff(t, prepend=t[0] if self._last_t is None else self._last_t)
+        start = 0
+        for gap in np.flatnonzero((dt > 1.5 * self.sample_interval) | (dt < 0)):
+            self._append(v[start:gap])
+            self._new_segment()
+            start = gap
+        self._append(v[start:])
+        self._last_t = float(t[-1])
+
+    def _new_segment(self):
+        self._base_sum, self._base_n = 0.0, 0
+        self._pending = [None] * self.levels
+        self._last = [None] * self.levels
+
+    def _append(self, v: np.ndarray):
+        if not len(v):
+            return
+        # 先补满上次剩下的不完整基础平均
+        if self._base_n:
+            take = min(len(v), self.base - self._base_n)
+            self._base_sum += float(v[:take].sum())
+            self._base_n += take
+            v = v[take:]
+            if self._base_n < self.base:
+                return
+            self._feed(0, np.array([self._base_sum / self.base]))
+            self._base_sum, self._base_n = 0.0, 0
+        full = len(v) // self.base * self.base
+        if full:
+            self._feed(0, v[:full].reshape(-1, self.base).mean(axis=1))
+        rest = v[full:]
+        self._base_sum = float(rest.sum())
+        self._base_n = len(rest)
+
+    def _feed(self, level: int, averages: np.ndarray):
+        while len(averages) and level < self.levels:
+            last = self._last[level]
+            chain = averages if last is None else np.concatenate(([last], averages))
+            diffs = np.diff(chain)
+            self._sumsq[level] += float(np.dot(diffs, diffs))
+            self._count[level] += len(diffs)
+            self._last[level] = float(averages[-1])
+            pending = self._pending[level]
+            if pending is not None:
+                averages = np.concatenate(([pending], averages))
+            pairs = len(averages) // 2 * 2
+            self._pending[level] = float(averages[-1]) if len(averages) % 2 else None
+            averages = averages[:pairs].reshape(-1, 2).mean(axis=1)
+            level += 1
+
+    def deviations(self) -> list[tuple[float, float]]:
+        """返回 [(τ, σ_y(τ))]，只包含至少有一个差值的级。"""
+        return [
+            (self.tau0 * 2 ** level, math.sqrt(0.5 * self._sumsq[level] / self._count[level]))
+            for level in range(self.levels)
+            if self._count[level]
+        ]
+
+    def at(self, tau: float) -> tuple[float, float]:
+        """最接近 ``tau`` 的倍频程上的 (τ, σ_y)，没有数据时为 NaN。"""
+        points = self.deviations()
+        if not points:
+            return float("nan"), float("nan")
+        return min(points, key=lambda p: abs(math.log(p[0] / tau)))
+
+    def to_dict(self) -> dict:
+        return {
+            "sample_interval": self.sample_interval,
+            "base": self.base,
+            "levels": self.levels,
+            "base_sum": self._base_sum,
+            "base_n": self._base_n,
+            "pending": self._pending,
+            "last": self._last,
+            "sumsq": self._sumsq,
+            "count": self._count,
+            "last_t": self._last_t,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AllanDeviation":
+        adev = cls(data["sample_interval"], data["base"], data["levels"])
+        adev._base_sum = data["base_sum"]
+        adev._base_n = data["base_n"]
+        adev._pending = list(data["pending"])
+        adev._last = list(data["last"])
+        adev._sumsq = list(data["sumsq"])
+        adev._count = list(data["count"])
+        adev._last_t = data.get("last_t")
+        return adev
+
+
+class ChannelStatistics:
+    """单个通道的在线统计：``RunningStats`` + ``QuantileSketch``，可选 ``AllanDeviation``。"""
+
+    def __init__(self, allan: AllanDeviation | None = None, sketch_k: int = 200):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(sketch_k)
+        self.allan = allan
+
+    def update(self, values, t=None):
+        self.stats.update(values)
+        self.sketch.update(values)
+        if self.allan is not None:
+            self.allan.update(values, t)
+
+    def summary(self, quantiles: tuple[float, ...] = (0.05, 0.5, 0.95)) -> dict:
+        s = self.stats
+        result = {
+            "count": s.count,
+            "mean": s.mean if s.count else float("nan"),
+            "std": s.std,
+            "min": s.min if s.count else float("nan"),
+            "max": s.max if s.count else float("nan"),
+        }
+        for q in quantiles:
+            result[f"p{round(q * 100):02d}"] = self.sketch.quantile(q)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "stats": self.stats.to_dict(),
+            "sketch": self.sketch.to_dict(),
+            "allan": self.allan.to_dict() if self.allan is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChannelStatistics":
+        channel = cls()
+        channel.stats = RunningStats.from_dict(data["stats"])
+        channel.sketch = QuantileSketch.from_dict(data["sketch"])
+        channel.allan = AllanDeviation.from_dict(data["allan"]) if data.get("allan") else None
+        return channel
+
+
+class SessionStatistics:
+    """一次样机装调的全部在线统计，按通道名组织，线程安全。
+
+    采集线程与 GUI 线程都可以调用 ``update``；``to_dict`` 供会话检查点序列化，
+    ``from_dict`` 从恢复的检查点重建。汇总的代价只与通道数有关，与样本总数无关。
+    """
+
+    def __init__(self):
+        self.channels: dict[str, ChannelStatistics] = {}
+        self._lock = threading.Lock()
+
+    def channel(self, name: str, allan: AllanDeviation | None = None) -> ChannelStatistics:
+        """返回（必要时创建）通道；已存在时忽略 ``allan``。"""
+        with self._lock:
+            channel = self.channels.get(name)
+            if channel is None:
+                channel = self.channels[name] = ChannelStatistics(allan)
+            return channel
+
+    def update(self, name: str, values, t=None):
+        """``t`` 为样本时间戳，供 Allan 偏差识别采集中断；省略时按连续样本处理。"""
+        channel = self.channels.get(name) or self.channel(name)
+        with self._lock:
+            channel.update(values, t)
+
+    def summary(self, name: str) -> dict | None:
+        with self._lock:
+            channel = self.channels.get(name)
+            return channel.summary() if channel is not None else None
+
+    def allan(self, name: str) -> list[tuple[float, float]]:
+        with self._lock:
+            channel = self.channels.get(name)
+            return channel.allan.deviations() if channel is not None and channel.allan is not None else []
+
+    def allan_at(self, name: str, tau: float) -> tuple[float, float]:
+        with self._lock:
+            channel = self.channels.get(name)
+            if channel is None or channel.allan is None:
+                return float("nan"), float("nan")
+            return channel.allan.at(tau)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {name: channel.to_dict() for name, channel in self.channels.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "SessionStatistics":
+        stats = cls()
+        for name, channel in (data or {}).items():
+            stats.channels[name] = ChannelStatistics.from_dict(channel)
+        return stats
+
+
+__all__ = [
+    "RunningStats",
+    "QuantileSketch",
+    "AllanDeviation",
+    "ChannelStatistics",
+    "SessionStatistics",
+]
@@ -0,0 +1,387 @@
+# task_scheduler.py
+# 后台任务调度：进程池跑计算、线程池跑 I/O，按当前步骤排优先级，结果通过 Qt 信号回到界面
+
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
+
+from PyQt6 import QtCore
+
+from logic.instrumentation import TRACER
+
+CPU = "cpu"
+IO = "io"
+
+
+class TaskHandle(QtCore.QObject):
+    """一次提交的任务。信号总是在 GUI 线程中发出。"""
+
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+    cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, task_id: int, step: str | None, kind: str, cancel_on_leave: bool, session: str | None = None):
+        super().__init__()
+        self.task_id = task_id
+        self.step = step
+        self.kind = kind
+        self.session = session
+        self.cancel_on_leave = cancel_on_leave
+        self.state = "pending"  # pending / running / done / failed / cancelled
+        self.name = ""
+        self.submitted_at = time.perf_counter()
+        self.started_at = 0.0
+        self._scheduler: "TaskScheduler | None" = None
+        self._call: tuple[Callable, tuple, dict] | None = None
+        self._future: concurrent.futures.Future | None = None
+
+    def cancel(self):
+        if self._scheduler is not None:
+            self._scheduler.cancel(self)
+
+    def is_done(self) -> bool:
+        return self.state in ("done", "failed", "cancelled")
+
+
+class TaskScheduler(QtCore.QObject):
+    """带优先级的后台任务调度器。
+
+    ``cpu`` 任务在进程池（spawn 启动，避免 fork 出带 Qt 状态的子进程）中运行，
+    函数与参数必须可 pickle；``io`` 任务在线程池中运行。每类任务同时最多
+    ``max_inflight`` 个交给执行器，其余在优先队列中等待：属于当前步骤的任务
+    优先，其次是不属于任何步骤的任务，最后是其他步骤的任务。切换步骤时，离开
+    的步骤中 ``cancel_on_leave`` 为真的任务会被取消；已在运行的进程任务无法
+    中断，其结果会被丢弃。
+
+    多个工位共用一个调度器时，每个工位通过 ``session`` 取得自己的
+    ``SchedulerSession``：当前步骤按工位分别记录，切换步骤只影响本工位的任务；
+    ``max_inflight`` 限制单个工位同时占用的执行器槽位，超出的任务留在队列中，
+    让其他工位的任务先执行。
+    """
+
+    _done = QtCore.pyqtSignal(object, object, object)  # handle, result, error
+
+    def __init__(
+        self,
+        cpu_workers: int | None = None,
+        io_workers: int = 4,
+        max_inflight: int | None = None,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.cpu_workers = cpu_workers or max(1, (multiprocessing.cpu_count() or 2) - 1)
+        self.io_workers = io_workers
+        self.max_inflight = {
+            CPU: max_inflight or self.cpu_workers,
+            IO: max_inflight or io_workers,
+        }
+        self._active_steps: dict[str | None, str | None] = {}
+        self._session_limits: dict[str, int] = {}
+        self._process_pool: concurrent.futures.ProcessPoolExecutor | None = None
+        self._thread_pool: concurrent.futures.ThreadPoolExecutor | None = None
+        self._queues: dict[str, list] = {CPU: [], IO: []}
+        self._inflight: dict[str, set[TaskHandle]] = {CPU: set(), IO: set()}
+        self._ids = itertools.count(1)
+        self._closed = False
+        # 显式排队：即使在 submit 中同步失败，信号也会在调用方连接之后才发出
+        self._done.connect(self._on_done, QtCore.Qt.ConnectionType.QueuedConnection)
+
+    # -- executors ----------------------------------------------------------
+
+    def _executor(self, kind: str) -> concurrent.futures.Executor:
+        if kind == CPU:
+            if self._process_pool is None:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    self.cpu_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(self.io_workers, thread_name_prefix="task-io")
+        return self._thread_pool
+
+    def shutdown(self):
+        # 仍在运行的任务不等待；它们结束时调度器可能已随页面销毁，不再回发结果
+        self._closed = True
+        for kind in (CPU, IO):
+            for entry in self._queues[kind]:
+                entry[-1].state = "cancelled"
+            self._queues[kind].clear()
+        for pool in (self._process_pool, self._thread_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._process_pool = None
+        self._thread_pool = None
+
+    # -- sessions -----------------------------------------------------------
+
+    @property
+    def active_step(self) -> str | None:
+        return self._active_steps.get(None)
+
+    def session(self, name: str, max_inflight: int | None = None) -> "SchedulerSession":
+        """返回工位 ``name`` 的调度视图；``max_inflight`` 为该工位每类任务的并发上限。"""
+        if max_inflight is None:
+            self._session_limits.pop(name, None)
+        else:
+            self._session_limits[name] = max(1, max_inflight)
+        return SchedulerSession(self, name)
+
+    def _session_full(self, handle: TaskHandle) -> bool:
+        limit = self._session_limits.get(handle.session)
+        if limit is None:
+            return False
+        return sum(1 for h in self._inflight[handle.kind] if h.session == handle.session) >= limit
+
+    # -- submission ---------------------------------------------------------
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        kind: str = CPU,
+        step: str | None = None,
+        cancel_on_leave: bool = True,
+        session: str | None = None,
+        **kwargs,
+    ) -> TaskHandle:
+        """提交任务并返回 ``TaskHandle``；``step`` 为 None 时任务不随步骤切换取消。"""
+        handle = TaskHandle(next(self._ids), step, kind, cancel_on_leave and step is not None, session)
+        handle._scheduler = self
+        handle._call = (fn, args, kwargs)
+        handle.name = getattr(fn, "__qualname__", type(fn).__name__)
+        heapq.heappush(self._queues[kind], [self._priority(step, session), handle.task_id, handle])
+        self._dispatch(kind)
+        return handle
+
+    def _priority(self, step: str | None, session: str | None = None) -> int:
+        if step is not None and step == self._active_steps.get(session):
+            return 0
+        return 1 if step is None else 2
+
+    def _dispatch(self, kind: str):
+        queue = self._queues[kind]
+        inflight = self._inflight[kind]
+        deferred = []
+        while queue and len(inflight) < self.max_inflight[kind]:
+            entry = heapq.heappop(queue)
+            handle = entry[-1]
+            if handle.state != "pending":
+                continue
+            if self._session_full(handle):
+                # 该工位已占满自己的份额，留给其他工位的任务
+                deferred.append(entry)
+                continue
+            fn, args, kwargs = handle._call
+            handle._call = None
+            handle.state = "running"
+            handle.started_at = time.perf_counter()
+            inflight.add(handle)
+            try:
+                future = self._executor(kind).submit(fn, *args, **kwargs)
+            except concurrent.futures.BrokenExecutor as exc:
+                # 工作进程异常退出后执行器不可再用，丢弃它以便下次重建
+                if kind == CPU:
+                    self._process_pool = None
+                else:
+                    self._thread_pool = None
+                self._done.emit(handle, None, exc)
+                continue
+            handle._future = future
+            future.add_done_callback(lambda f, h=handle: self._emit_done(h, f))
+        for entry in deferred:
+            heapq.heappush(queue, entry)
+
+    def _emit_done(self, handle: TaskHandle, future: concurrent.futures.Future):
+        # 运行在执行器的回调线程中，通过排队信号切回 GUI 线程
+        if self._closed:
+            return
+        if future.cancelled():
+            self._done.emit(handle, None, concurrent.futures.CancelledError())
+            return
+        error = future.exception()
+        self._done.emit(handle, None if error else future.result(), error)
+
+    def _on_done(self, handle: TaskHandle, result, error):
+        self._inflight[handle.kind].discard(handle)
+        if TRACER.enabled and handle.started_at:
+            wait_ms = (handle.started_at - handle.submitted_at) * 1000.0
+            TRACER.complete(f"task.{handle.name}", handle.started_at, time.perf_counter(), "task", {"wait_ms": wait_ms})
+        if handle.state == "running":
+            if isinstance(error, concurrent.futures.CancelledError):
+                handle.state = "cancelled"
+                handle.cancelled.emit()
+            elif error is not None:
+                handle.state = "failed"
+                message = "".join(traceback.format_exception_only(type(error), error)).strip()
+                handle.failed.emit(message)
+            else:
+                handle.state = "done"
+                handle.finished.emit(result)
+        self._dispatch(handle.kind)
+
+    # -- cancellation & priority --------------------------------------------
+
+    def cancel(self, handle: TaskHandle):
+        if handle.is_done():
+            return
+        previous = handle.state
+        handle.state = "cancelled"
+        if previous == "running" and handle._future is not None:
+            handle._future.cancel()
+        handle.cancelled.emit()
+
+    def set_active_step(self, step: str | None, session: str | None = None):
+        """切换 ``session`` 的当前步骤：取消其离开步骤的任务，并重排等待队列的优先级。"""
+        leaving = self._active_steps.get(session)
+        if step == leaving:
+            return
+        self._active_steps[session] = step
+        self._cancel_where(lambda h: h.session == session and h.cancel_on_leave and h.step == leaving)
+
+    def cancel_session(self, session: str):
+        """取消工位的全部等待与运行中的任务（工位关闭时调用）。"""
+        self._active_steps.pop(session, None)
+        self._session_limits.pop(session, None)
+        self._cancel_where(lambda h: h.session == session)
+
+    def _cancel_where(self, predicate: Callable[[TaskHandle], bool]):
+        for kind in (CPU, IO):
+            queue = self._queues[kind]
+            for entry in queue:
+                handle = entry[-1]
+                if handle.state == "pending" and predicate(handle):
+                    self.cancel(handle)
+                entry[0] = self._priority(handle.step, handle.session)
+            self._queues[kind] = [e for e in queue if e[-1].state == "pending"]
+            heapq.heapify(self._queues[kind])
+            for handle in list(self._inflight[kind]):
+                if predicate(handle):
+                    self.cancel(handle)
+
+    def pending_count(self, kind: str | None = None, session: str | None = None) -> int:
+        kinds = (kind,) if kind else (CPU, IO)
+        return sum(1 for k in kinds for e in self._queues[k] if session is None or e[-1].session == session)
+
+    def running_count(self, kind: str | None = None, session: str | None = None) -> int:
+        kinds = (kind,) if kind else (CPU, IO)
+        return sum(1 for k in kinds for h in self._inflight[k] if session is None or h.session == session)
+
+
+class SchedulerSession:
+    """一个工位在共享 ``TaskScheduler`` 上的视图，接口与调度器相同。
+
+    提交的任务都带上工位名，``set_active_step`` 只影响本工位的任务，
+    ``shutdown`` 只取消本工位的任务，不关闭共享的执行器。
+    """
+
+    def __init__(self, scheduler: TaskScheduler, name: str):
+        self.scheduler = scheduler
+        self.name = name
+
+    @property
+    def active_step(self) -> str | None:
+        return self.scheduler._active_steps.get(self.name)
+
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        kind: str = CPU,
+        step: str | None = None,
+        cancel_on_leave: bool = True,
+        **kwargs,
+    ) -> TaskHandle:
+        return self.scheduler.submit(
+            fn, *args, kind=kind, step=step, cancel_on_leave=cancel_on_leave, session=self.name, **kwargs
+        )
+
+    def set_active_step(self, step: str | None):
+        self.scheduler.set_active_step(step, session=self.name)
+
+    def pending_count(self, kind: str | None = None) -> int:
+        return self.scheduler.pending_count(kind, session=self.name)
+
+    def running_count(self, kind: str | None = None) -> int:
+        return self.scheduler.running_count(kind, session=self.name)
+
+    def shutdown(self):
+        self.scheduler.cancel_session(self.name)
+
+
+class UiWatchdog(QtCore.QObject):
+    """界面响应看门狗。
+
+    GUI 线程上的定时器每 ``interval_ms`` 记录一次心跳；后台线程发现心跳超过
+    ``stall_ms`` 未更新时，记录一次卡顿告警并附带 GUI 线程当前的调用栈，事件
+    循环恢复后再记录卡顿总时长。
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval_ms: int = 50,
+        stall_ms: int = 250,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.logger = logger
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.stalls = 0
+        self.longest_stall_ms = 0.0
+        self._last_beat = time.perf_counter()
+        self._gui_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._last_beat = time.perf_counter()
+        self._gui_thread_id = threading.get_ident()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _beat(self):
+        self._last_beat = time.perf_counter()
+
+    def _watch(self):
+        in_stall = False
+        stall_start = 0.0
+        while not self._stop.wait(self.interval_ms / 1000.0):
+            last = self._last_beat
+            lag_ms = (time.perf_counter() - last) * 1000.0
+            if lag_ms > self.stall_ms and not in_stall:
+                in_stall = True
+                stall_start = last
+                frame = sys._current_frames().get(self._gui_thread_id)
+                stack = "".join(traceback.format_stack(frame, limit=8)) if frame is not None else ""
+                self.logger.warning("界面事件循环卡顿超过 %.0f ms\n%s", lag_ms, stack.rstrip())
+            elif in_stall and last > stall_start:
+                in_stall = False
+                duration = (last - stall_start) * 1000.0
+                self.stalls += 1
+                self.longest_stall_ms = max(self.longest_stall_ms, duration)
+                self.logger.warning("界面事件循环恢复，卡顿 %.0f ms", duration)
+
+
+__all__ = ["CPU", "IO", "TaskHandle", "TaskScheduler", "SchedulerSession", "UiWatchdog"]
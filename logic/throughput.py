@@ -0,0 +1,43 @@
+# throughput.py
+# 工位吞吐限制：令牌桶限制单个工位每秒处理的相机帧数，避免一个工位占满共享的界面线程
+
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 ``rate`` 个令牌，最多积攒 ``burst`` 个。
+
+    ``acquire`` 有令牌时取走一个并返回 0，否则不取并返回还需等待的秒数，调用方
+    据此推迟处理而不是忙等。``granted`` / ``deferred`` 统计放行与推迟的次数。
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._clock = clock
+        self._tokens = self.burst
+        self._last = clock()
+        self.granted = 0
+        self.deferred = 0
+
+    def set_rate(self, rate: float):
+        self._refill()
+        self.rate = rate
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.granted += 1
+            return 0.0
+        self.deferred += 1
+        return (1.0 - self._tokens) / self.rate
+
+
+__all__ = ["TokenBucket"]
@@ -0,0 +1,169 @@
+# visibility.py
+# 页面可见性管理：隐藏页面的界面更新直接丢弃，重新可见时立即补一次快照，并统计各页面的 CPU 时间与更新频率
+
+import contextlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PyQt6 import QtCore, QtWidgets
+
+
+@dataclass
+class PageActivity:
+    """一个页面的更新计数。``cpu_s`` 只统计 GUI 线程在该页面更新上花费的 CPU 时间。"""
+
+    name: str
+    active: bool = False
+    updates: int = 0
+    skipped: int = 0  # 页面不可见时丢弃的更新
+    cpu_s: float = 0.0
+    rate: float = 0.0  # 最近一个统计窗口的更新频率（次/秒）
+    resumes: int = 0
+    _window_start: float = 0.0
+    _window_updates: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "active": self.active,
+            "updates": self.updates,
+            "skipped": self.skipped,
+            "cpu_ms": self.cpu_s * 1000.0,
+            "rate": self.rate,
+            "resumes": self.resumes,
+        }
+
+
+class VisibilityManager(QtCore.QObject):
+    """按页面可见性开关界面更新。
+
+    ``register`` 的页面在显示/隐藏时（事件过滤器捕获，合并到下一次事件循环处理）
+    重新判断是否活动：页面可见且管理器没有被任何原因 ``suspend``（窗口最小化、
+    侧边栏动画期间等）。``gate`` 包装的回调只在页面活动时执行，否则只计数后丢弃；
+    页面从不活动变为活动时调用注册时的 ``on_resume``，用于立即补一次最新快照，
+    不必等下一次周期更新。活动页面集合变化时发出 ``changed``，调用方据此调低
+    无人观看时的采集/轮询频率。
+    """
+
+    changed = QtCore.pyqtSignal()
+
+    def __init__(self, rate_window: float = 1.0, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.rate_window = rate_window
+        self._suspend_reasons: set[str] = set()
+        self._pages: dict[QtWidgets.QWidget, PageActivity] = {}
+        self._on_resume: dict[QtWidgets.QWidget, list[Callable[[], None]]] = {}
+        self._refresh_pending = False
+
+    def register(
+        self, page: QtWidgets.QWidget, name: str, on_resume: Callable[[], None] | None = None
+    ) -> PageActivity:
+        activity = self._pages.get(page)
+        if activity is None:
+            activity = self._pages[page] = PageActivity(name, _window_start=time.perf_counter())
+            page.installEventFilter(self)
+            page.destroyed.connect(lambda _=None, p=page: self._forget(p))
+            self._schedule_refresh()
+        if on_resume is not None:
+            self._on_resume.setdefault(page, []).append(on_resume)
+        return activity
+
+    def _forget(self, page: QtWidgets.QWidget):
+        self._pages.pop(page, None)
+        self._on_resume.pop(page, None)
+
+    def is_active(self, page: QtWidgets.QWidget) -> bool:
+        activity = self._pages.get(page)
+        return activity is not None and activity.active
+
+    def any_active(self, pages) -> bool:
+        return any(self.is_active(page) for page in pages)
+
+    @contextlib.contextmanager
+    def track(self, page: QtWidgets.QWidget):
+        """把块内花费的 CPU 时间计入 ``page``；调用方应先用 ``is_active`` 判断。"""
+        activity = self._pages[page]
+        start = time.thread_time()
+        try:
+            yield activity
+        finally:
+            activity.cpu_s += time.thread_time() - start
+            activity.updates += 1
+            activity._window_updates += 1
+            now = time.perf_counter()
+            elapsed = now - activity._window_start
+            if elapsed >= self.rate_window:
+                activity.rate = activity._window_updates / elapsed
+                activity._window_start = now
+                activity._window_updates = 0
+
+    def gate(self, page: QtWidgets.QWidget, fn: Callable) -> Callable:
+        """返回只在 ``page`` 活动时调用 ``fn`` 的包装函数。"""
+
+        def gated(*args):
+            activity = self._pages.get(page)
+            if activity is None or not activity.active:
+                if activity is not None:
+                    activity.skipped += 1
+                return
+            with self.track(page):
+                fn(*args)
+
+        return gated
+
+    @property
+    def suspended(self) -> bool:
+        return bool(self._suspend_reasons)
+
+    def suspend(self, reason: str):
+        if reason not in self._suspend_reasons:
+            self._suspend_reasons.add(reason)
+            self.refresh()
+
+    def release(self, reason: str):
+        if reason in self._suspend_reasons:
+            self._suspend_reasons.discard(reason)
+            self.refresh()
+
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() in (QtCore.QEvent.Type.Show, QtCore.QEvent.Type.Hide):
+            self._schedule_refresh()
+        return False
+
+    def _schedule_refresh(self):
+        # 一次导航会让多个页面依次收到显示/隐藏事件，合并为一次重新判断
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QtCore.QTimer.singleShot(0, self.refresh)
+
+    def refresh(self):
+        self._refresh_pending = False
+        resumed: list[QtWidgets.QWidget] = []
+        changed = False
+        for page, activity in self._pages.items():
+            active = not self.suspended and page.isVisible()
+            if active == activity.active:
+                continue
+            changed = True
+            activity.active = active
+            activity.rate = 0.0
+            activity._window_start = time.perf_counter()
+            activity._window_updates = 0
+            if active:
+                resumed.append(page)
+        for page in resumed:
+            self._pages[page].resumes += 1
+            for callback in self._on_resume.get(page, ()):
+                with self.track(page):
+                    callback()
+        if changed:
+            self.changed.emit()
+
+    def report(self) -> list[dict]:
+        """各页面计数，活动页面在前，其余按 CPU 时间降序。"""
+        activities = sorted(self._pages.values(), key=lambda a: (not a.active, -a.cpu_s))
+        return [activity.to_dict() for activity in activities]
+
+
+__all__ = ["PageActivity", "VisibilityManager"]
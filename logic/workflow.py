@@ -0,0 +1,225 @@
+# workflow.py
+# 装调流程定义：从 JSON 文件加载步骤树与各步骤的限值规则，预先建立索引；步骤切换时调用进入/离开钩子并按需启停采集引擎
+
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from logic.limits import LimitRule
+
+WORKFLOW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "workflows")
+# 样机类型 -> 流程文件；未知类型使用默认流程
+WORKFLOW_FILES = {"样机A": "prototype_a.json", "样机B": "prototype_b.json"}
+DEFAULT_WORKFLOW = "prototype_a.json"
+
+# 页面类型
+PLACEHOLDER = "placeholder"
+COMMON = "common"
+CAMERA = "camera"
+SUMMARY = "summary"
+REPORT = "report"  # 交付报告生成
+GROUP = "group"
+PAGE_KINDS = (PLACEHOLDER, COMMON, CAMERA, SUMMARY, REPORT, GROUP)
+
+# 采集引擎
+POWER_ENGINE = "power"
+CAMERA_ENGINE = "camera"
+TRANSMITTER_ENGINE = "transmitter"
+ENGINE_LABELS = {POWER_ENGINE: "功率计", CAMERA_ENGINE: "相机", TRANSMITTER_ENGINE: "发射机"}
+
+# 步骤上的分析
+COAX_ANALYSIS = "coax"  # 每帧光斑分析，记录相对参考光斑的偏移
+POWER_TEST_ANALYSIS = "power_test"  # 功率归档表格与进入时的趋势拟合
+ANALYSES = (COAX_ANALYSIS, POWER_TEST_ANALYSIS)
+ALIGNMENT_OBJECTIVES = ("power", "offset")
+
+
+@dataclass(eq=False)
+class WorkflowStep:
+    """流程中的一个步骤。有 ``children`` 的步骤是分组，本身只显示子步骤导航。"""
+
+    name: str
+    page: str = PLACEHOLDER
+    engines: frozenset[str] = frozenset()
+    alignment: str | None = None  # 自动对准目标："power" / "offset"
+    analysis: str | None = None
+    description: str = ""
+    limits: tuple[LimitRule, ...] = ()  # 本步骤启用的限值规则
+    children: list["WorkflowStep"] = field(default_factory=list)
+    parent: "WorkflowStep | None" = field(default=None, repr=False)
+    index: int = 0  # 在兄弟步骤中的序号
+
+    @property
+    def path(self) -> str:
+        return self.name if self.parent is None else f"{self.parent.path}/{self.name}"
+
+    @property
+    def title(self) -> str:
+        return self.name if self.parent is None else f"{self.parent.name} - {self.name}"
+
+    @property
+    def is_group(self) -> bool:
+        return bool(self.children)
+
+    @classmethod
+    def from_dict(cls, data: dict, parent: "WorkflowStep | None" = None, index: int = 0) -> "WorkflowStep":
+        name = data["name"]
+        children = data.get("children") or []
+        page = data.get("page", GROUP if children else PLACEHOLDER)
+        if page not in PAGE_KINDS:
+            raise ValueError(f"步骤 {name}：未知页面类型 {page}")
+        if (page == GROUP) != bool(children):
+            raise ValueError(f"步骤 {name}：只有分组步骤可以包含子步骤")
+        if children and parent is not None:
+            raise ValueError(f"步骤 {name}：最多支持两级步骤")
+        engines = frozenset(data.get("engines", ()))
+        if engines - ENGINE_LABELS.keys():
+            raise ValueError(f"步骤 {name}：未知引擎 {sorted(engines - ENGINE_LABELS.keys())}")
+        alignment = data.get("alignment")
+        if alignment is not None and (alignment not in ALIGNMENT_OBJECTIVES or page != COMMON):
+            raise ValueError(f"步骤 {name}：自动对准只能是 {ALIGNMENT_OBJECTIVES} 且用于 common 页面")
+        analysis = data.get("analysis")
+        if analysis is not None and analysis not in ANALYSES:
+            raise ValueError(f"步骤 {name}：未知分析 {analysis}")
+        if data.get("limits") and children:
+            raise ValueError(f"步骤 {name}：限值规则只能定义在子步骤上")
+        limits = tuple(
+            LimitRule.from_dict(rule, f"{name}/{rule.get('channel', '')}") for rule in data.get("limits", ())
+        )
+        if len({rule.name for rule in limits}) != len(limits):
+            raise ValueError(f"步骤 {name}：限值规则名称重复")
+        step = cls(
+            name, page, engines, alignment, analysis, data.get("description", ""), limits, parent=parent, index=index
+        )
+        step.children = [cls.from_dict(child, step, i) for i, child in enumerate(children)]
+        return step
+
+
+class Workflow:
+    """一个样机类型的装调流程。
+
+    构造时建立名称与路径到序号的映射，导航时按名称或路径查找都是 O(1)；
+    步骤路径为 ``"分组/子步骤"``，顶层步骤的路径就是其名称。
+    """
+
+    def __init__(self, name: str, steps: list[WorkflowStep], prototype_type: str = ""):
+        self.name = name
+        self.prototype_type = prototype_type
+        self.steps = steps
+        self.step_names = [step.name for step in steps]
+        self._index: dict[str, int] = {step.name: i for i, step in enumerate(steps)}
+        self._by_path: dict[str, WorkflowStep] = {}
+        for step in self.walk():
+            if step.path in self._by_path:
+                raise ValueError(f"流程 {name}：步骤重复 {step.path}")
+            self._by_path[step.path] = step
+
+    def index(self, name: str) -> int:
+        """顶层步骤的序号，不存在时为 -1。"""
+        return self._index.get(name, -1)
+
+    def step(self, path: str) -> WorkflowStep | None:
+        return self._by_path.get(path)
+
+    def leaf(self, step_idx: int, sub_idx: int = 0) -> WorkflowStep:
+        """实际显示的步骤：分组步骤返回其第 ``sub_idx`` 个子步骤。"""
+        step = self.steps[step_idx]
+        return step.children[sub_idx] if step.children else step
+
+    def locate(self, path: str) -> tuple[int, int | None]:
+        """返回 (顶层序号, 子步骤序号)；顶层步骤的子步骤序号为 None。"""
+        step = self._by_path[path]
+        if step.parent is None:
+            return step.index, None
+        return step.parent.index, step.index
+
+    def walk(self) -> Iterator[WorkflowStep]:
+        for step in self.steps:
+            yield step
+            yield from step.children
+
+    def leaves(self) -> Iterator[WorkflowStep]:
+        return (step for step in self.walk() if not step.children)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Workflow":
+        steps = [WorkflowStep.from_dict(step, index=i) for i, step in enumerate(data["steps"])]
+        if not steps:
+            raise ValueError("流程中没有步骤")
+        return cls(data.get("name", ""), steps, data.get("prototype_type", ""))
+
+
+def load_workflow(path: str) -> Workflow:
+    with open(path, encoding="utf-8") as f:
+        return Workflow.from_dict(json.load(f))
+
+
+def workflow_for(prototype_type: str) -> Workflow:
+    """按样机类型加载流程文件。"""
+    return load_workflow(os.path.join(WORKFLOW_DIR, WORKFLOW_FILES.get(prototype_type, DEFAULT_WORKFLOW)))
+
+
+class StepHooks:
+    """步骤切换时的进入/离开钩子与采集引擎启停。
+
+    每个步骤声明自己需要的引擎；切换时先调用旧步骤的离开钩子，再停止新步骤
+    不需要的引擎、启动新需要的引擎，最后调用新步骤的进入钩子。两个步骤都需要的
+    引擎保持运行，不会被重启。``transition(None)`` 停止全部引擎。
+    """
+
+    def __init__(self):
+        self._engines: dict[str, tuple[Callable[[], None], Callable[[], None]]] = {}
+        self._enter: dict[str, list[Callable[[WorkflowStep], None]]] = {}
+        self._exit: dict[str, list[Callable[[WorkflowStep], None]]] = {}
+        self.current: WorkflowStep | None = None
+        self.running: frozenset[str] = frozenset()
+
+    def register_engine(self, name: str, start: Callable[[], None], stop: Callable[[], None]):
+        self._engines[name] = (start, stop)
+
+    def on_enter(self, path: str, hook: Callable[[WorkflowStep], None]):
+        self._enter.setdefault(path, []).append(hook)
+
+    def on_exit(self, path: str, hook: Callable[[WorkflowStep], None]):
+        self._exit.setdefault(path, []).append(hook)
+
+    def transition(self, step: WorkflowStep | None):
+        old = self.current
+        if step is old:
+            return
+        if old is not None:
+            for hook in self._exit.get(old.path, ()):
+                hook(old)
+        self.current = step
+        required = (step.engines if step is not None else frozenset()) & self._engines.keys()
+        for name in self.running - required:
+            self._engines[name][1]()
+        for name in required - self.running:
+            self._engines[name][0]()
+        self.running = frozenset(required)
+        if step is not None:
+            for hook in self._enter.get(step.path, ()):
+                hook(step)
+
+
+__all__ = [
+    "WORKFLOW_DIR",
+    "PLACEHOLDER",
+    "COMMON",
+    "CAMERA",
+    "SUMMARY",
+    "REPORT",
+    "GROUP",
+    "POWER_ENGINE",
+    "CAMERA_ENGINE",
+    "TRANSMITTER_ENGINE",
+    "ENGINE_LABELS",
+    "COAX_ANALYSIS",
+    "POWER_TEST_ANALYSIS",
+    "WorkflowStep",
+    "Workflow",
+    "load_workflow",
+    "workflow_for",
+    "StepHooks",
+]
@@ -1,19 +1,131 @@
-# main.py
 import sys
-from PyQt6.QtWidgets import QApplication
+import time
 
-from logic.initial_page_logic import InitialPage   # 导入刚才写的逻辑页面
+_PROCESS_START = time.perf_counter()
+
+import argparse  # noqa: E402
+import contextlib  # noqa: E402
+
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(description="样机装调")
+    parser.add_argument("--profile-startup", action="store_true", help="输出导入与界面构建的耗时明细")
+    parser.add_argument("--profile-json", metavar="PATH", help="同时把启动剖析结果写入 JSON 文件")
+    parser.add_argument("--quit-after-startup", action="store_true", help="首次绘制后立即退出（用于基准测试）")
+    parser.add_argument("--no-warmup", action="store_true", help="不在后台预加载装调主页面")
+    parser.add_argument("--trace", metavar="PATH", help="启用性能跟踪，退出时把 Chrome trace JSON 写入该文件")
+    parser.add_argument("--stations", action="store_true", help="多工位模式：多个样机在同一窗口的标签页中并行装调")
+    parser.add_argument(
+        "--acquisition-process",
+        action="store_true",
+        help="功率计与相机驱动在独立的工作进程中运行，驱动卡死或崩溃时自动重启，不影响界面",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="SOURCE",
+        help="回放/仿真模式：预设负载剖面（nominal / heavy）、剖面 JSON 文件或录制的会话文件（.sqlite）",
+    )
+    parser.add_argument("--speed", default="1", help="回放速度：1 为实时，N 为 N 倍速，max 为尽快回放")
+    parser.add_argument("--replay-report", metavar="PATH", help="回放结束时把吞吐与延迟指标写入 JSON 文件")
+    parser.add_argument("--quit-after-replay", action="store_true", help="回放结束后退出（用于基准测试）")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, argv[:1] + qt_args
 
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_argv = parse_args(sys.argv)
+
+    profiler = None
+    if args.profile_startup or args.profile_json:
+        from logic.startup_profile import StartupProfiler
+
+        profiler = StartupProfiler(origin=_PROCESS_START)
+        profiler.install()
+
+    def phase(name: str):
+        return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+    with phase("import PyQt6"):
+        from PyQt6.QtWidgets import QApplication
+    with phase("import InitialPage"):
+        from logic.initial_page_logic import InitialPage   # 导入刚才写的逻辑页面
+
+    with phase("QApplication()"):
+        app = QApplication(qt_argv)
+
+    if args.trace:
+        from logic.instrumentation import TRACER
+
+        TRACER.enabled = True
+        app.aboutToQuit.connect(lambda: TRACER.export_chrome_trace(args.trace))
+
+    if args.replay:
+        sys.exit(_run_replay(args, app))
 
     # 创建“开始装调”页面
-    window = InitialPage()
-    window.show()
+    with phase("InitialPage()"):
+        window = InitialPage(multi_station=args.stations, acquisition_process=args.acquisition_process)
+    with phase("InitialPage.show()"):
+        window.show()
+
+    if profiler is not None:
+        profiler.mark("InitialPage.show()")
+        window.first_painted.connect(lambda: _finish_profile(profiler, args, app))
+    elif args.quit_after_startup:
+        window.first_painted.connect(app.quit)
+
+    if not args.no_warmup:
+        # 首帧之后再在后台预加载装调主页面，不与启动抢占
+        window.first_painted.connect(window.start_warm_up)
 
     sys.exit(app.exec())
 
 
+def _run_replay(args, app) -> int:
+    """回放模式：不经过开始页面，直接打开由回放数据驱动的装调主页面。"""
+    import json
+
+    from logic.replay import ReplayController, parse_speed
+
+    try:
+        controller = ReplayController.from_source(args.replay, speed=parse_speed(args.speed))
+    except (OSError, ValueError) as exc:
+        print(f"无法开始回放：{exc}", file=sys.stderr)
+        return 2
+    window = controller.create_page()
+    window.setWindowTitle(f"装调主页面（回放：{controller.profile.name}）")
+    window.resize(1400, 900)
+    window.show()
+
+    def finished(report: dict):
+        print(
+            f"回放 {report['profile']}：虚拟 {report['virtual_s']:.1f} s / 墙钟 {report['wall_s']:.1f} s"
+            f"（{report['effective_speed']:.1f}×），功率 {report['power']['samples']:,} 样本，"
+            f"相机 {report['camera']['frames']:,} 帧，日志 {report['logs']:,} 行",
+            file=sys.stderr,
+        )
+        if args.replay_report:
+            with open(args.replay_report, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, ensure_ascii=False, indent=2)
+        if args.quit_after_replay:
+            window.close()
+            app.quit()
+
+    controller.finished.connect(finished)
+    app.aboutToQuit.connect(controller.stop)
+    controller.start()
+    return app.exec()
+
+
+def _finish_profile(profiler, args, app):
+    profiler.mark("first paint")
+    profiler.uninstall()
+    print(profiler.report(), file=sys.stderr)
+    if args.profile_json:
+        profiler.dump_json(args.profile_json)
+    if args.quit_after_startup:
+        app.quit()
+
+
 if __name__ == "__main__":
     main()
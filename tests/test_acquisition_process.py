@@ -0,0 +1,104 @@
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from logic.acquisition_process import RemotePowerMeter, SharedSampleRing
+from logic.power_meter import SimulatedPowerMeter
+
+
+@pytest.fixture
+def ring():
+    ring = SharedSampleRing(100)
+    yield ring
+    ring.close(unlink=True)
+
+
+def test_sample_ring_wraparound_and_lost_counting(ring):
+    rng = np.random.default_rng(0)
+    reader = SharedSampleRing(ring.capacity, ring.shm.name)
+    stream = np.arange(5000, dtype=np.float64)
+    written, since, received, lost_total = 0, 0, [], 0
+    try:
+        while written < len(stream):
+            n = int(rng.choice([1, 7, 37, 99, 100, 160, 333]))
+            block = stream[written:written + n]
+            ring.write(block * 1e-3, block)
+            written += len(block)
+            if rng.random() < 0.6:
+                t, v, end, lost = reader.read(since)
+                assert end == written
+                # 丢失的都是最早的样本，读到的是紧接其后的连续一段
+                np.testing.assert_array_equal(v, stream[since + lost:end])
+                np.testing.assert_array_equal(t, v * 1e-3)
+                assert len(v) <= ring.capacity
+                received.append(v)
+                lost_total += lost
+                since = end
+        t, v, end, lost = reader.read(since)
+        received.append(v)
+        lost_total += lost
+    finally:
+        reader.close()
+    assert end == ring.written == len(stream)
+    assert sum(len(v) for v in received) + lost_total == len(stream)
+    assert lost_total > 0
+
+
+def test_sample_ring_oversized_write(ring):
+    ring.write(np.arange(250.0), np.arange(250.0))
+    t, v, end, lost = ring.read(0)
+    assert (end, lost) == (250, 150)
+    np.testing.assert_array_equal(v, np.arange(150.0, 250.0))
+    ring.write(np.arange(30.0), np.arange(30.0))
+    t, v, end, lost = ring.read(end)
+    assert (end, lost, len(v)) == (280, 0, 30)
+    t, v, end, lost = ring.read(end)
+    assert (len(v), end, lost) == (0, 280, 0)
+
+
+def _read_until(meter, predicate, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    blocks = []
+    while time.monotonic() < deadline:
+        t, v = meter.read_block()
+        if len(v):
+            blocks.append((t, v))
+            if predicate(blocks):
+                return blocks
+    raise AssertionError("工作进程未在时限内送回样本")
+
+
+def test_remote_power_meter_with_simulated_driver():
+    driver = SimulatedPowerMeter(sample_rate=1000.0, block_interval=0.002, noise=0.0)
+    meter = RemotePowerMeter(driver, capacity=1 << 14)
+    try:
+        meter.open()
+        blocks = _read_until(meter, lambda blocks: sum(len(v) for _, v in blocks) >= 200)
+        t = np.concatenate([t for t, _ in blocks])
+        np.testing.assert_allclose(np.diff(t), 1e-3)
+        assert meter.dropped == 0
+
+        # 方法调用转发给工作进程中的驱动
+        meter.call("set_power", 5.0)
+        _read_until(meter, lambda blocks: blocks[-1][1][-1] > 4.0)
+
+        # 工作进程崩溃后由 supervise 重启，并按之前的打开状态重新打开设备继续送回样本
+        pid = meter.process.pid
+        os.kill(pid, signal.SIGTERM)
+        blocks = _read_until(meter, lambda blocks: meter.process.pid != pid and len(blocks) > 2)
+        assert meter.process.restarts == 1
+        t = blocks[-1][0]
+
+        # close 只关闭设备，工作进程保留；重新打开时不回放关闭前的旧样本
+        meter.close()
+        time.sleep(0.05)
+        meter.open()
+        (t2, _), = _read_until(meter, lambda blocks: True)
+        assert t2[0] > t[-1]
+        assert meter.process.restarts == 1
+    finally:
+        meter.shutdown()
+    assert not meter.process.is_alive()
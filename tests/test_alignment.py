@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from logic.alignment import MAXIMIZE_POWER, MINIMIZE_OFFSET, AlignmentOptimizer, SimulatedOpticalBench
+
+
+@pytest.mark.parametrize("budget", [12, 40, 150])
+def test_actuators_end_at_best_point(budget):
+    bench = SimulatedOpticalBench(seed=3)
+    result = AlignmentOptimizer(bench.axes, bench.objective(MAXIMIZE_POWER), maximize=True, budget=budget).run()
+    np.testing.assert_array_equal(bench.position, result.x)
+    assert result.final_value == pytest.approx(result.value, rel=0.02)
+    assert bench.read_power() == pytest.approx(result.value, rel=0.02)
+
+
+def test_cancelled_run_returns_to_best_point():
+    bench = SimulatedOpticalBench(seed=1)
+    optimizer = AlignmentOptimizer(bench.axes, bench.objective(MINIMIZE_OFFSET))
+
+    def progress(evaluations, best):
+        if evaluations == 20:
+            optimizer.cancel()
+
+    optimizer.progress = progress
+    result = optimizer.run()
+    assert result.reason == "cancelled"
+    assert result.evaluations == 20
+    np.testing.assert_array_equal(bench.position, result.x)
+
+
+def test_converges_near_optimum():
+    bench = SimulatedOpticalBench(n_axes=3, seed=0)
+    result = AlignmentOptimizer(bench.axes, bench.objective(MAXIMIZE_POWER), maximize=True).run()
+    assert result.converged or result.reason == "stalled"
+    assert np.linalg.norm(bench.position - bench.optimum) < 0.05
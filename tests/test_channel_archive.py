@@ -0,0 +1,164 @@
+import logging
+import os
+
+import numpy as np
+import pytest
+
+from logic.channel_archive import ArchiveReader, ChannelArchive
+from logic.ring_buffer import decimate_minmax
+
+CHUNK = 1024
+BLOCK = 64
+
+
+def _samples(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 1e-3
+    v = np.cumsum(rng.normal(size=n))
+    return t, v
+
+
+def _fill(path, n, seed=0, hot_chunks=1, batch=300):
+    t, v = _samples(n, seed)
+    archive = ChannelArchive(path, chunk_size=CHUNK, summary_block=BLOCK, hot_chunks=hot_chunks)
+    for pos in range(0, n, batch):
+        archive.append(t[pos:pos + batch], v[pos:pos + batch])
+    return archive, t, v
+
+
+def test_append_seal_compress_round_trip(tmp_path):
+    n = 5 * CHUNK + 123
+    archive, t, v = _fill(str(tmp_path), n)
+    assert len(archive) == n
+    assert archive.sealed_chunks == 5
+    archive.close()
+
+    names = set(os.listdir(tmp_path))
+    # 最近 1 个封存块与热块保持未压缩，更早的块压缩后删除原始文件
+    for chunk in range(4):
+        assert f"chunk_{chunk:06d}.z" in names
+        assert f"chunk_{chunk:06d}.raw" not in names
+    assert {"chunk_000004.raw", "chunk_000005.raw"} <= names
+    assert not any(name.endswith(".tmp") for name in names)
+
+    reopened = ChannelArchive(str(tmp_path), chunk_size=CHUNK, summary_block=BLOCK, hot_chunks=1)
+    try:
+        assert len(reopened) == n
+        rt, rv = reopened.read()
+        np.testing.assert_array_equal(rt, t)
+        np.testing.assert_array_equal(rv, v)
+        rt, rv = reopened.read(CHUNK - 10, 3 * CHUNK + 7)
+        np.testing.assert_array_equal(rv, v[CHUNK - 10:3 * CHUNK + 7])
+        index = reopened.chunk_index()
+        np.testing.assert_array_equal(index["vmin"], v[:5 * CHUNK].reshape(5, CHUNK).min(axis=1))
+        np.testing.assert_allclose(index["vsum"], v[:5 * CHUNK].reshape(5, CHUNK).sum(axis=1))
+    finally:
+        reopened.close()
+
+
+def test_read_while_compressing(tmp_path):
+    archive, t, v = _fill(str(tmp_path), 12 * CHUNK, hot_chunks=0, batch=CHUNK // 3)
+    try:
+        for start in range(0, 12 * CHUNK, 700):
+            _, rv = archive.read(start, start + 900)
+            np.testing.assert_array_equal(rv, v[start:start + 900])
+    finally:
+        archive.close()
+    assert not any(name.endswith(".raw") and name != "chunk_000012.raw" for name in os.listdir(tmp_path))
+
+
+@pytest.mark.parametrize("n_bins", [4, 40, 400])
+@pytest.mark.parametrize("bounds", [(0, None), (CHUNK // 2, None), (300, 4 * CHUNK + 50)])
+def test_read_minmax_envelope(tmp_path, n_bins, bounds):
+    n = 6 * CHUNK + 500
+    archive, t, v = _fill(str(tmp_path), n)
+    try:
+        start, stop = bounds
+        stop = n if stop is None else stop
+        mt, mv = archive.read_minmax(start, stop, n_bins)
+        # 粗缩放时每块一对极值点，每箱至多 4 块
+        assert len(mt) <= 2 * (4 * n_bins + 2)
+        assert np.all(np.diff(mt) >= 0)
+        # 无论用块索引、块内摘要还是原始数据，极值包络都应覆盖区间（含热块）
+        # 且不超出区间所在的摘要块
+        lo, hi = start // BLOCK * BLOCK, -(-stop // BLOCK) * BLOCK
+        assert mv.max() >= v[start:stop].max()
+        assert mv.min() <= v[start:stop].min()
+        assert mv.max() <= v[lo // CHUNK * CHUNK:-(-hi // CHUNK) * CHUNK].max()
+        assert mv.min() >= v[lo // CHUNK * CHUNK:-(-hi // CHUNK) * CHUNK].min()
+    finally:
+        archive.close()
+
+
+def test_read_minmax_hot_only(tmp_path):
+    n = 3 * CHUNK + 700
+    archive, t, v = _fill(str(tmp_path), n)
+    try:
+        mt, mv = archive.read_minmax(3 * CHUNK, n, 50)
+        et, ev = decimate_minmax(t[3 * CHUNK:], v[3 * CHUNK:], 50)
+        np.testing.assert_array_equal(mt, et)
+        np.testing.assert_array_equal(mv, ev)
+        # 大部分在封存块、尾部落在热块：热块内的极值也要出现在结果中
+        archive.append(np.array([t[-1] + 1e-3]), np.array([v.max() + 100.0]))
+        _, mv = archive.read_minmax(0, n + 1, 8)
+        assert mv.max() == v.max() + 100.0
+    finally:
+        archive.close()
+
+
+def test_stats_matches_numpy(tmp_path):
+    n = 4 * CHUNK + 321
+    archive, t, v = _fill(str(tmp_path), n)
+    try:
+        for start, stop in [(0, None), (100, 3 * CHUNK + 5), (2 * CHUNK, 3 * CHUNK), (4 * CHUNK + 1, n)]:
+            part = v[start:stop]
+            stats = archive.stats(start, stop)
+            assert stats["count"] == len(part)
+            assert stats["min"] == part.min()
+            assert stats["max"] == part.max()
+            assert stats["mean"] == pytest.approx(part.mean(), rel=1e-9, abs=1e-9)
+            assert stats["std"] == pytest.approx(part.std(), rel=1e-6)
+        assert archive.stats(n, n + 10)["count"] == 0
+    finally:
+        archive.close()
+
+
+def test_archive_reader_round_trip(tmp_path):
+    n = 4 * CHUNK + 200
+    archive, t, v = _fill(str(tmp_path), n)
+    try:
+        # 写入方仍打开时读取：冷块已压缩、近期块未压缩、热块只写了一部分
+        archive._compressor.submit(lambda: None).result()
+        reader = ArchiveReader(str(tmp_path))
+        assert reader.sealed_chunks == 4
+        records = np.concatenate([reader.chunk_records(chunk) for chunk in range(5)])
+        np.testing.assert_array_equal(records["t"], t)
+        np.testing.assert_array_equal(records["v"], v)
+
+        summaries = np.concatenate(list(reader.iter_summaries(batch_rows=7)))
+        per_block = -(-n // BLOCK)
+        assert len(summaries) == per_block
+        edges = np.arange(0, n, BLOCK)
+        np.testing.assert_array_equal(summaries["vmin"], np.minimum.reduceat(v, edges))
+        np.testing.assert_array_equal(summaries["vmax"], np.maximum.reduceat(v, edges))
+        assert reader.time_range() == (t[0], summaries["t"][-1])
+    finally:
+        archive.close()
+
+
+def test_compression_failure_is_logged(tmp_path, monkeypatch, caplog):
+    def fail(raw):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("logic.channel_archive._shuffle", fail)
+    with caplog.at_level(logging.WARNING, logger="decoration.archive"):
+        archive, t, v = _fill(str(tmp_path), 3 * CHUNK)
+        archive.close()
+    assert "disk full" in caplog.text
+    # 压缩失败的块保持未压缩，仍可完整读出
+    assert os.path.exists(tmp_path / "chunk_000000.raw")
+    reopened = ChannelArchive(str(tmp_path))
+    try:
+        np.testing.assert_array_equal(reopened.read()[1], v)
+    finally:
+        reopened.close()
@@ -0,0 +1,99 @@
+import logging
+
+import numpy as np
+import pytest
+
+from logic.limits import AlarmEvent, AlarmLog, LimitEngine, LimitRule
+
+
+def _reference(rule, t, v):
+    """逐样本的报警状态机，作为分块向量化判定的参照。"""
+    active, violate_run, clear_run, events = False, 0, 0, []
+    v = np.asarray(v)
+    for ti, vi, violates, clears in zip(t, v, rule.violates(v), rule.clears(v)):
+        violate_run = violate_run + 1 if violates else 0
+        clear_run = clear_run + 1 if clears else 0
+        if not active and violate_run >= rule.debounce:
+            active = True
+            events.append((True, ti, vi))
+        elif active and clear_run >= rule.debounce:
+            active = False
+            events.append((False, ti, vi))
+    return events
+
+
+RULES = [
+    LimitRule("band", "p", low=-1.0, high=1.0, hysteresis=0.2, debounce=5),
+    LimitRule("high", "p", high=0.8, debounce=1),
+    LimitRule("low", "p", low=-0.5, hysteresis=0.3, debounce=17),
+]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_blocks_match_per_sample_reference(seed):
+    rng = np.random.default_rng(seed)
+    n = 20_000
+    t = np.arange(n) * 1e-3
+    # 缓变漂移叠加噪声：反复穿越限值与回差带，并有整块都在限内的平静段
+    v = 1.1 * np.sin(np.arange(n) / 700.0) * (np.arange(n) % 6000 > 1500) + rng.normal(0, 0.15, n)
+    engine = LimitEngine()
+    engine.set_rules(RULES)
+    events: list[AlarmEvent] = []
+    pos = 0
+    while pos < n:
+        step = int(rng.choice([1, 3, 64, 500, 2000]))
+        events.extend(engine.evaluate("p", t[pos:pos + step], v[pos:pos + step]))
+        pos += step
+    for rule in RULES:
+        got = [(e.raised, e.t, e.value) for e in events if e.rule is rule]
+        expected = _reference(rule, t, v)
+        assert got == expected
+        assert expected
+    stats = {rule.name: state for rule, state in engine.stats()}
+    for rule in RULES:
+        assert stats[rule.name].samples == n
+        assert stats[rule.name].violations == int(rule.violates(v).sum())
+        assert stats[rule.name].alarms == sum(raised for raised, _, _ in _reference(rule, t, v))
+
+
+def test_set_rules_resets_state_but_keeps_counts():
+    rule = LimitRule("high", "p", high=1.0, hysteresis=0.1, debounce=3)
+    engine = LimitEngine()
+    engine.set_rules([rule])
+    assert engine.evaluate("p", [0, 1], [2.0, 2.0]) == []
+    # 切换规则集后上一块的连续超限计数不再延续
+    engine.set_rules([rule])
+    assert engine.evaluate("p", [2], [2.0]) == []
+    raised = engine.evaluate("p", [3, 4], [2.0, 2.0])
+    assert [(e.raised, e.t) for e in raised] == [(True, 4.0)]
+    # 报警中切换规则集：报警状态清零，回到限内不再产生解除事件
+    engine.set_rules([rule])
+    assert engine.evaluate("p", [5, 6, 7, 8], [0.0] * 4) == []
+    assert engine.evaluate("q", [0], [5.0]) == []
+    (_, state), = engine.stats()
+    assert (state.samples, state.violations, state.alarms, state.active) == (9, 5, 1, False)
+
+    engine.set_rules([])
+    assert engine.rules == []
+    assert engine.evaluate("p", [9], [5.0]) == []
+
+
+def test_alarm_log_counts_suppressed_events(caplog):
+    now = [0.0]
+    log = AlarmLog(logging.getLogger("test.alarm"), rate=1.0, burst=2.0, clock=lambda: now[0])
+    loud = LimitRule("loud", "p", high=1.0, severity="error")
+    quiet = LimitRule("quiet", "q", high=1.0)
+    with caplog.at_level(logging.INFO, logger="test.alarm"):
+        log.emit([AlarmEvent(loud, i % 2 == 0, float(i), 2.0) for i in range(10)])
+        log.emit([AlarmEvent(quiet, True, 0.5, 3.0)])
+        assert len(caplog.records) == 3
+        now[0] = 1.0
+        log.emit([AlarmEvent(loud, True, 10.0, 2.5)])
+        now[0] = 10.0
+        log.emit([AlarmEvent(loud, False, 11.0, 0.5), AlarmEvent(loud, True, 12.0, 2.5)])
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 6
+    assert [r.levelno for r in caplog.records[:2]] == [logging.ERROR, logging.INFO]
+    assert "quiet" in messages[2] and "抑制" not in messages[2]
+    assert "另有 8 条报警被抑制" in messages[3]
+    assert "抑制" not in messages[4] and "抑制" not in messages[5]
@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import pytest
+from PyQt6 import QtCore
+
+from logic.measurement_table import MeasurementProxyModel, MeasurementTableModel
+
+COLUMNS = [("t", "f8", ".3f"), ("v", "f8", ".4f")]
+
+
+def _settle(app, proxy, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    app.processEvents()
+    while proxy.busy or proxy._resort_timer.isActive():
+        assert time.monotonic() < deadline, "代理模型的后台任务未在时限内完成"
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def _append(model, rng, start, n):
+    t = start + np.arange(n, dtype=np.float64)
+    model.append_rows(t, rng.normal(0, 1, n))
+    model.flush()
+
+
+def _shown(proxy):
+    return np.array([proxy.source_row(i) + proxy.source.row_offset for i in range(proxy.rowCount())], dtype=np.int64)
+
+
+def _positive(columns):
+    return columns[1] > 0
+
+
+@pytest.mark.parametrize("max_rows", [0, 2000])
+def test_incremental_filter_matches_full_filter(qapp, max_rows):
+    rng = np.random.default_rng(0)
+    model = MeasurementTableModel(COLUMNS, initial_capacity=64, max_rows=max_rows, flush_interval_ms=0)
+    proxy = MeasurementProxyModel(model)
+    threads = set()
+
+    def positive(columns):
+        threads.add(threading.current_thread())
+        return _positive(columns)
+
+    proxy.set_filter(positive)
+    written = 0
+    for i in range(60):
+        n = int(rng.integers(1, 300))
+        _append(model, rng, written, n)
+        written += n
+        # 有时在增量任务进行中继续追加，有时等它完成
+        if i % 3:
+            qapp.processEvents()
+        else:
+            _settle(qapp, proxy)
+    _settle(qapp, proxy)
+    # 增量过滤也在线程池中进行，GUI 线程不调用过滤条件
+    assert threads and threading.main_thread() not in threads
+    t, v = model.column(0), model.column(1)
+    expected = model.row_offset + np.flatnonzero(v > 0)
+    np.testing.assert_array_equal(_shown(proxy), expected)
+    assert proxy.rowCount() == len(expected)
+    if max_rows:
+        assert model.row_offset > 0 and model.rowCount() <= max_rows
+    # 显示内容与源模型一致
+    row = proxy.rowCount() // 2
+    assert proxy.data(proxy.index(row, 0)) == format(t[proxy.source_row(row)], ".3f")
+    assert proxy.headerData(row, QtCore.Qt.Orientation.Vertical) == str(int(expected[row]) + 1)
+
+    proxy.set_filter(None)
+    _settle(qapp, proxy)
+    np.testing.assert_array_equal(_shown(proxy), model.row_offset + np.arange(model.rowCount()))
+
+
+def test_sort_and_resort_on_append(qapp):
+    rng = np.random.default_rng(1)
+    model = MeasurementTableModel(COLUMNS, flush_interval_ms=0)
+    proxy = MeasurementProxyModel(model, resort_delay_ms=5)
+    _append(model, rng, 0, 500)
+    proxy.sort(1, QtCore.Qt.SortOrder.DescendingOrder)
+    _settle(qapp, proxy)
+    v = model.column(1)
+    np.testing.assert_array_equal(_shown(proxy), np.argsort(v, kind="stable")[::-1])
+    # 已排序时追加的行合并为一次后台重排
+    _append(model, rng, 500, 300)
+    _settle(qapp, proxy)
+    v = model.column(1)
+    assert proxy.rowCount() == 800
+    np.testing.assert_array_equal(_shown(proxy), np.argsort(v, kind="stable")[::-1])
+
+    proxy.set_filter(_positive)
+    proxy.sort(-1)
+    _settle(qapp, proxy)
+    np.testing.assert_array_equal(_shown(proxy), np.flatnonzero(model.column(1) > 0))
+
+
+def test_drop_head_removes_stale_rows(qapp):
+    rng = np.random.default_rng(2)
+    model = MeasurementTableModel(COLUMNS, max_rows=800, flush_interval_ms=0)
+    proxy = MeasurementProxyModel(model)
+    _append(model, rng, 0, 700)
+    _settle(qapp, proxy)
+    assert proxy.rowCount() == 700
+    _append(model, rng, 700, 300)
+    _settle(qapp, proxy)
+    assert model.row_offset >= 200
+    np.testing.assert_array_equal(_shown(proxy), model.row_offset + np.arange(model.rowCount()))
+    # 单批超过上限
+    _append(model, rng, 1000, 5000)
+    _settle(qapp, proxy)
+    assert model.rowCount() == 800
+    np.testing.assert_array_equal(_shown(proxy), model.row_offset + np.arange(800))
+    assert proxy.data(proxy.index(0, 0)) == format(float(model.row_offset), ".3f")
+
+
+def test_failing_predicate_is_logged(qapp, caplog):
+    rng = np.random.default_rng(3)
+    model = MeasurementTableModel(COLUMNS, flush_interval_ms=0)
+    proxy = MeasurementProxyModel(model)
+    _append(model, rng, 0, 100)
+    _settle(qapp, proxy)
+
+    def broken(columns):
+        raise ValueError("bad filter")
+
+    with caplog.at_level(logging.ERROR, logger="decoration.table"):
+        proxy.set_filter(broken)
+        _settle(qapp, proxy)
+    assert "bad filter" in caplog.text
+    assert proxy.rowCount() == 100 and not proxy.busy
+
+    # 增量判定出错时跳过这批行，后续的行照常判定
+    calls = []
+
+    def flaky(columns):
+        calls.append(len(columns[0]))
+        if len(calls) == 2:
+            raise ValueError("flaky")
+        return columns[1] > 0
+
+    proxy.set_filter(flaky)
+    _settle(qapp, proxy)
+    with caplog.at_level(logging.ERROR, logger="decoration.table"):
+        _append(model, rng, 100, 50)
+        _settle(qapp, proxy)
+    _append(model, rng, 150, 50)
+    _settle(qapp, proxy)
+    v = model.column(1)
+    expected = np.concatenate((np.flatnonzero(v[:100] > 0), 150 + np.flatnonzero(v[150:] > 0)))
+    np.testing.assert_array_equal(_shown(proxy), expected)
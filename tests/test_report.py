@@ -0,0 +1,63 @@
+from logic.report import ReportJob, ReportSpec
+
+
+class _Pipe:
+    """第一次 poll 时还没有消息，之后才收到工作进程退出前发出的结果。"""
+
+    def __init__(self, messages, late=True):
+        self.messages = list(messages)
+        self.polls = 0
+        self.late = late
+
+    def poll(self):
+        self.polls += 1
+        return bool(self.messages) and not (self.late and self.polls == 1)
+
+    def recv(self):
+        if not self.messages:
+            raise EOFError
+        return self.messages.pop(0)
+
+    def close(self):
+        pass
+
+
+class _DeadProcess:
+    exitcode = 0
+
+    def is_alive(self):
+        return False
+
+    def join(self, timeout=None):
+        pass
+
+
+def _job(tmp_path, messages, late=True):
+    output = tmp_path / "report.html"
+    output.write_text("<html></html>", encoding="utf-8")
+    job = ReportJob(ReportSpec(str(tmp_path / "s.sqlite"), str(output)))
+    job._events = _Pipe(messages, late)
+    job._process = _DeadProcess()
+    job._timer.start()
+    results = {}
+    job.finished.connect(lambda info: results.setdefault("finished", info))
+    job.failed.connect(lambda msg: results.setdefault("failed", msg))
+    job.progress.connect(lambda *args: results.setdefault("progress", []).append(args))
+    return job, output, results
+
+
+def test_result_sent_just_before_exit_is_not_a_crash(qapp, tmp_path):
+    job, output, results = _job(tmp_path, [("progress", 1, 1, "写入"), ("done", {"pages": 1})])
+    job._poll()
+    assert results == {"progress": [(1, 1, "写入")], "finished": {"pages": 1}}
+    assert output.exists()
+    assert not job.is_running()
+
+
+def test_exit_without_result_is_reported_and_partial_file_removed(qapp, tmp_path):
+    job, output, results = _job(tmp_path, [("progress", 1, 3, "读取")], late=False)
+    job._poll()
+    assert results["progress"] == [(1, 3, "读取")]
+    assert "异常退出" in results["failed"]
+    assert not output.exists()
+    assert not job.is_running()
@@ -0,0 +1,102 @@
+import logging
+import sqlite3
+import time
+
+import numpy as np
+
+from logic.session_store import SessionLogHandler, SessionReader, SessionStore, session_path
+
+
+def _wait_written(store, events, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while store.written_events < events:
+        assert time.monotonic() < deadline, "写入线程未在时限内提交"
+        time.sleep(0.01)
+
+
+def test_resume_replays_events_after_last_checkpoint(tmp_path):
+    path = str(tmp_path / "a.sqlite")
+    store = SessionStore(path, "P1", "X", flush_interval=0.01, checkpoint_every=10_000)
+    calls = []
+    store.add_checkpoint_provider("statistics", lambda: calls.append(1) or {"n": len(calls)})
+    store.record_state(step=1, sub_step=0)
+    store.record_event("step_done", step="a")
+    store.checkpoint()
+    store.record_state(step=2)
+    store.record_event("step_done", step="b")
+    store.record_event("step_done", step="a")
+    store.record_event("note", text="不影响状态")
+    _wait_written(store, 6)
+
+    # 写入方未正常关闭（没有最后的检查点）：恢复 = 检查点 + 其后的事件重放
+    crashed = SessionStore(path, flush_interval=0.01)
+    try:
+        state = crashed.resume()
+        assert state == {"step": 2, "sub_step": 0, "completed_steps": ["a", "b"], "statistics": {"n": 1}}
+        assert SessionReader(path).state() == state
+        # resume 返回副本
+        state["completed_steps"].append("c")
+        assert crashed.resume()["completed_steps"] == ["a", "b"]
+    finally:
+        crashed.close()
+        store.close()
+
+    # 正常关闭会写最后一个检查点，其中带有最新的统计
+    reopened = SessionStore(path)
+    try:
+        state = reopened.resume()
+        assert state["step"] == 2 and state["completed_steps"] == ["a", "b"]
+        assert state["statistics"] == {"n": len(calls)}
+    finally:
+        reopened.close()
+
+
+def test_checkpoint_every_bounds_replay(tmp_path):
+    path = str(tmp_path / "b.sqlite")
+    store = SessionStore(path, flush_interval=0.01, checkpoint_every=50)
+    for i in range(120):
+        store.record_state(step=i)
+    _wait_written(store, 120)
+    conn = sqlite3.connect(path)
+    try:
+        # 每 50 个事件一个检查点，恢复时至多重放最后 50 个事件
+        deadline = time.monotonic() + 5.0
+        while (conn.execute("SELECT MAX(last_event_id) FROM checkpoints").fetchone()[0] or 0) < 100:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert SessionStore._recover(conn)[0]["step"] == 119
+    finally:
+        conn.close()
+        store.close()
+
+
+def test_measurements_and_logs_round_trip(tmp_path):
+    root = str(tmp_path)
+    store = SessionStore.open(root, "样机 1/a", "X", flush_interval=0.01)
+    assert store.path == session_path(root, "样机 1/a", "X")
+    logger = logging.getLogger("test.session")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = SessionLogHandler(store)
+    logger.addHandler(handler)
+    try:
+        store.record_measurement("power", np.arange(5.0), np.arange(5.0) * 2)
+        store.record_measurement("power", 5.0, 10.0)
+        store.record_measurement("coax", [0.0, 1.0], [1.0, 2.0], 3.0)
+        logger.info("一条日志")
+        logger.debug("被级别过滤")
+    finally:
+        logger.removeHandler(handler)
+        store.close()
+    reader = SessionReader(store.path)
+    try:
+        power = np.concatenate(list(reader.measurements("power", chunk_rows=1)))
+        np.testing.assert_array_equal(power, np.column_stack([np.arange(6.0), np.arange(6.0) * 2]))
+        coax = np.concatenate(list(reader.measurements("coax")))
+        np.testing.assert_array_equal(coax, [[0, 1, 3], [1, 2, 3]])
+        assert reader.channels()["power"]["rows"] == 6
+        assert reader.log_count() == 1
+        assert [row[2] for rows in reader.logs() for row in rows] == ["一条日志"]
+        assert reader.meta()["prototype_name"] == "样机 1/a"
+    finally:
+        reader.close()
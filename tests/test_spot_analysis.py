@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from logic.camera import SimulatedCamera
+from logic.spot_analysis import SpotAnalyzer
+
+
+def grab(camera: SimulatedCamera, count: int) -> np.ndarray:
+    camera.open()
+    frames = np.empty((count, *camera.shape), dtype=camera.dtype)
+    for frame in frames:
+        camera.grab_into(frame)
+    return frames
+
+
+def test_noise_only_frame_is_invalid():
+    camera = SimulatedCamera(fps=1e9)
+    camera.spot = None
+    analyzer = SpotAnalyzer()
+    for frame in grab(camera, 8):
+        assert not analyzer.analyze(frame).valid
+    assert not analyzer.analyze_stack(grab(camera, 8))["valid"].any()
+    assert analyzer.last is None
+
+
+@pytest.mark.parametrize("dtype, tolerance", [(np.uint16, 0.005), (np.uint8, 0.03)])
+@pytest.mark.parametrize("sigma", [3.0, 12.0, 30.0])
+def test_sigma_matches_iso_second_moment(dtype, tolerance, sigma):
+    camera = SimulatedCamera(fps=1e9, dtype=dtype, spot_sigma=sigma)
+    analyzer = SpotAnalyzer()
+    results = [analyzer.analyze(frame) for frame in grab(camera, 20)]
+    assert all(r.valid for r in results)
+    assert np.mean([r.sigma_x for r in results]) == pytest.approx(sigma, rel=tolerance)
+    assert np.mean([r.sigma_y for r in results]) == pytest.approx(sigma, rel=tolerance)
+    assert results[-1].d4sigma[0] == pytest.approx(4 * results[-1].sigma_x)
+
+
+def test_centroid_follows_spot():
+    camera = SimulatedCamera(fps=1e9, dtype=np.uint16, seed=1)
+    camera.spot = (200.0, 150.0)
+    analyzer = SpotAnalyzer()
+    result = analyzer.analyze(grab(camera, 1)[0])
+    # 模拟光斑围绕设定点做 3 px 的圆周漂移
+    assert np.hypot(result.cx - 200.0, result.cy - 150.0) < 4.0
+
+
+def test_tracking_recovers_after_spot_moves():
+    camera = SimulatedCamera(fps=1e9, dtype=np.uint16)
+    analyzer = SpotAnalyzer()
+    analyzer.analyze(grab(camera, 1)[0])
+    camera.spot = (80.0, 400.0)
+    result = analyzer.analyze(grab(camera, 1)[0])
+    assert result.valid
+    assert np.hypot(result.cx - 80.0, result.cy - 400.0) < 4.0
+
+
+def test_stack_matches_single_frame():
+    camera = SimulatedCamera(fps=1e9, dtype=np.uint16)
+    frames = grab(camera, 6)
+    stack = SpotAnalyzer(track=False).analyze_stack(frames)
+    single = [SpotAnalyzer(track=False).analyze(frame) for frame in frames]
+    assert stack["valid"].all()
+    np.testing.assert_allclose(stack["cx"], [r.cx for r in single], atol=0.05)
+    np.testing.assert_allclose(stack["sigma_x"], [r.sigma_x for r in single], rtol=0.01)
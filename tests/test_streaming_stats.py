@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from logic.streaming_stats import AllanDeviation, QuantileSketch, RunningStats, SessionStatistics
+
+
+def _allan_reference(segments, base, level):
+    """逐段按非重叠平均计算 Allan 方差，各段的差值平方和合并。"""
+    m = base * 2 ** level
+    sumsq, count = 0.0, 0
+    for v in segments:
+        y = v[:len(v) // m * m].reshape(-1, m).mean(axis=1)
+        d = np.diff(y)
+        sumsq += float(np.dot(d, d))
+        count += len(d)
+    return np.sqrt(0.5 * sumsq / count) if count else None
+
+
+def _feed(adev, t, v, rng):
+    pos = 0
+    while pos < len(v):
+        n = int(rng.integers(1, 700))
+        adev.update(v[pos:pos + n], t[pos:pos + n])
+        pos += n
+
+
+def test_running_stats_merge_matches_numpy():
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(1e6, 3.0, n) for n in (1, 17, 1000, 5)]
+    merged = RunningStats()
+    for part in parts:
+        stats = RunningStats()
+        stats.update(part)
+        merged.merge(stats)
+    merged.merge(RunningStats())
+    every = np.concatenate(parts)
+    assert merged.count == len(every)
+    assert merged.mean == pytest.approx(every.mean(), rel=1e-12)
+    assert merged.variance == pytest.approx(every.var(ddof=1), rel=1e-9)
+    assert (merged.min, merged.max) == (every.min(), every.max())
+
+
+@pytest.mark.parametrize("dist", ["normal", "lognormal", "sorted"])
+def test_quantile_sketch_rank_error(dist):
+    rng = np.random.default_rng(2)
+    v = {"normal": rng.normal(size=200_000), "lognormal": rng.lognormal(0, 3, 200_000)}.get(dist)
+    if v is None:
+        v = np.arange(200_000, dtype=np.float64)
+    sketch, other = QuantileSketch(200, seed=0), QuantileSketch(200, seed=1)
+    for pos in range(0, len(v) // 2, 4096):
+        sketch.update(v[pos:min(pos + 4096, len(v) // 2)])
+    other.update(v[len(v) // 2:])
+    sketch.merge(other)
+    assert sketch.count == len(v)
+    ordered = np.sort(v)
+    for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(v)
+        assert abs(rank - q) < 0.02
+
+
+def test_allan_matches_numpy_reference():
+    rng = np.random.default_rng(3)
+    rate, base = 1000.0, 10
+    v = np.cumsum(rng.normal(0, 1e-3, 300_000)) + rng.normal(0, 1e-2, 300_000)
+    t = np.arange(len(v)) / rate
+    adev = AllanDeviation(1.0 / rate, base=base)
+    _feed(adev, t, v, rng)
+    points = adev.deviations()
+    assert len(points) >= 10
+    for level, (tau, sigma) in enumerate(points):
+        assert tau == pytest.approx(base * 2 ** level / rate)
+        assert sigma == pytest.approx(_allan_reference([v], base, level), rel=1e-9)
+
+
+def test_allan_restarts_at_gaps():
+    rng = np.random.default_rng(4)
+    rate, base = 1000.0, 10
+    v = rng.normal(0, 1e-2, 90_000)
+    t = np.arange(len(v)) / rate
+    # 采集停止 5 s 后重启，恢复会话后驱动时间轴从 0 重新开始
+    t[30_007:] += 5.0
+    t[61_234:] -= t[61_234]
+    adev = AllanDeviation(1.0 / rate, base=base)
+    _feed(adev, t, v, rng)
+    segments = [v[:30_007], v[30_007:61_234], v[61_234:]]
+    for level, (_, sigma) in enumerate(adev.deviations()):
+        assert sigma == pytest.approx(_allan_reference(segments, base, level), rel=1e-9)
+
+    # 跨段的阶跃不能混入统计
+    stepped = AllanDeviation(1.0 / rate, base=base)
+    stepped.update(np.zeros(5000), np.arange(5000) / rate)
+    stepped.update(np.ones(5000), 10.0 + np.arange(5000) / rate)
+    assert all(sigma == 0.0 for _, sigma in stepped.deviations())
+
+
+def test_allan_gap_survives_checkpoint():
+    rate = 100.0
+    stats = SessionStatistics()
+    stats.channel("p", AllanDeviation(1.0 / rate))
+    stats.update("p", np.zeros(1000), np.arange(1000) / rate)
+    resumed = SessionStatistics.from_dict(stats.to_dict())
+    resumed.update("p", np.ones(1000), np.arange(1000) / rate)
+    assert all(sigma == 0.0 for _, sigma in resumed.allan("p"))
+    assert resumed.summary("p")["count"] == 2000
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from logic.workflow import (
+    COMMON,
+    GROUP,
+    POWER_ENGINE,
+    WORKFLOW_FILES,
+    StepHooks,
+    Workflow,
+    load_workflow,
+    workflow_for,
+)
+
+SAMPLE = {
+    "name": "测试流程",
+    "prototype_type": "T",
+    "steps": [
+        {"name": "准备"},
+        {
+            "name": "对准",
+            "children": [
+                {"name": "粗调", "page": "common", "engines": ["power"], "alignment": "power"},
+                {
+                    "name": "功率",
+                    "page": "common",
+                    "engines": ["power", "transmitter"],
+                    "analysis": "power_test",
+                    "limits": [{"channel": "power", "low": 0.5, "high": 1.5, "debounce": 3}],
+                },
+            ],
+        },
+        {"name": "相机", "page": "camera", "engines": ["camera"]},
+    ],
+}
+
+
+@pytest.mark.parametrize("file", sorted(set(WORKFLOW_FILES.values())))
+def test_shipped_workflows_load(file):
+    prototype_type = next(k for k, v in WORKFLOW_FILES.items() if v == file)
+    workflow = workflow_for(prototype_type)
+    assert workflow.steps
+    for i, name in enumerate(workflow.step_names):
+        assert workflow.index(name) == i
+    for step in workflow.walk():
+        assert workflow.step(step.path) is step
+        top, sub = workflow.locate(step.path)
+        if step.parent is None:
+            assert sub is None and workflow.steps[top] is step
+        else:
+            assert workflow.leaf(top, sub) is step
+
+
+def test_index_maps(tmp_path):
+    path = tmp_path / "wf.json"
+    path.write_text(json.dumps(SAMPLE, ensure_ascii=False), encoding="utf-8")
+    workflow = load_workflow(str(path))
+    assert (workflow.name, workflow.prototype_type) == ("测试流程", "T")
+    assert workflow.step_names == ["准备", "对准", "相机"]
+    assert workflow.index("相机") == 2 and workflow.index("粗调") == -1
+    group = workflow.step("对准")
+    assert group.page == GROUP and group.is_group
+    power = workflow.step("对准/功率")
+    assert power.parent is group and power.index == 1
+    assert (power.path, power.title) == ("对准/功率", "对准 - 功率")
+    assert workflow.locate("对准/功率") == (1, 1)
+    assert workflow.locate("相机") == (2, None)
+    assert workflow.leaf(1) is workflow.step("对准/粗调")
+    assert workflow.leaf(0) is workflow.steps[0]
+    assert [s.path for s in workflow.leaves()] == ["准备", "对准/粗调", "对准/功率", "相机"]
+    assert workflow.step("粗调") is None
+    (rule,) = power.limits
+    assert (rule.name, rule.channel, rule.debounce) == ("功率/power", "power", 3)
+    assert workflow.step("对准/粗调").page == COMMON
+
+
+@pytest.mark.parametrize(
+    "step",
+    [
+        {"name": "x", "page": "nope"},
+        {"name": "x", "page": "group"},
+        {"name": "x", "page": "common", "children": [{"name": "y"}]},
+        {"name": "x", "engines": ["laser"]},
+        {"name": "x", "alignment": "power"},
+        {"name": "x", "page": "common", "alignment": "focus"},
+        {"name": "x", "analysis": "fft"},
+        {"name": "x", "children": [{"name": "y"}], "limits": [{"channel": "p", "high": 1}]},
+        {"name": "x", "limits": [{"channel": "p", "high": 1}, {"channel": "p", "low": 0}]},
+        {"name": "x", "limits": [{"channel": "p", "low": 2, "high": 1}]},
+        {"name": "x", "children": [{"name": "y", "children": [{"name": "z"}]}]},
+    ],
+)
+def test_invalid_steps_rejected(step):
+    with pytest.raises(ValueError):
+        Workflow.from_dict({"steps": [step]})
+
+
+def test_duplicate_and_empty_workflows_rejected():
+    with pytest.raises(ValueError):
+        Workflow.from_dict({"steps": []})
+    with pytest.raises(ValueError):
+        Workflow.from_dict({"steps": [{"name": "a"}, {"name": "a"}]})
+
+
+def test_step_hooks_keep_shared_engines_running():
+    workflow = Workflow.from_dict(SAMPLE)
+    calls = []
+    hooks = StepHooks()
+    for name in ("power", "camera", "transmitter"):
+        hooks.register_engine(name, lambda n=name: calls.append(f"+{n}"), lambda n=name: calls.append(f"-{n}"))
+    hooks.on_exit("对准/粗调", lambda step: calls.append(f"exit {step.path}"))
+    hooks.on_enter("对准/功率", lambda step: calls.append(f"enter {step.path}"))
+
+    hooks.transition(workflow.step("对准/粗调"))
+    assert calls == ["+power"]
+    calls.clear()
+    hooks.transition(workflow.step("对准/功率"))
+    assert calls == ["exit 对准/粗调", "+transmitter", "enter 对准/功率"]
+    assert hooks.running == {POWER_ENGINE, "transmitter"}
+    calls.clear()
+    hooks.transition(workflow.step("对准/功率"))
+    assert calls == []
+    hooks.transition(workflow.step("相机"))
+    assert sorted(calls[:2]) == ["-power", "-transmitter"] and calls[2:] == ["+camera"]
+    calls.clear()
+    hooks.transition(None)
+    assert calls == ["-camera"] and hooks.running == frozenset() and hooks.current is None
@@ -0,0 +1,79 @@
+from PyQt6 import QtCore, QtWidgets
+
+from ui.trace_plot import TracePlotWidget
+
+
+class AlignmentPanel(QtWidgets.QWidget):
+    """Automatic alignment controls hosted inside ``CommonContentWidget.align_group``.
+
+    ``start_requested`` carries the evaluation budget; progress and results are
+    pushed back through ``set_progress`` and ``set_result``.
+    """
+
+    start_requested = QtCore.pyqtSignal(int)
+    stop_requested = QtCore.pyqtSignal()
+
+    def __init__(self, objective_text: str, unit: str = "", parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.unit = unit
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        objective = QtWidgets.QLabel(objective_text, parent=self)
+        objective.setObjectName("hintLabel")
+        layout.addWidget(objective)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.setSpacing(6)
+        self.budget_spin = QtWidgets.QSpinBox(parent=self)
+        self.budget_spin.setRange(10, 5000)
+        self.budget_spin.setValue(150)
+        self.budget_spin.setPrefix("预算 ")
+        self.budget_spin.setSuffix(" 次")
+        controls.addWidget(self.budget_spin, 1)
+
+        self.start_btn = QtWidgets.QPushButton("开始", parent=self)
+        self.start_btn.clicked.connect(lambda: self.start_requested.emit(self.budget_spin.value()))
+        controls.addWidget(self.start_btn)
+
+        self.stop_btn = QtWidgets.QPushButton("停止", parent=self)
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_requested)
+        controls.addWidget(self.stop_btn)
+        layout.addLayout(controls)
+
+        self.value_label = QtWidgets.QLabel("--", parent=self)
+        self.value_label.setObjectName("powerValue")
+        self.value_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.value_label)
+
+        self.stats_label = QtWidgets.QLabel("", parent=self)
+        self.stats_label.setObjectName("hintLabel")
+        self.stats_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.stats_label.setWordWrap(True)
+        layout.addWidget(self.stats_label)
+
+        # x 轴为评估次数，曲线为当前最优值
+        self.plot = TracePlotWidget(capacity=1 << 13, window=5000, max_fps=15, unit=unit, parent=self)
+        layout.addWidget(self.plot, 1)
+
+    def set_running(self, running: bool):
+        self.start_btn.setEnabled(not running)
+        self.budget_spin.setEnabled(not running)
+        self.stop_btn.setEnabled(running)
+        if running:
+            self.plot.buffer.clear()
+            self.plot.window = self.budget_spin.value()
+            self.stats_label.setText("对准中…")
+
+    def set_progress(self, evaluations: int, best: float):
+        self.value_label.setText(f"{best:.4f} {self.unit}")
+        self.plot.append([evaluations], [best])
+
+    def set_result(self, text: str):
+        self.set_running(False)
+        self.stats_label.setText(text)
+
+
+__all__ = ["AlignmentPanel"]
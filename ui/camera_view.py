@@ -0,0 +1,53 @@
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class CameraView(QtWidgets.QWidget):
+    """Paints the current camera frame scaled to fit, keeping its aspect ratio.
+
+    The view holds on to the frame it displays (a ``QImage`` over the frame
+    buffer, no copy) and releases the previous one back to its pool when a
+    new frame is set. ``frame_painted`` fires after a frame hits the screen.
+    """
+
+    frame_painted = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.setObjectName("cameraView")
+        self.setMinimumSize(320, 240)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        self._frame = None
+        self._image: QtGui.QImage | None = None
+        self._painted = True
+        self.overlay_text = ""
+
+    def set_frame(self, frame):
+        if self._frame is not None:
+            self._frame.release()
+        self._frame = frame
+        self._image = frame.qimage() if frame is not None else None
+        self._painted = False
+        self.update()
+
+    def clear(self):
+        self.set_frame(None)
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtGui.QColor("#0f172a"))
+        if self._image is not None:
+            size = self._image.size().scaled(self.size(), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+            target = QtCore.QRect(QtCore.QPoint(0, 0), size)
+            target.moveCenter(self.rect().center())
+            painter.drawImage(target, self._image)
+        if self.overlay_text:
+            painter.setPen(QtGui.QColor("#e5e7eb"))
+            painter.drawText(self.rect().adjusted(8, 6, -8, -6), QtCore.Qt.AlignmentFlag.AlignTop, self.overlay_text)
+        painter.end()
+        if self._frame is not None and not self._painted:
+            self._painted = True
+            self.frame_painted.emit(self._frame)
+
+
+__all__ = ["CameraView"]
@@ -1,5 +1,14 @@
+from collections.abc import Callable
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 
+from logic.workflow import CAMERA, COMMON, ENGINE_LABELS, REPORT, SUMMARY, Workflow, WorkflowStep, workflow_for
+from ui.camera_view import CameraView
+from ui.perf_panel import PerfPanel
+from ui.report_panel import ReportPanel
+from ui.summary_panel import SummaryPanel
+from ui.theme import THEME
+
 
 class NavigationButton(QtWidgets.QToolButton):
     """A simple navigation button that supports collapsed/expanded layouts."""
@@ -37,9 +46,13 @@ class NavigationButton(QtWidgets.QToolButton):
 
 
 class CommonContentWidget(QtWidgets.QWidget):
-    """Shared three-column content area to host embedded pages."""
+    """Shared three-column content area to host embedded pages.
+
+    With ``alignment`` set, a fourth ``align_group`` column hosts the automatic
+    alignment controls.
+    """
 
-    def __init__(self, title: str, parent: QtWidgets.QWidget | None = None):
+    def __init__(self, title: str, alignment: bool = False, parent: QtWidgets.QWidget | None = None):
         super().__init__(parent)
         layout = QtWidgets.QVBoxLayout(self)
         header = QtWidgets.QLabel(title)
@@ -59,6 +72,21 @@ class CommonContentWidget(QtWidgets.QWidget):
         columns.addWidget(self.power_group)
         columns.addWidget(self.table_group)
 
+        self.align_group: QtWidgets.QGroupBox | None = None
+        if alignment:
+            self.align_group = self._build_group_box("自动对准")
+            columns.addWidget(self.align_group)
+
+    def set_group_content(self, box: QtWidgets.QGroupBox, widget: QtWidgets.QWidget):
+        """Replace the placeholder inside ``box`` with ``widget``."""
+        layout = box.layout()
+        while layout.count():
+            old = layout.takeAt(0).widget()
+            if old is not None:
+                old.setParent(None)
+                old.deleteLater()
+        layout.addWidget(widget, 1)
+
     def _build_group_box(self, title: str) -> QtWidgets.QGroupBox:
         box = QtWidgets.QGroupBox(title)
         box.setObjectName("contentGroup")
@@ -71,9 +99,84 @@ class CommonContentWidget(QtWidgets.QWidget):
         return box
 
 
+class LazyStackedWidget(QtWidgets.QStackedWidget):
+    """A stacked widget whose pages are built by factories on first access.
+
+    Every index is backed by a lightweight container so indices stay stable;
+    the real page is constructed and inserted into the container the first
+    time it becomes current (or when it is prewarmed).
+    """
+
+    page_built = QtCore.pyqtSignal(int, QtWidgets.QWidget)
+
+    def __init__(self, lazy: bool = True, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.lazy = lazy
+        self._factories: list[Callable[[], QtWidgets.QWidget] | None] = []
+        self._pages: list[QtWidgets.QWidget | None] = []
+
+    def add_page(self, page: QtWidgets.QWidget) -> int:
+        """Register an already constructed page."""
+        idx = self.addWidget(page)
+        self._factories.append(None)
+        self._pages.append(page)
+        return idx
+
+    def add_lazy_page(self, factory: Callable[[], QtWidgets.QWidget]) -> int:
+        container = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        idx = self.addWidget(container)
+        self._factories.append(factory)
+        self._pages.append(None)
+        if not self.lazy:
+            self.ensure_page(idx)
+        return idx
+
+    def ensure_page(self, idx: int) -> QtWidgets.QWidget | None:
+        """Build the page at ``idx`` if needed and return it."""
+        if not 0 <= idx < len(self._factories):
+            return None
+        page = self._pages[idx]
+        if page is None:
+            factory = self._factories[idx]
+            self._factories[idx] = None
+            page = factory()
+            self.widget(idx).layout().addWidget(page)
+            self._pages[idx] = page
+            self.page_built.emit(idx, page)
+        return page
+
+    def is_built(self, idx: int) -> bool:
+        return 0 <= idx < len(self._pages) and self._pages[idx] is not None
+
+    def page(self, idx: int) -> QtWidgets.QWidget | None:
+        """Return the built page at ``idx`` without building it."""
+        if 0 <= idx < len(self._pages):
+            return self._pages[idx]
+        return None
+
+    def prewarm(self, idx: int):
+        """Build the page at ``idx`` once the event loop is idle."""
+        if 0 <= idx < len(self._pages) and self._pages[idx] is None:
+            # The timer is a child of the stack, so it dies with it instead of firing into a deleted widget
+            timer = QtCore.QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self.ensure_page(idx))
+            timer.timeout.connect(timer.deleteLater)
+            timer.start(0)
+
+    def setCurrentIndex(self, idx: int):
+        self.ensure_page(idx)
+        super().setCurrentIndex(idx)
+
+
 class Ui_decoration_page(object):
-    def setupUi(self, decoration_page: QtWidgets.QWidget):
+    def setupUi(self, decoration_page: QtWidgets.QWidget, lazy: bool = True, workflow: Workflow | None = None):
         decoration_page.setObjectName("decoration_page")
+        self.lazy = lazy
+        self.workflow = workflow if workflow is not None else workflow_for("")
         decoration_page.resize(1400, 900)
 
         self.main_layout = QtWidgets.QHBoxLayout(decoration_page)
@@ -147,7 +250,7 @@ class Ui_decoration_page(object):
 
         self.content_layout.addWidget(self.header_bar)
 
-        self.main_stack = QtWidgets.QStackedWidget(parent=self.content_container)
+        self.main_stack = LazyStackedWidget(lazy, parent=self.content_container)
         self.main_stack.setObjectName("mainStack")
         self.content_layout.addWidget(self.main_stack, 1)
 
@@ -165,13 +268,16 @@ class Ui_decoration_page(object):
 
         # Start adjustment page with steps inside
         self.start_page = self._build_start_adjust_page()
-        self.main_stack.addWidget(self.start_page)
+        self.main_stack.add_page(self.start_page)
 
-        # Other primary pages
-        self.flow_page = self._build_simple_page("装调流程", "这里展示装调流程相关内容。")
-        self.config_page = self._build_simple_page("配置信息", "这里展示配置信息或配置表单。")
-        self.main_stack.addWidget(self.flow_page)
-        self.main_stack.addWidget(self.config_page)
+        # Other primary pages, built on first visit
+        self.flow_page: QtWidgets.QWidget | None = None
+        self.flow_tree: QtWidgets.QTreeWidget | None = None
+        self.config_page: QtWidgets.QWidget | None = None
+        self.perf_panel: PerfPanel | None = None
+        self.theme_box: QtWidgets.QCheckBox | None = None
+        self.main_stack.add_lazy_page(self._build_flow_page)
+        self.main_stack.add_lazy_page(self._build_config_page)
 
         self.main_layout.addWidget(self.sidebar, 0)
         self.main_layout.addWidget(self.content_container, 1)
@@ -194,35 +300,31 @@ class Ui_decoration_page(object):
         left_layout.setSpacing(8)
 
         self.step_buttons: list[NavigationButton] = []
-        step_names = [
-            "信号发",
-            "信号收",
-            "二向色镜装调",
-            "相机装调",
-            "信标光",
-            "同轴度",
-            "功率测试",
-            "样机总结",
-            "样机交付",
-        ]
-        self.step_names = step_names
-        for idx, name in enumerate(step_names):
-            btn = NavigationButton(name, None, page)
+        self.step_names = self.workflow.step_names
+        self.camera_views: dict[str, CameraView] = {}
+        self.camera_stats: dict[str, QtWidgets.QLabel] = {}
+        self.summary_panel: SummaryPanel | None = None
+        self.report_panels: dict[str, ReportPanel] = {}
+        # Group steps: step index -> sub-step rail frame / buttons / stacked pages
+        self.sub_step_frames: dict[int, QtWidgets.QFrame] = {}
+        self.sub_step_buttons: dict[int, list[NavigationButton]] = {}
+        self.sub_step_stacks: dict[int, LazyStackedWidget] = {}
+        for idx, step in enumerate(self.workflow.steps):
+            btn = NavigationButton(step.name, None, page)
             btn.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed)
+            btn.setToolTip(step.description)
             left_layout.addWidget(btn)
             self.step_buttons.append(btn)
 
-            if name == "同轴度":
-                self.substep_frame = QtWidgets.QFrame(parent=page)
-                self.substep_frame.setObjectName("subStepFrame")
-                substep_layout = QtWidgets.QVBoxLayout(self.substep_frame)
+            if step.is_group:
+                frame = QtWidgets.QFrame(parent=page)
+                frame.setObjectName("subStepFrame")
+                substep_layout = QtWidgets.QVBoxLayout(frame)
                 substep_layout.setContentsMargins(18, 4, 0, 4)
                 substep_layout.setSpacing(6)
-                self.sub_step_buttons: list[NavigationButton] = []
-                sub_step_names = ["信号收发同轴度", "信标收发同轴度"]
-                self.sub_step_names = sub_step_names
-                for sub_name in sub_step_names:
-                    sub_btn = NavigationButton(sub_name, None, self.substep_frame)
+                buttons: list[NavigationButton] = []
+                for child in step.children:
+                    sub_btn = NavigationButton(child.name, None, frame)
                     sub_btn.setIcon(QtGui.QIcon())
                     sub_btn.setCheckable(True)
                     sub_btn.setToolButtonStyle(QtCore.Qt.ToolButtonStyle.ToolButtonTextOnly)
@@ -230,9 +332,11 @@ class Ui_decoration_page(object):
                         QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Fixed
                     )
                     substep_layout.addWidget(sub_btn)
-                    self.sub_step_buttons.append(sub_btn)
-                self.substep_frame.hide()
-                left_layout.addWidget(self.substep_frame)
+                    buttons.append(sub_btn)
+                frame.hide()
+                left_layout.addWidget(frame)
+                self.sub_step_frames[idx] = frame
+                self.sub_step_buttons[idx] = buttons
 
         left_layout.addStretch(1)
 
@@ -241,35 +345,57 @@ class Ui_decoration_page(object):
         right_layout.setContentsMargins(0, 0, 0, 0)
         right_layout.setSpacing(10)
 
-        self.step_stack = QtWidgets.QStackedWidget(parent=right_panel)
+        self.step_stack = LazyStackedWidget(self.lazy, parent=right_panel)
         self.step_stack.setObjectName("stepStack")
         right_layout.addWidget(self.step_stack, 1)
 
         layout.addWidget(left_panel)
         layout.addWidget(right_panel, 1)
 
-        for idx, name in enumerate(step_names, start=1):
-            if name == "同轴度":
-                container = QtWidgets.QWidget()
-                container_layout = QtWidgets.QVBoxLayout(container)
-                container_layout.setSpacing(8)
-                hint = QtWidgets.QLabel("选择具体的同轴度子步骤以展示对应的公共组件页面。")
-                hint.setObjectName("hintLabel")
-                hint.setWordWrap(True)
-                container_layout.addWidget(hint)
-
-                self.sub_step_stack = QtWidgets.QStackedWidget(parent=container)
-                self.sub_step_stack.setObjectName("subStepStack")
-                for sub_name in self.sub_step_names:
-                    sub_page = CommonContentWidget(f"同轴度 - {sub_name}", parent=self.sub_step_stack)
-                    self.sub_step_stack.addWidget(sub_page)
-                container_layout.addWidget(self.sub_step_stack, 1)
-                self.step_stack.addWidget(container)
-            else:
-                self.step_stack.addWidget(self._build_step_page(name))
+        for idx, step in enumerate(self.workflow.steps):
+            if step.is_group:
+                # The group container is cheap and owns the sub-step stack, so the
+                # stack is created eagerly; its sub-pages stay lazy. Until the group
+                # page adopts it, the step stack owns it (hidden), so it is destroyed
+                # with the page even if the group is never visited.
+                stack = LazyStackedWidget(self.lazy, parent=self.step_stack)
+                stack.setObjectName("subStepStack")
+                stack.hide()
+                for child in step.children:
+                    stack.add_lazy_page(lambda child=child: self._build_step_content(child))
+                self.sub_step_stacks[idx] = stack
+            self.step_stack.add_lazy_page(lambda step=step: self._build_step_content(step))
 
         return page
 
+    def _build_step_content(self, step: WorkflowStep) -> QtWidgets.QWidget:
+        """Build the page declared for ``step`` in the workflow definition."""
+        if step.is_group:
+            return self._build_group_page(step)
+        if step.page == CAMERA:
+            return self._build_camera_page(step)
+        if step.page == COMMON:
+            return CommonContentWidget(step.title, alignment=step.alignment is not None)
+        if step.page == SUMMARY:
+            return self._build_summary_page(step)
+        if step.page == REPORT:
+            return self._build_report_page(step)
+        return self._build_step_page(step.title)
+
+    def _build_group_page(self, step: WorkflowStep) -> QtWidgets.QWidget:
+        container = QtWidgets.QWidget()
+        container_layout = QtWidgets.QVBoxLayout(container)
+        container_layout.setSpacing(8)
+        hint = QtWidgets.QLabel(f"选择具体的{step.name}子步骤以展示对应的公共组件页面。")
+        hint.setObjectName("hintLabel")
+        hint.setWordWrap(True)
+        container_layout.addWidget(hint)
+        stack = self.sub_step_stacks[step.index]
+        stack.setParent(container)
+        container_layout.addWidget(stack, 1)
+        stack.show()
+        return container
+
     def _build_step_page(self, name: str) -> QtWidgets.QWidget:
         page = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(page)
@@ -289,109 +415,141 @@ class Ui_decoration_page(object):
 
         return page
 
-    def _build_simple_page(self, title: str, description: str) -> QtWidgets.QWidget:
+    def _build_camera_page(self, step: WorkflowStep) -> QtWidgets.QWidget:
+        page = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(page)
+        layout.setSpacing(12)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title = QtWidgets.QLabel(step.title)
+        title.setObjectName("contentHeader")
+        title.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        layout.addWidget(title)
+
+        view = CameraView(parent=page)
+        layout.addWidget(view, 1)
+
+        stats = QtWidgets.QLabel("相机未连接", parent=page)
+        stats.setObjectName("hintLabel")
+        layout.addWidget(stats)
+
+        self.camera_views[step.path] = view
+        self.camera_stats[step.path] = stats
+        return page
+
+    def _build_summary_page(self, step: WorkflowStep) -> QtWidgets.QWidget:
+        page = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(page)
+        layout.setSpacing(12)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title = QtWidgets.QLabel(step.title)
+        title.setObjectName("contentHeader")
+        title.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        layout.addWidget(title)
+
+        self.summary_panel = SummaryPanel(parent=page)
+        layout.addWidget(self.summary_panel)
+        layout.addStretch(1)
+        self.report_panels[step.path] = ReportPanel(parent=page)
+        layout.addWidget(self.report_panels[step.path])
+        return page
+
+    def _build_report_page(self, step: WorkflowStep) -> QtWidgets.QWidget:
+        page = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(page)
+        layout.setSpacing(12)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title = QtWidgets.QLabel(step.title)
+        title.setObjectName("contentHeader")
+        title.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        layout.addWidget(title)
+
+        hint = QtWidgets.QLabel(
+            f"{step.description}。报告包含功率稳定性、同轴度与限值报警的统计、曲线与表格，"
+            "在后台进程中按块读取会话数据生成。"
+        )
+        hint.setObjectName("hintLabel")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        self.report_panels[step.path] = ReportPanel(parent=page)
+        layout.addWidget(self.report_panels[step.path])
+        layout.addStretch(1)
+        return page
+
+    def _build_flow_page(self) -> QtWidgets.QWidget:
         page = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(page)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(12)
 
-        title_label = QtWidgets.QLabel(title)
+        title_label = QtWidgets.QLabel("装调流程")
         title_label.setObjectName("pageTitle")
-        title_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
         layout.addWidget(title_label)
 
-        body = QtWidgets.QLabel(description)
-        body.setObjectName("placeholderLabel")
-        body.setWordWrap(True)
-        layout.addWidget(body, 1)
+        name_label = QtWidgets.QLabel(self.workflow.name)
+        name_label.setObjectName("hintLabel")
+        layout.addWidget(name_label)
+
+        self.flow_tree = QtWidgets.QTreeWidget(parent=page)
+        self.flow_tree.setObjectName("flowTree")
+        self.flow_tree.setHeaderLabels(["步骤", "设备", "说明"])
+        self.flow_tree.setRootIsDecorated(True)
+        for step in self.workflow.steps:
+            item = self._flow_item(step)
+            self.flow_tree.addTopLevelItem(item)
+            for child in step.children:
+                item.addChild(self._flow_item(child))
+        self.flow_tree.expandAll()
+        self.flow_tree.resizeColumnToContents(0)
+        layout.addWidget(self.flow_tree, 1)
+        self.flow_page = page
+        return self.flow_page
+
+    @staticmethod
+    def _flow_item(step: WorkflowStep) -> QtWidgets.QTreeWidgetItem:
+        engines = "、".join(label for engine, label in ENGINE_LABELS.items() if engine in step.engines)
+        item = QtWidgets.QTreeWidgetItem([step.name, engines, step.description])
+        # The path lets the flow page navigate straight to the step
+        item.setData(0, QtCore.Qt.ItemDataRole.UserRole, step.path)
+        return item
+
+    def _build_config_page(self) -> QtWidgets.QWidget:
+        page = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(12)
 
-        return page
+        title_label = QtWidgets.QLabel("配置信息")
+        title_label.setObjectName("pageTitle")
+        layout.addWidget(title_label)
+
+        self.theme_box = QtWidgets.QCheckBox("深色主题", parent=page)
+        self.theme_box.setChecked(THEME.name == "dark")
+        layout.addWidget(self.theme_box)
+
+        hint = QtWidgets.QLabel("运行时性能：各热点路径的延迟分位数、事件循环延迟与队列深度。")
+        hint.setObjectName("hintLabel")
+        layout.addWidget(hint)
+
+        self.perf_panel = PerfPanel(parent=page)
+        layout.addWidget(self.perf_panel, 1)
+        self.config_page = page
+        return self.config_page
 
     def _apply_style(self, root: QtWidgets.QWidget):
-        root.setStyleSheet(
-            """
-            QWidget#decoration_page { background: #f6f7fb; }
-            #sidebar { background: #111827; color: #e5e7eb; }
-            #navContainer QToolButton {
-                border: none;
-                color: #e5e7eb;
-                padding: 10px 12px;
-                border-radius: 10px;
-                text-align: left;
-            }
-            #toggleButton {
-                border: 1px solid rgba(255, 255, 255, 0.16);
-                background: transparent;
-                border-radius: 10px;
-                padding: 8px;
-            }
-            #toggleButton:hover {
-                background: rgba(255, 255, 255, 0.08);
-                border-color: rgba(255, 255, 255, 0.24);
-            }
-            #toggleButton:checked {
-                transform: rotate(180deg);
-            }
-            #navContainer QToolButton:checked {
-                background: #2563eb;
-            }
-            #navContainer QToolButton:hover {
-                background: #1f2937;
-            }
-            #subStepFrame QToolButton,
-            #subStepFrame QLabel,
-            #stepStack QToolButton {
-                border: none;
-                color: #1f2937;
-                padding: 10px 12px;
-                border-radius: 10px;
-                background: #e5e7eb;
-            }
-            #stepRail {
-                background: #fff;
-                border: 1px solid #e5e7eb;
-                border-radius: 12px;
-                padding: 8px;
-            }
-            #subStepFrame QToolButton:checked,
-            #stepStack QToolButton:checked {
-                background: #2563eb;
-                color: #ffffff;
-            }
-            #contentContainer { background: #f6f7fb; }
-            #headerBar { background: #ffffff; border-radius: 12px; padding: 12px 16px; }
-            #titleLabel { font-size: 22px; font-weight: 700; color: #111827; }
-            #prototypeTag {
-                background: #dbeafe;
-                color: #1e3a8a;
-                border-radius: 10px;
-                padding: 6px 10px;
-                font-weight: 700;
-            }
-            #contentHeader, #pageTitle { font-size: 18px; font-weight: 600; color: #1f2937; }
-            #hintLabel { color: #4b5563; }
-            #contentGroup { background: #ffffff; border: 1px solid #e5e7eb; border-radius: 12px; }
-            #contentGroup > QWidget { border: none; }
-            #placeholderLabel { color: #6b7280; padding: 12px; }
-            #mainStack, #stepStack { border: none; }
-            #logPanel {
-                background: #ffffff;
-                border: 1px solid #e5e7eb;
-                border-radius: 12px;
-            }
-            #logView {
-                background: #0f172a;
-                color: #d1d5db;
-                font-family: "JetBrains Mono", "Consolas", monospace;
-                border-radius: 8px;
-                min-height: 160px;
-            }
-            """
-        )
+        THEME.install(root)
 
     def set_prototype_name(self, name: str):
         display_name = name or "样机未选择"
         self.prototype_tag.setText(display_name)
 
 
-__all__ = ["Ui_decoration_page", "CommonContentWidget", "NavigationButton"]
+__all__ = [
+    "Ui_decoration_page",
+    "CommonContentWidget",
+    "LazyStackedWidget",
+    "NavigationButton",
+]
@@ -0,0 +1,42 @@
+from PyQt6 import QtCore, QtWidgets
+
+
+class MeasurementTableView(QtWidgets.QTableView):
+    """Table view tuned for large virtual models.
+
+    Fixed row heights and non-content-based header sizing keep Qt from
+    measuring every row, so scrolling cost depends only on the visible rows.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self.setObjectName("measurementTable")
+        self.setWordWrap(False)
+        self.setAlternatingRowColors(True)
+        self.setSortingEnabled(True)
+        self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        vertical = self.verticalHeader()
+        vertical.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(24)
+        horizontal = self.horizontalHeader()
+        horizontal.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        horizontal.setSortIndicatorShown(True)
+        horizontal.setSortIndicator(-1, QtCore.Qt.SortOrder.AscendingOrder)
+        self._follow_tail = True
+
+    def setModel(self, model: QtCore.QAbstractItemModel):
+        super().setModel(model)
+        model.rowsInserted.connect(self._on_rows_inserted)
+
+    def set_follow_tail(self, follow: bool):
+        """Keep the newest row in view while rows are appended."""
+        self._follow_tail = follow
+
+    def _on_rows_inserted(self, parent: QtCore.QModelIndex, first: int, last: int):
+        bar = self.verticalScrollBar()
+        if self._follow_tail and bar.value() >= bar.maximum() - self.verticalHeader().defaultSectionSize():
+            QtCore.QTimer.singleShot(0, self.scrollToBottom)
+
+
+__all__ = ["MeasurementTableView"]
@@ -0,0 +1,90 @@
+from PyQt6 import QtCore, QtWidgets
+
+
+class PerfPanel(QtWidgets.QWidget):
+    """Live latency view for the ``配置信息`` page.
+
+    ``enable_box`` toggles tracing; the table lists every span with its count and
+    p50/p99/max latency, and the labels show event-loop lag and queue depths.
+    Table items are created once per span name and only their texts change on
+    refresh, so a refresh costs the same no matter how long tracing has run.
+    """
+
+    export_requested = QtCore.pyqtSignal()
+    reset_requested = QtCore.pyqtSignal()
+
+    COLUMNS = ["区间", "次数", "p50 (ms)", "p99 (ms)", "最大 (ms)"]
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        controls = QtWidgets.QHBoxLayout()
+        self.enable_box = QtWidgets.QCheckBox("启用性能跟踪", parent=self)
+        self.reset_btn = QtWidgets.QPushButton("清空", parent=self)
+        self.export_btn = QtWidgets.QPushButton("导出 Chrome trace…", parent=self)
+        self.reset_btn.clicked.connect(self.reset_requested)
+        self.export_btn.clicked.connect(self.export_requested)
+        controls.addWidget(self.enable_box)
+        controls.addStretch(1)
+        controls.addWidget(self.reset_btn)
+        controls.addWidget(self.export_btn)
+        layout.addLayout(controls)
+
+        self.lag_label = QtWidgets.QLabel("事件循环延迟：—", parent=self)
+        self.lag_label.setObjectName("hintLabel")
+        self.queue_label = QtWidgets.QLabel("队列深度：—", parent=self)
+        self.queue_label.setObjectName("hintLabel")
+        self.queue_label.setWordWrap(True)
+        layout.addWidget(self.lag_label)
+        layout.addWidget(self.queue_label)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS), parent=self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 1)
+        self._rows: dict[str, int] = {}
+
+    def _row(self, name: str) -> int:
+        row = self._rows.get(name)
+        if row is None:
+            row = self._rows[name] = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(name))
+            for column in range(1, len(self.COLUMNS)):
+                item = QtWidgets.QTableWidgetItem()
+                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        return row
+
+    def set_stats(self, rows: list[dict]):
+        for stats in rows:
+            if stats["name"] == "event_loop.lag_ms":
+                self.lag_label.setText(
+                    f"事件循环延迟：p50 {stats['p50_ms']:.2f} ms  ·  p99 {stats['p99_ms']:.2f} ms  ·  "
+                    f"最大 {stats['max_ms']:.1f} ms"
+                )
+                continue
+            row = self._row(stats["name"])
+            for column, text in enumerate(
+                (f"{stats['count']:,}", f"{stats['p50_ms']:.3f}", f"{stats['p99_ms']:.3f}", f"{stats['max_ms']:.3f}"),
+                start=1,
+            ):
+                self.table.item(row, column).setText(text)
+
+    def set_queues(self, counters: dict[str, float]):
+        if counters:
+            self.queue_label.setText("队列深度：" + "  ·  ".join(f"{k} {v:g}" for k, v in sorted(counters.items())))
+
+    def clear(self):
+        self.table.setRowCount(0)
+        self._rows.clear()
+        self.lag_label.setText("事件循环延迟：—")
+        self.queue_label.setText("队列深度：—")
+
+
+__all__ = ["PerfPanel"]
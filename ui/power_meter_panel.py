@@ -0,0 +1,35 @@
+from PyQt6 import QtCore, QtWidgets
+
+from ui.trace_plot import TracePlotWidget
+
+
+class PowerMeterPanel(QtWidgets.QWidget):
+    """Live power-meter readout hosted inside ``CommonContentWidget.power_group``."""
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.value_label = QtWidgets.QLabel("-- mW", parent=self)
+        self.value_label.setObjectName("powerValue")
+        self.value_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.value_label)
+
+        self.stats_label = QtWidgets.QLabel("", parent=self)
+        self.stats_label.setObjectName("hintLabel")
+        self.stats_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.stats_label)
+
+        self.plot = TracePlotWidget(unit="mW", parent=self)
+        layout.addWidget(self.plot, 1)
+
+    def update_snapshot(self, snapshot):
+        self.value_label.setText(f"{snapshot.latest:.4f} mW")
+        self.stats_label.setText(
+            f"{snapshot.throughput:,.0f} S/s  ·  共 {snapshot.total_samples:,}  ·  丢失 {snapshot.dropped:,}"
+        )
+
+
+__all__ = ["PowerMeterPanel"]
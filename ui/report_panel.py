@@ -0,0 +1,71 @@
+from PyQt6 import QtCore, QtWidgets
+
+
+class ReportPanel(QtWidgets.QWidget):
+    """Report generation controls for the ``样机总结`` and ``样机交付`` steps.
+
+    The panel only emits intents (``generate_requested`` with the chosen format,
+    ``cancel_requested``); the page logic runs the report job and feeds progress
+    back via ``set_progress`` / ``set_running`` / ``set_status``.
+    """
+
+    generate_requested = QtCore.pyqtSignal(str)
+    cancel_requested = QtCore.pyqtSignal()
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.setSpacing(6)
+        self.format_box = QtWidgets.QComboBox(parent=self)
+        self.format_box.addItem("HTML", "html")
+        self.format_box.addItem("PDF", "pdf")
+        self.generate_btn = QtWidgets.QPushButton("生成报告", parent=self)
+        self.generate_btn.clicked.connect(lambda: self.generate_requested.emit(self.format_box.currentData()))
+        self.cancel_btn = QtWidgets.QPushButton("取消", parent=self)
+        self.cancel_btn.clicked.connect(self.cancel_requested)
+        controls.addWidget(self.format_box)
+        controls.addWidget(self.generate_btn)
+        controls.addWidget(self.cancel_btn)
+        controls.addStretch(1)
+        layout.addLayout(controls)
+
+        self.progress_bar = QtWidgets.QProgressBar(parent=self)
+        self.progress_bar.setTextVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QtWidgets.QLabel("", parent=self)
+        self.status_label.setObjectName("hintLabel")
+        self.status_label.setWordWrap(True)
+        self.status_label.setTextInteractionFlags(QtCore.Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.status_label)
+        self.set_running(False)
+
+    def set_running(self, running: bool):
+        self.generate_btn.setEnabled(not running)
+        self.format_box.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+        self.progress_bar.setVisible(running)
+        if running:
+            self.progress_bar.setRange(0, 0)
+
+    def set_progress(self, done: int, total: int, stage: str):
+        if self.progress_bar.maximum() != total:
+            self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"正在生成：{stage}（{done * 100 // max(1, total)}%）")
+
+    def set_status(self, text: str):
+        self.status_label.setText(text)
+
+    def set_available(self, available: bool, reason: str = ""):
+        self.generate_btn.setEnabled(available)
+        self.format_box.setEnabled(available)
+        if not available:
+            self.status_label.setText(reason)
+
+
+__all__ = ["ReportPanel"]
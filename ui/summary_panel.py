@@ -0,0 +1,60 @@
+from PyQt6 import QtCore, QtWidgets
+
+from ui.theme import THEME
+
+
+class SummaryPanel(QtWidgets.QWidget):
+    """Key/value summary grid for the ``样机总结`` step.
+
+    Rows are created once per (section, key) and only their texts change
+    afterwards, so a refresh costs the same no matter how long the session has
+    been running. A section heading is inserted before its first row.
+    ``passed`` colours the verdict cell: True = pass, False = fail, None = no limit.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        self._grid = QtWidgets.QGridLayout(self)
+        self._grid.setContentsMargins(0, 0, 0, 0)
+        self._grid.setHorizontalSpacing(16)
+        self._grid.setVerticalSpacing(6)
+        self._grid.setColumnStretch(1, 1)
+        self._rows: dict[tuple[str, str], tuple[QtWidgets.QLabel, QtWidgets.QLabel, QtWidgets.QLabel]] = {}
+        self._sections: set[str] = set()
+        self.verdict_label = QtWidgets.QLabel("", parent=self)
+        self.verdict_label.setObjectName("contentHeader")
+        self._grid.addWidget(self.verdict_label, 0, 0, 1, 3)
+
+    def _row(self, section: str, key: str) -> tuple[QtWidgets.QLabel, QtWidgets.QLabel, QtWidgets.QLabel]:
+        row = self._rows.get((section, key))
+        if row is None:
+            if section not in self._sections:
+                heading = QtWidgets.QLabel(section, parent=self)
+                heading.setObjectName("hintLabel")
+                self._grid.addWidget(heading, self._grid.rowCount(), 0, 1, 3)
+                self._sections.add(section)
+            index = self._grid.rowCount()
+            row = (QtWidgets.QLabel(key, parent=self), QtWidgets.QLabel(parent=self), QtWidgets.QLabel(parent=self))
+            row[1].setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+            for column, label in enumerate(row):
+                self._grid.addWidget(label, index, column)
+            self._rows[(section, key)] = row
+        return row
+
+    def set_value(self, section: str, key: str, text: str, passed: bool | None = None):
+        _, value, verdict = self._row(section, key)
+        value.setText(text)
+        text = "" if passed is None else ("合格" if passed else "不合格")
+        if verdict.text() != text:
+            # 只在结论变化时切换动态属性，只重新应用这一个标签的样式
+            verdict.setText(text)
+            THEME.set_state(verdict, "verdict", None if passed is None else ("pass" if passed else "fail"))
+
+    def set_verdict(self, passed: bool | None):
+        if passed is None:
+            self.verdict_label.setText("数据不足")
+        else:
+            self.verdict_label.setText("总体结论：合格" if passed else "总体结论：不合格")
+
+
+__all__ = ["SummaryPanel"]
@@ -0,0 +1,273 @@
+import json
+import os
+import string
+import time
+import weakref
+
+from PyQt6 import QtGui, QtWidgets, sip
+
+DEFAULT_THEME_PATH = os.path.join(os.path.expanduser("~"), ".fos", "theme.json")
+
+# Design tokens per theme; the stylesheet template and the palette only refer to these names
+THEMES: dict[str, dict[str, str]] = {
+    "light": {
+        "bg": "#f6f7fb",
+        "surface": "#ffffff",
+        "border": "#e5e7eb",
+        "text": "#111827",
+        "heading": "#1f2937",
+        "muted": "#4b5563",
+        "placeholder": "#6b7280",
+        "accent": "#2563eb",
+        "on_accent": "#ffffff",
+        "chip_bg": "#e5e7eb",
+        "chip_text": "#1f2937",
+        "sidebar_bg": "#111827",
+        "sidebar_text": "#e5e7eb",
+        "sidebar_hover": "#1f2937",
+        "tag_bg": "#dbeafe",
+        "tag_text": "#1e3a8a",
+        "log_bg": "#0f172a",
+        "log_text": "#d1d5db",
+        "pass": "#16a34a",
+        "fail": "#dc2626",
+    },
+    "dark": {
+        "bg": "#0b1120",
+        "surface": "#111827",
+        "border": "#1f2937",
+        "text": "#f3f4f6",
+        "heading": "#e5e7eb",
+        "muted": "#9ca3af",
+        "placeholder": "#9ca3af",
+        "accent": "#3b82f6",
+        "on_accent": "#ffffff",
+        "chip_bg": "#1f2937",
+        "chip_text": "#e5e7eb",
+        "sidebar_bg": "#020617",
+        "sidebar_text": "#e5e7eb",
+        "sidebar_hover": "#1e293b",
+        "tag_bg": "#1e3a8a",
+        "tag_text": "#dbeafe",
+        "log_bg": "#020617",
+        "log_text": "#d1d5db",
+        "pass": "#22c55e",
+        "fail": "#f87171",
+    },
+}
+
+TEMPLATE = """
+QWidget#decoration_page { background: $bg; }
+#sidebar { background: $sidebar_bg; color: $sidebar_text; }
+#navContainer QToolButton {
+    border: none;
+    color: $sidebar_text;
+    padding: 10px 12px;
+    border-radius: 10px;
+    text-align: left;
+}
+#toggleButton {
+    border: 1px solid rgba(255, 255, 255, 0.16);
+    background: transparent;
+    border-radius: 10px;
+    padding: 8px;
+}
+#toggleButton:hover {
+    background: rgba(255, 255, 255, 0.08);
+    border-color: rgba(255, 255, 255, 0.24);
+}
+#navContainer QToolButton:checked {
+    background: $accent;
+}
+#navContainer QToolButton:hover {
+    background: $sidebar_hover;
+}
+#subStepFrame QToolButton,
+#subStepFrame QLabel,
+#stepStack QToolButton {
+    border: none;
+    color: $chip_text;
+    padding: 10px 12px;
+    border-radius: 10px;
+    background: $chip_bg;
+}
+#stepRail {
+    background: $surface;
+    border: 1px solid $border;
+    border-radius: 12px;
+    padding: 8px;
+}
+#subStepFrame QToolButton:checked,
+#stepStack QToolButton:checked {
+    background: $accent;
+    color: $on_accent;
+}
+#contentContainer { background: $bg; }
+#headerBar { background: $surface; border-radius: 12px; padding: 12px 16px; }
+#titleLabel { font-size: 22px; font-weight: 700; color: $text; }
+#prototypeTag {
+    background: $tag_bg;
+    color: $tag_text;
+    border-radius: 10px;
+    padding: 6px 10px;
+    font-weight: 700;
+}
+#contentHeader, #pageTitle { font-size: 18px; font-weight: 600; color: $heading; }
+#hintLabel { color: $muted; }
+#contentGroup { background: $surface; border: 1px solid $border; border-radius: 12px; }
+#contentGroup > QWidget { border: none; }
+#placeholderLabel { color: $placeholder; padding: 12px; }
+#powerValue { font-size: 28px; font-weight: 700; color: $text; }
+#mainStack, #stepStack { border: none; }
+#logPanel {
+    background: $surface;
+    border: 1px solid $border;
+    border-radius: 12px;
+}
+#logView {
+    background: $log_bg;
+    color: $log_text;
+    font-family: "JetBrains Mono", "Consolas", monospace;
+    border-radius: 8px;
+    min-height: 160px;
+}
+QLabel[verdict="pass"] { color: $pass; }
+QLabel[verdict="fail"] { color: $fail; }
+"""
+
+# Palette roles derived from the same tokens, so unstyled widgets (tables, inputs) follow the theme
+PALETTE_ROLES = {
+    QtGui.QPalette.ColorRole.Window: "bg",
+    QtGui.QPalette.ColorRole.WindowText: "text",
+    QtGui.QPalette.ColorRole.Base: "surface",
+    QtGui.QPalette.ColorRole.AlternateBase: "bg",
+    QtGui.QPalette.ColorRole.Text: "text",
+    QtGui.QPalette.ColorRole.Button: "chip_bg",
+    QtGui.QPalette.ColorRole.ButtonText: "chip_text",
+    QtGui.QPalette.ColorRole.Highlight: "accent",
+    QtGui.QPalette.ColorRole.HighlightedText: "on_accent",
+    QtGui.QPalette.ColorRole.PlaceholderText: "placeholder",
+    QtGui.QPalette.ColorRole.ToolTipBase: "surface",
+    QtGui.QPalette.ColorRole.ToolTipText: "text",
+}
+
+
+class ThemeEngine:
+    """Token-based stylesheet and palette generator shared by all windows.
+
+    Each theme's QSS is generated once from ``TEMPLATE`` and then reused by every
+    window; ``install`` skips ``setStyleSheet`` when a root already carries the
+    current sheet, because Qt re-polishes the whole subtree even for an identical
+    string. ``set_theme`` re-applies the sheet to every installed root and returns
+    the re-polish time. The chosen theme is persisted to ``settings_path``, so the
+    next session starts with it. Per-widget state should go through
+    ``set_state``, which re-polishes only that widget instead of giving it its
+    own stylesheet.
+    """
+
+    def __init__(
+        self,
+        themes: dict[str, dict[str, str]] = THEMES,
+        template: str = TEMPLATE,
+        settings_path: str | None = DEFAULT_THEME_PATH,
+    ):
+        self.themes = themes
+        self.template = string.Template(template)
+        self.settings_path = settings_path
+        self.name = self._load_saved() or "light"
+        self.compiles = 0
+        self.last_repolish_ms = 0.0
+        self._sheets: dict[str, str] = {}
+        self._palettes: dict[str, QtGui.QPalette] = {}
+        self._colors: dict[tuple[str, str], QtGui.QColor] = {}
+        self._roots: weakref.WeakSet[QtWidgets.QWidget] = weakref.WeakSet()
+
+    def _load_saved(self) -> str | None:
+        if self.settings_path is None:
+            return None
+        try:
+            with open(self.settings_path, encoding="utf-8") as f:
+                name = json.load(f).get("theme")
+        except (OSError, ValueError, AttributeError):
+            return None
+        return name if name in self.themes else None
+
+    def _save(self):
+        if self.settings_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.settings_path), exist_ok=True)
+            with open(self.settings_path, "w", encoding="utf-8") as f:
+                json.dump({"theme": self.name}, f)
+        except OSError:
+            pass
+
+    def stylesheet(self, name: str | None = None) -> str:
+        name = name or self.name
+        sheet = self._sheets.get(name)
+        if sheet is None:
+            sheet = self._sheets[name] = self.template.substitute(self.themes[name])
+            self.compiles += 1
+        return sheet
+
+    def palette(self, name: str | None = None) -> QtGui.QPalette:
+        name = name or self.name
+        palette = self._palettes.get(name)
+        if palette is None:
+            palette = QtGui.QPalette()
+            for role, token in PALETTE_ROLES.items():
+                palette.setColor(role, self.color(token, name))
+            self._palettes[name] = palette
+        return palette
+
+    def color(self, token: str, name: str | None = None) -> QtGui.QColor:
+        """Token colour for custom-painted widgets."""
+        key = (name or self.name, token)
+        color = self._colors.get(key)
+        if color is None:
+            color = self._colors[key] = QtGui.QColor(self.themes[key[0]][token])
+        return color
+
+    def install(self, root: QtWidgets.QWidget):
+        self._roots.add(root)
+        self._apply(root)
+
+    def _apply(self, root: QtWidgets.QWidget):
+        sheet = self.stylesheet()
+        if root.styleSheet() == sheet:
+            return
+        root.setPalette(self.palette())
+        root.setStyleSheet(sheet)
+
+    def set_theme(self, name: str, persist: bool = True) -> float:
+        """Switch every installed window to ``name``; returns the re-polish time in ms."""
+        if name not in self.themes:
+            raise ValueError(f"unknown theme {name!r}")
+        if name == self.name:
+            return 0.0
+        self.name = name
+        start = time.perf_counter()
+        for root in list(self._roots):
+            if not sip.isdeleted(root):
+                self._apply(root)
+        self.last_repolish_ms = (time.perf_counter() - start) * 1000.0
+        if persist:
+            self._save()
+        return self.last_repolish_ms
+
+    @staticmethod
+    def set_state(widget: QtWidgets.QWidget, name: str, value):
+        """Set a dynamic property used by selectors like ``[verdict="pass"]`` and re-polish only ``widget``."""
+        if widget.property(name) == value:
+            return
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+
+
+THEME = ThemeEngine()
+
+
+__all__ = ["THEMES", "TEMPLATE", "ThemeEngine", "THEME"]
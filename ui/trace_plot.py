@@ -0,0 +1,208 @@
+import time
+
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from logic.channel_archive import ChannelArchive
+from logic.ring_buffer import SampleRingBuffer, decimate_segments
+from ui.theme import THEME
+
+
+def _polygon_from_arrays(xs: np.ndarray, ys: np.ndarray) -> QtGui.QPolygonF:
+    # 直接把坐标写入 QPolygonF 的内存（QPointF 即两个连续的 double），避免逐点构造
+    polygon = QtGui.QPolygonF([QtCore.QPointF()] * len(xs))
+    ptr = polygon.data()
+    ptr.setsize(len(xs) * 2 * np.dtype(np.float64).itemsize)
+    points = np.frombuffer(ptr, dtype=np.float64).reshape(-1, 2)
+    points[:, 0] = xs
+    points[:, 1] = ys
+    return polygon
+
+
+class TracePlotWidget(QtWidgets.QWidget):
+    """Real-time trace plot over a fixed-size NumPy ring buffer.
+
+    The visible window is min/max decimated down to one bin per pixel column
+    straight from ring buffer views, so the cost of a frame depends on the
+    widget width rather than on the number of buffered samples. Repaints are
+    driven by a throttled timer that only fires ``update()`` when new samples
+    arrived or the view changed. Drag to pan back through history, wheel to
+    zoom, double-click to return to live follow.
+
+    With an archive attached (``set_archive``) panning and zooming can go past
+    the ring buffer's retention; those views are drawn from the archive's
+    per-chunk summaries or decimated raw chunks.
+    """
+
+    def __init__(
+        self,
+        buffer: SampleRingBuffer | None = None,
+        capacity: int = 1 << 20,
+        window: int = 20000,
+        max_fps: float = 30.0,
+        unit: str = "",
+        parent: QtWidgets.QWidget | None = None,
+    ):
+        super().__init__(parent)
+        self.buffer = buffer if buffer is not None else SampleRingBuffer(capacity)
+        self.archive: ChannelArchive | None = None
+        self.archive_offset = 0
+        self.window = window
+        self.unit = unit
+        self.line_color: QtGui.QColor | None = None  # None 时使用主题的强调色
+        self.last_paint_ms = 0.0
+        self.paint_count = 0
+
+        self._anchor: int | None = None  # 平移时视窗右端对应的累计样本序号，None 表示跟随最新
+        self._drag_x: float | None = None
+        self._drag_anchor = 0
+        self._seen_total = -1
+        self._dirty = True
+
+        self.setMinimumHeight(120)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(int(1000 / max_fps))
+        self._timer.timeout.connect(self._on_tick)
+        self._timer.start()
+
+    # -- data ---------------------------------------------------------------
+
+    def append(self, t: np.ndarray, v: np.ndarray):
+        self.buffer.write(np.asarray(t, dtype=np.float64), np.asarray(v))
+
+    def set_buffer(self, buffer: SampleRingBuffer):
+        self.buffer = buffer
+        self._anchor = None
+        self._dirty = True
+
+    def set_archive(self, archive: ChannelArchive | None, offset: int = 0):
+        """Back the history with ``archive``; buffer sample ``i`` is archive sample ``i + offset``."""
+        self.archive = archive
+        self.archive_offset = offset
+        self._dirty = True
+
+    def _oldest(self) -> int:
+        """Oldest cumulative sample index that can be shown."""
+        if self.archive is not None:
+            return -self.archive_offset
+        return self.buffer.total_written - len(self.buffer)
+
+    def set_max_fps(self, max_fps: float):
+        self._timer.setInterval(int(1000 / max_fps))
+
+    def set_paused(self, paused: bool):
+        """Stop or resume the repaint timer (acquisition keeps filling the buffer)."""
+        if paused != self._timer.isActive():
+            return
+        if paused:
+            self._timer.stop()
+        else:
+            self._dirty = True
+            self._timer.start()
+
+    def is_live(self) -> bool:
+        return self._anchor is None
+
+    def follow_live(self):
+        self._anchor = None
+        self._dirty = True
+
+    def _on_tick(self):
+        total = self.buffer.total_written
+        if self._dirty or (self._anchor is None and total != self._seen_total):
+            self._seen_total = total
+            self._dirty = False
+            self.update()
+
+    def _visible_range(self) -> tuple[int, int]:
+        """Cumulative sample range ``[left, right)`` of the current view."""
+        total = self.buffer.total_written
+        oldest = self._oldest()
+        right = total if self._anchor is None else min(max(self._anchor, oldest), total)
+        left = max(oldest, right - self.window)
+        return left, right
+
+    # -- painting -----------------------------------------------------------
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        start = time.perf_counter()
+        painter = QtGui.QPainter(self)
+        rect = QtCore.QRectF(self.rect()).adjusted(48, 8, -8, -20)
+        painter.fillRect(self.rect(), THEME.color("surface"))
+        painter.setPen(QtGui.QPen(THEME.color("border")))
+        painter.drawRect(rect)
+
+        n_bins = max(1, int(rect.width()))
+        with self.buffer.lock:
+            left, right = self._visible_range()
+            ring_oldest = self.buffer.total_written - len(self.buffer)
+            from_ring = left >= ring_oldest or self.archive is None
+            if from_ring:
+                t, v = decimate_segments(self.buffer.segments(left - ring_oldest, right - left), n_bins)
+        if not from_ring:
+            # 视窗超出环形缓冲的保留范围，改从归档读取
+            t, v = self.archive.read_minmax(left + self.archive_offset, right + self.archive_offset, n_bins)
+
+        if len(v) >= 2:
+            t_span = float(t[-1] - t[0]) or 1.0
+            v_min = float(v.min())
+            v_max = float(v.max())
+            pad = (v_max - v_min) * 0.05 or 1e-9
+            v_min -= pad
+            v_max += pad
+            xs = rect.left() + (t - t[0]) * (rect.width() / t_span)
+            ys = rect.bottom() - (v - v_min) * (rect.height() / (v_max - v_min))
+            polyline = _polygon_from_arrays(xs, ys)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, False)
+            painter.setPen(QtGui.QPen(self.line_color or THEME.color("accent"), 1))
+            painter.drawPolyline(polyline)
+
+            painter.setPen(QtGui.QPen(THEME.color("placeholder")))
+            painter.drawText(QtCore.QRectF(0, rect.top() - 6, 46, 14), QtCore.Qt.AlignmentFlag.AlignRight, f"{v_max:.3g}")
+            painter.drawText(QtCore.QRectF(0, rect.bottom() - 8, 46, 14), QtCore.Qt.AlignmentFlag.AlignRight, f"{v_min:.3g}")
+            status = "实时" if self.is_live() else "回看"
+            painter.drawText(
+                QtCore.QRectF(rect.left(), rect.bottom() + 2, rect.width(), 16),
+                QtCore.Qt.AlignmentFlag.AlignRight,
+                f"{status}  {t_span:.2f} s  {self.unit}",
+            )
+        painter.end()
+        self.paint_count += 1
+        self.last_paint_ms = (time.perf_counter() - start) * 1000.0
+
+    # -- interaction --------------------------------------------------------
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == QtCore.Qt.MouseButton.LeftButton:
+            self._drag_x = event.position().x()
+            self._drag_anchor = self._anchor if self._anchor is not None else self.buffer.total_written
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent):
+        if self._drag_x is None:
+            return
+        samples_per_px = self.window / max(1, self.width() - 56)
+        shift = int((event.position().x() - self._drag_x) * samples_per_px)
+        self.pan_to(self._drag_anchor - shift)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent):
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, event: QtGui.QMouseEvent):
+        self.follow_live()
+
+    def wheelEvent(self, event: QtGui.QWheelEvent):
+        factor = 1.25 if event.angleDelta().y() < 0 else 0.8
+        history = self.buffer.total_written - self._oldest()
+        self.window = int(min(max(self.window * factor, 100), max(100, history)))
+        self._dirty = True
+
+    def pan_to(self, right_total: int):
+        """Anchor the right edge of the view at cumulative sample ``right_total``."""
+        total = self.buffer.total_written
+        self._anchor = None if right_total >= total else right_total
+        self._dirty = True
+
+
+__all__ = ["TracePlotWidget"]
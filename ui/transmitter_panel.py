@@ -0,0 +1,72 @@
+from PyQt6 import QtCore, QtWidgets
+
+from ui.trace_plot import TracePlotWidget
+
+
+class TransmitterPanel(QtWidgets.QWidget):
+    """Signal transmitter controls hosted inside ``CommonContentWidget.tx_group``.
+
+    The panel only emits intents (``output_requested``/``power_requested``); the
+    page logic turns them into instrument commands and feeds readbacks back via
+    ``update_readback``.
+    """
+
+    output_requested = QtCore.pyqtSignal(bool)
+    power_requested = QtCore.pyqtSignal(float)
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.setSpacing(6)
+        self.output_btn = QtWidgets.QPushButton("输出关", parent=self)
+        self.output_btn.setCheckable(True)
+        self.output_btn.toggled.connect(self._on_output_toggled)
+        controls.addWidget(self.output_btn)
+
+        self.power_spin = QtWidgets.QDoubleSpinBox(parent=self)
+        self.power_spin.setRange(0.0, 1000.0)
+        self.power_spin.setDecimals(3)
+        self.power_spin.setSuffix(" mW")
+        self.power_spin.setValue(1.0)
+        controls.addWidget(self.power_spin, 1)
+
+        self.apply_btn = QtWidgets.QPushButton("设置", parent=self)
+        self.apply_btn.clicked.connect(lambda: self.power_requested.emit(self.power_spin.value()))
+        controls.addWidget(self.apply_btn)
+        layout.addLayout(controls)
+
+        self.value_label = QtWidgets.QLabel("-- mW", parent=self)
+        self.value_label.setObjectName("powerValue")
+        self.value_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.value_label)
+
+        self.stats_label = QtWidgets.QLabel("", parent=self)
+        self.stats_label.setObjectName("hintLabel")
+        self.stats_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.stats_label)
+
+        self.plot = TracePlotWidget(capacity=1 << 14, window=600, max_fps=10, unit="mW", parent=self)
+        layout.addWidget(self.plot, 1)
+
+    def _on_output_toggled(self, on: bool):
+        self.output_btn.setText("输出开" if on else "输出关")
+        self.output_requested.emit(on)
+
+    def update_readback(self, t: float, output: bool, power: float):
+        if self.output_btn.isChecked() != output:
+            self.output_btn.blockSignals(True)
+            self.output_btn.setChecked(output)
+            self.output_btn.setText("输出开" if output else "输出关")
+            self.output_btn.blockSignals(False)
+        self.value_label.setText(f"{power:.4f} mW")
+        self.plot.append([t], [power])
+
+    def set_latency_text(self, text: str):
+        self.stats_label.setText(text)
+
+
+__all__ = ["TransmitterPanel"]